@@ -1,4 +1,6 @@
 #!/bin/bash
+# NOTE: Superseded by 'python runners/account_runner.py <number_of_accounts>', which creates and funds the accounts in batches, with one transaction per batch
+# instead of one Flow CLI call per account. This script is kept for reference only.
 # Grab the number of accounts to create from the user input
 i=-1
 while [ $i -le 0 ]
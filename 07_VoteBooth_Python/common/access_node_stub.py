@@ -0,0 +1,688 @@
+"""Module with an in-process stand-in for the Flow Access API, to run the Python side of the project (transaction building, signing, event decoding, tally) without a network.
+
+The stand-in is a grpclib server that answers the same gRPC routes used by flow_client, with canned JSON-Cadence results and configurable latencies. Since it speaks the real
+protocol, ScriptRunner, TransactionRunner and the rest of the runners work against it unmodified: start it on the host and port of the configured network (the emulator one,
+by default) and run them as usual. Routes that are not implemented here are answered with an UNIMPLEMENTED gRPC status.
+
+Canned results are keyed by the name of the script or transaction, as in the [scripts] and [transactions] config sections, and matched against the Cadence code received.
+Script results can be a cadence.Value, a JSON-Cadence dictionary or a function of the script arguments that returns one of these. Transaction results are a list of
+events (cadence.Event or JSON-Cadence dictionaries), or a function of the transaction arguments that returns one, plus an optional error message. Without a canned
+results file, setElectionDefaults gives the Election life cycle scripts and transactions results that follow the Elections created through the stand-in.
+"""
+from flow_py_sdk import cadence
+from flow_py_sdk.cadence import cadence_object_hook, encode_arguments
+from flow_py_sdk.proto.flow import access, entities
+
+from grpclib.const import Cardinality, Handler, Status
+from grpclib.exceptions import GRPCError
+from grpclib.server import Server
+
+import asyncio
+import configparser
+import datetime
+import hashlib
+import json
+import os
+import pathlib
+import random
+import time
+from typing import Callable
+
+from common.utils import Utils
+from common.source_cache import source_cache
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+config_path = pathlib.Path(os.getcwd()).joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+# gRPC routes answered by the stand-in, with the name used for their latency settings
+ACCESS_API_ROUTES: dict[str, str] = {
+    "ping": "/flow.access.AccessAPI/Ping",
+    "get_latest_block": "/flow.access.AccessAPI/GetLatestBlock",
+    "get_account_at_latest_block": "/flow.access.AccessAPI/GetAccountAtLatestBlock",
+    "execute_script": "/flow.access.AccessAPI/ExecuteScriptAtLatestBlock",
+    "send_transaction": "/flow.access.AccessAPI/SendTransaction",
+    "get_transaction_result": "/flow.access.AccessAPI/GetTransactionResult",
+    "get_events_for_height_range": "/flow.access.AccessAPI/GetEventsForHeightRange"
+}
+
+
+class AccessNodeStub(object):
+    """In-process Flow Access API stand-in. Use it as an async context manager, or call start() and stop(), from the event loop that runs the code under test.
+
+    Blocks are produced every block_interval seconds, accounts are created on the fly, with account_keys keys each, the first time they are requested, and transactions
+    are sealed seal_delay seconds (plus up to seal_jitter seconds, so that they can be sealed out of order) after being received. Transactions are executed, i.e., their
+    proposal key sequence number is checked and their events built, when they are sealed. Every sealed transaction emits, besides its canned events, the FlowFees.FeesDeducted and FungibleToken.Withdrawn
+    events that the gas profiling functions expect.
+    """
+    def __init__(self, host: str = None, port: int = None) -> None:
+        """
+        :param host (str): The host to listen on. Defaults to the [access_node_stub] config section value.
+        :param port (int): The port to listen on. Defaults to the [access_node_stub] config section value.
+        """
+        super().__init__()
+        self.host: str = host if host else config.get(section="access_node_stub", option="host", fallback="localhost")
+        self.port: int = port if port else config.getint(section="access_node_stub", option="port", fallback=3569)
+
+        self.block_interval: float = config.getfloat(section="access_node_stub", option="block_interval", fallback=1.0)
+        self.seal_delay: float = config.getfloat(section="access_node_stub", option="seal_delay", fallback=0.5)
+        self.seal_jitter: float = config.getfloat(section="access_node_stub", option="seal_jitter", fallback=0.0)
+        self.account_keys: int = config.getint(section="access_node_stub", option="account_keys", fallback=10)
+        self.account_balance: float = config.getfloat(section="access_node_stub", option="account_balance", fallback=1000.0)
+        self.fee_amount: float = config.getfloat(section="access_node_stub", option="fee_amount", fallback=0.00001)
+        self.check_sequence_numbers: bool = config.getboolean(section="access_node_stub", option="check_sequence_numbers", fallback=True)
+        self.latency_jitter: float = config.getfloat(section="access_node_stub", option="latency_jitter", fallback=0.0)
+
+        # Fixed latency added to each route, in seconds, e.g., the 'latency_execute_script' config option sets the one for 'execute_script'
+        self.latencies: dict[str, float] = {}
+
+        for route_name in ACCESS_API_ROUTES:
+            self.latencies[route_name] = config.getfloat(section="access_node_stub", option=f"latency_{route_name}", fallback=0.0)
+
+        # The fee events are emitted from the contract addresses of the current network, same as the ones EventRunner decodes
+        current_network: str = config.get(section="network", option="current")
+        self.flow_fees_address: str = config.get(section=current_network, option="FlowFees")
+        self.fungible_token_address: str = config.get(section=current_network, option="FungibleToken")
+        self.flow_token_address: str = config.get(section=current_network, option="FlowToken")
+        self.deployer_address: str = config.get(section=current_network, option="service_account")
+
+        # Canned results, keyed by the sha256 digest of the Cadence code, so that the code received can be matched without parsing it
+        self.script_results: dict[str, object] = {}
+        self.transaction_results: dict[str, tuple[object, str]] = {}
+        self.code_names: dict[str, str] = {}
+
+        # Network state
+        self.start_time: float = time.monotonic()
+        self.start_height: int = config.getint(section="access_node_stub", option="start_height", fallback=1)
+        self.accounts: dict[bytes, entities.Account] = {}
+        self.transactions: dict[bytes, dict] = {}
+
+        # Elections created through the stand-in, by election id, only kept when the Election defaults are set (see setElectionDefaults)
+        self.elections: dict[int, dict] = {}
+        self.last_election_id: int = 0
+        self.last_ballot_id: int = 0
+
+        # Statistics, per route, of the requests received so far
+        self.request_counts: dict[str, int] = {route_name: 0 for route_name in ACCESS_API_ROUTES}
+
+        self.server: Server = None
+
+        canned_results_path: str = config.get(section="access_node_stub", option="canned_results", fallback="")
+
+        if (canned_results_path):
+            self.loadCannedResults(canned_results_path=pathlib.Path(os.getcwd()).joinpath(canned_results_path))
+
+
+    def __mapping__(self) -> dict[str, Handler]:
+        """grpclib hook that maps each gRPC route to the function that handles it, as well as the request and reply types.
+        """
+        return {
+            ACCESS_API_ROUTES["ping"]: Handler(self.ping, Cardinality.UNARY_UNARY, access.PingRequest, access.PingResponse),
+            ACCESS_API_ROUTES["get_latest_block"]: Handler(self.getLatestBlock, Cardinality.UNARY_UNARY, access.GetLatestBlockRequest, access.BlockResponse),
+            ACCESS_API_ROUTES["get_account_at_latest_block"]: Handler(self.getAccountAtLatestBlock, Cardinality.UNARY_UNARY, access.GetAccountAtLatestBlockRequest, access.AccountResponse),
+            ACCESS_API_ROUTES["execute_script"]: Handler(self.executeScript, Cardinality.UNARY_UNARY, access.ExecuteScriptAtLatestBlockRequest, access.ExecuteScriptResponse),
+            ACCESS_API_ROUTES["send_transaction"]: Handler(self.sendTransaction, Cardinality.UNARY_UNARY, access.SendTransactionRequest, access.SendTransactionResponse),
+            ACCESS_API_ROUTES["get_transaction_result"]: Handler(self.getTransactionResult, Cardinality.UNARY_UNARY, access.GetTransactionRequest, access.TransactionResultResponse),
+            ACCESS_API_ROUTES["get_events_for_height_range"]: Handler(self.getEventsForHeightRange, Cardinality.UNARY_UNARY, access.GetEventsForHeightRangeRequest, access.EventsResponse)
+        }
+
+
+    async def start(self) -> None:
+        """Function to start listening for gRPC requests on the configured host and port.
+        """
+        self.server = Server([self])
+        await self.server.start(host=self.host, port=self.port)
+
+        log.info(f"Access node stand-in listening on {self.host}:{self.port}")
+
+
+    async def stop(self) -> None:
+        """Function to stop the gRPC server and wait for the open connections to close.
+        """
+        if (self.server == None):
+            return
+
+        self.server.close()
+        await self.server.wait_closed()
+        self.server = None
+
+        log.info(f"Access node stand-in on {self.host}:{self.port} stopped. Requests served: {self.request_counts}")
+
+
+    async def __aenter__(self) -> "AccessNodeStub":
+        await self.start()
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.stop()
+
+
+    def setLatency(self, route_name: str, latency: float) -> None:
+        """Function to change, at runtime, the latency added to one of the routes.
+
+        :param route_name (str): One of the ACCESS_API_ROUTES names, e.g., "execute_script".
+        :param latency (float): The latency to add to each request, in seconds.
+        """
+        if (route_name not in ACCESS_API_ROUTES):
+            raise Exception(f"ERROR: Unknown route '{route_name}'. Valid options are: {", ".join(ACCESS_API_ROUTES.keys())}")
+
+        self.latencies[route_name] = latency
+
+
+    def setScriptResult(self, script_name: str, result: cadence.Value | dict | Callable, script_code: str = None) -> None:
+        """Function to set the canned result of a script.
+
+        :param script_name (str): The name of the script, as in the [scripts] config section.
+        :param result (cadence.Value | dict | Callable): The value to return, either as a cadence.Value or a JSON-Cadence dictionary, or a function that receives the
+        script arguments, as a list of cadence.Value, and returns one of these.
+        :param script_code (str): The Cadence code of the script. If omitted, it is read from the file configured for the script name.
+        """
+        code_digest: str = self.registerCode(section="scripts", name=script_name, code=script_code)
+        self.script_results[code_digest] = result
+
+
+    def setTransactionResult(self, transaction_name: str, events: list | Callable = None, error_message: str = "", transaction_code: str = None) -> None:
+        """Function to set the canned result of a transaction.
+
+        :param transaction_name (str): The name of the transaction, as in the [transactions] config section.
+        :param events (list | Callable): The events emitted by the transaction, as cadence.Event or JSON-Cadence dictionaries, or a function that receives the transaction
+        arguments, as a list of cadence.Value, and the transaction itself, as an entities.Transaction, and returns such a list. If the function raises an Exception, the
+        transaction is sealed with its message as the error message.
+        :param error_message (str): If set, the transaction is sealed with this error message, and without events.
+        :param transaction_code (str): The Cadence code of the transaction. If omitted, it is read from the file configured for the transaction name.
+        """
+        code_digest: str = self.registerCode(section="transactions", name=transaction_name, code=transaction_code)
+        self.transaction_results[code_digest] = (events if events else [], error_message)
+
+
+    def loadCannedResults(self, canned_results_path: pathlib.Path) -> None:
+        """Function to load canned results from a JSON file in the format
+        {
+            "scripts": {script_name: JSON-Cadence value},
+            "transactions": {transaction_name: {"events": [JSON-Cadence event], "error_message": str}}
+        }
+
+        :param canned_results_path (pathlib.Path): The path to the JSON file.
+        """
+        with open(canned_results_path, "r") as canned_results_stream:
+            canned_results: dict = json.load(canned_results_stream)
+
+        for script_name, script_result in canned_results.get("scripts", {}).items():
+            self.setScriptResult(script_name=script_name, result=script_result)
+
+        for transaction_name, transaction_result in canned_results.get("transactions", {}).items():
+            self.setTransactionResult(transaction_name=transaction_name, events=transaction_result.get("events", []), error_message=transaction_result.get("error_message", ""))
+
+        log.info(f"Loaded {len(canned_results.get("scripts", {}))} script and {len(canned_results.get("transactions", {}))} transaction canned results from {canned_results_path}")
+
+
+    def setElectionDefaults(self) -> None:
+        """Function to set results, for the scripts and transactions of the Election life cycle, that follow the Elections created through the stand-in, i.e., the
+        Elections, VoteBoxes and Ballots are kept in memory and each transaction emits the events that the contracts would. This is enough to run every benchmark
+        scenario without a canned results file. Scripts and transactions that already have a canned result keep it.
+        """
+        election_scripts: dict[str, Callable] = {
+            "16_is_election_finished": self.isElectionFinishedResult,
+            "18_get_election_winner": self.getElectionWinnerResult,
+            "26_get_election_encrypted_ballots_page": self.getEncryptedBallotsPageResult
+        }
+
+        election_transactions: dict[str, Callable] = {
+            "01_create_election": self.createElectionEvents,
+            "02_create_vote_box": self.createVoteBoxEvents,
+            "03_create_ballot": self.createBallotEvents,
+            "04_cast_ballot": self.castBallotEvents,
+            "05_submit_ballot": self.submitBallotEvents,
+            "06_tally_election": self.tallyElectionEvents,
+            "12_finish_election": self.finishElectionEvents,
+            "17_vote": self.voteEvents
+        }
+
+        for script_name, script_result in election_scripts.items():
+            if (self.registerCode(section="scripts", name=script_name) not in self.script_results):
+                self.setScriptResult(script_name=script_name, result=script_result)
+
+        for transaction_name, transaction_events in election_transactions.items():
+            if (self.registerCode(section="transactions", name=transaction_name) not in self.transaction_results):
+                self.setTransactionResult(transaction_name=transaction_name, events=transaction_events)
+
+        log.info(f"Set the Election defaults for {len(election_scripts)} scripts and {len(election_transactions)} transactions")
+
+
+    def getElection(self, election_id: int) -> dict:
+        """Internal function to retrieve the state of an Election created through the stand-in.
+
+        :param election_id (int): The election identifier.
+
+        :return (dict): The Election state.
+        """
+        if (election_id not in self.elections):
+            raise Exception(f"ERROR: Election {election_id} does not exist")
+
+        return self.elections[election_id]
+
+
+    def buildElectionEvent(self, event_key: str, fields: list[tuple[str, cadence.Value]]) -> cadence.Event:
+        """Internal function to build an event emitted by one of the project contracts, which are deployed in the service account.
+
+        :param event_key (str): The '<contract>.<event>' key of the event, e.g., "ElectionStandard.BallotSubmitted".
+        :param fields (list[tuple[str, cadence.Value]]): The event fields, as (name, value) pairs.
+
+        :return (cadence.Event): The event.
+        """
+        return cadence.Event(f"A.{self.deployer_address}.{event_key}", fields)
+
+
+    def createElectionEvents(self, arguments: list[cadence.Value], transaction: entities.Transaction) -> list[cadence.Event]:
+        """Default result of 01_create_election. Arguments: name, ballot, options, public key, storage path and public path.
+        """
+        self.last_election_id += 1
+        self.elections[self.last_election_id] = {"name": arguments[0].value, "ballots": {}, "submitted": {}, "tallied": [], "finished": False, "results": {}}
+
+        return [self.buildElectionEvent(event_key="ElectionStandard.ElectionCreated", fields=[("_electionId", cadence.UInt64(self.last_election_id)), ("_electionName", arguments[0])])]
+
+
+    def createVoteBoxEvents(self, arguments: list[cadence.Value], transaction: entities.Transaction) -> list[cadence.Event]:
+        """Default result of 02_create_vote_box. The VoteBox goes to the first authorizer.
+        """
+        return [self.buildElectionEvent(event_key="VoteBoxStandard.VoteBoxCreated", fields=[("_voterAddress", cadence.Address(transaction.authorizers[0]))])]
+
+
+    def createBallotEvents(self, arguments: list[cadence.Value], transaction: entities.Transaction) -> list[cadence.Event]:
+        """Default result of 03_create_ballot. Arguments: election id and recipient address.
+        """
+        election_id: int = arguments[0].value
+        election: dict = self.getElection(election_id=election_id)
+
+        self.last_ballot_id += 1
+        election["ballots"][arguments[1].bytes.hex()] = {"ballot_id": self.last_ballot_id, "option": None}
+
+        return [self.buildElectionEvent(event_key="BallotStandard.BallotCreated", fields=[("_ballotId", cadence.UInt64(self.last_ballot_id)), ("_linkedElectionId", cadence.UInt64(election_id))])]
+
+
+    def castBallotEvents(self, arguments: list[cadence.Value], transaction: entities.Transaction) -> list[cadence.Event]:
+        """Default result of 04_cast_ballot. Arguments: election id and encrypted option. The Ballot is the one in the VoteBox of the first authorizer.
+        """
+        election: dict = self.getElection(election_id=arguments[0].value)
+        voter_address: str = transaction.authorizers[0].hex()
+
+        if (voter_address not in election["ballots"]):
+            raise Exception(f"ERROR: Account {voter_address} does not have a Ballot for Election {arguments[0].value}")
+
+        election["ballots"][voter_address]["option"] = arguments[1].value
+
+        return []
+
+
+    def submitBallotEvents(self, arguments: list[cadence.Value], transaction: entities.Transaction) -> list[cadence.Event]:
+        """Default result of 05_submit_ballot. Arguments: election id. The Ballot leaves the VoteBox of the first authorizer and replaces the one it submitted before,
+        if any.
+        """
+        election_id: int = arguments[0].value
+        election: dict = self.getElection(election_id=election_id)
+        voter_address: str = transaction.authorizers[0].hex()
+
+        if (election["finished"]):
+            raise Exception(f"ERROR: Election {election_id} is already finished")
+
+        if (voter_address not in election["ballots"]):
+            raise Exception(f"ERROR: Account {voter_address} does not have a Ballot for Election {election_id}")
+
+        new_ballot: dict = election["ballots"].pop(voter_address)
+        old_ballot: dict = election["submitted"].get(voter_address)
+        election["submitted"][voter_address] = new_ballot
+
+        if (old_ballot != None):
+            return [self.buildElectionEvent(event_key="ElectionStandard.BallotReplaced", fields=[
+                ("_oldBallotId", cadence.UInt64(old_ballot["ballot_id"])),
+                ("_newBallotId", cadence.UInt64(new_ballot["ballot_id"])),
+                ("_electionId", cadence.UInt64(election_id))
+            ])]
+
+        return [self.buildElectionEvent(event_key="ElectionStandard.BallotSubmitted", fields=[("_ballotId", cadence.UInt64(new_ballot["ballot_id"])), ("_electionId", cadence.UInt64(election_id))])]
+
+
+    def voteEvents(self, arguments: list[cadence.Value], transaction: entities.Transaction) -> list[cadence.Event]:
+        """Default result of 17_vote, i.e., 04_cast_ballot followed by 05_submit_ballot. Arguments: election id, encrypted option and ballot receipt.
+        """
+        self.castBallotEvents(arguments=arguments[0:2], transaction=transaction)
+
+        return self.submitBallotEvents(arguments=arguments[0:1], transaction=transaction)
+
+
+    def tallyElectionEvents(self, arguments: list[cadence.Value], transaction: entities.Transaction) -> list[cadence.Event]:
+        """Default result of 06_tally_election. Arguments: election id. The submitted Ballots are withdrawn, and their options kept for the encrypted ballots script.
+        """
+        election_id: int = arguments[0].value
+        election: dict = self.getElection(election_id=election_id)
+
+        withdrawn_options: list[str] = [submitted_ballot["option"] for submitted_ballot in election["submitted"].values() if submitted_ballot["option"] != None]
+        election["tallied"].extend(withdrawn_options)
+        election["submitted"] = {}
+
+        return [self.buildElectionEvent(event_key="ElectionStandard.BallotsWithdrawn", fields=[("_ballotsWithdrawn", cadence.UInt64(len(withdrawn_options))), ("_electionId", cadence.UInt64(election_id))])]
+
+
+    def finishElectionEvents(self, arguments: list[cadence.Value], transaction: entities.Transaction) -> list[cadence.Event]:
+        """Default result of 12_finish_election. Arguments: election id, results and ballot receipts. This transaction emits no events.
+        """
+        election: dict = self.getElection(election_id=arguments[0].value)
+        election["results"] = Utils.convertCadenceDictionaryToPythonDictionary(cadence_dict=arguments[1])
+        election["finished"] = True
+
+        return []
+
+
+    def isElectionFinishedResult(self, arguments: list[cadence.Value]) -> cadence.Bool:
+        """Default result of 16_is_election_finished. Arguments: election id.
+        """
+        return cadence.Bool(self.getElection(election_id=arguments[0].value)["finished"])
+
+
+    def getElectionWinnerResult(self, arguments: list[cadence.Value]) -> cadence.Optional:
+        """Default result of 18_get_election_winner. Arguments: election id. Every option with the most votes wins, and nil is returned until the Election is finished.
+        """
+        election: dict = self.getElection(election_id=arguments[0].value)
+
+        if (not election["finished"]):
+            return cadence.Optional(None)
+
+        winning_count: int = max(election["results"].values(), default=0)
+
+        return cadence.Optional(cadence.Dictionary([
+            cadence.KeyValuePair(key=cadence.String(option), value=cadence.Int(count)) for option, count in election["results"].items() if count == winning_count
+        ]))
+
+
+    def getEncryptedBallotsPageResult(self, arguments: list[cadence.Value]) -> cadence.Array:
+        """Default result of 26_get_election_encrypted_ballots_page. Arguments: election id, offset and limit.
+        """
+        election: dict = self.getElection(election_id=arguments[0].value)
+        offset: int = arguments[1].value
+        limit: int = arguments[2].value
+
+        return cadence.Array([cadence.String(encrypted_option) for encrypted_option in election["tallied"][offset:offset + limit]])
+
+
+    def registerCode(self, section: str, name: str, code: str = None) -> str:
+        """Internal function to compute the digest used to match the Cadence code of a script or transaction with its canned result.
+
+        :param section (str): The config section with the file path, i.e., "scripts" or "transactions".
+        :param name (str): The name of the script or transaction.
+        :param code (str): The Cadence code. If omitted, it is retrieved from the source cache, i.e., exactly as the runners send it.
+
+        :return (str): The digest of the Cadence code.
+        """
+        if (code == None):
+            code = source_cache.getSource(section=section, name=name)
+
+        code_digest: str = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        self.code_names[code_digest] = name
+
+        return code_digest
+
+
+    async def delay(self, route_name: str) -> None:
+        """Internal function to count the request and to wait for the latency configured for the route in question.
+
+        :param route_name (str): The name of the route.
+        """
+        self.request_counts[route_name] += 1
+        latency: float = self.latencies[route_name] + (random.uniform(0, self.latency_jitter) if self.latency_jitter > 0 else 0.0)
+
+        if (latency > 0):
+            await asyncio.sleep(latency)
+
+
+    def currentHeight(self) -> int:
+        """Internal function to compute the height of the latest block, based on the time elapsed since the stand-in was created.
+
+        :return (int): The latest block height.
+        """
+        return self.start_height + int((time.monotonic() - self.start_time) / self.block_interval)
+
+
+    def buildBlock(self, height: int) -> entities.Block:
+        """Internal function to build the (deterministic) block at the height provided.
+
+        :param height (int): The block height.
+
+        :return (entities.Block): The block protobuf message.
+        """
+        return entities.Block(
+            id=hashlib.sha3_256(height.to_bytes(8, "big")).digest(),
+            parent_id=hashlib.sha3_256((height - 1).to_bytes(8, "big", signed=True)).digest(),
+            height=height,
+            timestamp=datetime.datetime.now(tz=datetime.timezone.utc)
+        )
+
+
+    def getAccount(self, address: bytes) -> entities.Account:
+        """Internal function to retrieve an account, creating it, with account_keys keys, if it was never requested before.
+
+        :param address (bytes): The account address.
+
+        :return (entities.Account): The account protobuf message.
+        """
+        address = bytes(8 - len(address)) + address
+
+        if (address not in self.accounts):
+            self.accounts[address] = entities.Account(
+                address=address,
+                balance=int(self.account_balance * 10**8),
+                keys=[
+                    entities.AccountKey(
+                        index=key_index,
+                        public_key=hashlib.sha3_512(address + key_index.to_bytes(4, "big")).digest(),
+                        sign_algo=2,
+                        hash_algo=3,
+                        weight=1000,
+                        sequence_number=0
+                    ) for key_index in range(0, self.account_keys)
+                ]
+            )
+
+        return self.accounts[address]
+
+
+    def encodeValue(self, value: cadence.Value | dict) -> bytes:
+        """Internal function to encode a canned value into JSON-Cadence.
+
+        :param value (cadence.Value | dict): The value to encode.
+
+        :return (bytes): The JSON-Cadence encoded value.
+        """
+        if (isinstance(value, dict)):
+            return json.dumps(value).encode("utf-8")
+
+        return encode_arguments([value])[0]
+
+
+    def buildEvent(self, event: cadence.Event | dict, transaction_id: bytes, event_index: int) -> entities.Event:
+        """Internal function to build an event protobuf message from a canned event.
+
+        :param event (cadence.Event | dict): The canned event.
+        :param transaction_id (bytes): The id of the transaction that emitted the event.
+        :param event_index (int): The position of the event in the transaction.
+
+        :return (entities.Event): The event protobuf message.
+        """
+        event_type: str = event["value"]["id"] if isinstance(event, dict) else event.id
+
+        return entities.Event(
+            type=event_type,
+            transaction_id=transaction_id,
+            transaction_index=0,
+            event_index=event_index,
+            payload=self.encodeValue(event)
+        )
+
+
+    def buildFeeEvents(self, payer: bytes) -> list[cadence.Event]:
+        """Internal function to build the FlowFees.FeesDeducted and FungibleToken.Withdrawn events emitted by every transaction in the network.
+
+        :param payer (bytes): The address of the transaction payer.
+
+        :return (list[cadence.Event]): The fee events.
+        """
+        fee_amount: int = int(self.fee_amount * 10**8)
+        payer_account: entities.Account = self.getAccount(address=payer)
+        payer_account.balance = max(payer_account.balance - fee_amount, 0)
+
+        return [
+            cadence.Event(f"A.{self.fungible_token_address}.FungibleToken.Withdrawn", [
+                ("type", cadence.String(f"A.{self.flow_token_address}.FlowToken.Vault")),
+                ("amount", cadence.UFix64(fee_amount)),
+                ("from", cadence.Optional(cadence.Address(payer))),
+                ("fromUUID", cadence.UInt64(0)),
+                ("withdrawnUUID", cadence.UInt64(0)),
+                ("balanceAfter", cadence.UFix64(payer_account.balance))
+            ]),
+            cadence.Event(f"A.{self.flow_fees_address}.FlowFees.FeesDeducted", [
+                ("amount", cadence.UFix64(fee_amount)),
+                ("inclusionEffort", cadence.UFix64(10**8)),
+                ("executionEffort", cadence.UFix64(fee_amount))
+            ])
+        ]
+
+
+    async def ping(self, stream) -> None:
+        await stream.recv_message()
+        await self.delay(route_name="ping")
+        await stream.send_message(access.PingResponse())
+
+
+    async def getLatestBlock(self, stream) -> None:
+        await stream.recv_message()
+        await self.delay(route_name="get_latest_block")
+        await stream.send_message(access.BlockResponse(block=self.buildBlock(height=self.currentHeight())))
+
+
+    async def getAccountAtLatestBlock(self, stream) -> None:
+        request: access.GetAccountAtLatestBlockRequest = await stream.recv_message()
+        await self.delay(route_name="get_account_at_latest_block")
+        await stream.send_message(access.AccountResponse(account=self.getAccount(address=request.address)))
+
+
+    async def executeScript(self, stream) -> None:
+        request: access.ExecuteScriptAtLatestBlockRequest = await stream.recv_message()
+        await self.delay(route_name="execute_script")
+
+        code_digest: str = hashlib.sha256(request.script).hexdigest()
+
+        if (code_digest not in self.script_results):
+            raise GRPCError(Status.INVALID_ARGUMENT, f"ERROR: No canned result set for the script with digest {code_digest}")
+
+        script_result = self.script_results[code_digest]
+
+        if (callable(script_result)):
+            script_result = script_result([json.loads(argument, object_hook=cadence_object_hook) for argument in request.arguments])
+
+        await stream.send_message(access.ExecuteScriptResponse(value=self.encodeValue(script_result)))
+
+
+    async def sendTransaction(self, stream) -> None:
+        request: access.SendTransactionRequest = await stream.recv_message()
+        await self.delay(route_name="send_transaction")
+
+        transaction: entities.Transaction = request.transaction
+        transaction_id: bytes = hashlib.sha3_256(bytes(transaction)).digest()
+        code_digest: str = hashlib.sha256(transaction.script).hexdigest()
+
+        # With seal_jitter, transactions sent one after the other can be sealed, and executed, in a different order, as in the network
+        sealed_at: float = time.monotonic() + self.seal_delay + (random.uniform(0, self.seal_jitter) if self.seal_jitter > 0 else 0.0)
+
+        self.transactions[transaction_id] = {
+            "name": self.code_names.get(code_digest, "unknown"),
+            "transaction": transaction,
+            "code_digest": code_digest,
+            "executed": False,
+            "sealed_at": sealed_at,
+            "block_height": self.start_height + int((sealed_at - self.start_time) / self.block_interval),
+            "error_message": "",
+            "events": []
+        }
+
+        await stream.send_message(access.SendTransactionResponse(id=transaction_id))
+
+
+    def executeTransactions(self) -> None:
+        """Internal function to execute, in the order they are sealed, every transaction whose seal time has passed. The proposal key sequence number is checked, and
+        updated, at this point, the same way the network does it, and not when the transaction is received.
+        """
+        current_time: float = time.monotonic()
+        due_transactions: list[tuple[bytes, dict]] = [
+            (transaction_id, transaction) for transaction_id, transaction in self.transactions.items() if not transaction["executed"] and transaction["sealed_at"] <= current_time
+        ]
+
+        for transaction_id, transaction_record in sorted(due_transactions, key=lambda due_transaction: due_transaction[1]["sealed_at"]):
+            transaction: entities.Transaction = transaction_record["transaction"]
+            canned_events, error_message = self.transaction_results.get(transaction_record["code_digest"], ([], ""))
+            proposer_key: entities.AccountKey = self.getAccount(address=transaction.proposal_key.address).keys[transaction.proposal_key.key_id]
+
+            if (self.check_sequence_numbers and transaction.proposal_key.sequence_number != proposer_key.sequence_number):
+                error_message = (f"[Error Code: 1007] invalid proposal key: public key {transaction.proposal_key.key_id} on account {transaction.proposal_key.address.hex()} has sequence number {proposer_key.sequence_number}, but given {transaction.proposal_key.sequence_number}")
+            else:
+                proposer_key.sequence_number += 1
+
+            if (not error_message and callable(canned_events)):
+                try:
+                    canned_events = canned_events([json.loads(argument, object_hook=cadence_object_hook) for argument in transaction.arguments], transaction)
+                except Exception as error:
+                    error_message = str(error)
+
+            if (not error_message):
+                for canned_event in list(canned_events) + self.buildFeeEvents(payer=transaction.payer):
+                    transaction_record["events"].append(self.buildEvent(event=canned_event, transaction_id=transaction_id, event_index=len(transaction_record["events"])))
+
+            transaction_record["error_message"] = error_message
+            transaction_record["executed"] = True
+
+
+    async def getTransactionResult(self, stream) -> None:
+        request: access.GetTransactionRequest = await stream.recv_message()
+        await self.delay(route_name="get_transaction_result")
+
+        if (request.id not in self.transactions):
+            raise GRPCError(Status.NOT_FOUND, f"ERROR: Transaction {request.id.hex()} not found")
+
+        self.executeTransactions()
+        transaction: dict = self.transactions[request.id]
+
+        if (not transaction["executed"]):
+            await stream.send_message(access.TransactionResultResponse(status=entities.TransactionStatus.PENDING))
+            return
+
+        await stream.send_message(access.TransactionResultResponse(
+            status=entities.TransactionStatus.SEALED,
+            status_code=1 if transaction["error_message"] else 0,
+            error_message=transaction["error_message"],
+            events=transaction["events"]
+        ))
+
+
+    async def getEventsForHeightRange(self, stream) -> None:
+        request: access.GetEventsForHeightRangeRequest = await stream.recv_message()
+        await self.delay(route_name="get_events_for_height_range")
+
+        end_height: int = min(request.end_height, self.currentHeight())
+        block_events: dict[int, list[entities.Event]] = {height: [] for height in range(request.start_height, end_height + 1)}
+        self.executeTransactions()
+
+        for transaction in self.transactions.values():
+            if (transaction["block_height"] in block_events and transaction["executed"]):
+                block_events[transaction["block_height"]].extend([event for event in transaction["events"] if event.type == request.type])
+
+        await stream.send_message(access.EventsResponse(results=[
+            access.EventsResponseResult(
+                block_id=self.buildBlock(height=height).id,
+                block_height=height,
+                events=events,
+                block_timestamp=datetime.datetime.now(tz=datetime.timezone.utc)
+            ) for height, events in block_events.items()
+        ]))
@@ -4,6 +4,7 @@ from pathlib import Path
 import configparser
 import os
 from common.utils import Utils
+from common.receipt_store import receipt_store
 
 from flow_py_sdk.cadence import Address
 from flow_py_sdk.signer import InMemorySigner, HashAlgo, SignAlgo
@@ -21,8 +22,135 @@ config.read(config_path)
 network=config.get("network", "current")
 flow_json_file=config.get("flow.json", "location")
 
+class AccountRecord(object):
+    """Compact record for a configured account. The fields are slotted, so each record takes a fraction of the memory of the equivalent dictionary, and the address hex
+    string is computed only once, when the account is loaded. Records still support the account["field"] access used throughout the project.
+
+    The signers are only built when first used, from the key entries in flow.json. Building an InMemorySigner (and reading its key file) for every account used to be
+    most of the AccountConfig start up time, even though a runner only signs with a handful of them.
+    """
+    __slots__ = ("name", "address", "address_hex", "key_id", "key_data", "proposal_key_data", "built_signer", "built_keys")
+
+    # The fields exposed through account["field"]. signer and keys are properties over the lazily built values
+    fields: tuple[str] = ("name", "address", "address_hex", "key_id", "signer", "keys")
+
+    def __init__(self, name: str, address: Address, key_id: int, key_data: str | dict, proposal_key_data: int | list[dict] = None, signer: InMemorySigner = None) -> None:
+        """
+        :param name (str): The account name, as in flow.json.
+        :param address (Address): The account address.
+        :param key_id (int): The index of the main account key.
+        :param key_data (str | dict): The main account key entry, as in flow.json: either the private key hex string or an object with a "privateKey" or a "location" entry.
+        :param proposal_key_data (int | list[dict]): The "proposal_keys" entry from flow.json, if any. Check AccountConfig.loadProposalKeys for the format.
+        :param signer (InMemorySigner): The signer for the main account key, if it was already built.
+        """
+        self.name: str = name
+        self.address: Address = address
+        self.address_hex: str = address.hex()
+        self.key_id: int = key_id
+        self.key_data: str | dict = key_data
+        self.proposal_key_data: int | list[dict] = proposal_key_data
+        self.built_signer: InMemorySigner = signer
+        self.built_keys: list[dict] = None
+
+
+    @property
+    def signer(self) -> InMemorySigner:
+        """The signer for the main account key, built on first use.
+        """
+        if (self.built_signer == None):
+            self.built_signer = AccountConfig.buildSigner(key_data=self.key_data)
+
+        return self.built_signer
+
+
+    @signer.setter
+    def signer(self, signer: InMemorySigner) -> None:
+        self.built_signer = signer
+        self.built_keys = None
+
+
+    @property
+    def keys(self) -> list[dict]:
+        """The proposal keys, as returned by AccountConfig.loadProposalKeys, built on first use.
+        """
+        if (self.built_keys == None):
+            self.built_keys = AccountConfig.loadProposalKeys(account_data={"proposal_keys": self.proposal_key_data} if self.proposal_key_data != None else {}, signer=self.signer)
+
+        return self.built_keys
+
+
+    @keys.setter
+    def keys(self, keys: list[dict]) -> None:
+        self.built_keys = keys
+
+
+    def toIndexEntry(self) -> dict:
+        """Function to serialize this record into an account index entry. Only the flow.json entries are kept, never the signers.
+
+        :return (dict): The entry, in the {"name": str, "address": str, "key": str | dict, "proposal_keys": int | list[dict]} format.
+        """
+        return {"name": self.name, "address": self.address_hex, "key": self.key_data, "proposal_keys": self.proposal_key_data}
+
+
+    @staticmethod
+    def fromIndexEntry(index_entry: dict) -> "AccountRecord":
+        """Function to rebuild a record from an account index entry, as produced by toIndexEntry.
+
+        :param index_entry (dict): The account index entry.
+
+        :return (AccountRecord): The account record, without any signers built yet.
+        """
+        return AccountRecord(
+            name=index_entry["name"],
+            address=Address.from_hex(index_entry["address"]),
+            key_id=0,
+            key_data=index_entry["key"],
+            proposal_key_data=index_entry.get("proposal_keys")
+        )
+
+
+    def __getitem__(self, field: str):
+        if (field not in self.fields):
+            raise KeyError(field)
+
+        return getattr(self, field)
+
+
+    def __setitem__(self, field: str, value) -> None:
+        if (field not in self.fields):
+            raise KeyError(field)
+
+        setattr(self, field, value)
+
+
+    def __contains__(self, field: str) -> bool:
+        return (field in self.fields and getattr(self, field, None) != None)
+
+
+    def __repr__(self) -> str:
+        return f"AccountRecord(name={self.name}, address={self.address_hex}, signer={"built" if self.built_signer != None else "pending"})"
+
+
 class AccountConfig(object):
+    """Account configuration of the active network, loaded from flow.json. There is only one instance per process: every AccountConfig() call after the first one returns
+    the same, already loaded, object. Use AccountConfig.reset() after changing flow.json to have the next call load it again.
+    """
+    # The single instance for this process
+    instance: "AccountConfig" = None
+
+    def __new__(cls) -> "AccountConfig":
+        if (cls.instance == None):
+            cls.instance = super().__new__(cls)
+            cls.instance.loaded = False
+
+        return cls.instance
+
+
     def __init__(self) -> None:
+        # The ScriptRunner, the TransactionRunner, the EventRunner and every runner call AccountConfig(). Only the first call does any work
+        if (self.loaded):
+            return
+
         super().__init__()
 
         # Before anything, check that at least one valid network configuration is present. Stop the process if not.
@@ -35,169 +163,319 @@ class AccountConfig(object):
         self.access_node_host: str = config.get(network, "host")
         self.access_node_port: int = int(config.get(network, "port"))
 
-        self.accounts = []
+        self.active_network: str = active_network
+        self.service_account: AccountRecord = None
+        self.accounts: list[AccountRecord] = []
+
+        # The account index keeps the accounts of the active network, already selected, so that the next runners can skip flow.json altogether
+        self.use_index: bool = config.getboolean(section="account_config", option="use_index", fallback=True)
+        self.index_path: Path = project_cwd.joinpath(config.get(section="account_config", option="index_directory", fallback="results"), f"{active_network}_account_index.json")
+
+        if (not (self.use_index and self.loadIndex())):
+            self.loadFlowJson()
+
+            if (self.use_index):
+                self.writeIndex()
+
+        self.buildIndexes()
+        self.loaded = True
+
 
+    @classmethod
+    def reset(cls) -> None:
+        """Function to drop the process wide instance, so that the next AccountConfig() call loads flow.json, or the account index, again.
+        """
+        cls.instance = None
+
+
+    def getFlowJsonStamp(self) -> dict:
+        """Internal function to identify the current version of flow.json, to detect stale account indexes.
+
+        :return (dict): The stamp, in the {"flow_json": str, "mtime_ns": int, "size": int} format.
+        """
+        flow_json_stat: os.stat_result = os.stat(Path(flow_json_file))
+
+        return {"flow_json": str(flow_json_file), "mtime_ns": flow_json_stat.st_mtime_ns, "size": flow_json_stat.st_size}
+
+
+    def loadFlowJson(self) -> None:
+        """Internal function to select the accounts of the active network from flow.json. Emulator accounts are the ones not named "flow_test...", plus the
+        "emulator-account", and testnet accounts are the "flow_test..." ones. The account with the configured service_account address is set apart as the service account.
+        """
         # noinspection PyBroadException
         try:
             # Load the contents of this project's flow.json to a handy variable. Grab the location of the file from the configuration file
-            json_file = open(Path(flow_json_file))
-            data = json.load(json_file)
+            with open(Path(flow_json_file)) as json_file:
+                data = json.load(json_file)
         except Exception:
             log.warning(
                 f"Cannot open {flow_json_file}, using default settings",
                 exc_info=True,
                 stack_info=True,
             )
+            raise Exception(f"ERROR: Unable to load the account configuration from {flow_json_file}")
+
+        service_account_address: str = config.get(section=self.active_network, option="service_account")
 
         for account in data["accounts"]:
-            # Check which network is being used
-            if (active_network == "emulator"):
-                # Pre select the emulator exclusive accounts. All testnet bound accounts are prefixed with "flow_test". Use this to filter them out
-                if (account == "emulator-account" or not account.__contains__("flow_test")):
-                    # Load the required parameters while testing the formatting of the JSON file
-                    if ("hashAlgorithm" in data["accounts"][account]["key"]):
-                        hash_algorithm = HashAlgo.from_string(data["accounts"][account]["key"]["hashAlgorithm"])
-                    else: 
-                        hash_algorithm = HashAlgo.from_string("SHA3_256")
-
-                    if ("signatureAlgorithm" in data["accounts"][account]["key"]):
-                        signature_algorithm = SignAlgo.from_string(data["accounts"][account]["key"]["signatureAlgorithm"])
-                    else:
-                        signature_algorithm = SignAlgo.from_string("ECDSA_P256")
-
-                    if ("location" in data["accounts"][account]["key"]):
-                        private_key = open(data["accounts"][account]["key"]["location"]).readline()
-                    else:
-                        private_key = data["accounts"][account]["key"]
-
-                    # Turns out that the constructor for the InMemorySigner class does not like hexadecimal values prefixed with the usual '0x'
-                    # I need to test the current format of the private_key string and remove these characters if they are present
-                    if (private_key[0:2] == "0x"):
-                        # Skip the first 2 characters of the key string
-                        private_key = private_key[2:]
-                    
-                    # Repeat the process for the account addresses as well
-                    account_address = data["accounts"][account]["address"]
-
-                    if (account_address[0:2] == "0x"):
-                        account_address = account_address[2:]
-
-                    # The service account needs a special treatment
-                    if (account_address == config.get(section=active_network, option="service_account")):
-                        # If the account in question is the emulator-bound account, set this one apart from the rest as the service account
-                        self.service_account = {
-                            "name": account,
-                            "address": Address.from_hex(account_address),
-                            "key_id": 0,
-                            "signer": InMemorySigner(
-                                hash_algo=hash_algorithm,
-                                sign_algo=signature_algorithm,
-                                private_key_hex=private_key
-                            )
-                        }
-                    elif (not account.__contains__("flow_test")):
-                        # Otherwise set it as another "normal" account.
-                        # NOTE: The key_id field refers to the index of the key in question, given that accounts can have multiple encryption keys stored. But 
-                        # the first key, as it is this case, has index = 0.
-                        # NOTE: The user accounts have an additional "receipts" dictionary to be filled with a format {election_id: [random_vals]} where, for each 
-                        # election voted, this parameter keeps a record of all the random values used to add salt to the Ballot option, which is also used to 
-                        # verify Ballots. I'm keeping these in an array because, for testing purposes only, at some point I want users to be able to submit
-                        # multiple ballots into a single election. But in regular operation, there should be only one item per one of these arrays
-                        self.accounts.append(
-                            {
-                                "name": account,
-                                "address": Address.from_hex(account_address),
-                                "key_id": 0,
-                                "signer": InMemorySigner(
-                                    hash_algo=hash_algorithm,
-                                    sign_algo=signature_algorithm,
-                                    private_key_hex=private_key
-                                ),
-                                "receipts": {}
-                            }
-                        )
-            elif(active_network == "testnet"):
-                # Filter out for the testnet-bound accounts, which are named as "flow_test_account..."
-                if (account.__contains__("flow_test")):
-                    # Save all the common parameters to their own variables for now
-                    if ("hashAlgorithm" in data["accounts"][account]["key"]):
-                        hash_algorithm = HashAlgo.from_string(data["accounts"][account]["key"]["hashAlgorithm"])
-                    else:
-                        hash_algorithm = HashAlgo.from_string("SHA3_256")
-
-                    if ("signatureAlgorithm" in data["accounts"][account]["key"]):
-                        signature_algorithm = SignAlgo.from_string(data["accounts"][account]["key"]["signatureAlgorithm"])
-                    else:
-                        signature_algorithm = SignAlgo.from_string("ECDSA_P256")
-
-                    if ("location" in data["accounts"][account]["key"]):
-                        private_key = open(data["accounts"][account]["key"]["location"]).readline()
-                    else:
-                        private_key = data["accounts"][account]["key"]
-
-                    # Format the private key parameter, if needed
-                    if (private_key[0:2] == "0x"):
-                        private_key = private_key[2:]
-
-                    # And the account address as well
-                    account_address = data["accounts"][account]["address"]
-
-                    if (account_address[0:2] == "0x"):
-                        account_address = account_address[2:]
-
-                    # In this case, flow_test_account10 was selected to work as the service account. Set this up
-                    if (account_address == config.get(section=active_network, option="service_account")):
-                        self.service_account = {
-                            "name": "service_account",
-                            "address": Address.from_hex(account_address),
-                            "key_id": 0,
-                            "signer": InMemorySigner(
-                                hash_algo=hash_algorithm,
-                                sign_algo=signature_algorithm,
-                                private_key_hex=private_key
-                            )
-                        }
-                    else:
-                        # Process the rest of the test accounts
-                        self.accounts.append(
-                            {
-                                "name": account,
-                                "address": Address.from_hex(account_address),
-                                "key_id": 0,
-                                "signer": InMemorySigner(
-                                    hash_algo=hash_algorithm,
-                                    sign_algo=signature_algorithm,
-                                    private_key_hex=private_key
-                                ),
-                                "receipts": {}
-                            }
-                        )
+            # Check which network is being used. All testnet bound accounts are prefixed with "flow_test". Use this to filter them out
+            if (self.active_network == "emulator"):
+                if (account != "emulator-account" and account.__contains__("flow_test")):
+                    continue
+            elif (self.active_network == "testnet"):
+                if (not account.__contains__("flow_test")):
+                    continue
+            else:
+                raise Exception(f"ERROR: Unable to configure accounts for unrecognisable network {self.active_network}.")
+
+            # Turns out that the Address class does not like hexadecimal values prefixed with the usual '0x' either
+            account_address: str = data["accounts"][account]["address"].removeprefix("0x")
+
+            # The signers are only built when used, so this only keeps the key entries from flow.json.
+            # NOTE: The key_id field refers to the index of the key in question, given that accounts can have multiple encryption keys stored. But 
+            # the first key, as it is this case, has index = 0.
+            # NOTE: The ballot receipts of the user accounts, i.e., the random values used to add salt to the Ballot options, are no longer kept here
+            # but in the receipt store (common/receipt_store.py), so that they survive between runners
+            account_record: AccountRecord = AccountRecord(
+                name=account,
+                address=Address.from_hex(account_address),
+                key_id=0,
+                key_data=data["accounts"][account]["key"],
+                proposal_key_data=data["accounts"][account].get("proposal_keys")
+            )
+
+            if (account_address == service_account_address):
+                # In testnet, flow_test_account10 was selected to work as the service account
+                if (self.active_network == "testnet"):
+                    account_record.name = "service_account"
+
+                self.service_account = account_record
             else:
-                raise Exception(f"ERROR: Unable to configure accounts for unrecognisable network {active_network}.")
+                self.accounts.append(account_record)
+
+        if (self.service_account == None):
+            raise Exception(f"ERROR: The service account {service_account_address} is not configured in {flow_json_file} for network {self.active_network}")
+
+
+    def loadIndex(self) -> bool:
+        """Internal function to load the accounts from the account index, if there is one and it was built from the current flow.json.
+
+        :return (bool): True if the accounts were loaded from the index, False if flow.json needs to be loaded instead.
+        """
+        if (not self.index_path.exists()):
+            return False
+
+        # noinspection PyBroadException
+        try:
+            with open(self.index_path) as index_file:
+                account_index: dict = json.load(index_file)
+
+            if (account_index["stamp"] != self.getFlowJsonStamp() or account_index["service_account"]["address"] != config.get(section=self.active_network, option="service_account")):
+                log.debug(f"Account index {self.index_path} is out of date. Loading {flow_json_file} instead")
+                return False
+
+            self.service_account = AccountRecord.fromIndexEntry(index_entry=account_index["service_account"])
+            self.accounts = [AccountRecord.fromIndexEntry(index_entry=index_entry) for index_entry in account_index["accounts"]]
+        except Exception as e:
+            log.warning(f"Unable to load the account index {self.index_path}: {e}. Loading {flow_json_file} instead")
+            self.service_account = None
+            self.accounts = []
+            return False
+
+        return True
+
+
+    def writeIndex(self) -> None:
+        """Function to serialize the accounts of the active network into the account index. The index has the same key entries as flow.json, so keep it as private as
+        flow.json itself. It is written to a temporary file first and then renamed, since several worker processes can start, and write it, at the same time.
+        """
+        account_index: dict = {
+            "network": self.active_network,
+            "stamp": self.getFlowJsonStamp(),
+            "service_account": self.service_account.toIndexEntry(),
+            "accounts": [account.toIndexEntry() for account in self.accounts]
+        }
+
+        temporary_path: Path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+
+        # noinspection PyBroadException
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+
+            with open(temporary_path, "w") as index_file:
+                json.dump(account_index, index_file)
+
+            os.replace(temporary_path, self.index_path)
+        except Exception as e:
+            log.warning(f"Unable to write the account index {self.index_path}: {e}")
+
+
+    def buildIndexes(self) -> None:
+        """Internal function to index the configured accounts by address (hex string, without the '0x' prefix) and by name, so that looking up an account does not require
+        going through the whole account list. The service account is kept out of these indexes, since it never votes, and is checked separately by getAccount.
+        """
+        self.accounts_by_address: dict[str, AccountRecord] = {}
+        self.accounts_by_name: dict[str, AccountRecord] = {}
+
+        for account in self.accounts:
+            self.accounts_by_address[account.address_hex] = account
+            self.accounts_by_name[account.name] = account
+
+
+    def addAccount(self, account: AccountRecord) -> None:
+        """Function to add an account to the configuration, after it was loaded, keeping the indexes up to date.
+
+        :param account (AccountRecord): The account to add.
+        """
+        if (account.address_hex in self.accounts_by_address):
+            raise Exception(f"ERROR: Account {account.address_hex} is already configured for this network!")
+
+        self.accounts.append(account)
+        self.accounts_by_address[account.address_hex] = account
+        self.accounts_by_name[account.name] = account
+
+
+    def getAccount(self, address: str) -> AccountRecord:
+        """Function to retrieve the configured account, service account included, with the address provided.
+
+        :param address (str): The account address, as a hex string, with or without the '0x' prefix.
+
+        :return (AccountRecord): The account record, or None if the address is not configured for the current network.
+        """
+        address = address.removeprefix("0x")
+
+        if (address == self.service_account.address_hex):
+            return self.service_account
+
+        return self.accounts_by_address.get(address)
+
+
+    def getAccountByName(self, name: str) -> AccountRecord:
+        """Function to retrieve a configured user account by its flow.json name.
+
+        :param name (str): The account name.
+
+        :return (AccountRecord): The account record, or None if there is no account with that name in the current network.
+        """
+        return self.accounts_by_name.get(name)
+
+
+    def getVoterAccount(self, voter_address: str) -> AccountRecord:
+        """Internal function to retrieve a (non-service) account for the receipt functions, raising the usual Exception if it is not configured.
+
+        :param voter_address (str): The account address, as a hex string.
+
+        :return (AccountRecord): The account record.
+        """
+        account: AccountRecord = self.accounts_by_address.get(voter_address.removeprefix("0x"))
+
+        if (account == None):
+            raise Exception(f"ERROR: Voter address provided {voter_address} does not exist in the current account configuration!")
+
+        return account
+
+
+    @staticmethod
+    def buildSigner(key_data: str | dict) -> InMemorySigner:
+        """Function to build the signer for an account key entry from flow.json. The hash and signature algorithms default to SHA3_256 and ECDSA_P256.
+
+        :param key_data (str | dict): The key entry: either the private key hex string or an object with a "privateKey" or a "location" entry, and, optionally, the
+        "hashAlgorithm" and "signatureAlgorithm" entries.
+
+        :return (InMemorySigner): The signer.
+        """
+        if (isinstance(key_data, dict)):
+            if ("location" in key_data):
+                with open(key_data["location"]) as key_file:
+                    private_key: str = key_file.readline().strip()
+            else:
+                private_key: str = key_data["privateKey"]
+
+            hash_algorithm: str = key_data.get("hashAlgorithm", "SHA3_256")
+            signature_algorithm: str = key_data.get("signatureAlgorithm", "ECDSA_P256")
+        else:
+            private_key: str = key_data
+            hash_algorithm: str = "SHA3_256"
+            signature_algorithm: str = "ECDSA_P256"
+
+        # Turns out that the constructor for the InMemorySigner class does not like hexadecimal values prefixed with the usual '0x'
+        return InMemorySigner(
+            hash_algo=HashAlgo.from_string(hash_algorithm),
+            sign_algo=SignAlgo.from_string(signature_algorithm),
+            private_key_hex=private_key.removeprefix("0x")
+        )
+
     
-    def addReceipt(self, voter_address: str, election_id: int, ballot_receipt: int) -> None:
-        """This function adds a ballot receipt, which is the random value used as salt for encrypting the Ballot option, to the entry of the voter that cast the ballot in the first place. This function detects if the current user entry already has a key for the election_id provided or not. If so, it appends the provided ballot_receipt to it. Otherwise it creates a new one. If the voter_address provided does not exists in the current account list, this function raises and exception.
+    @staticmethod
+    def loadProposalKeys(account_data: dict, signer: InMemorySigner) -> list[dict]:
+        """Function to load all the proposal keys configured for an account in flow.json. Each key allows the account to have one more transaction in flight at the same time,
+        since each proposal key has its own sequence number. Besides the usual "key" entry (which is always key_id 0), an account may have a "proposal_keys" entry with either:
+        1. An integer N, meaning that the account key was added N times to the account, with key indexes 0 to N - 1. This is the usual way to set up multiple proposal keys
+        in Flow, since all keys share the same private key.
+        2. A list of key objects, in the same format as the "key" entry, each with an additional "index" field with the key index in the account.
+
+        :param account_data (dict): The account entry from flow.json.
+        :param signer (InMemorySigner): The signer object built for the main account key.
+
+        :return (list[dict]): A list of {"key_id": int, "signer": InMemorySigner} entries, starting with key_id 0.
+        """
+        proposal_keys: list[dict] = [{"key_id": 0, "signer": signer}]
+
+        if ("proposal_keys" not in account_data):
+            return proposal_keys
+
+        if (isinstance(account_data["proposal_keys"], int)):
+            # The same private key for all the key indexes. Reuse the signer object
+            for key_index in range(1, account_data["proposal_keys"]):
+                proposal_keys.append({"key_id": key_index, "signer": signer})
+        else:
+            for key_data in account_data["proposal_keys"]:
+                if (key_data["index"] == 0):
+                    # Key 0 is the main account key, which was already set above
+                    continue
+
+                proposal_keys.append({"key_id": key_data["index"], "signer": AccountConfig.buildSigner(key_data=key_data)})
+
+        return proposal_keys
+
+
+    async def addReceipt(self, voter_address: str, election_id: int, ballot_receipt: int) -> None:
+        """This function adds a ballot receipt, which is the random value used as salt for encrypting the Ballot option, under the voter that cast the ballot in the first place, in the persistent receipt store. If the voter_address provided does not exists in the current account list, this function raises and exception.
 
         @param voter_address: str The address of the account that submitted the Ballot.
         @param election_id: int The election identifier for the election where the ballot was submitted to.
         @param ballot_receipt: int The random value that was appended to the Ballot.option before encrypting it to be used as salt.
         """
-        # Validate that the voter_address provided corresponds to one of the configured account
-        for account in self.accounts:
-            if (account["address"].hex() == voter_address):
-                # Found a matching account. Add the new record to it.
-                if (election_id in account["receipts"]):
-                    # The election record already exists. Append the new receipt to it
-                    account["receipts"][election_id].append(ballot_receipt)
-                else:
-                    # In this case, I need to create a new entry key as well
-                    account["receipts"][election_id] = [ballot_receipt]
-
-                # All done. Finish this
-                return
-        
-        # If the for cycle finishes without finding a match to the voter_address provided, the account is not configured in this network yet
-        raise Exception(f"ERROR: Voter address provided {voter_address} does not exist in the current account configuration!")
+        # Validate that the voter_address provided corresponds to one of the configured account. This raises an Exception if it does not
+        account: AccountRecord = self.getVoterAccount(voter_address=voter_address)
+
+        # The receipt goes to the receipt store, which writes it to disk, where any other runner can pick it up, together with the ones from the other voters
+        await receipt_store.addReceipt(voter_address=account.address_hex, election_id=election_id, ballot_receipt=ballot_receipt)
+
+
+    def addReceipts(self, voter_address: str, election_id: int, ballot_receipts: list[int]) -> None:
+        """Bulk version of addReceipt, which writes all the receipts provided in a single transaction.
+
+        :param voter_address (str): The address of the account that submitted the Ballots.
+        :param election_id (int): The election identifier for the election where the ballots were submitted to.
+        :param ballot_receipts (list[int]): The random values appended to each Ballot.option before encrypting it.
+        """
+        account: AccountRecord = self.getVoterAccount(voter_address=voter_address)
+
+        receipt_store.addReceipts(receipts=[(account.address_hex, election_id, ballot_receipt) for ballot_receipt in ballot_receipts])
+
+
+    def getReceipts(self, voter_address: str, election_id: int) -> list[int]:
+        """Function to retrieve the ballot receipts stored for a voter in an election.
+
+        :param voter_address (str): The address of the account that submitted the Ballots.
+        :param election_id (int): The election identifier.
+
+        :return (list[int]): The receipts, in the order they were added. The list is empty if the voter has not voted in this election.
+        """
+        account: AccountRecord = self.getVoterAccount(voter_address=voter_address)
+
+        return receipt_store.getReceipts(voter_address=account.address_hex, election_id=election_id)
 
     
     def removeReceipt(self, voter_address: str, election_id: int, ballot_receipt: int) -> int:
@@ -210,21 +488,16 @@ class AccountConfig(object):
         @returns int: If successful, this function returns the receipt removed from the account list.
         """
         # This function is very similar to the previous one to an extent
-        for account in self.accounts:
-            if (account["address"].hex() == voter_address):
-                if (election_id in account["receipts"]):
-                    # The election in question also exists. Continue.
-                    try:
-                        receipt_to_remove: int = account["receipts"][election_id].remove(ballot_receipt)
-
-                        # Return the removed item. This is how this function exits successfully. Any other path raises an exception
-                        return receipt_to_remove
-                    except ValueError:
-                        raise ValueError(f"ERROR: Receipt {ballot_receipt} is not among the receipts for election {election_id} for account {voter_address}!")
-                else:
-                    raise ValueError(f"ERROR: Voter {voter_address} has never voted for election {election_id}")
-
-        raise Exception(f"ERROR: Voter address provided {voter_address} does not exist in the current account configuration!")
+        account: AccountRecord = self.getVoterAccount(voter_address=voter_address)
+
+        if (receipt_store.countReceipts(voter_address=account.address_hex, election_id=election_id) == 0):
+            raise ValueError(f"ERROR: Voter {voter_address} has never voted for election {election_id}")
+
+        if (not receipt_store.removeReceipt(voter_address=account.address_hex, election_id=election_id, ballot_receipt=ballot_receipt)):
+            raise ValueError(f"ERROR: Receipt {ballot_receipt} is not among the receipts for election {election_id} for account {voter_address}!")
+
+        # Return the removed item. This is how this function exits successfully. Any other path raises an exception
+        return ballot_receipt
     
 
     def countReceipts(self, voter_address: str, election_id: int) -> int:
@@ -235,41 +508,31 @@ class AccountConfig(object):
 
         @returns int Returns the number of ballots for the election entry.
         """
-
-        for account in self.accounts:
-            if (account["address"].hex() == voter_address):
-                if (election_id in account["receipts"]):
-                    # All good. Count the number of receipt and return it
-                    return len(account["receipts"][election_id])
-                else:
-                    raise Exception(f"ERROR: Voter {voter_address} has never voted for election {election_id}")
-        
-        raise Exception(f"ERROR: Voter address provided {voter_address} does not exist in the current account configuration!")
+        account: AccountRecord = self.getVoterAccount(voter_address=voter_address)
+        receipt_count: int = receipt_store.countReceipts(voter_address=account.address_hex, election_id=election_id)
+
+        if (receipt_count > 0):
+            # All good. Return the number of receipts
+            return receipt_count
+        else:
+            raise Exception(f"ERROR: Voter {voter_address} has never voted for election {election_id}")
     
 
     def removeElectionReceipt(self, voter_address: str, election_id: int) -> dict[int:list[int]]:
-        """This function removes the whole election entry from the account["receipts"] section and returns it back, if it exists.
+        """This function removes all the receipts of the voter for the election provided from the receipt store and returns them back, if there are any.
         
         @param voter_address: str The address of the account that should have the election_id entry in it.
         @param election_id: int The election identifier for the election where the ballots where submitted into.
 
-        @returns dict[int:list[int]] Returns the whole entry from the account["receipts"] that matches the election_id provided, if it exists.
+        @returns dict[int:list[int]] Returns the removed receipts, in a {election_id: [receipts]} format.
         """
-        for account in self.accounts:
-            if (account["address"].hex() == voter_address):
-                if (election_id in account["receipts"]):
-                    # Grab the entry to delete to an independent variable
-                    entry_to_return: dict[int:list[int]] = {election_id: account["receipts"][election_id]}
+        account: AccountRecord = self.getVoterAccount(voter_address=voter_address)
+        removed_receipts: list[int] = receipt_store.removeReceipts(voter_address=account.address_hex, election_id=election_id)
 
-                    # Remove the whole entry from the internal dictionary
-                    del account["receipts"][election_id]
-
-                    # Return the entry removed
-                    return entry_to_return
-                else:
-                    raise Exception(f"ERROR: Voter {voter_address} has never voted for election {election_id}")
-
-        raise Exception(f"ERROR: Voter address provided {voter_address} does not exists in the current account configuration!")
+        if (len(removed_receipts) > 0):
+            return {election_id: removed_receipts}
+        else:
+            raise Exception(f"ERROR: Voter {voter_address} has never voted for election {election_id}")
 
 
     def getFlowClient() -> flow_client:
@@ -290,10 +553,10 @@ class AccountConfig(object):
 
         network_accounts = {}
 
-        network_accounts["service"] = self.service_account["address"].hex()
+        network_accounts["service"] = self.service_account.address_hex
 
         for account in self.accounts:
-            network_accounts[account["name"]] = account["address"].hex()
+            network_accounts[account.name] = account.address_hex
         
         return network_accounts
     
@@ -305,11 +568,9 @@ class AccountConfig(object):
         """
         account_addresses: list[str] = []
 
-        account_addresses.append(self.service_account["address"].hex())
+        account_addresses.append(self.service_account.address_hex)
+        account_addresses.extend(self.accounts_by_address.keys())
 
-        for account in self.accounts:
-            account_addresses.append(account["address"].hex())
-        
         return account_addresses
     
     
@@ -0,0 +1,241 @@
+"""Module with a small pool of long-lived Flow access node clients.
+
+Every Script and Transaction runner function used to open (and close) a brand new gRPC channel per call, which, under load, ends up costing more than the Cadence code itself.
+This module keeps a set of open flow_client channels per (host, port) pair and lends them to whoever needs one, returning them to the pool once done.
+"""
+from flow_py_sdk import flow_client
+
+import asyncio
+import configparser
+import contextlib
+import os
+import pathlib
+import time
+
+from common.utils import Utils
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+config_path = pathlib.Path(os.getcwd()).joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+
+class PooledClient(object):
+    """Simple wrapper around an open flow_client context manager. I need to keep the context manager around to be able to close the channel properly later on, as well as some
+    bookkeeping on when was the last time this client was used successfully.
+    """
+    def __init__(self, host: str, port: int) -> None:
+        super().__init__()
+        self.host: str = host
+        self.port: int = port
+        self.context_manager: flow_client = None
+        self.client = None
+        self.last_used: float = 0.0
+
+
+    async def open(self) -> None:
+        """Function to open the gRPC channel to the access node configured.
+        """
+        self.context_manager = flow_client(host=self.host, port=self.port)
+        self.client = await self.context_manager.__aenter__()
+        self.last_used = time.monotonic()
+
+
+    async def close(self) -> None:
+        """Function to close the gRPC channel of this client. Any errors while closing are logged and dropped, since there's nothing else to do with a broken channel anyway.
+        """
+        if (self.context_manager == None):
+            return
+
+        try:
+            await self.context_manager.__aexit__(None, None, None)
+        except Exception as e:
+            log.warning(f"Unable to close client channel to {self.host}:{self.port}: {e}")
+        finally:
+            self.context_manager = None
+            self.client = None
+
+
+class FlowClientPool(object):
+    """Pool of long-lived flow_client objects connected to the same access node.
+
+    Clients are created lazily, up to the configured size, and lent through the borrow() async context manager. Idle clients are health checked (with a
+    get_latest_block request) before being lent again if they were idle for more than the configured interval. Clients that raise a connection-type error while
+    borrowed are discarded instead of returned to the pool.
+    """
+    def __init__(self, host: str, port: int, size: int = None, health_check_interval: float = None, health_check_timeout: float = None) -> None:
+        super().__init__()
+        self.host: str = host
+        self.port: int = port
+
+        self.size: int = size if size else config.getint(section="client_pool", option="size", fallback=4)
+        self.health_check_interval: float = health_check_interval if health_check_interval != None else config.getfloat(section="client_pool", option="health_check_interval", fallback=30.0)
+        self.health_check_timeout: float = health_check_timeout if health_check_timeout != None else config.getfloat(section="client_pool", option="health_check_timeout", fallback=5.0)
+
+        if (self.size < 1):
+            raise Exception(f"ERROR: Invalid client pool size provided: {self.size}. Need at least 1 client per pool!")
+
+        # asyncio primitives are bound to the event loop in which they are used. Keep a reference to it to detect if the pool is being used from a different loop
+        self.loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self.idle_clients: asyncio.LifoQueue = asyncio.LifoQueue()
+        self.slots: asyncio.Semaphore = asyncio.Semaphore(self.size)
+        self.borrowed: int = 0
+        self.all_returned: asyncio.Event = asyncio.Event()
+        self.all_returned.set()
+        self.closed: bool = False
+
+
+    async def isHealthy(self, pooled_client: PooledClient) -> bool:
+        """Function to check if a client that was sitting idle in the pool can still reach the access node.
+
+        :param pooled_client (PooledClient): The client to check.
+
+        :return (bool): True if the client answered a get_latest_block request within the configured timeout, False otherwise.
+        """
+        try:
+            await asyncio.wait_for(pooled_client.client.get_latest_block(), timeout=self.health_check_timeout)
+        except Exception as e:
+            log.warning(f"Pooled client to {self.host}:{self.port} failed its health check: {e}")
+            return False
+
+        return True
+
+
+    async def acquire(self) -> PooledClient:
+        """Function to get a client from the pool, either an idle one or a freshly opened one if there are no idle clients available. This function blocks if all the clients
+        in the pool are currently borrowed.
+
+        :return (PooledClient): An open client ready to use.
+        """
+        if (self.closed):
+            raise Exception(f"ERROR: The client pool for {self.host}:{self.port} is already closed!")
+
+        await self.slots.acquire()
+
+        try:
+            while (not self.idle_clients.empty()):
+                pooled_client: PooledClient = self.idle_clients.get_nowait()
+
+                # Only health check clients that were sitting idle for a while. Recently used clients are most likely fine
+                if (time.monotonic() - pooled_client.last_used < self.health_check_interval or await self.isHealthy(pooled_client=pooled_client)):
+                    break
+
+                await pooled_client.close()
+            else:
+                pooled_client = PooledClient(host=self.host, port=self.port)
+                await pooled_client.open()
+        except BaseException:
+            self.slots.release()
+            raise
+
+        self.borrowed += 1
+        self.all_returned.clear()
+
+        return pooled_client
+
+
+    async def release(self, pooled_client: PooledClient, discard: bool = False) -> None:
+        """Function to return a borrowed client to the pool.
+
+        :param pooled_client (PooledClient): The client to return.
+        :param discard (bool): If True, the client is closed instead of being set back as idle.
+        """
+        if (discard or self.closed):
+            await pooled_client.close()
+        else:
+            pooled_client.last_used = time.monotonic()
+            self.idle_clients.put_nowait(pooled_client)
+
+        self.borrowed -= 1
+
+        if (self.borrowed == 0):
+            self.all_returned.set()
+
+        self.slots.release()
+
+
+    @contextlib.asynccontextmanager
+    async def borrow(self):
+        """Async context manager that lends a client from the pool and returns it once the block finishes. It is meant as a drop in replacement for the usual
+        'async with flow_client(host, port) as client:' construct.
+        """
+        pooled_client: PooledClient = await self.acquire()
+        discard: bool = False
+
+        try:
+            yield pooled_client.client
+        except (OSError, asyncio.TimeoutError):
+            # Connection-type errors mean that the channel is most likely unusable. Drop it and let the pool open a new one later
+            discard = True
+            raise
+        except Exception as e:
+            # grpclib signals broken streams with its own exceptions. Check the name to avoid importing grpclib directly here
+            if (type(e).__name__ in ("StreamTerminatedError", "ProtocolError")):
+                discard = True
+            raise
+        finally:
+            await self.release(pooled_client=pooled_client, discard=discard)
+
+
+    async def close(self, timeout: float = None) -> None:
+        """Function to shut down the pool gracefully. New borrow requests are refused right away, the function waits for all the borrowed clients to be returned (up to the
+        timeout provided) and then closes every open channel.
+
+        :param timeout (float): Maximum number of seconds to wait for the borrowed clients to be returned. Waits indefinitely if not provided.
+        """
+        self.closed = True
+
+        try:
+            await asyncio.wait_for(self.all_returned.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            log.warning(f"Closing client pool for {self.host}:{self.port} with {self.borrowed} clients still borrowed")
+
+        while (not self.idle_clients.empty()):
+            await self.idle_clients.get_nowait().close()
+
+
+# Process-wide registry of client pools, keyed by (host, port)
+client_pools: dict[tuple[str, int], FlowClientPool] = {}
+
+
+def getClientPool(host: str, port: int) -> FlowClientPool:
+    """Function to retrieve the client pool for the access node provided, creating one if needed. This function needs to be called from within a running event loop.
+
+    :param host (str): The access node host.
+    :param port (int): The access node port.
+
+    :return (FlowClientPool): The client pool for the access node in question.
+    """
+    key: tuple[str, int] = (host, int(port))
+    pool: FlowClientPool = client_pools.get(key)
+
+    # A pool created under a previous asyncio.run() call cannot be used in the current one. Replace it with a new one
+    if (pool == None or pool.closed or pool.loop is not asyncio.get_running_loop()):
+        pool = FlowClientPool(host=host, port=int(port))
+        client_pools[key] = pool
+
+    return pool
+
+
+def borrowFlowClient(host: str, port: int):
+    """Shortcut function to borrow a client from the pool of the access node provided. Use it as 'async with borrowFlowClient(host, port) as client:'
+
+    :param host (str): The access node host.
+    :param port (int): The access node port.
+    """
+    return getClientPool(host=host, port=port).borrow()
+
+
+async def closeClientPools(timeout: float = None) -> None:
+    """Function to gracefully close all the client pools created in the current event loop. Call this at the end of a runner, before the event loop is closed.
+
+    :param timeout (float): Maximum number of seconds to wait for each pool's borrowed clients to be returned.
+    """
+    current_loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+    for key in list(client_pools.keys()):
+        if (client_pools[key].loop is current_loop):
+            await client_pools.pop(key).close(timeout=timeout)
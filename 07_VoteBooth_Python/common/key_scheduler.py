@@ -0,0 +1,121 @@
+"""Module with the proposal key rotation scheduler used by TransactionRunner.
+
+A Flow transaction proposal key can only have one transaction in flight at a time, since its sequence number is only incremented once the transaction is included in a
+block. Accounts with N proposal keys (see the 'proposal_keys' entry in AccountConfig) can run N transactions concurrently, as long as each of those uses a different key.
+This scheduler hands out free keys to concurrent submissions and blocks whoever asks for one when all of the account keys are busy.
+"""
+from flow_py_sdk.cadence import Address
+
+import asyncio
+
+from common.utils import Utils
+from common.account_config import AccountRecord
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+
+class ProposalKeyScheduler(object):
+    """Round-robin scheduler of proposal keys, per account. The keys are the {"key_id", "signer"} dictionaries set in the "keys" entry of each AccountConfig account.
+    Each account gets a queue with its free keys: acquiring a key takes the first one from the queue (waiting if it is empty) and releasing it puts it back at the end.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        # Free keys per account, in a {address_hex: asyncio.Queue} format
+        self.free_keys: dict[str, asyncio.Queue] = {}
+
+        # Keys currently handed out, in a {(address_hex, key_id): key_entry} format
+        self.busy_keys: dict[tuple[str, int], dict] = {}
+
+        # Subset of keys each account is allowed to use, in a {address_hex: set[key_id]} format. Accounts not in here use all of their keys. Unlike the queues, this is not
+        # bound to the event loop, so it survives between asyncio.run() calls
+        self.allowed_keys: dict[str, set[int]] = {}
+
+        # asyncio queues are bound to the event loop where they are used. Reset everything if the running loop changes between asyncio.run() calls
+        self.loop: asyncio.AbstractEventLoop = None
+
+
+    def checkLoop(self) -> None:
+        """Internal function to reset the key queues if the running event loop changed since the last call.
+        """
+        current_loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        if (self.loop is not current_loop):
+            self.loop = current_loop
+            self.free_keys = {}
+            self.busy_keys = {}
+
+
+    async def acquireKey(self, account: AccountRecord) -> dict:
+        """Function to get a free proposal key from the account provided. If all the account keys are currently in use, this function waits until one is released.
+
+        :param account (AccountRecord): The account record, from AccountConfig, that is going to propose the transaction.
+
+        :return (dict): The proposal key entry, in the {"key_id": int, "signer": InMemorySigner} format.
+        """
+        self.checkLoop()
+        address_hex: str = account.address_hex
+
+        if (address_hex not in self.free_keys):
+            allowed_key_ids: set[int] = self.allowed_keys.get(address_hex)
+            key_entries: list[dict] = [key_entry for key_entry in account.keys if allowed_key_ids == None or key_entry["key_id"] in allowed_key_ids]
+
+            if (len(key_entries) == 0):
+                raise Exception(f"ERROR: None of the proposal keys of account {address_hex} are allowed in this process. Allowed keys: {sorted(allowed_key_ids)}")
+
+            self.free_keys[address_hex] = asyncio.Queue()
+
+            for key_entry in key_entries:
+                self.free_keys[address_hex].put_nowait(key_entry)
+
+        key_entry: dict = await self.free_keys[address_hex].get()
+        self.busy_keys[(address_hex, key_entry["key_id"])] = key_entry
+
+        return key_entry
+
+
+    def restrictKeys(self, address: Address, key_ids: list[int]) -> None:
+        """Function to limit the proposal keys that this process hands out for the account provided. Use it when several processes propose transactions with the same
+        account, so that each one uses a disjoint set of keys and their locally tracked sequence numbers never collide.
+
+        :param address (Address): The account address.
+        :param key_ids (list[int]): The indexes of the keys this process is allowed to use.
+        """
+        self.allowed_keys[address.hex()] = set(key_ids)
+
+        # Drop the queue built so far, if any, so that the next acquireKey builds it again with the allowed keys only
+        self.free_keys.pop(address.hex(), None)
+
+
+    def releaseKey(self, address: Address, key_id: int) -> None:
+        """Function to return a proposal key to the pool of free keys of its account. Releasing a key that is not currently handed out does nothing, so it is safe to call
+        this function more than once for the same transaction.
+
+        :param address (Address): The address of the account that owns the key.
+        :param key_id (int): The index of the key to release.
+        """
+        if (self.loop == None):
+            return
+
+        key_entry: dict = self.busy_keys.pop((address.hex(), key_id), None)
+
+        if (key_entry != None and address.hex() in self.free_keys):
+            self.free_keys[address.hex()].put_nowait(key_entry)
+
+
+    def countFreeKeys(self, address: Address) -> int:
+        """Function to return the number of proposal keys currently available for the account provided.
+
+        :param address (Address): The account address.
+
+        :return (int): The number of free keys, or -1 if the account did not request any keys yet.
+        """
+        if (address.hex() not in self.free_keys):
+            return -1
+
+        return self.free_keys[address.hex()].qsize()
+
+
+# Single scheduler for the whole process, given that every runner needs to share the same key pools
+key_scheduler: ProposalKeyScheduler = ProposalKeyScheduler()
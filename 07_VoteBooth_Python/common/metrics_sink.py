@@ -0,0 +1,305 @@
+"""Module with a buffered sink for the gas and storage profiling records.
+
+Utils.processTransactionData and ScriptRunner.profile_all_accounts_csv used to open the results file in append mode, write a line or two and close it again for every
+transaction, which puts file I/O right in the middle of the transaction path. With this sink, those functions only append the record to an in-memory buffer. A background
+task moves the buffered records to the configured backend (CSV, JSONL or SQLite) periodically, or as soon as the buffer fills up, and whatever is left is flushed on
+shutdown.
+"""
+import asyncio
+import atexit
+import collections
+import configparser
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+from typing import Callable
+
+from common.utils import Utils
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+config_path = pathlib.Path(os.getcwd()).joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+
+class CsvMetricsBackend(object):
+    """Backend that writes each record as a comma separated line, exactly like the original profiling functions did. Files are kept open between flushes.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.output_streams: dict = {}
+
+
+    def getStream(self, output_file_path: pathlib.Path, headers: list[str]):
+        """Internal function to return the open stream for the file provided, creating the file, and writing its header line, if it does not exist yet.
+
+        :param output_file_path (pathlib.Path): The file to write into.
+        :param headers (list[str]): The column names, used only if the file needs to be created.
+        """
+        if (output_file_path not in self.output_streams):
+            if (os.path.isfile(output_file_path)):
+                self.output_streams[output_file_path] = open(output_file_path, "+a")
+            else:
+                self.output_streams[output_file_path] = open(output_file_path, "+x")
+                self.output_streams[output_file_path].write(", ".join(headers) + "\n")
+
+        return self.output_streams[output_file_path]
+
+
+    def write(self, output_file_path: pathlib.Path, headers: list[str], rows: list[list]) -> None:
+        """Function to write a batch of rows into the file provided.
+
+        :param output_file_path (pathlib.Path): The file to write into.
+        :param headers (list[str]): The column names.
+        :param rows (list[list]): The rows to write, each one with one value per column.
+        """
+        output_stream = self.getStream(output_file_path=output_file_path, headers=headers)
+        output_stream.writelines([",".join([str(value) for value in row]) + "\n" for row in rows])
+        output_stream.flush()
+
+
+    def close(self) -> None:
+        """Function to close every open file.
+        """
+        for output_stream in self.output_streams.values():
+            output_stream.close()
+
+        self.output_streams = {}
+
+
+class JsonlMetricsBackend(CsvMetricsBackend):
+    """Backend that writes each record as a JSON object, with the column names as keys, one per line. The output file gets a '.jsonl' extension instead of the one provided.
+    """
+    def getStream(self, output_file_path: pathlib.Path, headers: list[str]):
+        output_file_path = pathlib.Path(output_file_path).with_suffix(".jsonl")
+
+        if (output_file_path not in self.output_streams):
+            self.output_streams[output_file_path] = open(output_file_path, "a")
+
+        return self.output_streams[output_file_path]
+
+
+    def write(self, output_file_path: pathlib.Path, headers: list[str], rows: list[list]) -> None:
+        output_stream = self.getStream(output_file_path=output_file_path, headers=headers)
+        output_stream.writelines([json.dumps(dict(zip(headers, row))) + "\n" for row in rows])
+        output_stream.flush()
+
+
+class SqliteMetricsBackend(object):
+    """Backend that inserts each record into a 'metrics' table of a SQLite database. The database file gets a '.db' extension instead of the one provided. All the columns
+    are stored as text, with the same names as the CSV headers.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.connections: dict[pathlib.Path, sqlite3.Connection] = {}
+
+
+    def write(self, output_file_path: pathlib.Path, headers: list[str], rows: list[list]) -> None:
+        output_file_path = pathlib.Path(output_file_path).with_suffix(".db")
+
+        if (output_file_path not in self.connections):
+            # The flusher runs in a worker thread, which is not the one that created the connection
+            self.connections[output_file_path] = sqlite3.connect(output_file_path, check_same_thread=False)
+            column_definitions: str = ", ".join([f"\"{header}\" TEXT" for header in headers])
+            self.connections[output_file_path].execute(f"CREATE TABLE IF NOT EXISTS metrics ({column_definitions})")
+
+        connection: sqlite3.Connection = self.connections[output_file_path]
+        column_names: str = ", ".join([f"\"{header}\"" for header in headers])
+        placeholders: str = ", ".join(["?"] * len(headers))
+
+        with connection:
+            connection.executemany(f"INSERT INTO metrics ({column_names}) VALUES ({placeholders})", [[str(value) for value in row] for row in rows])
+
+
+    def close(self) -> None:
+        for connection in self.connections.values():
+            connection.close()
+
+        self.connections = {}
+
+
+metrics_backends: dict[str, type] = {
+    "csv": CsvMetricsBackend,
+    "jsonl": JsonlMetricsBackend,
+    "sqlite": SqliteMetricsBackend
+}
+
+
+class MetricsSink(object):
+    """Buffered sink for the profiling records. Records are appended to a bounded ring buffer and written, in batches, by a background task running in the current event
+    loop. If the buffer is full, the oldest record is dropped (and counted) instead of blocking the transaction path.
+    """
+    def __init__(self, backend: str = None, buffer_size: int = None, flush_interval: float = None, flush_threshold: int = None) -> None:
+        """
+        :param backend (str): One of "csv", "jsonl" or "sqlite". Defaults to the [metrics] config section value.
+        :param buffer_size (int): Maximum number of records kept in memory.
+        :param flush_interval (float): Maximum number of seconds between flushes.
+        :param flush_threshold (int): Number of buffered records that triggers a flush right away.
+        """
+        super().__init__()
+        backend_name: str = backend if backend else config.get(section="metrics", option="backend", fallback="csv")
+
+        if (backend_name not in metrics_backends):
+            raise Exception(f"ERROR: Unknown metrics backend '{backend_name}'. Valid options are: {", ".join(metrics_backends.keys())}")
+
+        self.backend = metrics_backends[backend_name]()
+        self.buffer_size: int = buffer_size if buffer_size else config.getint(section="metrics", option="buffer_size", fallback=10000)
+        self.flush_interval: float = flush_interval if flush_interval else config.getfloat(section="metrics", option="flush_interval", fallback=2.0)
+        self.flush_threshold: int = flush_threshold if flush_threshold else config.getint(section="metrics", option="flush_threshold", fallback=500)
+
+        self.buffer: collections.deque = collections.deque(maxlen=self.buffer_size)
+        self.dropped_records: int = 0
+
+        # Functions that want to see every record as it comes in, e.g., the benchmark runner, which aggregates the fees per scenario step
+        self.listeners: list[Callable] = []
+
+        # Flushes can run either in a worker thread (from the background task) or in the main thread (at exit), but never at the same time
+        self.flush_lock: threading.Lock = threading.Lock()
+
+        self.loop: asyncio.AbstractEventLoop = None
+        self.flush_event: asyncio.Event = None
+        self.flusher_task: asyncio.Task = None
+
+
+    def record(self, output_file_path: pathlib.Path, headers: list[str], values: list) -> None:
+        """Function to add a record to the buffer. This function never touches the disk: the record is written later on by the background flusher.
+
+        :param output_file_path (pathlib.Path): The file where the record is to be written to.
+        :param headers (list[str]): The column names of the record.
+        :param values (list): The record values, one per column.
+        """
+        if (len(self.buffer) == self.buffer_size):
+            self.dropped_records += 1
+
+            if (self.dropped_records == 1 or self.dropped_records % 1000 == 0):
+                log.warning(f"Metrics buffer full. {self.dropped_records} records dropped so far. Consider raising the buffer_size or lowering the flush_interval")
+
+        self.buffer.append((pathlib.Path(output_file_path), tuple(headers), list(values)))
+
+        for listener in self.listeners:
+            try:
+                listener(output_file_path, headers, values)
+            except Exception as e:
+                log.warning(f"Metrics listener {listener} failed: {e}")
+
+        self.startFlusher()
+
+        if (len(self.buffer) >= self.flush_threshold and self.flush_event != None):
+            self.flush_event.set()
+
+
+    def addListener(self, listener: Callable) -> None:
+        """Function to register a function that gets called, with the same arguments as record(), for every new record. Listeners run in the transaction path, so keep them cheap.
+
+        :param listener (Callable): The function to call.
+        """
+        if (listener not in self.listeners):
+            self.listeners.append(listener)
+
+
+    def removeListener(self, listener: Callable) -> None:
+        """Function to unregister a function previously added with addListener.
+
+        :param listener (Callable): The function to remove.
+        """
+        if (listener in self.listeners):
+            self.listeners.remove(listener)
+
+
+    def startFlusher(self) -> None:
+        """Internal function to launch the background flusher in the running event loop, if there is one and if it is not running there already. Records added outside of
+        an event loop stay in the buffer until the next flush() call or until the process exits.
+        """
+        try:
+            current_loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        if (self.loop is current_loop and self.flusher_task != None and not self.flusher_task.done()):
+            return
+
+        self.loop = current_loop
+        self.flush_event = asyncio.Event()
+        self.flusher_task = current_loop.create_task(self.runFlusher())
+
+
+    async def runFlusher(self) -> None:
+        """Background task that flushes the buffer every flush_interval seconds, or sooner if the buffer reaches the flush_threshold.
+        """
+        while (True):
+            try:
+                await asyncio.wait_for(self.flush_event.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self.flush_event.clear()
+
+            if (len(self.buffer) > 0):
+                # The actual file I/O runs in a worker thread to keep it out of the event loop
+                await asyncio.to_thread(self.flush)
+
+
+    def flush(self) -> int:
+        """Function to write every buffered record into the backend, grouping them by output file.
+
+        :return (int): The number of records written.
+        """
+        with self.flush_lock:
+            grouped_rows: dict[tuple, list[list]] = {}
+            records_written: int = 0
+
+            while (len(self.buffer) > 0):
+                output_file_path, headers, values = self.buffer.popleft()
+                grouped_rows.setdefault((output_file_path, headers), []).append(values)
+                records_written += 1
+
+            for (output_file_path, headers), rows in grouped_rows.items():
+                try:
+                    self.backend.write(output_file_path=output_file_path, headers=list(headers), rows=rows)
+                except Exception as e:
+                    log.error(f"Unable to write {len(rows)} metric records to {output_file_path}: {e}")
+
+            return records_written
+
+
+    async def close(self) -> None:
+        """Function to stop the background flusher, flush whatever is left in the buffer and close the backend.
+        """
+        if (self.flusher_task != None and not self.flusher_task.done()):
+            self.flusher_task.cancel()
+
+            try:
+                await self.flusher_task
+            except asyncio.CancelledError:
+                pass
+
+        self.flusher_task = None
+        await asyncio.to_thread(self.flush)
+        self.backend.close()
+
+
+# Single sink for the whole process, so that every runner shares the same buffer and open files
+metrics_sink: MetricsSink = MetricsSink()
+
+
+async def closeMetricsSink() -> None:
+    """Function to flush and close the process wide metrics sink. Call it before the event loop ends.
+    """
+    await metrics_sink.close()
+
+
+def flushAtExit() -> None:
+    """Last resort flush for records left in the buffer by programs that exit without calling closeMetricsSink.
+    """
+    if (len(metrics_sink.buffer) > 0):
+        metrics_sink.flush()
+
+    metrics_sink.backend.close()
+
+
+atexit.register(flushAtExit)
@@ -0,0 +1,437 @@
+"""Module with a persistent, on disk, store for the ballot receipts.
+
+AccountConfig used to keep the ballot receipts in a dictionary inside each account entry, which only lives as long as the process that created it. Since every runner builds
+its own AccountConfig, the receipts added by voter_runner were gone by the time election_finisher wanted to validate them. This store keeps them in a SQLite database instead,
+in WAL mode, indexed by (network, voter, election), so that any process can add receipts in bulk and any other process can read them back, as a set, for validation. The
+receipts of finished Elections are kept, as their audit trail, and only removed when the Election itself is destroyed (see removeElection).
+
+Single receipts, added by the voter coroutines after each Ballot, are written with a group commit: each voter queues its receipt and awaits it, while a background task
+writes everything queued so far in a single transaction, in a worker thread, so that the commit (and its disk sync) never runs on the event loop thread. A voter only
+moves on once its receipt is on disk, so a crash never loses a receipt for a Ballot the voter reported as cast.
+"""
+import asyncio
+import atexit
+import configparser
+import os
+import pathlib
+import sqlite3
+import threading
+from typing import Iterable
+
+from common.utils import Utils
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+config_path = pathlib.Path(os.getcwd()).joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+
+class ReceiptStore(object):
+    """SQLite backed store of ballot receipts, in a single 'receipts' table with one row per (network, voter, election_id, receipt). Writes are committed in a single transaction per
+    call, so a crash either keeps a whole batch or none of it, and the database can be shared by several processes at the same time (SQLite serialises the writers).
+    """
+    def __init__(self, database_path: pathlib.Path = None, synchronous: str = None, busy_timeout: float = None, network: str = None) -> None:
+        """
+        :param database_path (pathlib.Path): The database file. Defaults to '<network>_receipts.db' in the [receipt_store] directory, so that receipts from different
+        networks, which reuse the same election ids, are never mixed.
+        :param synchronous (str): The SQLite synchronous mode. FULL syncs every commit to disk. NORMAL is faster, and still consistent after a crash in WAL mode, but can lose
+        the last commits on a power failure.
+        :param busy_timeout (float): Seconds to wait for another process to finish writing before giving up.
+        :param network (str): The network the receipts belong to. Every row is keyed by it, so that a database shared between networks never mixes their receipts.
+        Defaults to the current network in the config file.
+        """
+        super().__init__()
+        self.network: str = network if network else config.get(section="network", option="current").lower().strip()
+
+        if (database_path == None):
+            database_directory: pathlib.Path = pathlib.Path(os.getcwd()).joinpath(config.get(section="receipt_store", option="directory", fallback="results"))
+            database_path = database_directory.joinpath(f"{self.network}_receipts.db")
+
+        self.database_path: pathlib.Path = pathlib.Path(database_path)
+        self.synchronous: str = synchronous if synchronous else config.get(section="receipt_store", option="synchronous", fallback="FULL")
+        self.busy_timeout: float = busy_timeout if busy_timeout else config.getfloat(section="receipt_store", option="busy_timeout", fallback=30.0)
+
+        # The connection is only opened when first needed, so that importing this module does not create any files
+        self.connection: sqlite3.Connection = None
+
+        # The same connection can be used from the event loop thread and from worker threads, but not by two of them at once
+        self.lock: threading.Lock = threading.Lock()
+
+        # Receipts added with addReceipt and not yet written, as (voter_address, election_id, ballot_receipt) tuples, next to the futures their voters are awaiting
+        self.buffer: list[tuple[str, int, int]] = []
+        self.waiters: list[asyncio.Future] = []
+        self.buffer_lock: threading.Lock = threading.Lock()
+
+        self.loop: asyncio.AbstractEventLoop = None
+        self.flush_event: asyncio.Event = None
+        self.flusher_task: asyncio.Task = None
+
+
+    def getConnection(self) -> sqlite3.Connection:
+        """Internal function to open the database, and create the receipts table and its indexes, if that was not done yet.
+
+        :return (sqlite3.Connection): The open connection.
+        """
+        if (self.connection == None):
+            self.database_path.parent.mkdir(parents=True, exist_ok=True)
+            self.connection = sqlite3.connect(self.database_path, timeout=self.busy_timeout, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(f"PRAGMA synchronous={self.synchronous}")
+
+            with self.connection:
+                self.connection.execute("CREATE TABLE IF NOT EXISTS receipts (network TEXT NOT NULL, voter TEXT NOT NULL, election_id INTEGER NOT NULL, receipt INTEGER NOT NULL)")
+
+                # Databases created before the network column was added only have receipts from the network in their file name, i.e., the current one
+                if ("network" not in [column[1] for column in self.connection.execute("PRAGMA table_info(receipts)")]):
+                    self.connection.execute("ALTER TABLE receipts ADD COLUMN network TEXT NOT NULL DEFAULT ''")
+                    self.connection.execute("UPDATE receipts SET network = ?", (self.network,))
+                    self.connection.execute("DROP INDEX IF EXISTS receipts_by_voter")
+                    self.connection.execute("DROP INDEX IF EXISTS receipts_by_election")
+
+                self.connection.execute("CREATE INDEX IF NOT EXISTS receipts_by_network_voter ON receipts (network, voter, election_id)")
+                self.connection.execute("CREATE INDEX IF NOT EXISTS receipts_by_network_election ON receipts (network, election_id, receipt)")
+
+        return self.connection
+
+
+    def writeReceipts(self, receipts: Iterable[tuple[str, int, int]]) -> int:
+        """Internal function to write a batch of receipts in one transaction. The caller must hold self.lock.
+
+        :param receipts (Iterable[tuple[str, int, int]]): The receipts to write, as (voter_address, election_id, ballot_receipt) tuples.
+
+        :return (int): The number of receipts written.
+        """
+        rows: list[tuple[str, str, int, int]] = [(self.network, voter_address.removeprefix("0x"), int(election_id), int(ballot_receipt)) for voter_address, election_id, ballot_receipt in receipts]
+
+        if (len(rows) == 0):
+            return 0
+
+        connection: sqlite3.Connection = self.getConnection()
+
+        with connection:
+            connection.executemany("INSERT INTO receipts (network, voter, election_id, receipt) VALUES (?, ?, ?, ?)", rows)
+
+        return len(rows)
+
+
+    def addReceipts(self, receipts: Iterable[tuple[str, int, int]]) -> int:
+        """Function to add a batch of receipts in one transaction.
+
+        :param receipts (Iterable[tuple[str, int, int]]): The receipts to add, as (voter_address, election_id, ballot_receipt) tuples. The voter address is stored without
+        the '0x' prefix.
+
+        :return (int): The number of receipts added.
+        """
+        with self.lock:
+            return self.writeReceipts(receipts=receipts)
+
+
+    async def addReceipt(self, voter_address: str, election_id: int, ballot_receipt: int) -> None:
+        """Function to add a single receipt. The receipt goes into the buffer and this function returns only once the background flusher has written it, together with every
+        other receipt buffered in the meantime, in a single transaction in a worker thread. If that write fails, the exception is raised here.
+
+        :param voter_address (str): The address of the account that submitted the ballot.
+        :param election_id (int): The election identifier.
+        :param ballot_receipt (int): The receipt to add.
+        """
+        self.startFlusher()
+        receipt_written: asyncio.Future = self.loop.create_future()
+
+        with self.buffer_lock:
+            self.buffer.append((voter_address, election_id, ballot_receipt))
+            self.waiters.append(receipt_written)
+
+        self.flush_event.set()
+        await receipt_written
+
+
+    def startFlusher(self) -> None:
+        """Internal function to launch the background flusher in the running event loop, if it is not running there already.
+        """
+        current_loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        if (self.loop is current_loop and self.flusher_task != None and not self.flusher_task.done()):
+            return
+
+        self.loop = current_loop
+        self.flush_event = asyncio.Event()
+        self.flusher_task = current_loop.create_task(self.runFlusher())
+
+
+    async def runFlusher(self) -> None:
+        """Background task that writes the buffered receipts as soon as there are any. Receipts added while a write is running wait for the next one, so the number of
+        receipts per transaction grows with the number of concurrent voters.
+        """
+        while (True):
+            await self.flush_event.wait()
+            self.flush_event.clear()
+
+            if (len(self.buffer) > 0):
+                try:
+                    await asyncio.to_thread(self.flush)
+                except Exception as e:
+                    log.error(f"Unable to write buffered receipts to {self.database_path}: {e}")
+
+
+    def flush(self) -> int:
+        """Function to write every buffered receipt in a single transaction and wake up the voters awaiting them. The lock is held from the moment the buffer is taken until
+        the transaction is committed, so a read that comes after it always sees these receipts. If the write fails, the voters get the exception instead.
+
+        :return (int): The number of receipts written.
+        """
+        with self.lock:
+            with self.buffer_lock:
+                buffered_receipts: list[tuple[str, int, int]] = self.buffer
+                receipt_waiters: list[asyncio.Future] = self.waiters
+                self.buffer = []
+                self.waiters = []
+
+            try:
+                receipts_written: int = self.writeReceipts(receipts=buffered_receipts)
+            except Exception as e:
+                ReceiptStore.wakeWaiters(receipt_waiters=receipt_waiters, exception=e)
+                raise
+
+        ReceiptStore.wakeWaiters(receipt_waiters=receipt_waiters)
+
+        return receipts_written
+
+
+    @staticmethod
+    def wakeWaiters(receipt_waiters: list[asyncio.Future], exception: Exception = None) -> None:
+        """Internal function to resolve the futures of the voters awaiting a write, from whichever thread did the write.
+
+        :param receipt_waiters (list[asyncio.Future]): The futures to resolve.
+        :param exception (Exception): The exception to set on them, if the write failed.
+        """
+        def resolve(receipt_written: asyncio.Future) -> None:
+            if (not receipt_written.done()):
+                if (exception != None):
+                    receipt_written.set_exception(exception)
+                else:
+                    receipt_written.set_result(None)
+
+        for receipt_written in receipt_waiters:
+            try:
+                receipt_written.get_loop().call_soon_threadsafe(resolve, receipt_written)
+            except RuntimeError:
+                # The event loop of that voter is already closed, so nobody is waiting anymore
+                pass
+
+
+    def removeReceipt(self, voter_address: str, election_id: int, ballot_receipt: int) -> bool:
+        """Function to remove one occurrence of a receipt.
+
+        :param voter_address (str): The address of the account that holds the receipt.
+        :param election_id (int): The election identifier.
+        :param ballot_receipt (int): The receipt to remove.
+
+        :return (bool): True if the receipt was removed, False if it was not in the store.
+        """
+        self.flush()
+
+        with self.lock:
+            connection: sqlite3.Connection = self.getConnection()
+
+            with connection:
+                cursor: sqlite3.Cursor = connection.execute(
+                    "DELETE FROM receipts WHERE rowid = (SELECT rowid FROM receipts WHERE network = ? AND voter = ? AND election_id = ? AND receipt = ? LIMIT 1)",
+                    (self.network, voter_address.removeprefix("0x"), int(election_id), int(ballot_receipt))
+                )
+
+        return (cursor.rowcount > 0)
+
+
+    def removeReceipts(self, voter_address: str, election_id: int) -> list[int]:
+        """Function to remove every receipt from a voter for an election.
+
+        :param voter_address (str): The address of the account that holds the receipts.
+        :param election_id (int): The election identifier.
+
+        :return (list[int]): The receipts removed.
+        """
+        self.flush()
+
+        with self.lock:
+            connection: sqlite3.Connection = self.getConnection()
+
+            with connection:
+                parameters: tuple = (self.network, voter_address.removeprefix("0x"), int(election_id))
+                removed_receipts: list[int] = [row[0] for row in connection.execute("SELECT receipt FROM receipts WHERE network = ? AND voter = ? AND election_id = ? ORDER BY rowid", parameters)]
+                connection.execute("DELETE FROM receipts WHERE network = ? AND voter = ? AND election_id = ?", parameters)
+
+        return removed_receipts
+
+
+    def removeElection(self, election_id: int) -> int:
+        """Function to remove every receipt, from every voter, for an election. Only call it once the election is destroyed, since the receipts of a finished election are
+        its audit trail.
+
+        :param election_id (int): The election identifier.
+
+        :return (int): The number of receipts removed.
+        """
+        self.flush()
+
+        with self.lock:
+            connection: sqlite3.Connection = self.getConnection()
+
+            with connection:
+                cursor: sqlite3.Cursor = connection.execute("DELETE FROM receipts WHERE network = ? AND election_id = ?", (self.network, int(election_id)))
+
+        return cursor.rowcount
+
+
+    def getReceipts(self, voter_address: str, election_id: int) -> list[int]:
+        """Function to retrieve the receipts from a voter for an election, in the order they were added.
+
+        :param voter_address (str): The address of the account that holds the receipts.
+        :param election_id (int): The election identifier.
+
+        :return (list[int]): The receipts, or an empty list if the voter has none for this election.
+        """
+        self.flush()
+
+        with self.lock:
+            return [row[0] for row in self.getConnection().execute(
+                "SELECT receipt FROM receipts WHERE network = ? AND voter = ? AND election_id = ? ORDER BY rowid",
+                (self.network, voter_address.removeprefix("0x"), int(election_id))
+            )]
+
+
+    def countReceipts(self, voter_address: str, election_id: int) -> int:
+        """Function to count the receipts from a voter for an election.
+
+        :param voter_address (str): The address of the account that holds the receipts.
+        :param election_id (int): The election identifier.
+
+        :return (int): The number of receipts.
+        """
+        self.flush()
+
+        with self.lock:
+            return self.getConnection().execute(
+                "SELECT COUNT(*) FROM receipts WHERE network = ? AND voter = ? AND election_id = ?",
+                (self.network, voter_address.removeprefix("0x"), int(election_id))
+            ).fetchone()[0]
+
+
+    def getVoterReceipts(self, voter_address: str) -> dict[int, list[int]]:
+        """Function to retrieve every receipt from a voter, grouped by election. This is the same format that AccountConfig used to keep in account["receipts"].
+
+        :param voter_address (str): The address of the account that holds the receipts.
+
+        :return (dict[int, list[int]]): The receipts, in a {election_id: [receipts]} format.
+        """
+        self.flush()
+
+        voter_receipts: dict[int, list[int]] = {}
+
+        with self.lock:
+            for election_id, receipt in self.getConnection().execute("SELECT election_id, receipt FROM receipts WHERE network = ? AND voter = ? ORDER BY rowid", (self.network, voter_address.removeprefix("0x"))):
+                voter_receipts.setdefault(election_id, []).append(receipt)
+
+        return voter_receipts
+
+
+    def getElectionReceipts(self, election_id: int) -> dict[str, set[int]]:
+        """Function to retrieve every receipt for an election, grouped by voter.
+
+        :param election_id (int): The election identifier.
+
+        :return (dict[str, set[int]]): The receipts, in a {voter_address: {receipts}} format, with the addresses without the '0x' prefix.
+        """
+        self.flush()
+
+        election_receipts: dict[str, set[int]] = {}
+
+        with self.lock:
+            for voter, receipt in self.getConnection().execute("SELECT voter, receipt FROM receipts WHERE network = ? AND election_id = ?", (self.network, int(election_id))):
+                election_receipts.setdefault(voter, set()).add(receipt)
+
+        return election_receipts
+
+
+    def getElectionReceiptSet(self, election_id: int) -> set[int]:
+        """Function to retrieve the set of distinct receipts for an election, from all voters. This is a range scan over the (network, election_id, receipt) index.
+
+        :param election_id (int): The election identifier.
+
+        :return (set[int]): The receipts.
+        """
+        self.flush()
+
+        with self.lock:
+            return {row[0] for row in self.getConnection().execute("SELECT DISTINCT receipt FROM receipts WHERE network = ? AND election_id = ?", (self.network, int(election_id)))}
+
+
+    def matchElectionReceipts(self, election_id: int, ballot_receipts: Iterable[int]) -> dict[str, int]:
+        """Function to compare the receipts stored for an election with the ones extracted from the election ballots, as sets.
+
+        :param election_id (int): The election identifier.
+        :param ballot_receipts (Iterable[int]): The receipts extracted from the decrypted ballots.
+
+        :return (dict[str, int]): The comparison, in a {"stored": int, "ballots": int, "matched": int, "missing": int, "unknown": int} format, where "missing" counts the
+        stored receipts that are not among the ballots and "unknown" counts the ballot receipts that were never stored.
+        """
+        stored_receipts: set[int] = self.getElectionReceiptSet(election_id=election_id)
+        ballot_receipt_set: set[int] = set(ballot_receipts)
+        matched_receipts: int = len(stored_receipts & ballot_receipt_set)
+
+        return {
+            "stored": len(stored_receipts),
+            "ballots": len(ballot_receipt_set),
+            "matched": matched_receipts,
+            "missing": len(stored_receipts) - matched_receipts,
+            "unknown": len(ballot_receipt_set) - matched_receipts
+        }
+
+
+    async def close(self) -> None:
+        """Function to stop the background flusher, write whatever is left in the buffer and close the database connection. The store reopens it if it is used again.
+        """
+        if (self.flusher_task != None and not self.flusher_task.done()):
+            self.flusher_task.cancel()
+
+            try:
+                await self.flusher_task
+            except asyncio.CancelledError:
+                pass
+
+        self.flusher_task = None
+        await asyncio.to_thread(self.flush)
+        self.closeConnection()
+
+
+    def closeConnection(self) -> None:
+        """Internal function to close the database connection.
+        """
+        with self.lock:
+            if (self.connection != None):
+                self.connection.close()
+                self.connection = None
+
+
+# Single store for the whole process, like the metrics sink
+receipt_store: ReceiptStore = ReceiptStore()
+
+
+async def closeReceiptStore() -> None:
+    """Function to write the buffered receipts and close the process wide receipt store. Call it before the event loop ends.
+    """
+    await receipt_store.close()
+
+
+def flushAtExit() -> None:
+    """Last resort flush for receipts left in the buffer by programs that exit without calling closeReceiptStore.
+    """
+    if (len(receipt_store.buffer) > 0):
+        receipt_store.flush()
+
+    receipt_store.closeConnection()
+
+
+atexit.register(flushAtExit)
@@ -0,0 +1,149 @@
+"""Module with a batched poller for the results of transactions already sent to the network.
+
+flow_client.execute_transaction(wait_for_seal=True) polls the access node once per second, per transaction, until that transaction is sealed, and the caller holds the
+transaction proposal key for the whole time. With this poller, TransactionRunner sends the transaction, frees the proposal key right away and gets a future back. A single
+background task checks every pending transaction in one go, on each tick, and resolves the futures as their transactions are sealed.
+"""
+import asyncio
+import configparser
+import os
+import pathlib
+import time
+
+from common.utils import Utils
+from common.client_pool import borrowFlowClient
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+config_path = pathlib.Path(os.getcwd()).joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+# Transaction status values, as defined in the Flow Access API protobuf (flow/entities/transaction.proto)
+TX_STATUS_SEALED: int = 4
+TX_STATUS_EXPIRED: int = 5
+
+
+class TransactionResultPoller(object):
+    """Background poller of transaction results. Call track() with the id of a transaction already sent and await the future returned: it resolves to the
+    TransactionResultResponse once the transaction is sealed, or raises an Exception if the transaction failed, expired or was not sealed within the timeout.
+    """
+    def __init__(self, host: str, port: int, poll_interval: float = None, batch_size: int = None, timeout: float = None) -> None:
+        """
+        :param host (str): The access node host.
+        :param port (int): The access node port.
+        :param poll_interval (float): Seconds between polling rounds.
+        :param batch_size (int): Maximum number of transaction results requested concurrently in each round.
+        :param timeout (float): Seconds after which a transaction that is still not sealed is given up on.
+        """
+        super().__init__()
+        self.host: str = host
+        self.port: int = port
+        self.poll_interval: float = poll_interval if poll_interval else config.getfloat(section="result_poller", option="poll_interval", fallback=0.5)
+        self.batch_size: int = batch_size if batch_size else config.getint(section="result_poller", option="batch_size", fallback=50)
+        self.timeout: float = timeout if timeout else config.getfloat(section="result_poller", option="timeout", fallback=60.0)
+
+        # Pending transactions, in a {tx_id: (future, tracking_start)} format. Dictionaries keep the insertion order, so the oldest transactions are polled first
+        self.pending: dict[bytes, tuple[asyncio.Future, float]] = {}
+
+        self.loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self.poller_task: asyncio.Task = None
+
+
+    def track(self, tx_id: bytes) -> asyncio.Future:
+        """Function to start tracking a transaction that was already sent to the network.
+
+        :param tx_id (bytes): The transaction id, as returned by send_transaction.
+
+        :return (asyncio.Future): A future that resolves to the TransactionResultResponse of the sealed transaction.
+        """
+        if (tx_id in self.pending):
+            return self.pending[tx_id][0]
+
+        tx_future: asyncio.Future = self.loop.create_future()
+        self.pending[tx_id] = (tx_future, time.monotonic())
+
+        if (self.poller_task == None or self.poller_task.done()):
+            self.poller_task = self.loop.create_task(self.run())
+
+        return tx_future
+
+
+    async def pollBatch(self, client, tx_ids: list[bytes]) -> None:
+        """Function to request the results of a batch of pending transactions, concurrently, and to resolve the futures of the ones that are done.
+
+        :param client (AccessAPI): An open access node client.
+        :param tx_ids (list[bytes]): The ids of the transactions to check.
+        """
+        tx_results: list = await asyncio.gather(*[client.get_transaction_result(id=tx_id) for tx_id in tx_ids], return_exceptions=True)
+
+        for tx_id, tx_result in zip(tx_ids, tx_results):
+            tx_future, tracking_start = self.pending[tx_id]
+
+            if (tx_future.done()):
+                # The caller gave up on this one (cancelled the future). Nothing else to do with it
+                self.pending.pop(tx_id)
+                continue
+
+            if (isinstance(tx_result, Exception)):
+                # Most likely a transient access node error, or a transaction not yet known by the node that answered. Retry on the next round, unless it timed out
+                if (time.monotonic() - tracking_start > self.timeout):
+                    self.pending.pop(tx_id)
+                    tx_future.set_exception(tx_result)
+
+                continue
+
+            if (tx_result.error_message):
+                self.pending.pop(tx_id)
+                tx_future.set_exception(Exception(f"ERROR: Transaction {tx_id.hex()} failed: {tx_result.error_message}"))
+            elif (int(tx_result.status) == TX_STATUS_SEALED):
+                self.pending.pop(tx_id)
+                tx_future.set_result(tx_result)
+            elif (int(tx_result.status) == TX_STATUS_EXPIRED):
+                self.pending.pop(tx_id)
+                tx_future.set_exception(Exception(f"ERROR: Transaction {tx_id.hex()} expired before being sealed!"))
+            elif (time.monotonic() - tracking_start > self.timeout):
+                self.pending.pop(tx_id)
+                tx_future.set_exception(TimeoutError(f"ERROR: Transaction {tx_id.hex()} was not sealed after {self.timeout} seconds!"))
+
+
+    async def run(self) -> None:
+        """Background task that keeps polling while there are pending transactions. It ends once there is nothing left to poll and is restarted by the next track() call.
+        """
+        while (len(self.pending) > 0):
+            # Give the network a moment to process the transactions before asking for their results
+            await asyncio.sleep(self.poll_interval)
+
+            try:
+                async with borrowFlowClient(host=self.host, port=self.port) as client:
+                    tx_ids: list[bytes] = list(self.pending.keys())
+
+                    for batch_start in range(0, len(tx_ids), self.batch_size):
+                        await self.pollBatch(client=client, tx_ids=tx_ids[batch_start:batch_start + self.batch_size])
+            except Exception as e:
+                log.warning(f"Unable to poll {len(self.pending)} pending transaction results: {e}. Retrying in {self.poll_interval} seconds")
+
+
+# Process-wide registry of pollers, keyed by (host, port), like the client pools
+result_pollers: dict[tuple[str, int], TransactionResultPoller] = {}
+
+
+def getResultPoller(host: str, port: int) -> TransactionResultPoller:
+    """Function to retrieve the result poller for the access node provided, creating one if needed. This function needs to be called from within a running event loop.
+
+    :param host (str): The access node host.
+    :param port (int): The access node port.
+
+    :return (TransactionResultPoller): The result poller for the access node in question.
+    """
+    key: tuple[str, int] = (host, int(port))
+    poller: TransactionResultPoller = result_pollers.get(key)
+
+    # Pollers are bound to the event loop that created them, same as the client pools
+    if (poller == None or poller.loop is not asyncio.get_running_loop()):
+        poller = TransactionResultPoller(host=host, port=int(port))
+        result_pollers[key] = poller
+
+    return poller
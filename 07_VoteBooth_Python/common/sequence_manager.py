@@ -0,0 +1,148 @@
+"""Module to keep track, locally, of the proposal key sequence numbers and of the reference block used to build transactions.
+
+Every transaction built by TransactionRunner.getTransaction used to request the latest block (for the reference block id) and the proposer account (just to read the
+sequence number of its proposal key) from the access node. Flow only requires the reference block to be within the last ~600 blocks and the sequence number only
+changes when a transaction from that key is included in a block, so both can be kept locally and only refreshed when needed.
+"""
+from flow_py_sdk.cadence import Address
+
+import asyncio
+import configparser
+import os
+import pathlib
+import time
+
+from common.utils import Utils
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+config_path = pathlib.Path(os.getcwd()).joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+
+class SequenceNumberManager(object):
+    """Per account, per key, tracker of proposal key sequence numbers, plus a cache for the reference block id.
+
+    The first time a key is used, its sequence number is read from the network. After that, each reservation returns the current value and increments it locally,
+    which is what happens in the network once the transaction is included in a block. If a transaction fails to be sent or sealed, e.g., the network rejects it
+    with a sequence number mismatch, the entry is invalidated and re-read from the network on the next reservation.
+    """
+    def __init__(self, reference_block_max_age: float = None) -> None:
+        super().__init__()
+        # Maximum number of seconds that a reference block is reused. Flow accepts reference blocks up to 600 blocks behind, which, at around one block per second, gives
+        # plenty of margin to the default value in the config file
+        self.reference_block_max_age: float = reference_block_max_age if reference_block_max_age != None else config.getfloat(section="sequence_manager", option="reference_block_max_age", fallback=60.0)
+
+        # Sequence numbers, in a {(address_hex, key_id): next_sequence_number} format
+        self.sequence_numbers: dict[tuple[str, int], int] = {}
+
+        self.reference_block_id: bytes = None
+        self.reference_block_height: int = None
+        self.reference_block_timestamp: float = 0.0
+
+        # asyncio locks are bound to the event loop. Keep a reference to the loop to be able to reset the locks if this object is used from another asyncio.run() call
+        self.loop: asyncio.AbstractEventLoop = None
+        self.locks: dict[tuple[str, int], asyncio.Lock] = {}
+        self.block_lock: asyncio.Lock = None
+
+
+    def checkLoop(self) -> None:
+        """Internal function to reset the asyncio locks if the running event loop changed since the last call.
+        """
+        current_loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        if (self.loop is not current_loop):
+            self.loop = current_loop
+            self.locks = {}
+            self.block_lock = asyncio.Lock()
+
+
+    async def getReferenceBlockId(self, client) -> bytes:
+        """Function to retrieve a reference block id to build a transaction with, requesting a new one from the network only if the cached one is too old.
+
+        :param client (AccessAPI): An open access node client, used if the reference block needs to be refreshed.
+
+        :return (bytes): The id of the block to use as reference for a new transaction.
+        """
+        self.checkLoop()
+
+        async with self.block_lock:
+            if (self.reference_block_id == None or time.monotonic() - self.reference_block_timestamp > self.reference_block_max_age):
+                latest_block = await client.get_latest_block()
+
+                self.reference_block_id = latest_block.id
+                self.reference_block_height = latest_block.height
+                self.reference_block_timestamp = time.monotonic()
+
+            return self.reference_block_id
+
+
+    async def reserveSequenceNumber(self, client, address: Address, key_id: int) -> int:
+        """Function to get the sequence number to use with a new transaction proposed by the account key provided. The local sequence number is incremented right away,
+        so that consecutive transactions from the same key get consecutive sequence numbers.
+
+        :param client (AccessAPI): An open access node client, used if the sequence number needs to be read from the network.
+        :param address (Address): The address of the proposer account.
+        :param key_id (int): The index of the proposal key in the proposer account.
+
+        :return (int): The sequence number to set in the transaction proposal key.
+        """
+        self.checkLoop()
+        key: tuple[str, int] = (address.hex(), key_id)
+
+        if (key not in self.locks):
+            self.locks[key] = asyncio.Lock()
+
+        async with self.locks[key]:
+            if (key not in self.sequence_numbers):
+                proposer = await client.get_account_at_latest_block(address=address.bytes)
+                self.sequence_numbers[key] = proposer.keys[key_id].sequence_number
+
+            sequence_number: int = self.sequence_numbers[key]
+            self.sequence_numbers[key] = sequence_number + 1
+
+            return sequence_number
+
+
+    def invalidate(self, address: Address, key_id: int) -> None:
+        """Function to drop the local sequence number of the account key provided, forcing it to be re-read from the network the next time it is needed.
+
+        :param address (Address): The address of the proposer account.
+        :param key_id (int): The index of the proposal key in the proposer account.
+        """
+        self.sequence_numbers.pop((address.hex(), key_id), None)
+
+
+    def isSequenceNumberMismatch(self, error: Exception) -> bool:
+        """Function to determine if the Exception raised while submitting a transaction is due to an invalid proposal key sequence number.
+
+        :param error (Exception): The Exception raised.
+
+        :return (bool): True if the error is a sequence number mismatch, False otherwise.
+        """
+        error_message: str = str(error).lower()
+
+        return (error_message.__contains__("sequence number") or error_message.__contains__("error code: 1007"))
+
+
+    def handleSubmitError(self, tx_object, error: Exception) -> None:
+        """Function to process an Exception raised while submitting a transaction. The proposal key used by the transaction is always invalidated, so that the next
+        transaction re-syncs with the network: after a failure, the local sequence number cannot tell if the transaction was included (and the network incremented it)
+        or not, e.g., after a timeout or a dropped connection.
+
+        :param tx_object (Tx): The transaction that failed.
+        :param error (Exception): The Exception raised.
+        """
+        if (self.isSequenceNumberMismatch(error=error)):
+            log.warning(f"Sequence number mismatch for key {tx_object.proposal_key.key_id} of account {tx_object.proposal_key.key_address.hex()}. Re-syncing it on the next transaction")
+        else:
+            log.debug(f"Transaction from key {tx_object.proposal_key.key_id} of account {tx_object.proposal_key.key_address.hex()} failed. Re-syncing the key on the next transaction")
+
+        self.invalidate(address=tx_object.proposal_key.key_address, key_id=tx_object.proposal_key.key_id)
+
+
+# Single manager for the whole process. Sequence numbers are a property of each account key, so every runner needs to share the same counters
+sequence_manager: SequenceNumberManager = SequenceNumberManager()
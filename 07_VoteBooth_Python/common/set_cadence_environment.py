@@ -33,12 +33,11 @@ config_path = project_cwd.joinpath("common", "config.ini")
 config = configparser.ConfigParser()
 config.read(config_path)
 
-# Path for the buffer file
-temp_path: Path = Path(os.getcwd()).joinpath("temp_file.cdc")
-
 def main(env: str = "local"):
+    input_env: str = env
+
     if (len(sys.argv) > 1):
-        input_env: str = sys.argv[1].lower().strip()
+        input_env = sys.argv[1].lower().strip()
 
     if (input_env == "local"):
         env = "local"
@@ -140,262 +139,138 @@ def set_environment(env: str = "local") -> None:
         raise Exception(f"ERROR: Invalid environment option provided: {env}. Please use either 'local' or 'remote' to continue")
 
 
-def switchToLocal(source_path: Path) -> None:
-    """
-    Function to switch the source text provided, under the assumption that it refers to a contract, transaction, or script, with all the import statements normalised to the local environment, i.e., with the imports recognised in the local emulator. NOTE: For this function, it is irrelevant if the source files are in "remote" or "testnet" mode since the contract addresses are both getting cut. 
-    
-    :param source_text (Path): The Path object for the source file to adapt.
-    """
-    # Validate the path provided
-    if (not os.path.exists(source_path)):
-        raise Exception(f"ERROR: The source path provided: {source_path.__str__()} does not exists!")
-
-    if (os.path.isdir(source_path)):
-        raise Exception(f"ERROR: The source path provided: {source_path.__str__()} points to a directory and not a file!")
-    
-    # All seems good so far. Read the file line by line and process it
-    file_stream = open(source_path, "+r")
-    
-    try:
-        temp_stream = open(temp_path, "+x")
-    except FileExistsError:
-        temp_stream = open(temp_path, "+w")
-
-    current_line = file_stream.readline()
-
-    while (current_line != ""):
-        # Read the file line by line and look out for import statements but without the 'from' bit
-        if (current_line.__contains__('import ') and not current_line.__contains__('from')):
-            # Import lines set for the remote environment are set as 'import "<contract_name>"', so if I have an 'import' followed by a single '"', I have a line that needs 
-            # changing
-            # Remove the quotes first
-            current_line = current_line.replace('\"', '')
-
-            # Split it by the space character. This is a remote bound import, so it should yield two elements with the last one being the contract imported
-            import_elements: list[str] = current_line.strip().split(' ')
-            contract_name: str = import_elements[-1]
-
-            # Grab the contract name and test if it is one of the ones that are not deployed in the service_account
-            if (contract_name == "FlowFees"):
-                # Append the rest of the import statement
-                current_line = f"import {contract_name} from 0x{config.get(section="emulator", option=contract_name)}\n"
-            elif (contract_name == "FlowToken"):
-                current_line = f"import {contract_name} from 0x{config.get(section="emulator", option=contract_name)}\n"
-            elif (contract_name == "FungibleToken"):
-                current_line = f"import {contract_name} from 0x{config.get(section="emulator", option=contract_name)}\n"
-            elif (contract_name == "Burner"):
-                current_line = f"import {contract_name} from 0x{config.get(section="emulator", option=contract_name)}\n"
-            elif (contract_name == "Crypto"):
-                current_line = f"import {contract_name} from 0x{config.get(section="emulator", option=contract_name)}\n"
-            else:
-                # Default to the service account
-                current_line = f"import {contract_name} from 0x{config.get(section="emulator", option="service_account")}\n"
-        
-        elif (current_line.__contains__("import ") and current_line.__contains__(" from ")):
-            line_elements: list[str] = current_line.strip().split(' ')
-            current_line: str = ""
+# Contracts that are not deployed into the service account of each network, and therefore have their own address entry in the config file
+standard_contracts: list[str] = ["FlowFees", "FlowToken", "FungibleToken", "Burner", "Crypto"]
 
-            contract_name: str = line_elements[1]
 
-            for i in range(0, len(line_elements) - 1):
-                current_line += f"{line_elements[i]} "
+def getImportAddress(contract_name: str, network: str) -> str:
+    """
+    Function to retrieve the address from where a contract should be imported from in the network provided.
 
-            if (contract_name == "FlowFees"):
-                # Finish the new line
-                current_line += f"0x{str(config.get(section="emulator", option=contract_name))}\n"
-            elif (contract_name == "FlowToken"):
-                current_line += f"0x{str(config.get(section="emulator", option=contract_name))}\n"
-            elif (contract_name == "FungibleToken"):
-                current_line += f"0x{str(config.get(section="emulator", option=contract_name))}\n"
-            elif (contract_name == "Burner"):
-                current_line += f"0x{str(config.get(section="emulator", option=contract_name))}\n"
-            elif (contract_name == "Crypto"):
-                current_line += f"0x{str(config.get(section="emulator", option=contract_name))}\n"
-            else:
-                # Default to the service account if the contract is different from these ones
-                current_line += f"0x{str(config.get(section="emulator", option="service_account"))}\n"
-        
-        # Write the line to the temp file
-        temp_stream.write(current_line)
-        
-        # Grab new line and go for another round
-        current_line = file_stream.readline()
-        
-    # Done. Rewrite the initial file by re-opening it in truncating mode, and dumping the temp stream into it
-    # Close the origin stream and temp stream
-    file_stream.close()
-    temp_stream.close()
+    :param contract_name (str): The name of the contract to import.
+    :param network (str): The config section with the network addresses, namely, "emulator" or "testnet".
 
-    # Re-open it in truncating mode
-    file_stream = open(source_path, "+w")
-    # And the temp stream in read mode
-    temp_stream = open(temp_path, "+r")
+    :return (str): The address, without the '0x' prefix, where the contract is deployed in the network in question. All non standard contracts default to the service account.
+    """
+    if (contract_name in standard_contracts):
+        return config.get(section=network, option=contract_name)
+    else:
+        return config.get(section=network, option="service_account")
 
-    # Write the temp stream into the file stream
-    file_stream.writelines(temp_stream.readlines())
 
-    # Close both streams to finish the job
-    file_stream.close()
-    temp_stream.close()
+def rewriteImports(source_text: str, env: str = "local") -> str:
+    """
+    Function that does the actual import switching, but over a string with the contents of a contract, transaction or script instead of the file itself. The switchTo* functions
+    use this one to rewrite the .cdc files in place, while the Cadence source cache uses it to adapt the source text in memory, without touching the files.
 
+    :param source_text (str): The Cadence source code to adapt.
+    :param env (str): The environment to adapt the source code to, namely, "local", "remote", and "testnet"
 
-def switchToTestnet(source_path: Path) -> None:
+    :return (str): The source code with all the import statements normalised to the environment provided.
     """
-    Function to switch the source text provided, under the assumption that it refers to a contract, transaction, or script, with all the import statements normalised to the testnet environment, i.e., with the imports recognisable by the testnet environment
+    env = env.lower()
 
-    :param source_text (Path): The Path object for the source file to adapt.
-    """
-    # Validate the path provided
-    if (not os.path.exists(source_path)):
-        raise Exception(f"ERROR: The source path provided {source_path.__str__()} does not exists!")
-    
-    if (os.path.isdir(source_path)):
-        raise Exception(f"ERROR: The source path provided {source_path.__str__()} points to a directory instead of a file!")
-    
-    file_stream = open(source_path, "+r")
+    if (env == "local"):
+        network = "emulator"
+    elif (env == "testnet"):
+        network = "testnet"
+    elif (env != "remote"):
+        raise Exception(f"ERROR: Invalid environment option provided: {env}. Please use either 'local', 'remote' or 'testnet' to continue")
 
-    try:
-        temp_stream = open(temp_path, "+x")
-    except FileExistsError:
-        temp_stream = open(temp_path, "+w")
+    new_lines: list[str] = []
 
-    current_line = file_stream.readline()
+    for current_line in source_text.splitlines(keepends=True):
+        if (env == "remote"):
+            # Test for the two elements that characterise a local import
+            if (current_line.__contains__("import ") and current_line.__contains__(" from ")):
+                # This one is easy. Split the line into words using a space as separator
+                line_elements: list[str] = current_line.split(' ')
 
-    while (current_line != ""):
-        # Test for the two elements that characterise a local import
-        if (current_line.__contains__("import ") and current_line.__contains__(" from ")):
-            # In this case, split the line by spaces
-            line_elements: list[str] = current_line.strip().split(' ')
-            current_line: str = ""
+                # The two first line elements are the ones that I need. Put them in a line with the second one inside quotes
+                current_line = f'{line_elements[0]} "{line_elements[1]}"\n'
 
-            # Extract the contract name for a variable. The split should have returned:
+        elif (current_line.__contains__("import ") and current_line.__contains__(" from ")):
+            # Local or testnet bound import. Rebuild the line with all elements but the last one, which is the one with the contract address, and append the correct address
             # line_elements[0] = import
             # line_elements[1] = <contract_name>
             # line_elements[2] = from
-            # line_elements[2] = <contract_address>
-            # 
-            # The contract name should be in element #1
+            # line_elements[3] = <contract_address>
+            line_elements: list[str] = current_line.strip().split(' ')
+            current_line: str = ""
+
             contract_name: str = line_elements[1]
 
-            # Rebuilt the line with all elements but the last one, which is currently the one with the local contract address
             for i in range(0, len(line_elements) - 1):
                 current_line += f"{line_elements[i]} "
-            
-            # Append the new address to the line
-            if (contract_name == "FlowFees"):
-                # Finish the new line
-                current_line += f"0x{str(config.get(section="testnet", option=contract_name))}\n"
-            elif (contract_name == "FlowToken"):
-                current_line += f"0x{str(config.get(section="testnet", option=contract_name))}\n"
-            elif (contract_name == "FungibleToken"):
-                current_line += f"0x{str(config.get(section="testnet", option=contract_name))}\n"
-            elif (contract_name == "Burner"):
-                current_line += f"0x{str(config.get(section="testnet", option=contract_name))}\n"
-            elif (contract_name == "Crypto"):
-                current_line += f"0x{str(config.get(section="testnet", option=contract_name))}\n"
-            else:
-                # Default to the service account if the contract is different from these ones
-                current_line += f"0x{str(config.get(section="testnet", option="service_account"))}\n"
-        
-        elif(current_line.__contains__("import ") and not current_line.__contains__("from")):
-            # The source file is in remote mode
-            # Remove the quotes from the contract name
-            current_line = current_line.replace('\"', '')
 
-            # Split the line by spaces into tokens
-            line_elements: list[str] = current_line.strip().split(' ')
-            contract_name: str = line_elements[1]
+            current_line += f"0x{getImportAddress(contract_name=contract_name, network=network)}\n"
 
-            if (contract_name == "FlowFees"):
-                current_line = f"import {contract_name} from 0x{config.get(section="testnet", option=contract_name)}\n"
-            elif (contract_name == "FlowToken"):
-                current_line = f"import {contract_name} from 0x{config.get(section="testnet", option=contract_name)}\n"
-            elif (contract_name == "FungibleToken"):
-                current_line = f"import {contract_name} from 0x{config.get(section="testnet", option=contract_name)}\n"
-            elif (contract_name == "Burner"):
-                current_line = f"import {contract_name} from 0x{config.get(section="testnet", option=contract_name)}\n"
-            elif (contract_name == "Crypto"):
-                current_line = f"import {contract_name} from 0x{config.get(section="testnet", option=contract_name)}\n"
-            else:
-                # Default to the service account
-                current_line = f"import {contract_name} from 0x{config.get(section="testnet", option="service_account")}\n"
-        
-        # Write the line to the temp file
-        temp_stream.write(current_line)
-
-        # Grab new line and go for another round
-        current_line = file_stream.readline()
+        elif (current_line.__contains__("import ") and not current_line.__contains__("from")):
+            # Import lines set for the remote environment are set as 'import "<contract_name>"'. Remove the quotes first
+            current_line = current_line.replace('\"', '')
 
-    # Done. Rewrite the initial file by re-opening it in truncating mode, and dump the temp stream into it.
-    # Close the origin and temp stream
-    file_stream.close()
-    temp_stream.close()
+            # Split it by the space character. This is a remote bound import, so it should yield two elements with the last one being the contract imported
+            line_elements: list[str] = current_line.strip().split(' ')
+            contract_name: str = line_elements[-1]
 
-    # Re-open it in truncating mode
-    file_stream = open(source_path, "+w")
-    # And the temp stream in read mode
-    temp_stream = open(temp_path, "+r")
+            current_line = f"import {contract_name} from 0x{getImportAddress(contract_name=contract_name, network=network)}\n"
 
-    # Write the temp stream into the file stream
-    file_stream.writelines(temp_stream.readlines())
+        new_lines.append(current_line)
 
-    # Close both streams to finish the job
-    file_stream.close()
-    temp_stream.close()
+    return "".join(new_lines)
 
 
-def switchToRemote(source_path: Path) -> None:
+def switchFile(source_path: Path, env: str) -> None:
     """
-    Function to switch the source text provided, under the assumption that it refers to a contract, transaction, or script, with all the import statements normalised to the remote environment, i.e., with the imports recognisable by an environment that is able to process absolute contract paths.
+    Function to rewrite the imports of the source file provided, in place, to the environment provided.
 
-    :param source_text (Path): The Path object for the source file to adapt.
+    :param source_path (Path): The Path object for the source file to adapt.
+    :param env (str): The environment to adapt the source file to, namely, "local", "remote", and "testnet"
     """
     # Validate the path provided
     if (not os.path.exists(source_path)):
         raise Exception(f"ERROR: The source path provided: {source_path.__str__()} does not exists!")
-    
+
     if (os.path.isdir(source_path)):
-        raise Exception(f"ERROR: The source path provided: {source_path.__str__()} points to a directory instead of a file!")
-    
-    file_stream = open(source_path, "+r")
-    try:
-        temp_stream = open(temp_path, "+x")
-    except FileExistsError:
-        temp_stream = open(temp_path, "+w")
-
-    current_line = file_stream.readline()
-
-    while (current_line != ""):
-        # Test for the two elements that characterise a local import
-        if (current_line.__contains__("import ") and current_line.__contains__(" from ")):
-            # This one is easy. Split the line into words using a space as separator
-            line_elements: list[str] = current_line.split(' ')
-
-            # The two first line elements are the ones that I need. Put them in a line with the second one inside quotes
-            current_line = f'{line_elements[0]} "{line_elements[1]}"\n'
-        
-        # Write the current line to the temp file
-        temp_stream.write(current_line)
+        raise Exception(f"ERROR: The source path provided: {source_path.__str__()} points to a directory and not a file!")
+
+    with open(source_path, "r") as file_stream:
+        source_text: str = file_stream.read()
+
+    new_source_text: str = rewriteImports(source_text=source_text, env=env)
+
+    # Only touch the file if something actually changed. Keeps the file mtime intact otherwise
+    if (new_source_text != source_text):
+        with open(source_path, "w") as file_stream:
+            file_stream.write(new_source_text)
 
-        # And grab a new one
-        current_line = file_stream.readline()
+
+def switchToLocal(source_path: Path) -> None:
+    """
+    Function to switch the source file provided, under the assumption that it refers to a contract, transaction, or script, with all the import statements normalised to the local environment, i.e., with the imports recognised in the local emulator. NOTE: For this function, it is irrelevant if the source files are in "remote" or "testnet" mode since the contract addresses are both getting cut. 
     
-    # Done. Rewrite the initial file by re-opening it in truncating mode, and dumping the temp stream into it
-    # Close the origin stream and temp stream
-    file_stream.close()
-    temp_stream.close()
+    :param source_path (Path): The Path object for the source file to adapt.
+    """
+    switchFile(source_path=source_path, env="local")
 
-    # Re-open it in truncating mode
-    file_stream = open(source_path, "+w")
-    # And the temp stream in read mode
-    temp_stream = open(temp_path, "+r")
 
-    # Write the temp stream into the file stream
-    file_stream.writelines(temp_stream.readlines())
+def switchToTestnet(source_path: Path) -> None:
+    """
+    Function to switch the source file provided, under the assumption that it refers to a contract, transaction, or script, with all the import statements normalised to the testnet environment, i.e., with the imports recognisable by the testnet environment
+
+    :param source_path (Path): The Path object for the source file to adapt.
+    """
+    switchFile(source_path=source_path, env="testnet")
+
 
-    # Close both streams to finish the job
-    file_stream.close()
-    temp_stream.close()
+def switchToRemote(source_path: Path) -> None:
+    """
+    Function to switch the source file provided, under the assumption that it refers to a contract, transaction, or script, with all the import statements normalised to the remote environment, i.e., with the imports recognisable by an environment that is able to process absolute contract paths.
+
+    :param source_path (Path): The Path object for the source file to adapt.
+    """
+    switchFile(source_path=source_path, env="remote")
 
 
-main(env="local")
\ No newline at end of file
+if __name__ == "__main__":
+    main(env="local")
@@ -0,0 +1,113 @@
+"""Process-wide cache for the Cadence source code of the scripts and transactions used in this project.
+
+ScriptRunner.getScript and TransactionRunner.getTransaction used to resolve the file path from the config file and read the .cdc file from disk every single time, which,
+for a voter run, means reading the same handful of transaction files hundreds of times. This cache keeps the source text in memory, keyed by the config section and name,
+and only re-reads a file when its modification time (or size) changes.
+"""
+import configparser
+import os
+import pathlib
+import threading
+
+from common.utils import Utils
+from common import set_cadence_environment
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+config_path = pathlib.Path(os.getcwd()).joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+
+class CadenceSourceCache(object):
+    """Cache of Cadence source texts. Each entry is keyed by (section, name), e.g., ("transactions", "03_create_ballot"), and keeps the resolved file path, the mtime and
+    size of the file when it was last read, and the (possibly import-rewritten) source text.
+
+    If the 'rewrite_imports' option of the [source_cache] config section is set, the import statements are adapted to the current network in memory, with the same logic
+    used by common/set_cadence_environment.py, instead of having to rewrite the .cdc files in place before each run.
+    """
+    def __init__(self, rewrite_imports: bool = None, env: str = None) -> None:
+        super().__init__()
+        self.rewrite_imports: bool = rewrite_imports if rewrite_imports != None else config.getboolean(section="source_cache", option="rewrite_imports", fallback=False)
+
+        if (env == None):
+            # Match the environment names used in set_cadence_environment with the networks used in the config file
+            current_network: str = config.get(section="network", option="current").lower().strip()
+            env = "local" if current_network == "emulator" else current_network
+
+        self.env: str = env
+        self.paths: dict[tuple[str, str], pathlib.Path] = {}
+        self.entries: dict[tuple[str, str], tuple[int, int, str]] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+        # The runners can be used from worker threads, so protect the dictionaries with a lock
+        self.lock: threading.Lock = threading.Lock()
+
+
+    def getPath(self, section: str, name: str) -> pathlib.Path:
+        """Function to resolve the path of a script or transaction from the config file, only once per name.
+
+        :param section (str): The config section where the file path is, i.e., "scripts" or "transactions".
+        :param name (str): The name of the script or transaction.
+
+        :return (pathlib.Path): The path to the .cdc file. Raises a configparser.NoOptionError if the name is not configured.
+        """
+        key: tuple[str, str] = (section, name)
+        source_path: pathlib.Path = self.paths.get(key)
+
+        if (source_path == None):
+            source_path = pathlib.Path(config.get(section=section, option=name))
+            self.paths[key] = source_path
+
+        return source_path
+
+
+    def getSource(self, section: str, name: str) -> str:
+        """Function to retrieve the source code of a script or transaction, reading it from disk only if it was never read before or if the file changed since then.
+
+        :param section (str): The config section where the file path is, i.e., "scripts" or "transactions".
+        :param name (str): The name of the script or transaction.
+
+        :return (str): The Cadence source code, ready to be set in a Script or Tx object.
+        """
+        key: tuple[str, str] = (section, name)
+
+        with self.lock:
+            source_path: pathlib.Path = self.getPath(section=section, name=name)
+            file_stat: os.stat_result = os.stat(source_path)
+            entry: tuple[int, int, str] = self.entries.get(key)
+
+            if (entry != None and entry[0] == file_stat.st_mtime_ns and entry[1] == file_stat.st_size):
+                self.hits += 1
+                return entry[2]
+
+            self.misses += 1
+
+            with open(source_path, "r") as source_stream:
+                source_text: str = source_stream.read()
+
+            if (self.rewrite_imports):
+                source_text = set_cadence_environment.rewriteImports(source_text=source_text, env=self.env)
+
+            self.entries[key] = (file_stat.st_mtime_ns, file_stat.st_size, source_text)
+
+            return source_text
+
+
+    def invalidate(self, section: str = None, name: str = None) -> None:
+        """Function to drop cached entries. If no arguments are provided, the whole cache is cleared.
+
+        :param section (str): If provided, only entries from this section are dropped.
+        :param name (str): If provided (with the section), only the entry for this name is dropped.
+        """
+        with self.lock:
+            for key in list(self.entries.keys()):
+                if ((section == None or key[0] == section) and (name == None or key[1] == name)):
+                    del self.entries[key]
+
+
+# Single cache instance shared by every runner in the process
+source_cache: CadenceSourceCache = CadenceSourceCache()
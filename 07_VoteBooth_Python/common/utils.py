@@ -4,6 +4,7 @@ import os, sys
 import pathlib
 from flow_py_sdk import cadence
 import datetime
+import math
 
 config_path = pathlib.Path(os.getcwd()).joinpath("common", "config.ini")
 config = configparser.ConfigParser()
@@ -91,7 +92,7 @@ class Utils():
 
 
     def processTransactionData(fees_deducted_events: list[dict], tokens_withdrawn_events: list[dict], elapsed_time: int, tx_description: str, output_file_path: pathlib.Path) -> None:
-        """Function to automate the processing of transaction metrics that are interesting to characterise the system performance. These metrics are retrieved from the system through events. This function continues the processing by retrieving the data from the events, format it in a handy .csv format, and appends it to a file whose path is provided as argument. The idea is to have a nice data feed to build graphs and do all sort of post analysis.
+        """Function to automate the processing of transaction metrics that are interesting to characterise the system performance. These metrics are retrieved from the system through events. This function continues the processing by retrieving the data from the events, format it in a handy .csv format, and queues it, through the buffered metrics sink, to be appended to a file whose path is provided as argument. The idea is to have a nice data feed to build graphs and do all sort of post analysis.
         
         :param flow_fees_events (list[dict]): A list with all the FlowFees.FeesDeducted events to retrieve the gas paid in the transaction and the execution effort (computational effort) required by the computation. 
         :param tokens_withdrawn_events (list[dict]): A list with all the FungibleToken.Withdrawn events related to the transaction to retrieve additional gas expenditure details.
@@ -99,35 +100,40 @@ class Utils():
         :param tx_description (str): A descriptor for the data set, namely, a summary of what the transaction did, e.g., "create ballot", "tally election", etc.
         :param output_file_path (pathlib.Path): A pathlib.Path object to the file to be used to write the analysis data.
         """
-        # Test if the file pointed by the Path provided exists, create a new one if does not
-        if (os.path.isfile(output_file_path)):
-            # If the file already exists, open it in append mode
-            output_stream = open(output_file_path, "+a")
-        else:
-            # If not, create a new one
-            output_stream = open(output_file_path, "+x")
-            # And write the headers in the first line
-            new_line: str = f"Transaction Descriptor, Timestamp, Tx Execution Time (ns), Fee Amount (FLOW), Execution Effort, Inclusion Effort, Tokens Withdrawn (FLOW), From Account, Balance After (FLOW)\n"
-            output_stream.write(new_line)
+        # The records go into the buffered metrics sink, which writes them to the output file in the background. Imported in here since the sink module uses Utils too
+        from common.metrics_sink import metrics_sink
 
+        headers: list[str] = ["Transaction Descriptor", "Timestamp", "Tx Execution Time (ns)", "Fee Amount (FLOW)", "Execution Effort", "Inclusion Effort", "Tokens Withdrawn (FLOW)", "From Account", "Balance After (FLOW)"]
 
         # Process the FlowFees.FeesDeducted and FungibleToken.Withdrawn events at the same time since these are always emitted simultaneously. In case they aren't, I created this
         # clever loop that omits missing events but guarantees that each pair of events is properly processed
         for i in range(0,max(len(fees_deducted_events), len(tokens_withdrawn_events))):
-            new_line: str = ""
-            if (fees_deducted_events[i]):
-                new_line = f"{tx_description},{datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S")}, {elapsed_time},{fees_deducted_events[i]["amount"]},{fees_deducted_events[i]["execution_effort"]},{fees_deducted_events[i]["inclusion_effort"]},"
+            values: list = [tx_description, datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S"), elapsed_time]
+
+            if (i < len(fees_deducted_events) and fees_deducted_events[i]):
+                values += [fees_deducted_events[i]["amount"], fees_deducted_events[i]["execution_effort"], fees_deducted_events[i]["inclusion_effort"]]
             else:
-                new_line = f"{tx_description},{datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S")},{elapsed_time},,,,"
+                values += ["", "", ""]
 
-            if (tokens_withdrawn_events[i]):
-                new_line += f"{tokens_withdrawn_events[i]["amount"]},{tokens_withdrawn_events[i]["from"]},{tokens_withdrawn_events[i]["balance_after"]}\n"
+            if (i < len(tokens_withdrawn_events) and tokens_withdrawn_events[i]):
+                values += [tokens_withdrawn_events[i]["amount"], tokens_withdrawn_events[i]["from"], tokens_withdrawn_events[i]["balance_after"]]
             else:
-                new_line += f",,\n"
-            
-            # Write the line to the stream and move to the next pair
-            output_stream.write(new_line)
-        
-        # All done. Close the output stream before exiting
-        output_stream.close()
+                values += ["", "", ""]
+
+            metrics_sink.record(output_file_path=output_file_path, headers=headers, values=values)
+
+
+    def percentile(sorted_values: list[int], percent: float) -> float:
+        """Function to compute a percentile with the nearest-rank method, as used in the latency reports of the load generator and of the benchmark runner.
+
+        :param sorted_values (list[int]): The values to compute the percentile from, already sorted.
+        :param percent (float): The percentile to compute, between 0 and 100.
+
+        :return (float): The percentile value, or 0 if no values were provided.
+        """
+        if (len(sorted_values) == 0):
+            return 0.0
+
+        rank: int = max(1, math.ceil(percent / 100 * len(sorted_values)))
 
+        return float(sorted_values[rank - 1])
@@ -1,6 +1,9 @@
 import asyncio
 from common.utils import Utils
 from common.account_config import AccountConfig
+from common.client_pool import closeClientPools
+from common.metrics_sink import closeMetricsSink
+from common.receipt_store import receipt_store, closeReceiptStore
 from python_scripts.cadence_scripts import ScriptRunner
 from python_scripts.cadence_transactions import TransactionRunner
 from python_scripts.event_management import EventRunner
@@ -10,9 +13,6 @@ import os, pathlib
 import configparser
 import random
 import datetime
-import time
-import threading
-from concurrent.futures import ThreadPoolExecutor
 
 import logging
 log = logging.getLogger(__name__)
@@ -199,8 +199,7 @@ async def main(election_index: int = 0) -> None:
 
     # 4. Mint a blank Ballot into the account provided, for the election in question
     if (False):
-        for user_account in ctx.accounts:
-            await current_election.mint_ballot_to_votebox(votebox_address=user_account["address"].hex(), tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
+        await current_election.mint_ballots_to_voteboxes(votebox_addresses=[user_account["address"].hex() for user_account in ctx.accounts], tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
     
     # 5. Cast the ballots for each of the user accounts to a random option from within the ones available for the election
     if (False):
@@ -215,7 +214,7 @@ async def main(election_index: int = 0) -> None:
                 receipt = await current_election.cast_ballot(option_to_set=random_option, tx_signer_address=user_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
             
             # Set the ballot receipt received to the user account object
-            ctx.addReceipt(voter_address=user_account["address"].hex(),election_id=current_election.election_id, ballot_receipt=receipt)
+            await ctx.addReceipt(voter_address=user_account["address"].hex(),election_id=current_election.election_id, ballot_receipt=receipt)
 
             log.info(f"Voter {user_account["address"].hex()} ballot receipt for election {current_election.election_id} is '{receipt}'")
 
@@ -237,8 +236,7 @@ async def main(election_index: int = 0) -> None:
         while (rounds > 0):
             log.info(f"ROUND #{rounds}")
             # Create Ballots
-            for user_account in ctx.accounts:
-                await current_election.mint_ballot_to_votebox(votebox_address=user_account["address"].hex(), tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
+            await current_election.mint_ballots_to_voteboxes(votebox_addresses=[user_account["address"].hex() for user_account in ctx.accounts], tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
 
             # Cast Ballots
             for user_account in ctx.accounts:
@@ -253,7 +251,7 @@ async def main(election_index: int = 0) -> None:
                     receipt: int = await current_election.cast_ballot(option_to_set=random_option, tx_signer_address=user_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
                 
                 # Set the ballot receipt received to the user account object
-                ctx.addReceipt(voter_address=user_account["address"].hex(),election_id=current_election.election_id, ballot_receipt=receipt)
+                await ctx.addReceipt(voter_address=user_account["address"].hex(),election_id=current_election.election_id, ballot_receipt=receipt)
 
                 log.info(f"Voter {user_account["address"].hex()} ballot receipt for election {current_election.election_id} is '{receipt}'")
 
@@ -266,65 +264,17 @@ async def main(election_index: int = 0) -> None:
                 
             rounds -= 1
 
-    #7.2 Run the same cycle as before, but using parallel threads
+    #7.2 Run the same cycle as before, but with many concurrent voters, using the asyncio load generator
     if (False):
-        rounds: int = 10
-        max_delay:int = 10
-        # --------------------------------------------------------------------------------------------------------------------------------------------------------------------------
-        async def process_ballot_account(voter_address: str) -> None:
-            """
-            Simple function to abstract the minting, casting, and submission of ballots. The idea is to have this function running on a separate thread, casting ballots continuously from one account. 
-            :param voter_address (str): The account address to use for this purpose.
-            """
-            
-            if (voter_address == ctx.service_account["address"].hex()):
-                raise Exception(f"ERROR: Service account {ctx.service_account["address"].hex()} is not able to vote")
-            
-            # Set the thread to sleep for a random value between 0 and the max value provided
-            time.sleep(random.randint(a=0, b=max_delay))
+        from runners import load_generator
 
-            # Run this in a while loop
-            while(rounds > 0):
-                # Mint a new ballot to the account
-                await current_election.mint_ballot_to_votebox(votebox_address=voter_address, tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
-
-                # Cast the Ballot
-                random_index: int = random.randint(a=1, b=len(election_options[election_index]))
-                random_option: dict[int:str] = election_options[election_index][random_index]
-
-                if (current_election.free):
-                    receipt: int = await current_election.cast_ballot(option_to_set=random_option, tx_signer_address=None, tx_proposer_address=voter_address, tx_payer_address=ctx.service_account["address"].hex(), tx_authorizer_address=[voter_address], gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
-                else:
-                    receipt: int = await current_election.cast_ballot(option_to_set=random_option, tx_signer_address=voter_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
-                
-                # Set the ballot receipt to the user account
-                ctx.addReceipt(voter_address=voter_address, election_id=current_election.election_id, ballot_receipt=receipt)
-
-                # Submit the Ballot
-                if (current_election.free):
-                    await current_election.submit_ballot(tx_signer_address=None, tx_proposer_address=voter_address, tx_payer_address=ctx.service_account["account".hex()], tx_authorizer_address=[voter_address], gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
-                else:
-                    await current_election.submit_ballot(tx_signer_address=voter_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
-
-                rounds -= 1
-        # --------------------------------------------------------------------------------------------------------------------------------------------------------------------------
-        voter_addresses: list[str] = []
-
-        for account in ctx.accounts:
-            voter_addresses.append(account["address"].hex())
-
-        log.info("Starting parallel threads")
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            results = executor.map(process_ballot_account, voter_addresses)
-
-        log.info("Threads done")
+        await load_generator.run_load(election_id=current_election.election_id, total_voters=len(ctx.accounts) * 10, max_concurrency=len(ctx.accounts), rounds=1, ramp_up_profile="constant", gas_results_file_path=gas_results_file_path)
 
 
     # 8. Mint another round of Ballots to the user accounts, cast them again using a random option, and re-submit them to trigger the BallotReplaced event
     if (False):
         # Mint a new round of Ballots
-        for user_account in ctx.accounts:
-            await current_election.mint_ballot_to_votebox(votebox_address=user_account["address"].hex(), tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
+        await current_election.mint_ballots_to_voteboxes(votebox_addresses=[user_account["address"].hex() for user_account in ctx.accounts], tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
 
         # Cast the randomly as well
         for user_account in ctx.accounts:
@@ -338,7 +288,7 @@ async def main(election_index: int = 0) -> None:
                 # Cast the ballot and save the int ballot receipt returned
                 receipt: int = await current_election.cast_ballot(option_to_set=random_option, tx_signer_address=user_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
             
-            ctx.addReceipt(voter_address=user_account["address"].hex(), election_id=current_election.election_id, ballot_receipt=receipt)
+            await ctx.addReceipt(voter_address=user_account["address"].hex(), election_id=current_election.election_id, ballot_receipt=receipt)
 
             log.info(f"Voter {user_account["address"].hex()} new ballot receipt for election {current_election.election_id} is '{receipt}'")
 
@@ -481,13 +431,15 @@ async def main(election_index: int = 0) -> None:
         await current_election.finish_election(tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
         
         for user_account in ctx.accounts:
-            for election_id in user_account["receipts"]:
-                for receipt in user_account["receipts"][election_id]:
-                    receipt_status: bool = await script_runner.isBallotReceiptValid(election_id=current_election.election_id, ballot_receipt=receipt)
-                    if (receipt_status):
-                        log.info(f"Ballot with receipt {receipt} from voter {user_account["address"].hex()} is valid!")
-                    else:
-                        log.warning(f"WARNING: Ballot with receipt {receipt} from voter {user_account["address"].hex()} is not among the ballot receipt list returned!")
+            # Only the receipts for this Election. Receipts for other Elections would never be among its ballot receipts
+            voter_receipts: list[int] = receipt_store.getReceipts(voter_address=user_account["address"].hex(), election_id=current_election.election_id)
+
+            for receipt in voter_receipts:
+                receipt_status: bool = await script_runner.isBallotReceiptValid(election_id=current_election.election_id, ballot_receipt=receipt)
+                if (receipt_status):
+                    log.info(f"Ballot with receipt {receipt} from voter {user_account["address"].hex()} is valid!")
+                else:
+                    log.warning(f"WARNING: Ballot with receipt {receipt} from voter {user_account["address"].hex()} is not among the ballot receipt list returned!")
         
     
     # 9. Check that the election is tallied but not yet finished
@@ -508,6 +460,10 @@ async def main(election_index: int = 0) -> None:
         # Destroy the resources from the VoteBooth contract
         await current_election.deleteVoteBooth(tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
 
+    # Close the pooled access node connections, and write any buffered gas and storage records, before the event loop goes away
+    await closeClientPools()
+    await closeMetricsSink()
+    await closeReceiptStore()
 
     
 if __name__ == "__main__":
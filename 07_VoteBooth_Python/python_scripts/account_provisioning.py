@@ -0,0 +1,228 @@
+"""Module to create, and fund, test accounts in bulk, replacing the 01_create_emulator_accounts.sh script.
+
+The script ran 'flow keys generate' and 'flow accounts create' once per account, and patched flow.json with jq in between, after which the accounts still needed a separate
+fundAllAccounts transaction. This module generates the key pairs locally, creates and funds a whole batch of accounts per transaction (18_create_accounts), and, after each
+batch, saves the private keys to files and adds the new accounts to flow.json, replacing the file atomically. A failed run keeps every batch finished before the failure.
+When it is done, the account index (see AccountConfig.writeIndex) is written again, so the next runner starts from the new accounts right away.
+"""
+import asyncio
+import configparser
+import json
+import os
+import pathlib
+import re
+
+from ecdsa import SigningKey, NIST256p
+from flow_py_sdk.cadence import Address
+
+from common.utils import Utils
+from common.account_config import AccountConfig, AccountRecord, flow_json_file
+from python_scripts.cadence_transactions import TransactionRunner
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+config_path = pathlib.Path(os.getcwd()).joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+
+class AccountProvisioner(object):
+    """Bulk account creation for the active network. New accounts are named after the existing ones, i.e., "accountNN" in the emulator and "flow_test_accountNN" in testnet,
+    continuing from the highest number already in flow.json or in the key folder.
+    """
+    def __init__(self, batch_size: int = None, proposal_keys: int = None, funding_amount: float = None, key_directory: str = None) -> None:
+        """
+        :param batch_size (int): Number of accounts created per transaction. Defaults to the [account_provisioning] config section value.
+        :param proposal_keys (int): Number of proposal keys in each new account. Defaults to the [account_provisioning] config section value.
+        :param funding_amount (float): FLOW deposited into each new account. Defaults to the [account_provisioning] config section value.
+        :param key_directory (str): The folder, relative to the project folder, where the private key files are saved.
+        """
+        super().__init__()
+        self.batch_size: int = batch_size if batch_size else config.getint(section="account_provisioning", option="batch_size", fallback=50)
+        self.proposal_keys: int = proposal_keys if proposal_keys else config.getint(section="account_provisioning", option="proposal_keys", fallback=1)
+        self.funding_amount: float = funding_amount if funding_amount != None else config.getfloat(section="account_provisioning", option="funding_amount", fallback=10.0)
+        self.key_directory: str = key_directory if key_directory else config.get(section="account_provisioning", option="key_directory", fallback="keys/local_emulator")
+
+        self.tx_runner: TransactionRunner = TransactionRunner()
+        self.ctx: AccountConfig = self.tx_runner.ctx
+
+        # Testnet accounts are only picked up by AccountConfig if their names contain "flow_test"
+        self.name_prefix: str = "flow_test_account" if self.ctx.active_network == "testnet" else "account"
+
+
+    @staticmethod
+    def generateKeyPair() -> tuple[str, str]:
+        """Function to generate a new ECDSA_P256 key pair, in the same format as 'flow keys generate'.
+
+        :return (tuple[str, str]): The private key and the uncompressed public key (64 bytes, without prefix), both hex encoded.
+        """
+        private_key: SigningKey = SigningKey.generate(curve=NIST256p)
+
+        return (private_key.to_string().hex(), private_key.get_verifying_key().to_string().hex())
+
+
+    def readFlowJson(self) -> dict:
+        """Internal function to read the current contents of flow.json.
+
+        :return (dict): The flow.json contents.
+        """
+        with open(pathlib.Path(flow_json_file)) as json_file:
+            return json.load(json_file)
+
+
+    def writeFlowJson(self, new_accounts: dict[str, dict]) -> None:
+        """Function to add account entries to flow.json. The file is read again, updated and written to a temporary file that then replaces the original, so that a crash
+        never leaves a half written flow.json behind.
+
+        :param new_accounts (dict[str, dict]): The new flow.json account entries, by account name.
+        """
+        flow_json: dict = self.readFlowJson()
+        flow_json["accounts"].update(new_accounts)
+
+        flow_json_path: pathlib.Path = pathlib.Path(flow_json_file)
+        temporary_path: pathlib.Path = flow_json_path.with_name(f"{flow_json_path.name}.{os.getpid()}.tmp")
+
+        with open(temporary_path, "w") as json_file:
+            json.dump(flow_json, json_file, indent=4)
+
+        os.replace(temporary_path, flow_json_path)
+
+
+    def getAccountNames(self, count: int) -> list[str]:
+        """Function to reserve the names for the next accounts, following the highest "<prefix>NN" name already in flow.json or in the key folder. Key files can exist
+        without a flow.json entry, e.g., from a batch that failed, and are never overwritten.
+
+        :param count (int): The number of names to reserve.
+
+        :return (list[str]): The new account names.
+        """
+        name_pattern: re.Pattern = re.compile(f"^{self.name_prefix}(\\d+)$")
+        last_index: int = 0
+
+        key_directory: pathlib.Path = pathlib.Path(os.getcwd()).joinpath(self.key_directory)
+        key_names: list[str] = [key_path.stem for key_path in key_directory.glob("*.pkey")] if key_directory.is_dir() else []
+
+        for account_name in list(self.readFlowJson()["accounts"]) + key_names:
+            name_match: re.Match = name_pattern.match(account_name)
+
+            if (name_match):
+                last_index = max(last_index, int(name_match.group(1)))
+
+        return [f"{self.name_prefix}{account_index:02d}" for account_index in range(last_index + 1, last_index + count + 1)]
+
+
+    def saveKey(self, account_name: str, private_key: str) -> str:
+        """Function to save a private key to its own file, as 01_create_emulator_accounts.sh did. The keys folder is already excluded from git. The file is created in
+        exclusive mode, so an existing key, which may belong to a live account, is never overwritten.
+
+        :param account_name (str): The name of the account that uses the key.
+        :param private_key (str): The hex encoded private key.
+
+        :return (str): The key file location, as set in flow.json.
+        """
+        key_location: str = f"./{self.key_directory}/{account_name}.pkey"
+        key_path: pathlib.Path = pathlib.Path(os.getcwd()).joinpath(self.key_directory, f"{account_name}.pkey")
+        key_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(key_path, "x") as key_file:
+            key_file.write(private_key)
+
+        return key_location
+
+
+    async def provisionBatch(self, account_names: list[str], gas_results_file_path: pathlib.Path = None) -> list[AccountRecord]:
+        """Function to create, fund and register one batch of accounts.
+
+        :param account_names (list[str]): The names for the new accounts.
+        :param gas_results_file_path (pathlib.Path): If provided, the gas data of the account creation transactions is written into this file.
+
+        :return (list[AccountRecord]): The new accounts.
+        """
+        key_pairs: list[tuple[str, str]] = [self.generateKeyPair() for _ in account_names]
+
+        # Save the private keys before creating the accounts. An account whose key was lost is of no use to anyone
+        key_entries: list[dict] = [
+            {"type": "file", "location": self.saveKey(account_name=account_name, private_key=private_key), "signatureAlgorithm": "ECDSA_P256", "hashAlgorithm": "SHA3_256"}
+            for account_name, (private_key, public_key) in zip(account_names, key_pairs)
+        ]
+
+        new_addresses: list[str] = await self.tx_runner.createAccounts(
+            public_keys=[public_key for private_key, public_key in key_pairs],
+            proposal_keys=self.proposal_keys,
+            amount=self.funding_amount,
+            tx_signer_address=self.ctx.service_account.address_hex,
+            batch_size=self.batch_size,
+            gas_results_file_path=gas_results_file_path
+        )
+
+        new_accounts: dict[str, dict] = {}
+        new_records: list[AccountRecord] = []
+
+        for account_name, account_address, key_entry in zip(account_names, new_addresses, key_entries):
+            # Accounts from a part of the batch that failed. Their key files stay, and their names are not reused, in case the transaction went through after all
+            if (account_address == None):
+                log.warning(f"Account {account_name} was not created. Keeping its key file {key_entry["location"]}")
+                continue
+
+            new_accounts[account_name] = {"address": account_address, "key": key_entry}
+
+            if (self.proposal_keys > 1):
+                new_accounts[account_name]["proposal_keys"] = self.proposal_keys
+
+            new_records.append(
+                AccountRecord(
+                    name=account_name,
+                    address=Address.from_hex(account_address),
+                    key_id=0,
+                    key_data=key_entry,
+                    proposal_key_data=new_accounts[account_name].get("proposal_keys")
+                )
+            )
+
+        if (len(new_records) == 0):
+            raise Exception(f"ERROR: None of the accounts {account_names[0]} to {account_names[-1]} were created")
+
+        # No awaits between reading and writing flow.json, so concurrent batches cannot overwrite each other
+        self.writeFlowJson(new_accounts=new_accounts)
+
+        for new_record in new_records:
+            self.ctx.addAccount(account=new_record)
+
+        log.info(f"Created and funded {len(new_records)} of {len(account_names)} accounts: {new_records[0].name} ({new_records[0].address_hex}) to {new_records[-1].name} ({new_records[-1].address_hex})")
+
+        return new_records
+
+
+    async def provisionAccounts(self, count: int, gas_results_file_path: pathlib.Path = None) -> list[AccountRecord]:
+        """Function to create, fund and register the number of accounts provided. Batches are submitted concurrently, and the key scheduler limits how many are actually
+        in flight, according to the number of proposal keys of the service account.
+
+        :param count (int): The number of accounts to create.
+        :param gas_results_file_path (pathlib.Path): If provided, the gas data of the account creation transactions is written into this file.
+
+        :return (list[AccountRecord]): The new accounts, in name order. Batches that failed are logged and left out.
+        """
+        if (count < 1):
+            raise Exception(f"ERROR: Invalid number of accounts provided: {count}. Please provide a positive number to continue!")
+
+        account_names: list[str] = self.getAccountNames(count=count)
+        batches: list[list[str]] = [account_names[index:index + self.batch_size] for index in range(0, len(account_names), self.batch_size)]
+
+        log.info(f"Creating {count} accounts in {len(batches)} batches of up to {self.batch_size}, with {self.funding_amount} FLOW and {self.proposal_keys} proposal keys each")
+
+        batch_results: list = await asyncio.gather(*[self.provisionBatch(account_names=batch, gas_results_file_path=gas_results_file_path) for batch in batches], return_exceptions=True)
+        new_records: list[AccountRecord] = []
+
+        for batch, batch_result in zip(batches, batch_results):
+            if (isinstance(batch_result, BaseException)):
+                log.error(f"Unable to create accounts {batch[0]} to {batch[-1]}: {batch_result}")
+            else:
+                new_records.extend(batch_result)
+
+        # flow.json changed, so the account index needs to be written again, or the next runner would have to go back to flow.json
+        if (self.ctx.use_index):
+            self.ctx.writeIndex()
+
+        return new_records
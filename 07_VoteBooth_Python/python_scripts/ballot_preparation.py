@@ -0,0 +1,268 @@
+"""Module with a background service that prepares encrypted ballots ahead of time.
+
+Every voting round used to pick an option, generate a salt, concatenate both and encrypt the result (RSA-OAEP, or ECDH + AES-GCM for hybrid Elections) on the event loop
+thread, which stalls every other voter coroutine while it runs. This service does that work in a thread or process pool instead, and keeps, per election_id, a bounded
+queue of ballots that are ready to be cast. The voter coroutines only pull a PreparedBallot from the queue, and the pool refills it in batches as it drains.
+"""
+import asyncio
+import configparser
+import os
+import pathlib
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from common.utils import Utils
+from python_scripts.crypto_management import CryptoUtils
+from python_scripts.election_cache import election_cache, ElectionMetadata
+from python_scripts.event_management import addEventListener
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+config_path = pathlib.Path(os.getcwd()).joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+# Public keys deserialized by the worker, by PEM string, so that each worker parses an Election key only once
+worker_public_keys: dict[str, object] = {}
+
+
+def initWorker() -> None:
+    """Initializer for each worker process. Forked workers inherit the random generator state from the parent, and would otherwise produce the same options and salts.
+    """
+    random.seed()
+
+
+def prepareBallots(public_key_string: str, election_options: list[str], option_separator: str, count: int) -> list[tuple[str, int, str]]:
+    """Function, executed in a worker, that picks, salts and encrypts a batch of ballot options, in the same way the voter runners used to do it inline.
+
+    :param public_key_string (str): The Election public encryption key, in PEM format.
+    :param election_options (list[str]): The options to pick from, at random.
+    :param option_separator (str): The character used to concatenate the option with the salt.
+    :param count (int): The number of ballots to prepare.
+
+    :return (list[tuple[str, int, str]]): The ballots, as (option, salt, encrypted_option) tuples.
+    """
+    if (public_key_string not in worker_public_keys):
+        worker_public_keys[public_key_string] = CryptoUtils.load_public_key_from_string(key_string=public_key_string)
+
+    public_key = worker_public_keys[public_key_string]
+    prepared_ballots: list[tuple[str, int, str]] = []
+
+    for _ in range(0, count):
+        option: str = random.choice(election_options)
+        option_salt: int = CryptoUtils.generate_random_salt()
+        encrypted_option: str = CryptoUtils.encrypt_ballot_option(plaintext_option=option + option_separator + str(option_salt), public_key=public_key)
+
+        prepared_ballots.append((option, option_salt, encrypted_option))
+
+    return prepared_ballots
+
+
+class PreparedBallot(object):
+    """A ballot option that is already salted and encrypted, ready to be cast.
+    """
+    __slots__ = ("election_id", "option", "salt", "encrypted_option")
+
+    def __init__(self, election_id: int, option: str, salt: int, encrypted_option: str) -> None:
+        """
+        :param election_id (int): The election identifier.
+        :param option (str): The option in clear.
+        :param salt (int): The random salt, which is also the ballot receipt.
+        :param encrypted_option (str): The encrypted option, as produced by CryptoUtils.encrypt_ballot_option.
+        """
+        self.election_id: int = election_id
+        self.option: str = option
+        self.salt: int = salt
+        self.encrypted_option: str = encrypted_option
+
+
+class BallotPreparationService(object):
+    """Per election_id queues of PreparedBallot objects, refilled by a background producer task that runs prepareBallots in an executor.
+    """
+    def __init__(self, executor_type: str = None, max_workers: int = None, queue_size: int = None, batch_size: int = None) -> None:
+        """
+        :param executor_type (str): Either "thread" or "process". Threads avoid forking a process that already holds open access node channels. Processes avoid the GIL
+        when the encryption itself becomes the bottleneck.
+        :param max_workers (int): Number of workers in the pool. 0 uses the number of CPUs.
+        :param queue_size (int): Maximum number of ready ballots kept per Election.
+        :param batch_size (int): Number of ballots prepared per worker job.
+        """
+        super().__init__()
+        self.executor_type: str = executor_type if executor_type else config.get(section="ballot_preparation", option="executor", fallback="thread")
+        self.max_workers: int = max_workers if max_workers else config.getint(section="ballot_preparation", option="max_workers", fallback=0)
+        self.queue_size: int = queue_size if queue_size else config.getint(section="ballot_preparation", option="queue_size", fallback=64)
+        self.batch_size: int = batch_size if batch_size else config.getint(section="ballot_preparation", option="batch_size", fallback=16)
+
+        if (self.executor_type not in ("thread", "process")):
+            raise Exception(f"ERROR: Invalid ballot preparation executor '{self.executor_type}'. Use either 'thread' or 'process'")
+
+        if (self.max_workers <= 0):
+            self.max_workers = os.cpu_count() or 1
+
+        self.option_separator: str = config.get(section="encryption", option="separator")
+
+        # The pool is only started when the first ballot is requested
+        self.executor: Executor = None
+
+        # Queues and producers, in a {election_id: asyncio.Queue} and {election_id: asyncio.Task} format. Both are bound to an event loop, so they are dropped when the
+        # loop changes
+        self.loop: asyncio.AbstractEventLoop = None
+        self.queues: dict[int, asyncio.Queue] = {}
+        self.producers: dict[int, asyncio.Task] = {}
+
+
+    def checkLoop(self) -> None:
+        """Internal function to drop the queues and producers if the running event loop changed since the last call.
+        """
+        current_loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        if (self.loop is not current_loop):
+            self.loop = current_loop
+            self.queues = {}
+            self.producers = {}
+
+
+    def getExecutor(self) -> Executor:
+        """Internal function to start the worker pool, if that was not done yet.
+
+        :return (Executor): The worker pool.
+        """
+        if (self.executor == None):
+            if (self.executor_type == "process"):
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=initWorker)
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ballot_preparation")
+
+            log.info(f"Started a {self.executor_type} pool with {self.max_workers} workers to prepare ballots")
+
+        return self.executor
+
+
+    async def runProducer(self, election_id: int, ballot_queue: asyncio.Queue) -> None:
+        """Background task that keeps the queue of an Election full. Each job prepares, at most, as many ballots as there are free slots in the queue, so that the queue
+        never holds more than queue_size ballots.
+
+        :param election_id (int): The election identifier.
+        :param ballot_queue (asyncio.Queue): The queue to fill.
+        """
+        election_metadata: ElectionMetadata = await election_cache.getElection(election_id=election_id)
+        election_options: list[str] = list(election_metadata.options.values())
+
+        if (len(election_options) == 0):
+            raise Exception(f"ERROR: Election {election_id} does not have any options to vote on")
+
+        while (True):
+            ballot_count: int = max(1, min(self.batch_size, ballot_queue.maxsize - ballot_queue.qsize()))
+
+            prepared_ballots: list[tuple[str, int, str]] = await self.loop.run_in_executor(
+                self.getExecutor(),
+                prepareBallots,
+                election_metadata.public_key_string,
+                election_options,
+                self.option_separator,
+                ballot_count
+            )
+
+            for option, option_salt, encrypted_option in prepared_ballots:
+                # Blocks while the queue is full, which is what keeps the workers from running ahead of the voters
+                await ballot_queue.put(PreparedBallot(election_id=election_id, option=option, salt=option_salt, encrypted_option=encrypted_option))
+
+
+    def startElection(self, election_id: int) -> asyncio.Queue:
+        """Function to start preparing ballots for an Election, if that is not happening already. Call it ahead of time to have the queue full before the first voter
+        needs a ballot.
+
+        :param election_id (int): The election identifier.
+
+        :return (asyncio.Queue): The queue of ready ballots for the Election.
+        """
+        self.checkLoop()
+
+        if (election_id not in self.queues):
+            self.queues[election_id] = asyncio.Queue(maxsize=self.queue_size)
+
+        if (election_id not in self.producers or self.producers[election_id].done()):
+            self.producers[election_id] = self.loop.create_task(self.runProducer(election_id=election_id, ballot_queue=self.queues[election_id]))
+
+        return self.queues[election_id]
+
+
+    def stopElection(self, election_id: int) -> None:
+        """Function to stop preparing ballots for an Election and drop the ones already prepared.
+
+        :param election_id (int): The election identifier.
+        """
+        producer: asyncio.Task = self.producers.pop(election_id, None)
+
+        if (producer != None and not producer.done()):
+            producer.cancel()
+
+        if (self.queues.pop(election_id, None) != None):
+            log.debug(f"Dropped the prepared ballots for Election {election_id}")
+
+
+    async def getBallot(self, election_id: int) -> PreparedBallot:
+        """Function to retrieve a ballot that is ready to be cast, waiting for one if the queue is empty.
+
+        :param election_id (int): The election identifier.
+
+        :return (PreparedBallot): The next prepared ballot.
+        """
+        ballot_queue: asyncio.Queue = self.startElection(election_id=election_id)
+
+        if (not ballot_queue.empty()):
+            return ballot_queue.get_nowait()
+
+        producer: asyncio.Task = self.producers[election_id]
+        next_ballot: asyncio.Task = asyncio.ensure_future(ballot_queue.get())
+
+        # Wait on the producer as well, otherwise a failed producer (a missing Election, for instance) leaves the caller waiting forever
+        await asyncio.wait({next_ballot, producer}, return_when=asyncio.FIRST_COMPLETED)
+
+        if (next_ballot.done()):
+            return next_ballot.result()
+
+        next_ballot.cancel()
+
+        # The producer only finishes on errors or when the Election was stopped
+        if (producer.cancelled()):
+            raise Exception(f"ERROR: Ballot preparation for Election {election_id} was stopped")
+
+        producer.result()
+
+
+    def onEvents(self, decoded_events: dict[str:list[dict]]) -> None:
+        """Event listener that stops preparing ballots for Elections that were created or destroyed, since the prepared ones may have been encrypted with a stale key.
+
+        :param decoded_events (dict[str:list[dict]]): The decoded events, grouped by their '<contract>.<event>' key, as returned by EventRunner.decodeEvents.
+        """
+        for event_key in ("ElectionStandard.ElectionCreated", "ElectionStandard.ElectionDestroyed"):
+            for decoded_event in decoded_events.get(event_key, []):
+                self.stopElection(election_id=int(decoded_event["election_id"]))
+
+
+    async def close(self) -> None:
+        """Function to stop every producer and shut down the worker pool. The service starts them again if it is used again.
+        """
+        for election_id in list(self.producers.keys()):
+            self.stopElection(election_id=election_id)
+
+        self.queues = {}
+
+        if (self.executor != None):
+            executor: Executor = self.executor
+            self.executor = None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+
+# Single service for the whole process, shared by every voter coroutine
+ballot_preparation: BallotPreparationService = BallotPreparationService()
+addEventListener(ballot_preparation.onEvents)
+
+
+async def closeBallotPreparation() -> None:
+    """Function to stop the process wide ballot preparation service. Call it before the event loop ends.
+    """
+    await ballot_preparation.close()
@@ -1,5 +1,4 @@
 from flow_py_sdk import (
-    flow_client,
     cadence,
     Script
 )
@@ -7,6 +6,9 @@ from flow_py_sdk import (
 import configparser
 from common.utils import Utils
 from common.account_config import AccountConfig
+from common.client_pool import borrowFlowClient
+from common.source_cache import source_cache
+from common.metrics_sink import metrics_sink
 import pathlib
 import os
 import datetime
@@ -42,6 +44,10 @@ class ScriptRunner():
         self.config = configparser.ConfigParser()
         self.config.read(config_path)
 
+        # ElectionStandard contracts deployed before getEncryptedOptionsPage was added do not support paging. Set to False once that is found out, so that the
+        # encrypted ballots are retrieved in one go from then on
+        self.encrypted_ballot_paging: bool = True
+
 
     def getScript(self, script_name: str, script_arguments: list) -> Script:
         """
@@ -52,7 +58,8 @@ class ScriptRunner():
         :return (Script): If successful, this function returns a configured Script object ready to be executed.
         """
         try:
-            script_path = pathlib.Path(self.config.get(section="scripts", option=script_name))
+            # The source cache resolves the script path once and only reads the file again if it was modified in the meantime
+            script_code = source_cache.getSource(section="scripts", name=script_name)
         except configparser.NoOptionError:
             log.error(f"No script named '{script_name}' configured for this project.")
             exit(-2)
@@ -60,8 +67,6 @@ class ScriptRunner():
             log.error(f"Unable to retrieve a valid path for script '{script_name}':")
             log.error(e)
             exit(-1)
-        
-        script_code = open(script_path).read()
 
         return Script(
             code=script_code,
@@ -80,7 +85,7 @@ class ScriptRunner():
         # Create the script object with the argument array
         script_object = self.getScript(script_name=name, script_arguments=[])
         # Run the script
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -107,7 +112,7 @@ class ScriptRunner():
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -142,7 +147,7 @@ class ScriptRunner():
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             
@@ -172,7 +177,7 @@ class ScriptRunner():
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -201,7 +206,7 @@ class ScriptRunner():
         
         script_object = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -229,7 +234,7 @@ class ScriptRunner():
             arguments.append(cadence.Optional(None))
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -258,7 +263,7 @@ class ScriptRunner():
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -287,7 +292,7 @@ class ScriptRunner():
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -316,7 +321,7 @@ class ScriptRunner():
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -339,7 +344,7 @@ class ScriptRunner():
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -361,7 +366,7 @@ class ScriptRunner():
         arguments = [cadence.UInt64(election_id)]
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -382,7 +387,7 @@ class ScriptRunner():
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -406,7 +411,7 @@ class ScriptRunner():
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -430,7 +435,7 @@ class ScriptRunner():
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -458,7 +463,7 @@ class ScriptRunner():
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             
@@ -481,7 +486,7 @@ class ScriptRunner():
 
         script_object = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -504,7 +509,7 @@ class ScriptRunner():
 
         script_object: Script = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -534,7 +539,7 @@ class ScriptRunner():
 
         script_object: Script = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -551,6 +556,76 @@ class ScriptRunner():
                 return encrypted_options
             else:
                 return []
+
+
+    async def getElectionEncryptedBallotsPage(self, election_id: int, offset: int, limit: int) -> list[str]:
+        """Function to retrieve a page of the encrypted options of an Election, instead of the whole array in one go.
+
+        :param election_id (int): The election identifier for the Election to be processed.
+        :param offset (int): The index of the first encrypted option to retrieve.
+        :param limit (int): The maximum number of encrypted options to retrieve.
+
+        :return (list[str]): The page of Ballot options, still in its encrypted format. A page with less than limit elements is the last one.
+        """
+        name = "26_get_election_encrypted_ballots_page"
+        arguments = [cadence.UInt64(election_id), cadence.Int(offset), cadence.Int(limit)]
+
+        script_object: Script = self.getScript(script_name=name, script_arguments=arguments)
+
+        async with borrowFlowClient(
+            host=self.ctx.access_node_host, port=self.ctx.access_node_port
+        ) as client:
+            script_result = await client.execute_script(script=script_object)
+
+            if (not script_result):
+                raise ScriptError(script_name=name)
+
+            encrypted_options: list[str] = []
+
+            for result_value in script_result.value:
+                encrypted_options.append(result_value.__str__())
+
+            return encrypted_options
+
+
+    async def iterateElectionEncryptedBallots(self, election_id: int, page_size: int = None):
+        """Async generator that retrieves the encrypted options of an Election one page at a time. Use it instead of getElectionEncryptedBallots for large Elections, since
+        neither the script result nor the Python list need to hold every encrypted option at once. If the ElectionStandard contract deployed is older than the paging
+        functions, this falls back to getElectionEncryptedBallots and yields its result in pages of the same size.
+
+        :param election_id (int): The election identifier for the Election to be processed.
+        :param page_size (int): Number of encrypted options per script call. Defaults to the 'page_size' entry in the [tally] config section.
+        """
+        if (page_size == None):
+            page_size = self.config.getint(section="tally", option="page_size", fallback=500)
+
+        offset: int = 0
+
+        while (self.encrypted_ballot_paging):
+            try:
+                encrypted_options: list[str] = await self.getElectionEncryptedBallotsPage(election_id=election_id, offset=offset, limit=page_size)
+            except Exception as e:
+                # Only a failure on the first page, caused by the missing contract function, means that paging is not supported. Anything else is a real error
+                if (offset > 0 or "getEncryptedOptionsPage" not in str(e)):
+                    raise
+
+                log.warning(f"The ElectionStandard contract deployed does not support paging yet. Retrieving the encrypted ballots from Election {election_id} in one go instead. Run 'python runners/contract_runner.py update' to add the paging functions")
+                self.encrypted_ballot_paging = False
+                break
+
+            if (len(encrypted_options) > 0):
+                yield encrypted_options
+
+            # A short page means that the end of the array was reached
+            if (len(encrypted_options) < page_size):
+                return
+
+            offset += len(encrypted_options)
+
+        encrypted_options: list[str] = await self.getElectionEncryptedBallots(election_id=election_id)
+
+        for page_start in range(0, len(encrypted_options), page_size):
+            yield encrypted_options[page_start:page_start + page_size]
     
 
     async def isElectionFree(self, election_id: int) -> bool:
@@ -565,7 +640,7 @@ class ScriptRunner():
 
         script_object: Script = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -589,7 +664,7 @@ class ScriptRunner():
 
         script_object: Script = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -617,7 +692,7 @@ class ScriptRunner():
 
         script_object: Script = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -656,7 +731,7 @@ class ScriptRunner():
 
         script_object: Script = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -670,6 +745,53 @@ class ScriptRunner():
                 return {}
             
     
+    async def getAccountsState(self, recipient_addresses: list[str]) -> dict[str:dict]:
+        """
+        This function returns the account balance and storage values for all the account addresses provided, using a single script execution instead of one
+        getAccountBalance plus one getAccountStorage per account.
+
+        :param recipient_addresses (list[str]): The account addresses for the accounts whose state is to be retrieved.
+        :return (dict[str:dict]): Returns the state of each account, indexed by the account address provided, in the format
+        {
+            "default": float,
+            "available": float,
+            "capacity": int,
+            "used": int
+        },
+        where the values have the same meaning as the ones returned by getAccountBalance and getAccountStorage.
+        """
+        if (len(recipient_addresses) == 0):
+            return {}
+
+        name = "27_get_accounts_state"
+        arguments = [cadence.Array([cadence.Address.from_hex(recipient_address) for recipient_address in recipient_addresses])]
+
+        script_object: Script = self.getScript(script_name=name, script_arguments=arguments)
+
+        async with borrowFlowClient(
+            host=self.ctx.access_node_host, port=self.ctx.access_node_port
+        ) as client:
+            script_result = await client.execute_script(script=script_object)
+
+            if (not script_result):
+                raise ScriptError(script_name=name)
+
+            accounts_state: dict[str:dict] = {}
+
+            # The script returns one dictionary per address, in the same order as the input
+            for recipient_address, account_entry in zip(recipient_addresses, script_result.value):
+                account_state: dict = Utils.convertCadenceDictionaryToPythonDictionary(cadence_dict=account_entry)
+
+                # Same as in getAccountBalance, the balance values are missing the decimal value at the 8th digit
+                scale_factor: int = 100000000
+                account_state["default"] = float(account_state["default"])/float(scale_factor)
+                account_state["available"] = float(account_state["available"])/float(scale_factor)
+
+                accounts_state[recipient_address] = account_state
+
+            return accounts_state
+
+
     async def getBallotReceipts(self, voter_address: str, election_id: int) -> list[int]:
         """
         Function to retrieve the list of ballot receipts from the VoteBox in the account with the voter_address provided, stored under the election_id provided as well.
@@ -683,7 +805,7 @@ class ScriptRunner():
 
         script_object: Script = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             script_result = await client.execute_script(script=script_object)
@@ -703,8 +825,46 @@ class ScriptRunner():
                     return []
             except AttributeError:
                 return []
-            
-    
+
+
+    async def getVotersBallotReceipts(self, voter_addresses: list[str], election_id: int) -> dict[str:list[int]]:
+        """
+        This function returns the ballot receipts, under the election_id provided, from the VoteBoxes of all the account addresses provided, using a single script
+        execution instead of one getBallotReceipts per voter.
+
+        :param voter_addresses (list[str]): The account addresses of the accounts to retrieve the VoteBoxes from.
+        :param election_id (int): The election identifier for the entry to use to retrieve the lists of ballot receipts.
+        :return (dict[str:list[int]]): Returns the list of ballot receipts of each voter, indexed by the account address provided. Voters without a VoteBox, or without
+        an entry for this election in it, get a None instead.
+        """
+        if (len(voter_addresses) == 0):
+            return {}
+
+        name = "28_get_voters_ballot_receipts"
+        arguments = [cadence.Array([cadence.Address.from_hex(voter_address) for voter_address in voter_addresses]), cadence.UInt64(election_id)]
+
+        script_object: Script = self.getScript(script_name=name, script_arguments=arguments)
+
+        async with borrowFlowClient(
+            host=self.ctx.access_node_host, port=self.ctx.access_node_port
+        ) as client:
+            script_result = await client.execute_script(script=script_object)
+
+            if (script_result == None):
+                raise ScriptError(script_name=name)
+
+            voters_receipts: dict[str:list[int]] = {}
+
+            # The script returns one optional array per address, in the same order as the input
+            for voter_address, voter_entry in zip(voter_addresses, script_result.value):
+                if (voter_entry.value == None):
+                    voters_receipts[voter_address] = None
+                else:
+                    voters_receipts[voter_address] = [int(receipt_value.__str__()) for receipt_value in voter_entry.value.value]
+
+            return voters_receipts
+
+
     async def validateBallotReceipt(self, voter_address: str, election_id: int, ballot_receipt: int) -> bool:
         """
         Function to validate if a ballot receipt provided exists in the receipts structure, in a VoteBox resource saved in the account address provided, under the election_id indicated.
@@ -718,7 +878,7 @@ class ScriptRunner():
 
         script_object: Script = self.getScript(script_name=name, script_arguments=arguments)
 
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client: 
             script_result = await client.execute_script(script=script_object)
@@ -733,7 +893,7 @@ class ScriptRunner():
         """
         Simple function to abstract and automate the characterisation of all configured accounts, i.e., all the one indicated in the "accounts" section of this project's flow.json file. The function require no inputs and returns no data. All results are printed to stdout.
         :param program_state(str): If provided, this item is added to the line describing the current account profile. If not, the whole entry is omitted from the final result
-        :param account (str): If provided, this function prints a single line to the to the account indicated, if it exists. Otherwise, it profiles all accounts at once.
+        :param account (str | list[str]): If provided, this function prints a single line to the to the account indicated, if it exists, or one line per account if a list of accounts is provided. Otherwise, it profiles all accounts at once. The state of every account profiled is retrieved with a single script execution.
         """
         if (program_stage):
             print(program_stage)
@@ -788,50 +948,26 @@ class ScriptRunner():
         ctx = AccountConfig()
         accounts = ctx.getAddresses()
 
-        # Check if the file pointed by the path exists and proceed accordingly
-        if (output_file_path):
-            # If a file path was provided
-            if (os.path.isfile(output_file_path)):
-                # And the file already exists, open it in append mode
-                output_stream = open(output_file_path, "+a")
-            else:
-                # Create a new one
-                output_stream = open(output_file_path, "+x")
-                # Create the header line
-                new_line: str = "Program Stage, Timestamp, Account Address, Default Balance, Available Balance, Storage Capacity, Used Storage\n"
-                output_stream.write(new_line)
-
-        if (account and (account in accounts)):
-            # Get account data
-            account_balance: dict[str:float] = await self.getAccountBalance(recipient_address=account)
-            account_storage: dict[str:int] = await self.getAccountStorage(recipient_address=account)
+        headers: list[str] = ["Program Stage", "Timestamp", "Account Address", "Default Balance", "Available Balance", "Storage Capacity", "Used Storage"]
 
-            # Print the account info in a single line, using the csv format
-            new_line = f"{program_stage},{datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S")},{account},{account_balance["default"]},{account_balance["available"]},{account_storage["capacity"]},{account_storage["used"]}\n"
-
-            if (output_stream):
-                # If an output stream is present, dump the new line into it
-                output_stream.write(new_line)
-            else:
-                # Otherwise print it to stdout
-                print(new_line)        
+        if (isinstance(account, list)):
+            profiled_accounts: list[str] = [account_entry for account_entry in account if account_entry in accounts]
+        elif (account and (account in accounts)):
+            profiled_accounts: list[str] = [account]
         else:
-            for account_entry in accounts:
-                # Get account data
-                account_balance: dict[str:float] = await self.getAccountBalance(recipient_address=account_entry)
-                account_storage: dict[str:int] = await self.getAccountStorage(recipient_address=account_entry)
+            profiled_accounts: list[str] = accounts
 
-                # Print the account info in a single line, using the csv format
-                new_line = f"{program_stage},{datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S")},{account_entry},{account_balance["default"]},{account_balance["available"]},{account_storage["capacity"]},{account_storage["used"]}\n"
+        # Get the balance and storage data for every account at once
+        accounts_state: dict[str:dict] = await self.getAccountsState(recipient_addresses=profiled_accounts)
 
-                if (output_stream):
-                    # If an output stream is present, dump the new line into it
-                    output_stream.write(new_line)
-                else:
-                    # Otherwise print it to stdout
-                    print(new_line)
+        for account_entry in profiled_accounts:
+            account_state: dict = accounts_state[account_entry]
+            values: list = [program_stage, datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S"), account_entry, account_state["default"], account_state["available"], account_state["capacity"], account_state["used"]]
 
-        # Check if an output stream was created and close it if so
-        if (output_stream):
-            output_stream.close()
+            if (output_file_path):
+                # If a file path was provided, queue the line in the metrics sink. It gets written to the file in the background
+                metrics_sink.record(output_file_path=output_file_path, headers=headers, values=values)
+            else:
+                # Otherwise print it to stdout, using the csv format
+                print(",".join([str(value) for value in values]))
                 
\ No newline at end of file
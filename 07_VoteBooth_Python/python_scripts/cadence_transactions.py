@@ -1,5 +1,4 @@
 from flow_py_sdk import (
-    flow_client,
     cadence,
     Tx,
     ProposalKey,
@@ -8,10 +7,16 @@ from flow_py_sdk import (
 
 import configparser
 from common.utils import Utils
-from common.account_config import AccountConfig
+from common.account_config import AccountConfig, AccountRecord
+from common.client_pool import borrowFlowClient
+from common.result_poller import getResultPoller
+from common.source_cache import source_cache
+from common.sequence_manager import sequence_manager
+from common.key_scheduler import key_scheduler
 import pathlib
 import os
 import time
+import asyncio
 
 from python_scripts.event_management import EventRunner
 from python_scripts.cadence_scripts import ScriptRunner
@@ -55,9 +60,27 @@ class TransactionRunner():
         self.event_runner: EventRunner = EventRunner()
         self.script_runner: ScriptRunner = ScriptRunner()
 
-        # Set up a pair of time counters to calculate elapsed time
-        self.tx_start: int = 0
-        self.tx_end: int = 0
+        # Process-wide scheduler that hands out free proposal keys to concurrent transactions from the same account
+        self.key_scheduler = key_scheduler
+
+        # Storage profiling sampling: only one in every sample_every transactions gets its accounts profiled
+        self.profiling_sample_every: int = max(1, self.config.getint(section="profiling", option="sample_every", fallback=1))
+        self.profiling_counter: int = 0
+
+
+    def shouldProfileStorage(self, storage_results_file_path: pathlib.Path) -> bool:
+        """Function to decide if the storage of the accounts involved in the current transaction is to be profiled. Each pre and post profile costs one script execution, so,
+        for load runs, the profiling can be sampled with the 'sample_every' entry of the [profiling] config section.
+
+        :param storage_results_file_path (pathlib.Path): The storage results file of the current transaction. Nothing is profiled if this one is None.
+        :return (bool): True if this transaction should be profiled, False otherwise.
+        """
+        if (not storage_results_file_path):
+            return False
+
+        self.profiling_counter += 1
+
+        return ((self.profiling_counter - 1) % self.profiling_sample_every == 0)
 
     async def getTransaction(self, tx_name: str, tx_arguments: list, tx_signer_address: str = None, tx_proposer_address: str = None, tx_payer_address: str = None, tx_authorizers: list[str]= []) -> Tx:
         """
@@ -92,7 +115,8 @@ class TransactionRunner():
             self.event_runner.configureDeployerAddress()
 
         try:
-            tx_path = pathlib.Path(self.config.get(section="transactions", option=tx_name))
+            # Get the transaction text to a variable. The source cache only reads the file from disk if it changed since the last time it was read
+            tx_code = source_cache.getSource(section="transactions", name=tx_name)
         except configparser.NoOptionError:
             log.error(f"No transaction file named '{tx_name}' configured for this project!")
             exit(-2)
@@ -116,136 +140,98 @@ class TransactionRunner():
                 
                 raise Exception(error_msg)
 
-        async with flow_client(
-            host=self.ctx.access_node_host, port=self.ctx.access_node_port
-        ) as client:
-            latest_block = await client.get_latest_block()
-            proposal_key: ProposalKey = None
-            # Get the transaction text to a variable
-            tx_code = open(tx_path).read()
-            
-            # Priority case: a signer address was provided. Continue to build the transaction
+        # Proposal key taken from the key scheduler, if any. If something fails before the transaction object is returned, the key needs to be released and its sequence
+        # number re-synced, since the transaction is never going to be submitted
+        reserved_key: tuple = None
+
+        try:
+            # Priority case: a signer address was provided. The signer is the proposer, the payer and the only authorizer
             if (tx_signer_address):
-                if (tx_signer_address == self.ctx.service_account["address"].hex()):
-                    signer_address = self.ctx.service_account["address"]
-                    signer_key_id = self.ctx.service_account["key_id"]
-                    signer = self.ctx.service_account["signer"]
-                else:
-                    # I need to check with every one of the user accounts and see if the provided address matches any of the configured ones
-                    for account in self.ctx.accounts:
-                        # If a match is found, fill out the required parameters
-                        if (tx_signer_address == account["address"].hex()):
-                            signer_address = account["address"]
-                            signer_key_id = account["key_id"]
-                            signer = account["signer"]
+                # The account configuration keeps the accounts indexed by address, so this is a single lookup, service account included
+                proposer_account: AccountRecord = self.ctx.getAccount(address=tx_signer_address)
 
                 # Check if a valid signer account was found in the meantime
-                if (signer_address == None or signer_key_id == None or signer == None):
+                if (proposer_account == None):
                     raise Exception(f"Unable to configure a signer object for account {tx_signer_address}. The account is not configured for network {self.ctx.access_node_host}:{self.ctx.access_node_port}")
-                
-                proposer = await client.get_account_at_latest_block(
-                    address=signer_address.bytes
-                )
-                
-                proposal_key = ProposalKey(
-                    key_address=signer_address,
-                    key_id=signer_key_id,
-                    key_sequence_number=proposer.keys[0].sequence_number
-                )
 
-                # Begin the construction of the Tx object
-                tx_object: Tx = Tx(
-                    code=tx_code,
-                    reference_block_id=latest_block.id,
-                    payer=signer_address,
-                    proposal_key=proposal_key
-                )
+                payer_account: AccountRecord = None
+                authorizers = [proposer_account.address]
 
-                # Run a loop to add all the arguments provided to the tx_object. This arguments need to be provided already in the expected "cadence" format that 
-                # the transaction script expects. This function does not have the necessary context to make this determination.
-                for argument in tx_arguments:
-                    tx_object = tx_object.add_arguments(argument)
-                
-                # Finish the object by adding the authorizers and envelope signature objects to it
-                tx_object = tx_object.add_authorizers(signer_address)
-                tx_object = tx_object.with_envelope_signature(
-                    address=signer_address,
-                    key_id=signer_key_id,
-                    signer=signer
-                )
-
-                # Done. Return it
-                return tx_object
-            
             # Default case: use the proposer, payer, and authoriser provided to build the transaction
             else:
                 # Grab the parameters needed to build and sign the transaction object
-                if (tx_proposer_address == self.ctx.service_account["address"].hex()):
-                    proposer_address = self.ctx.service_account["address"]
-                    proposer_key_id = self.ctx.service_account["key_id"]
-                    proposer_signer = self.ctx.service_account["signer"]
-                else:
-                    for account in self.ctx.accounts:
-                        if(tx_proposer_address == account["address"].hex()):
-                            proposer_address = account["address"]
-                            proposer_key_id = account["key_id"]
-                            proposer_signer = account["signer"]
-
-                if (tx_payer_address == self.ctx.service_account["address"].hex()):
-                    payer_address = self.ctx.service_account["address"]
-                    payer_key_id = self.ctx.service_account["key_id"]
-                    payer_signer = self.ctx.service_account["signer"]
-                else:
-                    for account in self.ctx.accounts:
-                        if(tx_payer_address == account["address"].hex()):
-                            payer_address = account["address"]
-                            payer_key_id = account["key_id"]
-                            payer_signer = account["signer"]
-                
+                proposer_account: AccountRecord = self.ctx.getAccount(address=tx_proposer_address)
+                payer_account: AccountRecord = self.ctx.getAccount(address=tx_payer_address)
+
+                if (payer_account == None):
+                    raise Exception(f"Unable to configure payer object for account {tx_payer_address}. The account is not configured for network {self.ctx.access_node_host}:{self.ctx.access_node_port}")
+
+                # Authorizers that are not configured in this network are skipped, as before
                 authorizers = []
                 for tx_authorizer in tx_authorizers:
-                    if (tx_authorizer == self.ctx.service_account["address"].hex()):
-                        authorizers.append(self.ctx.service_account["address"])
-                    else:
-                        for account in self.ctx.accounts:
-                            if (tx_authorizer == account["address"].hex()):
-                                authorizers.append(account["address"])
-                
+                    authorizer_account: AccountRecord = self.ctx.getAccount(address=tx_authorizer)
+
+                    if (authorizer_account != None):
+                        authorizers.append(authorizer_account.address)
+
                 # Validate the proposer object
-                if (proposer_address == None or proposer_key_id == None or proposer_signer == None):
+                if (proposer_account == None):
                     raise Exception(f"Unable to configure proposer object for account {tx_proposer_address}. The account is not configured for network {self.ctx.access_node_host}:{self.ctx.access_node_port}")
-                
-                proposer = await client.get_account_at_latest_block(
-                    address=proposer_address.bytes
-                )
 
-                proposal_key = ProposalKey(
+            # Grab a free proposal key from the proposer account. This waits if all the account keys are being used by other transactions, and it must happen before a client
+            # is borrowed from the pool: the transactions holding the keys need a client to be sent, and release their keys only after that. The key is released once the
+            # transaction is submitted
+            proposal_key_entry: dict = await self.key_scheduler.acquireKey(account=proposer_account)
+            proposer_address = proposer_account["address"]
+            proposer_key_id = proposal_key_entry["key_id"]
+            proposer_signer = proposal_key_entry["signer"]
+
+            reserved_key = (proposer_address, proposer_key_id)
+
+            # Only hold the client for the network calls
+            async with borrowFlowClient(
+                host=self.ctx.access_node_host, port=self.ctx.access_node_port
+            ) as client:
+                # The reference block is cached for a while, since Flow accepts reference blocks that are a few hundred blocks behind
+                reference_block_id: bytes = await sequence_manager.getReferenceBlockId(client=client)
+
+                # The sequence number is tracked locally and only read from the network the first time this key is used, or after a failed transaction
+                proposal_key: ProposalKey = ProposalKey(
                     key_address=proposer_address,
                     key_id=proposer_key_id,
-                    key_sequence_number=proposer.keys[0].sequence_number
+                    key_sequence_number=await sequence_manager.reserveSequenceNumber(client=client, address=proposer_address, key_id=proposer_key_id)
                 )
 
-                # Build the Tx object
-                tx_object: Tx = Tx(
-                    code=tx_code,
-                    reference_block_id=latest_block.id,
-                    payer=payer_address,
-                    proposal_key=proposal_key
-                )
+            # Begin the construction of the Tx object
+            tx_object: Tx = Tx(
+                code=tx_code,
+                reference_block_id=reference_block_id,
+                payer=payer_account.address if payer_account != None else proposer_address,
+                proposal_key=proposal_key
+            )
 
-                # Add the arguments to the object
-                for argument in tx_arguments:
-                    tx_object = tx_object.add_arguments(argument)
+            # Run a loop to add all the arguments provided to the tx_object. This arguments need to be provided already in the expected "cadence" format that
+            # the transaction script expects. This function does not have the necessary context to make this determination.
+            for argument in tx_arguments:
+                tx_object = tx_object.add_arguments(argument)
 
-                # Add authorisers in the cadence.Address format
-                for authorizer in authorizers:
-                    tx_object.add_authorizers(authorizer)
-                
+            # Add authorisers in the cadence.Address format
+            for authorizer in authorizers:
+                tx_object = tx_object.add_authorizers(authorizer)
+
+            if (payer_account == None):
+                # The signer signs the envelope with the proposal key it was given
+                tx_object = tx_object.with_envelope_signature(
+                    address=proposer_address,
+                    key_id=proposer_key_id,
+                    signer=proposer_signer
+                )
+            else:
                 # In the case where the payer, proposer, and authoriser are different entities, the payer signs the envelope
                 tx_object = tx_object.with_envelope_signature(
-                    address=payer_address,
-                    key_id=payer_key_id,
-                    signer=payer_signer
+                    address=payer_account.address,
+                    key_id=payer_account.key_id,
+                    signer=payer_account.signer
                 )
 
                 # And the proposer signs the payload. I guess this is the signature that goes into the "prepare" block
@@ -255,10 +241,60 @@ class TransactionRunner():
                     signer=proposer_signer
                 )
 
-                # Done
-                return tx_object
+            # Done. Return it
+            return tx_object
+
+        except Exception:
+            if (reserved_key != None):
+                self.key_scheduler.releaseKey(address=reserved_key[0], key_id=reserved_key[1])
+                sequence_manager.invalidate(address=reserved_key[0], key_id=reserved_key[1])
+            raise
 
     
+    async def sendTransaction(self, tx_object: Tx) -> asyncio.Future:
+        """
+        Function to send a transaction to the network without waiting for it to be sealed. The result is retrieved later on, together with the results of every other
+        pending transaction, by the process-wide result poller. The proposal key of the transaction stays busy until then: Flow does not guarantee that the transactions
+        from the same key are executed in the order they were sent, so a key with more than one transaction in flight gets sequence number mismatches.
+
+        :param tx_object (Tx): This function requires a previously prepared Tx-type object.
+
+        :returns (asyncio.Future): A future that resolves to the TransactionResultResponse once the transaction is sealed, or that raises an Exception if it failed.
+        """
+        try:
+            async with borrowFlowClient(
+                host=self.ctx.access_node_host, port=self.ctx.access_node_port
+            ) as client:
+                send_response: entities.SendTransactionResponse = await client.send_transaction(transaction=tx_object.to_signed_grpc())
+        except Exception as e:
+            log.error(f"Unable to send transaction from account {tx_object.payer.hex()}: ")
+            log.error(e)
+            # The transaction may or may not have reached the network, so the proposal key gets re-synced before the next transaction
+            sequence_manager.handleSubmitError(tx_object=tx_object, error=e)
+            self.key_scheduler.releaseKey(address=tx_object.proposal_key.key_address, key_id=tx_object.proposal_key.key_id)
+            raise e
+
+        tx_future: asyncio.Future = getResultPoller(host=self.ctx.access_node_host, port=self.ctx.access_node_port).track(tx_id=send_response.id)
+        tx_future.add_done_callback(lambda done_future: self.onTransactionDone(tx_object=tx_object, tx_future=done_future))
+
+        return tx_future
+
+
+    def onTransactionDone(self, tx_object: Tx, tx_future: asyncio.Future) -> None:
+        """Internal callback that frees the proposal key of a transaction once its result is known. If the transaction failed, the key is re-synced before the next
+        transaction. Since the key had no other transaction in flight, the sequence number read from the network is the right one.
+
+        :param tx_object (Tx): The transaction sent.
+        :param tx_future (asyncio.Future): The future returned by the result poller for the transaction.
+        """
+        if (tx_future.cancelled()):
+            sequence_manager.invalidate(address=tx_object.proposal_key.key_address, key_id=tx_object.proposal_key.key_id)
+        elif (tx_future.exception() != None):
+            sequence_manager.handleSubmitError(tx_object=tx_object, error=tx_future.exception())
+
+        self.key_scheduler.releaseKey(address=tx_object.proposal_key.key_address, key_id=tx_object.proposal_key.key_id)
+
+
     async def submitTransaction(self, tx_object: Tx) -> entities.TransactionResultResponse:
         """
         Simple internal function to abstract all the logic to submit a transaction for execution and process any raised errors. This is always the same process for most transactions, therefore it is best to encode it into a single function.
@@ -267,15 +303,15 @@ class TransactionRunner():
 
         :returns (TransactionResultResponse): An object that encapsules all the state changes related to the transaction executed, including events.
         """
+        tx_future: asyncio.Future = await self.sendTransaction(tx_object=tx_object)
+
         try:
-            async with flow_client(
-                host=self.ctx.access_node_host, port=self.ctx.access_node_port
-            ) as client:
-                tx_response: entities.TransactionResultResponse = await client.execute_transaction(tx=tx_object, wait_for_seal=True)
+            tx_response: entities.TransactionResultResponse = await tx_future
 
-                return tx_response
+            return tx_response
         except Exception as e:
-            log.error(f"Unable to execute transaction from account {tx_object.payer.hex()}: ")
+            # The proposal key was already re-synced and released by onTransactionDone
+            log.error(f"Transaction from account {tx_object.payer.hex()} failed: ")
             log.error(e)
             # Propagate the Exception upwards for additional treatment
             raise e
@@ -332,24 +368,27 @@ class TransactionRunner():
         tx_object: Tx = await self.getTransaction(tx_name=tx_name, tx_arguments=tx_arguments, tx_signer_address=tx_signer_address)
         tx_object = tx_object.with_gas_limit(int(self.config.get(section="gas", option="limit")))
 
-        if (storage_results_file_path):
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Election {election_name} - pre creation", output_file_path=storage_results_file_path, account=tx_signer_address)
 
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_file_path):
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Election {election_name} - post creation", output_file_path=storage_results_file_path, account=tx_signer_address)
 
         
         # Grab only the latest ElectionCreated event
-        election_created_events: list[dict] = await self.event_runner.getElectionCreatedEvents(tx_response=tx_response)
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        election_created_events: list[dict] = decoded_events["ElectionStandard.ElectionCreated"]
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_file_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"Election {election_name} created", output_file_path=gas_results_file_path)
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"Election {election_name} created", output_file_path=gas_results_file_path)
         
         return election_created_events[0]["election_id"]
 
@@ -369,22 +408,25 @@ class TransactionRunner():
         tx_object: Tx = await self.getTransaction(tx_name=tx_name, tx_arguments=tx_arguments, tx_signer_address=tx_signer_address)
         tx_object.with_gas_limit(gas_limit=int(self.config.get(section="gas", option="limit")))
 
-        if (storage_results_file_path):
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Election id {election_id} - pre destruction", output_file_path=storage_results_file_path, account=tx_signer_address)
         
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_file_path):
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Election id {election_id} - post destruction", output_file_path=storage_results_file_path, account=tx_signer_address)
 
-        election_destroyed_events: list[dict] = await self.event_runner.getElectionDestroyedEvents(tx_response=tx_response)
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        election_destroyed_events: list[dict] = decoded_events["ElectionStandard.ElectionDestroyed"]
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_file_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"Election id {election_id} destroyed", output_file_path=gas_results_file_path)
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"Election id {election_id} destroyed", output_file_path=gas_results_file_path)
 
         for election_destroyed_event in election_destroyed_events:
             log.info(f"Election {election_destroyed_event["election_id"]} with {election_destroyed_event["ballots_stored"]} Ballots inside destroyed")
@@ -425,23 +467,26 @@ class TransactionRunner():
         tx_object: Tx = await self.getTransaction(tx_name=tx_name, tx_arguments=tx_arguments, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizers=tx_authorizer_address)
 
         voter_address: str = (tx_signer_address or tx_proposer_address)
-        if (storage_results_file_path):
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"VoteBox account {voter_address} - pre creation", output_file_path=storage_results_file_path, account=tx_proposer_address)
 
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_file_path):
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"VoteBox account {voter_address} - post creation", output_file_path=storage_results_file_path, account=tx_proposer_address)
 
         # Grab the VoteBoxCreated event list
-        votebox_created_events: list[dict[str:str]] = await self.event_runner.getVoteBoxCreatedEvents(tx_response=tx_response)
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        votebox_created_events: list[dict[str:str]] = decoded_events["VoteBoxStandard.VoteBoxCreated"]
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_file_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"VoteBox account {voter_address} creation", output_file_path=gas_results_file_path)
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"VoteBox account {voter_address} creation", output_file_path=gas_results_file_path)
 
 
         log.info(f"VoteBox created for account {voter_address}")
@@ -487,22 +532,25 @@ class TransactionRunner():
 
         voter_address: str = (tx_signer_address or tx_proposer_address)
 
-        if (storage_results_file_path):
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"VoteBox account {voter_address} - pre destruction", output_file_path=storage_results_file_path, account=tx_proposer_address)
 
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_file_path):
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"VoteBox account {voter_address} - post destruction", output_file_path=storage_results_file_path, account=tx_proposer_address)
 
-        votebox_destroyed_events: list[dict] = await self.event_runner.getVoteBoxBurnedEvents(tx_response=tx_response)
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        votebox_destroyed_events: list[dict] = decoded_events["VoteBoxStandard.VoteBoxBurned"]
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_file_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"VoteBox account {voter_address} deletion", output_file_path=gas_results_file_path)
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"VoteBox account {voter_address} deletion", output_file_path=gas_results_file_path)
 
         log.info(f"Successfully destroyed the VoteBox from account {voter_address}")
         return votebox_destroyed_events
@@ -534,28 +582,228 @@ class TransactionRunner():
 
         tx_object: Tx = await self.getTransaction(tx_name=tx_name, tx_arguments=tx_arguments, tx_signer_address=tx_signer_address)
 
-        if (storage_results_file_path):
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot for account {tx_signer_address} - pre creation", output_file_path=storage_results_file_path, account=tx_signer_address)
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot for account {recipient_address} - pre creation", output_file_path=storage_results_file_path, account=recipient_address)
 
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_file_path):
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot for account {tx_signer_address} - post creation", output_file_path=storage_results_file_path, account=tx_signer_address)
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot for account {recipient_address} - post creation", output_file_path=storage_results_file_path, account=recipient_address)
 
-        ballot_created_events: list[dict] = await self.event_runner.getBallotCreatedEvents(tx_response=tx_response)
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        ballot_created_events: list[dict] = decoded_events["BallotStandard.BallotCreated"]
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_file_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"Ballot for account {recipient_address} creation", output_file_path=gas_results_file_path)
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"Ballot for account {recipient_address} creation", output_file_path=gas_results_file_path)
 
         return ballot_created_events
     
 
+    def getBallotBatchSize(self) -> int:
+        """Function to compute how many Ballots can be minted in a single 16_create_ballots transaction without going over the gas limit set in the config file. The computation
+        cost of each Ballot mint, as well as the fixed cost of the transaction itself, are estimates set in the [batch_mint] config section.
+
+        :return (int): The maximum number of recipients per batch transaction. Always at least 1.
+        """
+        gas_limit: int = int(self.config.get(section="gas", option="limit"))
+        computation_per_ballot: int = self.config.getint(section="batch_mint", option="computation_per_ballot", fallback=150)
+        computation_overhead: int = self.config.getint(section="batch_mint", option="computation_overhead", fallback=100)
+
+        return max(1, (gas_limit - computation_overhead) // computation_per_ballot)
+
+
+    async def createBallots(self, election_id: int, recipient_addresses: list[str], tx_signer_address: str, gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> dict[str:dict]:
+        """Function to create and deposit one ballot resource into the votebox of each one of the accounts identified by the recipient addresses provided. This is the batched
+        version of createBallot: the recipients are split into chunks that fit within the gas limit set in the config file (see getBallotBatchSize) and each chunk is minted with
+        a single transaction. If a chunk still exceeds the computation limit, it is split in half and tried again. A chunk that fails is logged and does not affect the others.
+
+        :param election_id (int): The identifier for the Election that these Ballots should be associated to.
+        :param recipient_addresses (list[str]): The addresses of the accounts with the VoteBoxes where the Ballots should be deposited into.
+        :param tx_signer_address (str): The address of the account that can authorize these transactions with a digital signature.
+        :param gas_results_file_path (pathlib.Path): A valid path to a file to where the gas calculations should be written into. If None is provided, the function skips the gas analysis.
+        :param storage_results_file_path (pathlib.Path): A valid path to a file where the storage computations should be written into. If None is provided, the function skips the storage analysis.
+        :return (dict[str:dict]): Returns the BallotStandard.BallotCreated event parameters per recipient address, in the format
+        {
+            recipient_address: {
+                "ballot_id": int,
+                "linked_election_id": int
+            }
+        }
+        with None for the recipients that did not get a Ballot, i.e., every recipient provided is in the dictionary.
+        """
+        tx_name: str = "16_create_ballots"
+
+        # Normalise the recipient addresses, i.e., remove the "0x" prefix if present, to use them as keys in the dictionary to return
+        recipients: list[str] = [recipient_address[2:] if recipient_address[0:2] == "0x" else recipient_address for recipient_address in recipient_addresses]
+
+        if (len(recipients) == 0):
+            return {}
+
+        def collectBallots(chunks: list[list[str]], chunk_results: list) -> list[dict]:
+            # Same as in createAccounts: chunks that failed are logged and get None events, so that the Ballots already minted are never thrown away because of another one
+            chunk_events: list[dict] = []
+
+            for chunk, chunk_result in zip(chunks, chunk_results):
+                if (isinstance(chunk_result, BaseException)):
+                    log.error(f"Unable to mint a batch of {len(chunk)} Ballots: {chunk_result}")
+                    chunk_events.extend([None] * len(chunk))
+                else:
+                    chunk_events.extend(chunk_result)
+
+            return chunk_events
+
+        async def mintChunk(chunk: list[str]) -> list[dict]:
+            tx_arguments: list = [
+                cadence.UInt64(election_id),
+                cadence.Array([cadence.Address.from_hex(f"0x{recipient}") for recipient in chunk])
+            ]
+
+            tx_object: Tx = await self.getTransaction(tx_name=tx_name, tx_arguments=tx_arguments, tx_signer_address=tx_signer_address)
+            tx_object = tx_object.with_gas_limit(gas_limit=int(self.config.get(section="gas", option="limit")))
+
+            profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+            if (profile_storage):
+                await self.script_runner.profile_all_accounts_csv(program_stage=f"Batch of {len(chunk)} Ballots - pre creation", output_file_path=storage_results_file_path, account=tx_signer_address)
+
+            try:
+                tx_start: int = time.time_ns()
+                tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
+                tx_end: int = time.time_ns()
+            except Exception as e:
+                error_message: str = str(e).lower()
+
+                # If the batch was too big after all, split it in two and try again
+                if (len(chunk) > 1 and error_message.__contains__("computation") and error_message.__contains__("limit")):
+                    log.warning(f"Batch of {len(chunk)} Ballots exceeded the computation limit. Splitting it in two...")
+                    middle: int = len(chunk) // 2
+                    chunk_halves: list[list[str]] = [chunk[:middle], chunk[middle:]]
+                    chunk_results: list = await asyncio.gather(*[mintChunk(chunk_half) for chunk_half in chunk_halves], return_exceptions=True)
+
+                    return collectBallots(chunks=chunk_halves, chunk_results=chunk_results)
+
+                raise e
+
+            if (profile_storage):
+                await self.script_runner.profile_all_accounts_csv(program_stage=f"Batch of {len(chunk)} Ballots - post creation", output_file_path=storage_results_file_path, account=tx_signer_address)
+
+            decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+            ballot_created_events: list[dict] = decoded_events["BallotStandard.BallotCreated"]
+            tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+            fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
+
+            if (gas_results_file_path):
+                Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"Batch of {len(chunk)} Ballots creation", output_file_path=gas_results_file_path)
+
+            if (len(ballot_created_events) != len(chunk)):
+                log.warning(f"Expected {len(chunk)} BallotCreated events from a batch mint but got {len(ballot_created_events)} instead!")
+
+            # The BallotCreated events are emitted in the same order as the recipient addresses in the chunk. Recipients without an event get None
+            return (ballot_created_events + [None] * len(chunk))[0:len(chunk)]
+
+        batch_size: int = self.getBallotBatchSize()
+        chunks: list[list[str]] = [recipients[index:index + batch_size] for index in range(0, len(recipients), batch_size)]
+
+        # Chunks run concurrently. The key scheduler decides how many of these actually run at the same time, based on the number of proposal keys of the signer account
+        chunk_results: list = await asyncio.gather(*[mintChunk(chunk) for chunk in chunks], return_exceptions=True)
+
+        return dict(zip(recipients, collectBallots(chunks=chunks, chunk_results=chunk_results)))
+
+
+    async def createAccounts(self, public_keys: list[str], proposal_keys: int, amount: float, tx_signer_address: str, batch_size: int = 50, gas_results_file_path: pathlib.Path = None) -> list[str]:
+        """Function to create one new account per public key provided, and fund each one with the amount provided, with one transaction per batch of keys. If a batch exceeds
+        the computation limit, it is split in half and tried again, as in createBallots.
+
+        :param public_keys (list[str]): The hex encoded, uncompressed, ECDSA_P256 public keys of the accounts to create.
+        :param proposal_keys (int): The number of times each public key is added to its account, i.e., the number of proposal keys of each new account.
+        :param amount (float): The amount of FLOW token to deposit into each new account.
+        :param tx_signer_address (str): The address of the account that pays for the new accounts and for the funding.
+        :param batch_size (int): The maximum number of accounts created per transaction.
+        :param gas_results_file_path (pathlib.Path): A valid path to a file to where the gas calculations should be written into. If None is provided, the function skips the gas analysis.
+
+        :return (list[str]): The addresses of the new accounts, without the '0x' prefix, in the same order as the public keys, with None for the keys whose accounts were not
+        created. A batch that fails is logged and does not affect the others.
+        """
+        if (amount < 0):
+            raise Exception(f"ERROR: Invalid FLOW amount provided: {amount}. Please provide a positive float value for this parameter!")
+
+        if (proposal_keys < 1):
+            raise Exception(f"ERROR: Invalid number of proposal keys provided: {proposal_keys}. Each account needs at least one key!")
+
+        tx_name: str = "18_create_accounts"
+
+        if (len(public_keys) == 0):
+            return []
+
+        def collectAddresses(chunks: list[list[str]], chunk_results: list) -> list[str]:
+            # Chunks that failed are logged and get None addresses, so that the ones already created are never thrown away because of another one
+            chunk_addresses: list[str] = []
+
+            for chunk, chunk_result in zip(chunks, chunk_results):
+                if (isinstance(chunk_result, BaseException)):
+                    log.error(f"Unable to create a batch of {len(chunk)} accounts: {chunk_result}")
+                    chunk_addresses.extend([None] * len(chunk))
+                else:
+                    chunk_addresses.extend(chunk_result)
+
+            return chunk_addresses
+
+        async def createChunk(chunk: list[str]) -> list[str]:
+            tx_arguments: list = [
+                cadence.Array([cadence.String(public_key) for public_key in chunk]),
+                cadence.UInt8(proposal_keys),
+                # cadence.UFix64 takes the fixed point value already scaled by 10^8, i.e., 1.0 FLOW is UFix64(100000000)
+                cadence.UFix64(int(round(amount * 10**8)))
+            ]
+
+            tx_object: Tx = await self.getTransaction(tx_name=tx_name, tx_arguments=tx_arguments, tx_signer_address=tx_signer_address)
+            tx_object = tx_object.with_gas_limit(gas_limit=int(self.config.get(section="gas", option="limit")))
+
+            try:
+                tx_start: int = time.time_ns()
+                tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
+                tx_end: int = time.time_ns()
+            except Exception as e:
+                error_message: str = str(e).lower()
+
+                if (len(chunk) > 1 and error_message.__contains__("computation") and error_message.__contains__("limit")):
+                    log.warning(f"Batch of {len(chunk)} accounts exceeded the computation limit. Splitting it in two...")
+                    middle: int = len(chunk) // 2
+                    chunk_halves: list[list[str]] = [chunk[:middle], chunk[middle:]]
+                    chunk_results: list = await asyncio.gather(*[createChunk(chunk_half) for chunk_half in chunk_halves], return_exceptions=True)
+
+                    return collectAddresses(chunks=chunk_halves, chunk_results=chunk_results)
+
+                raise e
+
+            decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+            account_created_events: list[dict] = decoded_events["flow.AccountCreated"]
+
+            if (gas_results_file_path):
+                Utils.processTransactionData(fees_deducted_events=decoded_events["FlowFees.FeesDeducted"], tokens_withdrawn_events=decoded_events["FungibleToken.Withdrawn"], elapsed_time=(tx_end - tx_start), tx_description=f"Batch of {len(chunk)} accounts creation", output_file_path=gas_results_file_path)
+
+            # Without one event per key there is no telling which address belongs to which key
+            if (len(account_created_events) != len(chunk)):
+                raise Exception(f"ERROR: Expected {len(chunk)} AccountCreated events from a batch of accounts but got {len(account_created_events)} instead!")
+
+            return [account_created_event["address"] for account_created_event in account_created_events]
+
+        chunks: list[list[str]] = [public_keys[index:index + batch_size] for index in range(0, len(public_keys), batch_size)]
+
+        # As with createBallots, the key scheduler decides how many of these run at the same time, based on the number of proposal keys of the signer account
+        chunk_results: list = await asyncio.gather(*[createChunk(chunk) for chunk in chunks], return_exceptions=True)
+
+        return collectAddresses(chunks=chunks, chunk_results=chunk_results)
+    
+
     async def castBallot(self, election_id: int, new_option: str, tx_signer_address: str, tx_proposer_address: str, tx_payer_address: str, tx_authorizer_address: list[str], gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> None:
         """Function to set the option provided as the 'new_option' argument in a Ballot cast for the Election identified with the election_id provided, for a VoteBox in the account that digitally signs this transaction.
 
@@ -592,23 +840,24 @@ class TransactionRunner():
         tx_object: Tx = await self.getTransaction(tx_name=tx_name, tx_arguments=tx_arguments, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizers=tx_authorizer_address)
 
         voter_address = (tx_signer_address or tx_proposer_address)
-        if (storage_results_file_path):
-            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot from {voter_address} - pre cast", output_file_path=storage_results_file_path, account=voter_address)
-            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot from {voter_address} - pre cast", output_file_path=storage_results_file_path, account=tx_payer_address)
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+        if (profile_storage):
+            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot from {voter_address} - pre cast", output_file_path=storage_results_file_path, account=[voter_address, tx_payer_address])
 
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_file_path):
-            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot from {voter_address} - post cast", output_file_path=storage_results_file_path, account=voter_address)
-            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot from {voter_address} - post cast", output_file_path=storage_results_file_path, account=tx_payer_address)
+        if (profile_storage):
+            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot from {voter_address} - post cast", output_file_path=storage_results_file_path, account=[voter_address, tx_payer_address])
 
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_file_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"Voter {voter_address} ballot casting", output_file_path=gas_results_file_path)
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"Voter {voter_address} ballot casting", output_file_path=gas_results_file_path)
 
     
     async def submitBallot(self, election_id: int, tx_signer_address: str = None, tx_proposer_address: str = None, tx_payer_address: str = None, tx_authorizer_address: list[str] = [], gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> list[dict]:
@@ -646,34 +895,46 @@ class TransactionRunner():
 
         voter_address: str = (tx_signer_address or tx_proposer_address)
         
-        if (storage_results_file_path):
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot account {tx_payer_address} - pre submission", output_file_path=storage_results_file_path, account=tx_payer_address)
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot account {voter_address} - pre submission", output_file_path=storage_results_file_path, account=tx_proposer_address)
 
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_file_path):
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot accounts {tx_payer_address} - post submission", output_file_path=storage_results_file_path, account=tx_payer_address)
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot accounts {voter_address} - post submission", output_file_path=storage_results_file_path, account=tx_proposer_address)
 
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+
+        # Retrieve the fee events
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
+
+        if (gas_results_file_path):
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"Ballot account {voter_address} - submission", output_file_path=gas_results_file_path)
+
+        return self.getBallotSubmissionEvents(decoded_events=decoded_events, voter_address=voter_address)
+
+
+    def getBallotSubmissionEvents(self, decoded_events: dict[str:list[dict]], voter_address: str) -> list[dict]:
+        """Internal function to pick the events that confirm a Ballot submission, from the decoded events of either a submitBallot or a vote transaction.
+
+        :param decoded_events (dict[str:list[dict]]): The decoded events of the transaction, as returned by EventRunner.decodeEvents.
+        :param voter_address (str): The address of the voter, for the error messages.
+        :return (list[dict]): Either the BallotSubmitted or the BallotReplaced events, depending which operation was triggered.
+        """
         # This transaction can trigger either a BallotSubmitted or a BallotReplaced event depending on the state of the user's VoteBox.
         # If no Ballots exist for the current_election_id, this submission triggers the BallotSubmitted event. But if this Ballot
         # replaces a previously submitted one, then this transaction triggers the BallotReplaced instead
-
-        # Start by grabbing the BallotSubmitted event for this transaction
-        ballot_submitted_events: list[dict] = await self.event_runner.getBallotSubmittedEvents(tx_response=tx_response)
+        ballot_submitted_events: list[dict] = decoded_events["ElectionStandard.BallotSubmitted"]
 
         # And the respective BallotReplaced event as well. If all goes well, I should have only one item in either one of these lists.
-        ballot_replaced_events: list[dict] = await self.event_runner.getBallotReplacedEvents(tx_response=tx_response)
-
-        # Retrieve the remaining events
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
-
-        if (gas_results_file_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"Ballot account {voter_address} - submission", output_file_path=gas_results_file_path)
+        ballot_replaced_events: list[dict] = decoded_events["ElectionStandard.BallotReplaced"]
 
         # Case 1: I have one BallotSubmitted event and 0 BallotReplaced. The transaction submitted the first Ballot to the VoteBox resource
         if (len(ballot_submitted_events) > 0 and len(ballot_replaced_events) == 0):
@@ -692,8 +953,71 @@ class TransactionRunner():
             raise Exception(f"ERROR: Transaction did not triggered any BallotSubmitted or BallotReplaced events!")
         else:
             # Something else happened
-            raise Exception(f"ERROR: Ballot submission for account {tx_signer_address} failed!")
-        
+            raise Exception(f"ERROR: Ballot submission for account {voter_address} failed!")
+
+
+    async def vote(self, election_id: int, new_option: str, ballot_receipt: int, tx_signer_address: str = None, tx_proposer_address: str = None, tx_payer_address: str = None, tx_authorizer_address: list[str] = [], gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> list[dict]:
+        """Function to cast, submit and add the receipt of a Ballot in a single transaction, i.e., castBallot, submitBallot and addBallotReceipt rolled into one. The voter
+        waits for one sealed transaction instead of three, pays the inclusion fees once, and the Ballot can never end up cast but not submitted, or submitted without a receipt.
+
+        :param election_id (int): The election identifier to select the ballot to vote with.
+        :param new_option (str): The new value to set the ballot's option to.
+        :param ballot_receipt (int): The ballot receipt to add to the VoteBox internal receipt dictionary.
+        :param tx_signer_address (str): The address of the account that can authorize this transaction with a digital signature.
+        :param tx_proposer_address (str): The address of the account that proposes the transaction.
+        :param tx_payer_address (str): The address of the account that pays for the network and gas fees for the transaction.
+        :param tx_authorizer_address (list[str]): The list of addresses for the accounts that provide the authorizations defined in the "prepare" block of the transaction.
+        :param gas_results_file_path (pathlib.Path): A valid path to a file to where the gas calculations should be written into. If None is provided, the function skips the gas analysis.
+        :param storage_results_file_path (pathlib.Path): A valid path to a file where the storage computations should be written into. If None is provided, the function skips the storage analysis.
+        :return (list[dict]): If successful, this function returns either the BallotSubmitted or the BallotReplaced events, same as submitBallot.
+        """
+        # Validate signature inputs
+        if (tx_signer_address == None and (tx_proposer_address == None or tx_payer_address == None or len(tx_authorizer_address) == 0)):
+            error_msg = "ERROR: Missing signature elements to run the transaction:\n"
+
+            if (tx_proposer_address == None):
+                error_msg += "tx_proposer_address\n"
+
+            if (tx_payer_address == None):
+                error_msg += "tx_payer_address\n"
+
+            if (len(tx_authorizer_address) == 0):
+                error_msg += "tx_authorizer_address\n"
+
+            raise Exception(error_msg)
+
+        tx_name: str = "17_vote"
+        tx_arguments: list = [
+            cadence.UInt64(election_id),
+            cadence.String(new_option),
+            cadence.UInt64(ballot_receipt)
+        ]
+
+        tx_object: Tx = await self.getTransaction(tx_name=tx_name, tx_arguments=tx_arguments, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizers=tx_authorizer_address)
+
+        voter_address: str = (tx_signer_address or tx_proposer_address)
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+        if (profile_storage):
+            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot from {voter_address} - pre vote", output_file_path=storage_results_file_path, account=[voter_address, tx_payer_address])
+
+        tx_start: int = time.time_ns()
+        tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
+        tx_end: int = time.time_ns()
+
+        if (profile_storage):
+            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot from {voter_address} - post vote", output_file_path=storage_results_file_path, account=[voter_address, tx_payer_address])
+
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
+
+        if (gas_results_file_path):
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"Voter {voter_address} vote (cast, submit and receipt)", output_file_path=gas_results_file_path)
+
+        return self.getBallotSubmissionEvents(decoded_events=decoded_events, voter_address=voter_address)
+
+
     
     async def tallyElection(self, election_id: int, tx_signer_address: str, gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> list[dict]:
         """
@@ -710,22 +1034,25 @@ class TransactionRunner():
         tx_object: Tx = await self.getTransaction(tx_name=tx_name, tx_arguments=tx_arguments, tx_signer_address=tx_signer_address)
         tx_object = tx_object.with_gas_limit(gas_limit=int(self.config.get(section="gas", option="limit")))
  
-        if (storage_results_file_path):
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Election {election_id} - pre tally", output_file_path=storage_results_file_path, account=tx_signer_address)
 
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_file_path):
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Election {election_id} - post tally", output_file_path=storage_results_file_path, account=tx_signer_address)
 
-        ballots_withdrawn_events: list[dict] = await self.event_runner.getBallotsWithdrawnEvents(tx_response=tx_response)
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        ballots_withdrawn_events: list[dict] = decoded_events["ElectionStandard.BallotsWithdrawn"]
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_file_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"Election {election_id} tally", output_file_path=gas_results_file_path)
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"Election {election_id} tally", output_file_path=gas_results_file_path)
 
         return ballots_withdrawn_events
 
@@ -765,21 +1092,24 @@ class TransactionRunner():
 
         tx_object: Tx = await self.getTransaction(tx_name=tx_name, tx_arguments=tx_arguments, tx_signer_address=tx_signer_address)
         
-        if (storage_results_file_path):
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Election {election_id} - pre finish", output_file_path=storage_results_file_path, account=tx_signer_address)
 
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_file_path):
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"Election {election_id} - post finish", output_file_path=storage_results_file_path, account=tx_signer_address)
 
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_file_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"Election {election_id} finished", output_file_path=gas_results_file_path)
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"Election {election_id} finished", output_file_path=gas_results_file_path)
 
 
     async def addBallotReceipt(self, election_id: int, ballot_receipt: int, tx_signer_address: str = None, tx_proposer_address: str = None, tx_payer_address: str = None, tx_authorizer_address: list[str] = [], gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> None:
@@ -801,23 +1131,24 @@ class TransactionRunner():
         tx_object: Tx = await self.getTransaction(tx_name=tx_name, tx_arguments=tx_arguments, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizers=tx_authorizer_address)
         
         voter_address: str = (tx_signer_address or tx_proposer_address)
-        if (storage_results_file_path):
-            await self.script_runner.profile_all_accounts_csv(program_stage=f"{voter_address} ballot receipt - pre addition", output_file_path=storage_results_file_path, account=voter_address)
-            await self.script_runner.profile_all_accounts_csv(program_stage=f"{voter_address} ballot receipt - pre addition", output_file_path=storage_results_file_path, account=tx_payer_address)
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
 
-        self.tx_start = time.time_ns()
+        if (profile_storage):
+            await self.script_runner.profile_all_accounts_csv(program_stage=f"{voter_address} ballot receipt - pre addition", output_file_path=storage_results_file_path, account=[voter_address, tx_payer_address])
+
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_file_path):
-            await self.script_runner.profile_all_accounts_csv(program_stage=f"{voter_address} ballot receipt - post addition", output_file_path=storage_results_file_path, account=voter_address)
-            await self.script_runner.profile_all_accounts_csv(program_stage=f"{voter_address} ballot receipt - post addition", output_file_path=storage_results_file_path, account=tx_payer_address)
+        if (profile_storage):
+            await self.script_runner.profile_all_accounts_csv(program_stage=f"{voter_address} ballot receipt - post addition", output_file_path=storage_results_file_path, account=[voter_address, tx_payer_address])
 
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_file_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"Account {voter_address} added ballot receipt", output_file_path=gas_results_file_path)
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"Account {voter_address} added ballot receipt", output_file_path=gas_results_file_path)
 
     
     async def removeBallotReceipt(self, election_id: int, ballot_receipt: int, tx_signer_address: str = None, tx_proposer_address: str = None, tx_payer_address: str = None, tx_authorizer_address: list[str] = [], gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> None:
@@ -840,21 +1171,24 @@ class TransactionRunner():
 
         voter_address: str = (tx_signer_address or tx_proposer_address)
 
-        if (storage_results_file_path):
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"{voter_address} ballot receipt - pre deletion", output_file_path=storage_results_file_path, account=voter_address)
 
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_file_path):
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"{voter_address} ballot receipt - post deletion", output_file_path=storage_results_file_path, account=voter_address)
 
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_file_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"Account {voter_address} removed ballot receipt", output_file_path=gas_results_file_path)
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"Account {voter_address} removed ballot receipt", output_file_path=gas_results_file_path)
 
 
     async def delegateBallot(self, election_id: int, recipient_address: str, tx_signer_address: str, tx_proposer_address: str, tx_payer_address: str, tx_authorizer_address: list[str], gas_results_file_path: pathlib.Path, storage_results_file_path: pathlib.Path) -> None:
@@ -879,29 +1213,30 @@ class TransactionRunner():
         tx_proposer_address: str = (tx_signer_address or tx_proposer_address)
         tx_payer_address: str = (tx_signer_address or tx_payer_address)
 
-        if (storage_results_file_path):
-            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot Delegation to {recipient_address} - pre delegation", output_file_path=storage_results_file_path, account=tx_payer_address)
-            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot Delegation to {recipient_address} - pre delegation", output_file_path=storage_results_file_path, account=recipient_address)
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+        if (profile_storage):
+            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot Delegation to {recipient_address} - pre delegation", output_file_path=storage_results_file_path, account=[tx_payer_address, recipient_address])
 
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
         
-        if (storage_results_file_path):
-            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot Delegation to {recipient_address} - post delegation", output_file_path=storage_results_file_path, account=tx_payer_address)
-            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot Delegation to {recipient_address} - post delegation", output_file_path=storage_results_file_path, account=recipient_address)
+        if (profile_storage):
+            await self.script_runner.profile_all_accounts_csv(program_stage=f"Ballot Delegation to {recipient_address} - post delegation", output_file_path=storage_results_file_path, account=[tx_payer_address, recipient_address])
 
-            # Grab all the events
-            ballot_delegated_events: list[dict] = await self.event_runner.getBallotDelegatedEvents(tx_response=tx_response)
-            fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
-            tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
+        # Grab all the events
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        ballot_delegated_events: list[dict] = decoded_events["VoteBoxStandard.BallotDelegated"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
 
-            if (gas_results_file_path):
-                Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"Ballot Delegation from {tx_payer_address} to {recipient_address}", output_file_path=gas_results_file_path)
+        if (gas_results_file_path):
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"Ballot Delegation from {tx_payer_address} to {recipient_address}", output_file_path=gas_results_file_path)
 
-            # Print out the results
-            for ballot_delegated_event in ballot_delegated_events:
-                log.info(f"Ballot for election {ballot_delegated_event["election_id"]} delegated successfully from account {ballot_delegated_event["delegator_address"]} to account {ballot_delegated_event["recipient_address"]}")
+        # Print out the results
+        for ballot_delegated_event in ballot_delegated_events:
+            log.info(f"Ballot for election {ballot_delegated_event["election_id"]} delegated successfully from account {ballot_delegated_event["delegator_address"]} to account {ballot_delegated_event["recipient_address"]}")
 
     
     async def cleanupVoteBooth(self, tx_signer_address: str, gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> None:
@@ -915,25 +1250,28 @@ class TransactionRunner():
         tx_arguments: list = []
         tx_object: Tx = await self.getTransaction(tx_name=tx_name, tx_arguments=tx_arguments, tx_signer_address=tx_signer_address)
 
-        if (storage_results_file_path):
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_file_path)
+
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"VoteBooth - pre cleanup", output_file_path=storage_results_file_path, account=tx_signer_address)
 
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_file_path):
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"VoteBooth - post cleanup", output_file_path=storage_results_file_path, account=tx_signer_address)
 
         # Grab all the events
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
-        election_destroyed_events: list[dict] = await self.event_runner.getElectionDestroyedEvents(tx_response=tx_response)
-        election_index_destroyed_events: list[dict] = await self.event_runner.getElectionIndexDestroyedEvents(tx_response=tx_response)
-        votebooth_printer_admin_destroyed_events: list[dict] = await self.event_runner.getVoteBoothPrinterAdminDestroyedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
+        election_destroyed_events: list[dict] = decoded_events["ElectionStandard.ElectionDestroyed"]
+        election_index_destroyed_events: list[dict] = decoded_events["VoteBooth.ElectionIndexDestroyed"]
+        votebooth_printer_admin_destroyed_events: list[dict] = decoded_events["VoteBooth.VoteBoothPrinterAdminDestroyed"]
 
         if (gas_results_file_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"VoteBooth - cleanup", output_file_path=gas_results_file_path)
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"VoteBooth - cleanup", output_file_path=gas_results_file_path)
 
         # It is easier to do all the log.info printing from this side
         log.info(f"Successfully deleted {len(election_destroyed_events)} Elections from the VoteBooth contract in account {tx_signer_address}:")
@@ -970,7 +1308,8 @@ class TransactionRunner():
 
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
 
-        token_deposited_events: list[dict] = await self.event_runner.getTokensDepositedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        token_deposited_events: list[dict] = decoded_events["FlowToken.TokensDeposited"]
 
         # Run the script to get the balance of all accounts, including the service_account
         current_accounts: dict = {
@@ -1024,22 +1363,25 @@ class TransactionRunner():
 
         voter_address: str = (tx_signer_address or tx_proposer_address)
 
-        if (storage_results_input_path):
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_input_path)
+
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"VoteBox from {voter_address}, Ballot from Election {election_id} - pre deletion", output_file_path=storage_results_input_path, account=tx_proposer_address)
 
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_input_path):
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"VoteBox from {voter_address}, Ballot from Election {election_id} - post deletion", output_file_path=storage_results_input_path, account=tx_proposer_address)
 
-        ballots_burned_events: list[dict] = await self.event_runner.getBallotBurnedEvents(tx_response=tx_response)
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        ballots_burned_events: list[dict] = decoded_events["BallotStandard.BallotBurned"]
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_input_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"VoteBox from {voter_address}, Ballot from Election {election_id} deleted")
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"VoteBox from {voter_address}, Ballot from Election {election_id} deleted", output_file_path=gas_results_input_path)
 
         for ballot_burned_event in ballots_burned_events:
             log.info(f"Ballot {ballot_burned_event["ballot_id"]} attached to election {ballot_burned_event["linked_election_id"]}")
@@ -1076,22 +1418,25 @@ class TransactionRunner():
         
         voter_address: str = (tx_signer_address or tx_proposer_address)
 
-        if (storage_results_input_path):
+        profile_storage: bool = self.shouldProfileStorage(storage_results_file_path=storage_results_input_path)
+
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"VoteBox from account {voter_address} - pre cleanup", output_file_path=storage_results_input_path, account=tx_proposer_address)
 
-        self.tx_start = time.time_ns()
+        tx_start: int = time.time_ns()
         tx_response: entities.TransactionResultResponse = await self.submitTransaction(tx_object=tx_object)
-        self.tx_end = time.time_ns()
+        tx_end: int = time.time_ns()
 
-        if (storage_results_input_path):
+        if (profile_storage):
             await self.script_runner.profile_all_accounts_csv(program_stage=f"VoteBox from account {voter_address} - post cleanup", output_file_path=storage_results_input_path, account=tx_proposer_address)
 
-        ballot_burned_events: list[dict] = await self.event_runner.getBallotBurnedEvents(tx_response=tx_response)
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        ballot_burned_events: list[dict] = decoded_events["BallotStandard.BallotBurned"]
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_input_path):
-            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(self.tx_end - self.tx_start), tx_description=f"VoteBox from account {voter_address} cleanup", output_file_path=gas_results_input_path)
+            Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"VoteBox from account {voter_address} cleanup", output_file_path=gas_results_input_path)
 
         for ballot_burned_event in ballot_burned_events:
             log.info(f"Ballot {ballot_burned_event["ballot_id"]} attached to election {ballot_burned_event["linked_election_id"]}")
@@ -239,8 +239,9 @@ class DeployContract():
             log.error(e)
             exit(-1)
 
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_file_path):
             Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description="BallotStandard deployment", output_file_path=gas_results_file_path)
@@ -266,8 +267,9 @@ class DeployContract():
             log.error(e)
             exit(-1)
 
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_file_path):
             Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description="ElectionStandard deployment", output_file_path=gas_results_file_path)
@@ -293,8 +295,9 @@ class DeployContract():
             log.error(e)
             exit(-1)
 
-        tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-        fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+        decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+        tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+        fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
         if (gas_results_file_path):
             Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description="VoteBoxStandard deployment", output_file_path=gas_results_file_path)
@@ -321,18 +324,19 @@ class DeployContract():
             # that are needed to process the events properly. This needs to happen before running any of the event capturing routines or it will fail
             self.event_runner.configureDeployerAddress()
 
-            election_index_created_events: list[dict] = await self.event_runner.getElectionIndexCreatedEvents(tx_response=tx_response)
+            decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+            election_index_created_events: list[dict] = decoded_events["VoteBooth.ElectionIndexCreated"]
 
             for election_index_created_event in election_index_created_events:
                 log.info(f"ElectionIndex created for account {election_index_created_event["account_address"]}")
 
-            votebooth_printer_admin_created_events: list[dict[str:str]] = await self.event_runner.getVoteBoothPrinterAdminCreatedEvents(tx_response=tx_response)
+            votebooth_printer_admin_created_events: list[dict[str:str]] = decoded_events["VoteBooth.VoteBoothPrinterAdminCreated"]
             
             for votebooth_printer_admin_created_event in votebooth_printer_admin_created_events:
                 log.info(f"VoteBoothPrinterAdmin created for account {votebooth_printer_admin_created_event["account_address"]}")
 
-            tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-            fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+            tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+            fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
             if (gas_results_file_path):
                 Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description="VoteBooth deployment", output_file_path=gas_results_file_path)
@@ -442,8 +446,9 @@ class DeleteContract():
             log.info(f"Contract '{project_contract}' deleted successfully!")
 
 
-            tokens_withdrawn_events: list[dict] = await self.event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-            fees_deducted_events: list[dict] = await self.event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+            decoded_events: dict[str:list[dict]] = await self.event_runner.decodeEvents(tx_response=tx_response)
+            tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+            fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
             if (gas_results_file_path):
                 Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"{project_contract} contract removal", output_file_path=gas_results_file_path)
@@ -3,11 +3,14 @@ import os
 import pathlib
 import configparser
 import random
+import base64
 
 from cryptography.hazmat.primitives.asymmetric import rsa, padding, ec
 from cryptography.hazmat.primitives import hashes
-from cryptography.exceptions import InvalidSignature
+from cryptography.exceptions import InvalidSignature, InvalidTag
 from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.backends import default_backend
 
 import logging
@@ -19,6 +22,14 @@ config = configparser.ConfigParser()
 config.read(config_path)
 str_encoding = config.get(section="encryption", option="encoding")
 
+# Ballot options encrypted with the hybrid scheme (ephemeral ECDH + AES-GCM) are stored with this prefix in front of the base64 text. The prefix is not part of the base64
+# alphabet, so ballots without it are the original RSA-OAEP ones (version 1) and both kinds can be decrypted from the same Election
+hybrid_ballot_tag: str = "v2:"
+hybrid_key_info: bytes = b"VoteBooth ballot option v2"
+
+# Each ballot uses a new ephemeral key, hence a new AES key, so a fixed nonce is safe and saves 12 bytes per ballot
+hybrid_nonce: bytes = bytes(12)
+
 
 test_message: str = "This is ballot option nr 19820301"
 
@@ -65,6 +76,95 @@ class CryptoUtils():
         return encrypted_message
 
 
+    def derive_hybrid_key(shared_secret: bytes, ephemeral_public_bytes: bytes) -> bytes:
+        """Internal function to derive the AES-256 key of a hybrid ballot from the ECDH shared secret. The ephemeral public key goes into the HKDF salt, which binds the
+        AES key to it.
+
+        :param shared_secret (bytes): The ECDH shared secret.
+        :param ephemeral_public_bytes (bytes): The ephemeral public key, in compressed point format.
+
+        :return (bytes): The 32 byte AES key.
+        """
+        return HKDF(algorithm=hashes.SHA256(), length=32, salt=ephemeral_public_bytes, info=hybrid_key_info).derive(shared_secret)
+
+
+    def hybrid_encrypt_message(plaintext_message: str, public_key: ec.EllipticCurvePublicKey) -> bytes:
+        """Function to encrypt a message with an ephemeral ECDH key agreement, on the curve of the public key provided, and AES-256-GCM. The result is the ephemeral public
+        key (33 bytes, compressed) followed by the AES-GCM ciphertext and tag, i.e., 49 bytes plus the message length, against the 256 bytes of RSA-2048-OAEP.
+
+        :param plaintext_message (str): The message to encrypt.
+        :param public_key (ec.EllipticCurvePublicKey): The recipient public key, e.g., from generate_ec_key_pair.
+
+        :return (bytes): The encrypted message.
+        """
+        ephemeral_private_key: ec.EllipticCurvePrivateKey = ec.generate_private_key(curve=public_key.curve, backend=default_backend())
+        ephemeral_public_bytes: bytes = ephemeral_private_key.public_key().public_bytes(encoding=serialization.Encoding.X962, format=serialization.PublicFormat.CompressedPoint)
+
+        aes_key: bytes = CryptoUtils.derive_hybrid_key(shared_secret=ephemeral_private_key.exchange(ec.ECDH(), public_key), ephemeral_public_bytes=ephemeral_public_bytes)
+
+        return ephemeral_public_bytes + AESGCM(aes_key).encrypt(nonce=hybrid_nonce, data=bytes(plaintext_message, encoding=str_encoding), associated_data=None)
+
+
+    def hybrid_decrypt_message(ciphertext_message: bytes, private_key: ec.EllipticCurvePrivateKey) -> bytes:
+        """Function to decrypt a message encrypted with hybrid_encrypt_message.
+
+        :param ciphertext_message (bytes): The encrypted message.
+        :param private_key (ec.EllipticCurvePrivateKey): The recipient private key.
+
+        :return (bytes): The decrypted message.
+        """
+        # Compressed points take one byte more than the curve size, in bytes
+        point_size: int = (private_key.curve.key_size + 7) // 8 + 1
+        ephemeral_public_bytes: bytes = ciphertext_message[:point_size]
+
+        try:
+            ephemeral_public_key: ec.EllipticCurvePublicKey = ec.EllipticCurvePublicKey.from_encoded_point(curve=private_key.curve, data=ephemeral_public_bytes)
+            aes_key: bytes = CryptoUtils.derive_hybrid_key(shared_secret=private_key.exchange(ec.ECDH(), ephemeral_public_key), ephemeral_public_bytes=ephemeral_public_bytes)
+
+            return AESGCM(aes_key).decrypt(nonce=hybrid_nonce, data=ciphertext_message[point_size:], associated_data=None)
+        except (ValueError, InvalidTag):
+            raise Exception("Unable to decrypt message!")
+
+
+    def encrypt_ballot_option(plaintext_option: str, public_key) -> str:
+        """Function to encrypt a salted ballot option into the text stored on chain. The scheme depends on the Election public key: RSA keys produce the original base64
+        encoded RSA-OAEP ciphertext, and elliptic curve keys produce a hybrid_ballot_tag prefixed, base64 encoded, hybrid_encrypt_message ciphertext.
+
+        :param plaintext_option (str): The salted ballot option.
+        :param public_key (rsa.RSAPublicKey | ec.EllipticCurvePublicKey): The Election public encryption key.
+
+        :return (str): The encrypted ballot option, ready to be cast.
+        """
+        if (isinstance(public_key, ec.EllipticCurvePublicKey)):
+            return hybrid_ballot_tag + str(base64.b64encode(CryptoUtils.hybrid_encrypt_message(plaintext_message=plaintext_option, public_key=public_key)), encoding=str_encoding)
+
+        return str(base64.b64encode(CryptoUtils.encrypt_message(plaintext_message=plaintext_option, public_key=public_key)), encoding=str_encoding)
+
+
+    def decrypt_ballot_option(encrypted_option: str, private_key) -> str:
+        """Function to decrypt a ballot option produced by encrypt_ballot_option, with either scheme.
+
+        :param encrypted_option (str): The encrypted ballot option, as stored on chain.
+        :param private_key (rsa.RSAPrivateKey | ec.EllipticCurvePrivateKey): The Election private encryption key.
+
+        :return (str): The salted ballot option.
+        """
+        if (encrypted_option.startswith(hybrid_ballot_tag)):
+            if (not isinstance(private_key, ec.EllipticCurvePrivateKey)):
+                raise Exception("Unable to decrypt a hybrid encrypted ballot option without an elliptic curve private key!")
+
+            ciphertext: bytes = base64.b64decode(bytes(encrypted_option[len(hybrid_ballot_tag):], encoding=str_encoding))
+
+            return str(CryptoUtils.hybrid_decrypt_message(ciphertext_message=ciphertext, private_key=private_key), encoding=str_encoding)
+
+        if (not isinstance(private_key, rsa.RSAPrivateKey)):
+            raise Exception("Unable to decrypt an RSA encrypted ballot option without an RSA private key!")
+
+        ciphertext: bytes = base64.b64decode(bytes(encrypted_option, encoding=str_encoding))
+
+        return str(CryptoUtils.decrypt_message(ciphertext_message=ciphertext, private_key=private_key), encoding=str_encoding)
+
+
     def decrypt_message(ciphertext_message: str, private_key) -> str:
         try:
             decrypted_message: str = private_key.decrypt(
@@ -158,6 +258,16 @@ class CryptoUtils():
             return private_key
         
 
+    def load_private_key_from_bytes(key_bytes: bytes) -> rsa.RSAPrivateKey:
+        private_key = serialization.load_pem_private_key(
+            data=key_bytes,
+            password=None,
+            backend=default_backend()
+        )
+
+        return private_key
+
+
     def load_public_key_from_file(filename:str) -> rsa.RSAPublicKey:
         file_path: pathlib.Path = pathlib.Path(os.getcwd()).joinpath("keys", filename)
 
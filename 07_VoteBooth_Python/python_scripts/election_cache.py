@@ -0,0 +1,211 @@
+"""Module with a process-wide cache for the Election metadata that does not change during the Election lifetime.
+
+The voter runners used to run isElectionFree, getElectionOptions and getPublicEncryptionKey for every voter, and CryptoUtils.load_public_key_from_string re-parsed the same
+PEM string for every ballot cast. This cache keeps, per election_id, the free flag, the options and the public encryption key, already deserialized, and fetches the three
+of them concurrently the first time an Election is requested. Entries expire after a configurable TTL and are dropped as soon as this process sees an ElectionCreated or
+ElectionDestroyed event for the same election_id, either in a transaction result or from the EventIndexer.
+"""
+import asyncio
+import configparser
+import os
+import pathlib
+import time
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from common.utils import Utils
+from python_scripts.cadence_scripts import ScriptRunner
+from python_scripts.crypto_management import CryptoUtils
+from python_scripts.event_management import addEventListener
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+config_path = pathlib.Path(os.getcwd()).joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+
+class ElectionMetadata(object):
+    """The cached parameters of one Election.
+    """
+    __slots__ = ("election_id", "free", "options", "public_key_string", "public_key", "fetched_at")
+
+    def __init__(self, election_id: int, free: bool, options: dict[int:str], public_key_string: str, public_key: rsa.RSAPublicKey) -> None:
+        """
+        :param election_id (int): The election identifier.
+        :param free (bool): True if the service account pays for the voter transactions in this Election.
+        :param options (dict[int:str]): The election options, as returned by ScriptRunner.getElectionOptions.
+        :param public_key_string (str): The public encryption key, in PEM format.
+        :param public_key (rsa.RSAPublicKey): The same public encryption key, deserialized. Elections that use hybrid ballot encryption have an ec.EllipticCurvePublicKey instead.
+        """
+        self.election_id: int = election_id
+        self.free: bool = free
+        self.options: dict[int:str] = options
+        self.public_key_string: str = public_key_string
+        self.public_key: rsa.RSAPublicKey = public_key
+        self.fetched_at: float = time.monotonic()
+
+
+class ElectionMetadataCache(object):
+    """Per election_id cache of ElectionMetadata objects. Concurrent requests for an Election that is not cached yet share the same fetch.
+    """
+    def __init__(self, ttl: float = None) -> None:
+        """
+        :param ttl (float): Seconds after which a cached entry is fetched again. 0 keeps the entries until they are invalidated by an event.
+        """
+        super().__init__()
+        self.ttl: float = ttl if ttl != None else config.getfloat(section="election_cache", option="ttl", fallback=300.0)
+
+        self.elections: dict[int, ElectionMetadata] = {}
+
+        # Deserialized public keys, by PEM string. Different Election objects can share the same key, and the key string alone is enough to avoid parsing it again
+        self.public_keys: dict[str, rsa.RSAPublicKey] = {}
+
+        # Fetches in progress, in a {election_id: asyncio.Task} format. Tasks are bound to an event loop, so these are dropped when the loop changes
+        self.loop: asyncio.AbstractEventLoop = None
+        self.fetches: dict[int, asyncio.Task] = {}
+
+        # The ScriptRunner is only built on the first fetch, since it loads the whole account configuration
+        self.script_runner: ScriptRunner = None
+
+
+    def checkLoop(self) -> None:
+        """Internal function to drop the fetches in progress if the running event loop changed since the last call.
+        """
+        current_loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+        if (self.loop is not current_loop):
+            self.loop = current_loop
+            self.fetches = {}
+
+
+    def isFresh(self, election_metadata: ElectionMetadata) -> bool:
+        """Internal function to check if a cached entry is still within its TTL.
+
+        :param election_metadata (ElectionMetadata): The cached entry.
+
+        :return (bool): True if the entry can still be used.
+        """
+        return (self.ttl <= 0 or time.monotonic() - election_metadata.fetched_at < self.ttl)
+
+
+    def loadPublicKey(self, key_string: str) -> rsa.RSAPublicKey:
+        """Function to deserialize a public encryption key, only once per PEM string.
+
+        :param key_string (str): The public key, in PEM format.
+
+        :return (rsa.RSAPublicKey): The deserialized key.
+        """
+        if (key_string not in self.public_keys):
+            self.public_keys[key_string] = CryptoUtils.load_public_key_from_string(key_string=key_string)
+
+        return self.public_keys[key_string]
+
+
+    async def fetchElection(self, election_id: int) -> ElectionMetadata:
+        """Internal function to retrieve the Election parameters from the network, with the three scripts running concurrently.
+
+        :param election_id (int): The election identifier.
+
+        :return (ElectionMetadata): The new cache entry.
+        """
+        if (self.script_runner == None):
+            self.script_runner = ScriptRunner()
+
+        free_election, election_options, public_key_string = await asyncio.gather(
+            self.script_runner.isElectionFree(election_id=election_id),
+            self.script_runner.getElectionOptions(election_id=election_id),
+            self.script_runner.getPublicEncryptionKey(election_id=election_id)
+        )
+
+        election_metadata: ElectionMetadata = ElectionMetadata(
+            election_id=election_id,
+            free=free_election,
+            options=election_options,
+            public_key_string=public_key_string,
+            public_key=self.loadPublicKey(key_string=public_key_string)
+        )
+
+        self.elections[election_id] = election_metadata
+        log.debug(f"Cached the metadata for Election {election_id}")
+
+        return election_metadata
+
+
+    async def getElection(self, election_id: int) -> ElectionMetadata:
+        """Function to retrieve the parameters of an Election, from the cache if possible.
+
+        :param election_id (int): The election identifier.
+
+        :return (ElectionMetadata): The Election parameters.
+        """
+        election_metadata: ElectionMetadata = self.elections.get(election_id)
+
+        if (election_metadata != None and self.isFresh(election_metadata=election_metadata)):
+            return election_metadata
+
+        self.checkLoop()
+
+        if (election_id not in self.fetches or self.fetches[election_id].done()):
+            self.fetches[election_id] = asyncio.create_task(self.fetchElection(election_id=election_id))
+
+        fetch_task: asyncio.Task = self.fetches[election_id]
+
+        try:
+            # Shield the fetch so that a cancelled caller does not cancel it for everybody else waiting on it
+            return await asyncio.shield(fetch_task)
+        finally:
+            if (fetch_task.done() and self.fetches.get(election_id) is fetch_task):
+                self.fetches.pop(election_id)
+
+
+    def putElection(self, election_id: int, free: bool, options: dict[int:str], public_key_string: str) -> ElectionMetadata:
+        """Function to add an Election that was created by this process, and whose parameters are already known, to the cache.
+
+        :param election_id (int): The election identifier.
+        :param free (bool): True if the service account pays for the voter transactions in this Election.
+        :param options (dict[int:str]): The election options.
+        :param public_key_string (str): The public encryption key, in PEM format.
+
+        :return (ElectionMetadata): The new cache entry.
+        """
+        election_metadata: ElectionMetadata = ElectionMetadata(
+            election_id=election_id,
+            free=free,
+            options=options,
+            public_key_string=public_key_string,
+            public_key=self.loadPublicKey(key_string=public_key_string)
+        )
+
+        self.elections[election_id] = election_metadata
+
+        return election_metadata
+
+
+    def invalidate(self, election_id: int = None) -> None:
+        """Function to drop a cached Election, or every cached Election if no election_id is provided.
+
+        :param election_id (int): The election identifier.
+        """
+        if (election_id == None):
+            self.elections = {}
+        elif (self.elections.pop(election_id, None) != None):
+            log.debug(f"Dropped the cached metadata for Election {election_id}")
+
+
+    def onEvents(self, decoded_events: dict[str:list[dict]]) -> None:
+        """Event listener that drops the cached Elections that were created or destroyed. Election ids are not reused on chain, but a redeployed contract starts
+        counting again, which is why ElectionCreated events invalidate as well.
+
+        :param decoded_events (dict[str:list[dict]]): The decoded events, grouped by their '<contract>.<event>' key, as returned by EventRunner.decodeEvents.
+        """
+        for event_key in ("ElectionStandard.ElectionCreated", "ElectionStandard.ElectionDestroyed"):
+            for decoded_event in decoded_events.get(event_key, []):
+                self.invalidate(election_id=int(decoded_event["election_id"]))
+
+
+# Single cache for the whole process, shared by the Election objects and the runners
+election_cache: ElectionMetadataCache = ElectionMetadataCache()
+addEventListener(election_cache.onEvents)
@@ -3,9 +3,11 @@ from python_scripts.cadence_scripts import ScriptRunner
 from python_scripts.cadence_transactions import TransactionRunner
 from python_scripts.event_management import EventRunner
 from python_scripts.crypto_management import CryptoUtils
+from python_scripts.tally_engine import TallyEngine
+from python_scripts.election_cache import election_cache
 from common.utils import Utils
+from common.receipt_store import receipt_store
 import configparser
-import base64
 from flow_py_sdk import cadence
 
 
@@ -74,7 +76,6 @@ class Election(object):
             election_public_key=new_election_public_key,
             election_storage_path=new_election_storage_path,
             election_public_path=new_election_public_path,
-            free_election=free_election,
             tx_signer_address=new_tx_signer_address,
             gas_results_file_path=gas_results_file_path,
             storage_results_file_path=storage_results_file_path
@@ -92,6 +93,9 @@ class Election(object):
         # The election options also
         self.election_options = new_election_options
 
+        # This process already knows everything about the new election, so there is no need for the runners to fetch it again
+        election_cache.putElection(election_id=election_id, free=free_election, options=new_election_options, public_key_string=new_election_public_key)
+
         return election_id
     
 
@@ -120,6 +124,9 @@ class Election(object):
 
         for election_destroyed_event in election_destroyed_events:
             log.info(f"Successfully destroyed Election with id {election_destroyed_event["election_id"]}. It had {election_destroyed_event["ballots_stored"]} ballots in it")
+
+        # The Election is gone, so its receipts have nothing left to be validated against
+        receipt_store.removeElection(election_id=self.election_id)
         
         # Election destroyed. Set the internal election_id to None and return the old value back
         self.election_id = None
@@ -206,6 +213,29 @@ class Election(object):
             log.error(e)
 
     
+    async def mint_ballots_to_voteboxes(self, votebox_addresses: list[str], tx_signer_address: str, gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> dict[str:dict]:
+        """Function to mint a new Ballot for each one of the VoteBoxes in the accounts provided, in batches, instead of one transaction per account as in mint_ballot_to_votebox. If the Election class in question does not have an active election in it, this function raises an Exception.
+
+        :param votebox_addresses (list[str]): The account addresses to where the new Ballots are to be deposited to. These accounts should have a VoteBox resource already configured in them.
+        :param tx_signer_address (str): The account address to use to digitally sign the transactions.
+        :param gas_results_file_path (pathlib.Path): A valid path to a file to where the gas calculations should be written into. If None is provided, the function skips the gas analysis.
+        :param storage_results_file_path (pathlib.Path): A valid path to a file where the storage computations should be written into. If None is provided, the function skips the storage analysis.
+        :return (dict[str:dict]): Returns the BallotStandard.BallotCreated event parameters per account address, as returned by TransactionRunner.createBallots, with None for the accounts that did not get a Ballot.
+        """
+        if (self.election_id == None):
+            raise Exception(f"ERROR: This Election instance does not have an active election in it!")
+
+        ballots_created: dict[str:dict] = await self.tx_runner.createBallots(election_id=self.election_id, recipient_addresses=votebox_addresses, tx_signer_address=tx_signer_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
+        failed_addresses: list[str] = [votebox_address for votebox_address, ballot_created_event in ballots_created.items() if ballot_created_event == None]
+
+        log.info(f"Successfully created {len(ballots_created) - len(failed_addresses)} Ballots attached to Election {self.election_id}")
+
+        if (len(failed_addresses) > 0):
+            log.error(f"Unable to create a new Ballot to {len(failed_addresses)} accounts: {", ".join(failed_addresses)}")
+
+        return ballots_created
+
+    
     async def cast_ballot(self, option_to_set: str, tx_signer_address: str = None, tx_proposer_address: str = None, tx_payer_address: str = None, tx_authorizer_address: list[str] = None, gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> int:
         """Function to cast a Ballot stored in the VoteBox resource in the account from the tx_signer_address provided with the encrypted and salted version of the option provided, as long as a Ballot exists for the election_id configured in the current Election object. This function also salts and encrypts the option provided before setting it in the Ballot.option in question.
         :param option_to_set (str): The option to set the Ballot to, as defined in the election options set values.
@@ -231,18 +261,16 @@ class Election(object):
         salted_option: str = option_to_set + self.option_separator + str(option_salt)
 
         # Encrypt this option with the public encryption key set in this class instance
-        # Retrieve the RSAPublicKey object from the public key string
-        current_public_key = CryptoUtils.load_public_key_from_string(key_string=self.election_public_encryption_key)
+        # Retrieve the public key object (RSA or elliptic curve) from the public key string. The election cache only parses each key string once
+        current_public_key = election_cache.loadPublicKey(key_string=self.election_public_encryption_key)
 
-        # Use the reconstructed key to encrypt the salted option
-        encrypted_salted_option: str = CryptoUtils.encrypt_message(
-            plaintext_message=salted_option,
+        # Use the reconstructed key to encrypt the salted option. RSA keys produce the original RSA-OAEP ballots and elliptic curve keys the smaller hybrid ones
+        base64_option: str = CryptoUtils.encrypt_ballot_option(
+            plaintext_option=salted_option,
             public_key=current_public_key
         )
 
-        base64_option: str = base64.b64encode(encrypted_salted_option)
-
-        await self.tx_runner.castBallot(election_id=self.election_id, new_option=str(base64_option, encoding=self.encoding), tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=tx_authorizer_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
+        await self.tx_runner.castBallot(election_id=self.election_id, new_option=base64_option, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=tx_authorizer_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
 
         log.info(f"Successfully cast a Ballot for account {voter_address} and for election {self.election_id}")
 
@@ -267,6 +295,15 @@ class Election(object):
 
         voter_address: str = (tx_signer_address or tx_proposer_address)
 
+        self.log_ballot_submission(ballot_submitted_events=ballot_submitted_events, voter_address=voter_address)
+
+
+    def log_ballot_submission(self, ballot_submitted_events: list[dict], voter_address: str) -> None:
+        """Internal function to report the BallotSubmitted or BallotReplaced events returned by a ballot submission.
+
+        :param ballot_submitted_events (list[dict]): The events returned by TransactionRunner.submitBallot or TransactionRunner.vote.
+        :param voter_address (str): The address of the voter that submitted the Ballot.
+        """
         for ballot_submitted_event in ballot_submitted_events:
             # Test the dictionary structure returned to determine which event was triggered
             if "ballot_id" in ballot_submitted_event:
@@ -281,6 +318,42 @@ class Election(object):
                 raise Exception("ERROR: Submitted a ballot but it did not triggered a BallotSubmitted nor a BallotReplaced event!")
     
 
+    async def vote(self, option_to_set: str, tx_signer_address: str = None, tx_proposer_address: str = None, tx_payer_address: str = None, tx_authorizer_address: list[str] = None, gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> int:
+        """Function that does the same as cast_ballot followed by submit_ballot, plus the addition of the ballot receipt to the VoteBox, in one single transaction. The
+        Ballot must have been minted to the voter's VoteBox beforehand, as with cast_ballot.
+
+        :param option_to_set (str): The option to set the Ballot to, as defined in the election options set values.
+        :param tx_signer_address (str): The account address to use to digitally sign the transaction.
+        :param tx_proposer_address (str): The address of the account that proposes the transaction.
+        :param tx_payer_address (str): The address of the account that pays for the network and gas fees for the transaction.
+        :param tx_authorizer_address (list[str]): The list of addresses for the accounts that provide the authorizations defined in the "prepare" block of the transaction.
+        :param gas_results_file_path (pathlib.Path): A valid path to a file to where the gas calculations should be written into. If None is provided, the function skips the gas analysis.
+        :param storage_results_file_path (pathlib.Path): A valid path to a file where the storage computations should be written into. If None is provided, the function skips the storage analysis.
+        :return (int): If successful, this function returns the random salt used to obfuscate the Ballot option, which is also the receipt stored in the VoteBox.
+        """
+        if (self.election_id == None):
+            raise Exception(f"ERROR: This Election instance does not have an active election yet!")
+        elif (self.election_public_encryption_key == None):
+            raise Exception(f"ERROR: This Election class does not have a public encryption key set yet!")
+
+        voter_address: str = (tx_signer_address or tx_proposer_address)
+
+        # Salt and encrypt the option exactly as cast_ballot does
+        option_salt: int = CryptoUtils.generate_random_salt()
+        salted_option: str = option_to_set + self.option_separator + str(option_salt)
+
+        base64_option: str = CryptoUtils.encrypt_ballot_option(
+            plaintext_option=salted_option,
+            public_key=election_cache.loadPublicKey(key_string=self.election_public_encryption_key)
+        )
+
+        ballot_submitted_events: list[dict] = await self.tx_runner.vote(election_id=self.election_id, new_option=base64_option, ballot_receipt=option_salt, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=(tx_authorizer_address or []), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
+
+        self.log_ballot_submission(ballot_submitted_events=ballot_submitted_events, voter_address=voter_address)
+
+        return option_salt
+
+
     async def tally_election(self, private_encryption_key_name: str, tx_signer_address: str, gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> dict[str: int]:
         """
         Function to trigger the end of the election by processing their ballots, retrieving the ballot.options, decrypting and processing them, tallying the results and producing the winning option. This function also sets the function as finished.
@@ -302,56 +375,13 @@ class Election(object):
         for ballots_withdrawn_event in ballots_withdrawn_events:
             log.info(f"Election {ballots_withdrawn_event["election_id"]} tallied after processing {ballots_withdrawn_event["ballots_withdrawn"]} ballots.")
 
-        # Fetch the election results, namely the array of encrypted ballot options
-        encrypted_ballots: list[str] = await self.script_runner.getElectionEncryptedBallots(election_id=self.election_id)
-
-        # Recover the private encryption key from the path provided
-        private_key = CryptoUtils.load_private_key_from_file(private_encryption_key_name)
-
-        # Decrypt the ballot options. These were base64 encoded initially, so they need to be decoded before decrypting
-        decrypted_ballot_options: list[bytes] = []
-
-        for encrypted_ballot in encrypted_ballots:
-            # Decode the ballot option from a string first
-            bytes_ballot_option: bytes = bytes(encrypted_ballot, encoding=self.encoding)
-            decoded_ballot_option = base64.b64decode(bytes_ballot_option)
-
-            decrypted_ballot_option: str = CryptoUtils.decrypt_message(ciphertext_message=decoded_ballot_option, private_key=private_key)
-
-            decrypted_ballot_options.append(str(decrypted_ballot_option, encoding=self.encoding))
-        
-        # All the ballots are decrypted. Run another loop to split them from the salt, put it to another array and start counting options
-        election_options_tally: dict[str:int] = {}
-        # Pre-fill the election_options_tally with the current election options (values) as the keys for this dictionary and set each value, the vote counter
-        # to 0 to start counting
-        for election_option in self.election_options:
-            election_options_tally[self.election_options[election_option]] = 0
-        
-        # Create an entry for invalid options as well
-        election_options_tally["invalid"] = 0
-
-        ballot_receipts: list[int] = []
-
-        for decrypted_ballot_option in decrypted_ballot_options:
-            # Split the decrypted ballot option by the character used to concatenate the option with the random salt
-            option_elements: list[str] = decrypted_ballot_option.split(self.option_separator)
-
-            # I expect 2 and exactly 2 elements from the string split before. Anything different than that is a problem!
-            if (len(option_elements) != 2):
-                log.error(f"ERROR: Found a illegally formatted ballot option: {decrypted_ballot_option}! Unable to process it further. Skipping...")
-                continue
-
-            # If the current option retrieved is among the ones in the tally dictionary
-            if (option_elements[0] in election_options_tally):
-                # Increase the tally by 1
-                election_options_tally[option_elements[0]] += 1
-            else:
-                # Count it as an "invalid" one and log its contents for debug purposes
-                election_options_tally["invalid"] += 1
-                log.warning("CAUTION: Retrieved a Ballot with an invalid option: {option}. Ballot counted as 'invalid'")
+        # Fetch the election results, namely the array of encrypted ballot options, one page at a time. The pages are fed to the tally engine as they arrive, so the
+        # whole array is never held in memory
+        encrypted_ballots = self.script_runner.iterateElectionEncryptedBallots(election_id=self.election_id)
 
-            # Put the receipts in another return array
-            ballot_receipts.append(int(option_elements[1]))
+        # Decrypt and count the ballots in parallel, with a pool of worker processes
+        tally_engine: TallyEngine = TallyEngine(election_options=self.election_options, private_encryption_key_name=private_encryption_key_name)
+        election_options_tally, ballot_receipts = await tally_engine.tally(encrypted_ballots=encrypted_ballots)
 
         # Set this election instance election_results parameter with the results computed so far before returning the results
         self.election_results = election_options_tally
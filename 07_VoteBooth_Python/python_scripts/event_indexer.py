@@ -0,0 +1,348 @@
+"""Module with a background indexer for the VoteBooth events.
+
+EventRunner.getEventsByName only looks at the latest block, which misses events as soon as the network seals more than one block between the transaction and the query.
+The EventIndexer in here walks the chain with get_events_for_height_range, in windows of a configurable number of blocks, decodes the BallotCreated, BallotSubmitted,
+BallotReplaced, ElectionCreated and ElectionDestroyed events and saves them into a local SQLite database. The last height processed is checkpointed to disk, so that a restarted indexer
+resumes where it stopped. Audit and analytics queries can then use the EventStore instead of hitting the access node.
+"""
+from flow_py_sdk import entities
+
+import asyncio
+import configparser
+import json
+import os
+import pathlib
+import sqlite3
+
+from common.utils import Utils
+from common.account_config import AccountConfig
+from common.client_pool import borrowFlowClient
+from python_scripts.event_management import EventRunner, notifyEventListeners
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+config_path = pathlib.Path(os.getcwd()).joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+
+class EventStore(object):
+    """Local, SQLite based, store for the decoded events. Each event is identified by the transaction that emitted it and its index in that transaction, so storing the
+    same event twice (which happens if the indexer is stopped after storing a window but before checkpointing it) does nothing.
+    """
+    def __init__(self, database_path: pathlib.Path = None) -> None:
+        """
+        :param database_path (pathlib.Path): The SQLite database file. Defaults to the 'database' entry in the [event_indexer] config section.
+        """
+        super().__init__()
+        self.database_path: pathlib.Path = database_path if database_path else pathlib.Path(os.getcwd()).joinpath(config.get(section="event_indexer", option="database", fallback="results/event_index.db"))
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection: sqlite3.Connection = sqlite3.connect(self.database_path)
+        self.connection.row_factory = sqlite3.Row
+
+        self.connection.execute(
+            """CREATE TABLE IF NOT EXISTS events (
+                event_type TEXT NOT NULL,
+                block_height INTEGER NOT NULL,
+                transaction_id TEXT NOT NULL,
+                event_index INTEGER NOT NULL,
+                election_id INTEGER,
+                ballot_id INTEGER,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (transaction_id, event_index)
+            )"""
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS events_by_type_election ON events (event_type, election_id)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS events_by_height ON events (block_height)")
+        self.connection.commit()
+
+
+    def storeEvents(self, events: list[dict]) -> int:
+        """Function to save a batch of decoded events in a single database transaction.
+
+        :param events (list[dict]): The events to store, in the format produced by EventIndexer.decodeEvent.
+
+        :return (int): The number of new events stored, i.e., without the ones that were already in the database.
+        """
+        if (len(events) == 0):
+            return 0
+
+        rows_before: int = self.connection.total_changes
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO events (event_type, block_height, transaction_id, event_index, election_id, ballot_id, payload) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        event["event_type"],
+                        event["block_height"],
+                        event["transaction_id"],
+                        event["event_index"],
+                        event["data"].get("election_id", event["data"].get("linked_election_id")),
+                        event["data"].get("ballot_id", event["data"].get("new_ballot_id")),
+                        json.dumps(event["data"])
+                    ) for event in events
+                ]
+            )
+
+        return self.connection.total_changes - rows_before
+
+
+    def getEvents(self, event_type: str = None, election_id: int = None, from_height: int = None, to_height: int = None) -> list[dict]:
+        """Function to query the stored events. Every filter is optional and the ones provided are combined.
+
+        :param event_type (str): The short event type, e.g., "BallotSubmitted".
+        :param election_id (int): Return only the events from this Election.
+        :param from_height (int): Return only the events emitted at or after this block height.
+        :param to_height (int): Return only the events emitted at or before this block height.
+
+        :return (list[dict]): The events, in chain order, in the format {"event_type": str, "block_height": int, "transaction_id": str, "event_index": int, "data": dict}
+        """
+        conditions: list[str] = []
+        parameters: list = []
+
+        if (event_type != None):
+            conditions.append("event_type = ?")
+            parameters.append(event_type)
+
+        if (election_id != None):
+            conditions.append("election_id = ?")
+            parameters.append(election_id)
+
+        if (from_height != None):
+            conditions.append("block_height >= ?")
+            parameters.append(from_height)
+
+        if (to_height != None):
+            conditions.append("block_height <= ?")
+            parameters.append(to_height)
+
+        query: str = "SELECT event_type, block_height, transaction_id, event_index, payload FROM events"
+
+        if (len(conditions) > 0):
+            query += " WHERE " + " AND ".join(conditions)
+
+        query += " ORDER BY block_height, transaction_id, event_index"
+
+        return [
+            {
+                "event_type": row["event_type"],
+                "block_height": row["block_height"],
+                "transaction_id": row["transaction_id"],
+                "event_index": row["event_index"],
+                "data": json.loads(row["payload"])
+            } for row in self.connection.execute(query, parameters)
+        ]
+
+
+    def countEvents(self, event_type: str, election_id: int = None) -> int:
+        """Function to count the stored events of a given type, optionally for a single Election.
+
+        :param event_type (str): The short event type, e.g., "BallotCreated".
+        :param election_id (int): If provided, count only the events from this Election.
+
+        :return (int): The number of events found.
+        """
+        if (election_id == None):
+            cursor = self.connection.execute("SELECT COUNT(*) FROM events WHERE event_type = ?", (event_type,))
+        else:
+            cursor = self.connection.execute("SELECT COUNT(*) FROM events WHERE event_type = ? AND election_id = ?", (event_type, election_id))
+
+        return cursor.fetchone()[0]
+
+
+    def close(self) -> None:
+        """Function to close the database connection.
+        """
+        self.connection.close()
+
+
+class EventIndexer(object):
+    """Background indexer that walks the chain, from the last checkpoint up to the latest sealed block, and saves the VoteBooth events into an EventStore.
+    """
+    def __init__(self, event_store: EventStore = None, start_height: int = None, window_size: int = None, poll_interval: float = None, checkpoint_path: pathlib.Path = None) -> None:
+        """
+        :param event_store (EventStore): Where to save the decoded events. A new one, with the configured database, is created if None is provided.
+        :param start_height (int): The first block height to index if there is no checkpoint yet. Defaults to the config value or, if that one is 0, to the latest sealed block.
+        :param window_size (int): Number of blocks per get_events_for_height_range request. Access nodes reject ranges larger than 250 blocks.
+        :param poll_interval (float): Number of seconds to wait for new blocks once the indexer catches up with the chain.
+        :param checkpoint_path (pathlib.Path): The file with the last block height processed.
+        """
+        super().__init__()
+        self.ctx = AccountConfig()
+        self.event_store: EventStore = event_store if event_store else EventStore()
+
+        self.start_height: int = start_height if start_height != None else config.getint(section="event_indexer", option="start_height", fallback=0)
+        self.window_size: int = window_size if window_size else config.getint(section="event_indexer", option="window_size", fallback=200)
+        self.poll_interval: float = poll_interval if poll_interval else config.getfloat(section="event_indexer", option="poll_interval", fallback=5.0)
+        self.checkpoint_path: pathlib.Path = checkpoint_path if checkpoint_path else pathlib.Path(os.getcwd()).joinpath(config.get(section="event_indexer", option="checkpoint", fallback="results/event_index_checkpoint.json"))
+
+        # The events are decoded with the same dispatch table used for the transaction results. Only the event types listed here are indexed
+        self.event_runner: EventRunner = EventRunner()
+        self.indexed_events: list[str] = [
+            "BallotStandard.BallotCreated",
+            "ElectionStandard.BallotSubmitted",
+            "ElectionStandard.BallotReplaced",
+            "ElectionStandard.ElectionCreated",
+            "ElectionStandard.ElectionDestroyed"
+        ]
+
+        self.stop_event: asyncio.Event = None
+        self.task: asyncio.Task = None
+
+
+    def loadCheckpoint(self) -> int:
+        """Function to read the last block height processed from the checkpoint file.
+
+        :return (int): The last block height processed, or None if there is no checkpoint yet.
+        """
+        if (not self.checkpoint_path.exists()):
+            return None
+
+        with open(file=self.checkpoint_path, mode="r") as checkpoint_file:
+            return json.load(checkpoint_file)["last_height"]
+
+
+    def saveCheckpoint(self, last_height: int) -> None:
+        """Function to write the last block height processed into the checkpoint file. The file is written to a temporary file first and then moved into place, so that
+        an interrupted write never leaves a broken checkpoint behind.
+
+        :param last_height (int): The last block height fully processed.
+        """
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path: pathlib.Path = self.checkpoint_path.with_suffix(".tmp")
+
+        with open(file=temp_path, mode="w") as checkpoint_file:
+            json.dump({"last_height": last_height}, checkpoint_file)
+
+        os.replace(temp_path, self.checkpoint_path)
+
+
+    def decodeEvent(self, event: entities.Event, block_height: int) -> dict:
+        """Function to convert a raw event into the format saved in the EventStore.
+
+        :param event (entities.Event): The event, as returned by get_events_for_height_range.
+        :param block_height (int): The height of the block where the event was emitted.
+
+        :return (dict): The decoded event, in the {"event_type": str, "block_height": int, "transaction_id": str, "event_index": int, "data": dict} format.
+        """
+        event_key, event_decoder = self.event_runner.event_decoders[event.type]
+
+        return {
+            "event_type": event_key.split(".")[-1],
+            "block_height": block_height,
+            "transaction_id": event.transaction_id.hex(),
+            "event_index": event.event_index,
+            "data": event_decoder(event)
+        }
+
+
+    async def indexRange(self, client, start_height: int, end_height: int) -> int:
+        """Function to fetch, decode and store all the indexed event types in the [start_height, end_height] range. The range is processed in windows of window_size
+        blocks and the checkpoint is updated after each window is stored.
+
+        :param client (AccessAPI): An open access node client.
+        :param start_height (int): The first block height to process.
+        :param end_height (int): The last block height to process.
+
+        :return (int): The number of new events stored.
+        """
+        new_events: int = 0
+        window_start: int = start_height
+
+        while (window_start <= end_height):
+            window_end: int = min(window_start + self.window_size - 1, end_height)
+            decoded_events: list[dict] = []
+
+            # The same events, grouped by event key, for the event listeners in this process
+            grouped_events: dict[str:list[dict]] = {}
+
+            for event_key in self.indexed_events:
+                event_type: str = self.event_runner.event_types[event_key]
+                block_events_list = await client.get_events_for_height_range(type=event_type, start_height=window_start, end_height=window_end)
+                grouped_events[event_key] = []
+
+                for block_events in block_events_list:
+                    for event in block_events.events:
+                        decoded_event: dict = self.decodeEvent(event=event, block_height=block_events.block_height)
+                        decoded_events.append(decoded_event)
+                        grouped_events[event_key].append(decoded_event["data"])
+
+            new_events += self.event_store.storeEvents(events=decoded_events)
+            notifyEventListeners(decoded_events=grouped_events)
+            self.saveCheckpoint(last_height=window_end)
+
+            log.debug(f"Indexed blocks {window_start} to {window_end}: {len(decoded_events)} events")
+            window_start = window_end + 1
+
+        return new_events
+
+
+    async def catchUp(self) -> int:
+        """Function to index every block between the last checkpoint and the latest sealed block.
+
+        :return (int): The number of new events stored.
+        """
+        async with borrowFlowClient(
+            host=self.ctx.access_node_host, port=self.ctx.access_node_port
+        ) as client:
+            latest_block = await client.get_latest_block(is_sealed=True)
+            last_height: int = self.loadCheckpoint()
+
+            if (last_height == None):
+                # No checkpoint yet. Start from the configured height, or from the current block if none was set
+                start_height: int = self.start_height if self.start_height > 0 else latest_block.height
+            else:
+                start_height: int = last_height + 1
+
+            if (start_height > latest_block.height):
+                return 0
+
+            new_events: int = await self.indexRange(client=client, start_height=start_height, end_height=latest_block.height)
+
+            if (new_events > 0):
+                log.info(f"Indexed {new_events} new events up to block {latest_block.height}")
+
+            return new_events
+
+
+    async def run(self) -> None:
+        """Function to keep the index up to date until stop() is called. Errors while talking to the access node are logged and retried on the next poll, given that
+        the checkpoint guarantees that no block is skipped.
+        """
+        self.stop_event = asyncio.Event()
+
+        while (not self.stop_event.is_set()):
+            try:
+                await self.catchUp()
+            except Exception as e:
+                log.warning(f"Event indexing failed: {e}. Retrying in {self.poll_interval} seconds")
+
+            try:
+                await asyncio.wait_for(self.stop_event.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+    def start(self) -> asyncio.Task:
+        """Function to launch the indexer as a background task in the running event loop.
+
+        :return (asyncio.Task): The task running the indexer.
+        """
+        self.task = asyncio.create_task(self.run())
+
+        return self.task
+
+
+    async def stop(self) -> None:
+        """Function to stop a running indexer and wait for the current window to finish.
+        """
+        if (self.stop_event != None):
+            self.stop_event.set()
+
+        if (self.task != None):
+            await self.task
+            self.task = None
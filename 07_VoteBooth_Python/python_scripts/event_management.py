@@ -1,5 +1,4 @@
 from flow_py_sdk import(
-    flow_client,
     cadence,
     entities
 )
@@ -7,15 +6,51 @@ from flow_py_sdk import(
 import configparser
 import os
 import pathlib
+from typing import Callable
 
 from common.utils import Utils
 from common.account_config import AccountConfig
+from common.client_pool import borrowFlowClient
 from python_scripts import cadence_scripts
 
 import logging
 log = logging.getLogger(__name__)
 Utils.configureLogging()
 
+# Process-wide listeners for decoded events, e.g., the election metadata cache, which drops an Election when it sees it destroyed. Each listener gets the same
+# {event_key: [decoded events]} dictionary returned by EventRunner.decodeEvents
+event_listeners: list[Callable] = []
+
+
+def addEventListener(listener: Callable) -> None:
+    """Function to register a function to be called with every batch of decoded events, either from a transaction result or from the EventIndexer.
+
+    :param listener (Callable): The function to call. It should be quick, since it runs in the transaction path.
+    """
+    if (listener not in event_listeners):
+        event_listeners.append(listener)
+
+
+def removeEventListener(listener: Callable) -> None:
+    """Function to unregister a function previously added with addEventListener.
+
+    :param listener (Callable): The function to remove.
+    """
+    if (listener in event_listeners):
+        event_listeners.remove(listener)
+
+
+def notifyEventListeners(decoded_events: dict[str:list[dict]]) -> None:
+    """Function to pass a batch of decoded events to every registered listener. A failing listener is logged and does not stop the others.
+
+    :param decoded_events (dict[str:list[dict]]): The decoded events, grouped by their '<contract>.<event>' key.
+    """
+    for listener in event_listeners:
+        try:
+            listener(decoded_events)
+        except Exception as e:
+            log.warning(f"Event listener {listener} failed: {e}")
+
 
 class EventRunner():
     def __init__(self) -> None:
@@ -51,6 +86,47 @@ class EventRunner():
         self.fungible_token_deployer_address = self.config.get(section=current_network, option="FungibleToken")
         self.deployer_address = self.config.get(section=current_network, option="service_account")
 
+        # The full event types depend on the addresses set above, so the decoder table needs to be rebuilt every time these are (re)configured
+        self.buildDecoderTable()
+
+
+    def buildDecoderTable(self) -> None:
+        """Internal function to build the dispatch table used by decodeEvents. Each full event type, i.e., 'A.<address>.<contract>.<event>', is mapped to the short
+        '<contract>.<event>' key used to group the decoded events and to the function that decodes that event type.
+        """
+        self.event_decoders: dict[str:tuple[str, Callable]] = {}
+
+        # Reverse lookup, from the short key to the full event type, used by filterEvents
+        self.event_types: dict[str:str] = {}
+
+        for deployer_address, event_key, event_decoder in [
+            (self.deployer_address, "BallotStandard.BallotCreated", self.decodeBallotCreated),
+            (self.deployer_address, "BallotStandard.BallotBurned", self.decodeBallotBurned),
+            (self.deployer_address, "ElectionStandard.BallotSubmitted", self.decodeBallotSubmitted),
+            (self.deployer_address, "ElectionStandard.BallotReplaced", self.decodeBallotReplaced),
+            (self.deployer_address, "ElectionStandard.BallotRevoked", self.decodeBallotRevoked),
+            (self.deployer_address, "ElectionStandard.BallotsWithdrawn", self.decodeBallotsWithdrawn),
+            (self.deployer_address, "ElectionStandard.ElectionCreated", self.decodeElectionCreated),
+            (self.deployer_address, "ElectionStandard.ElectionDestroyed", self.decodeElectionDestroyed),
+            (self.deployer_address, "ElectionStandard.NonNilResourceReturned", self.decodeNonNilResourceReturned),
+            (self.deployer_address, "VoteBoxStandard.VoteBoxCreated", self.decodeVoteBoxCreated),
+            (self.deployer_address, "VoteBoxStandard.VoteBoxBurned", self.decodeVoteBoxBurned),
+            (self.deployer_address, "VoteBooth.ElectionIndexCreated", self.decodeElectionIndexCreated),
+            (self.deployer_address, "VoteBooth.ElectionIndexDestroyed", self.decodeElectionIndexDestroyed),
+            (self.deployer_address, "VoteBooth.VoteBoothPrinterAdminCreated", self.decodeVoteBoothPrinterAdminCreated),
+            (self.deployer_address, "VoteBooth.VoteBoothPrinterAdminDestroyed", self.decodeVoteBoothPrinterAdminDestroyed),
+            (self.flow_token_deployer_address, "FlowToken.TokensDeposited", self.decodeTokensDeposited),
+            (self.fungible_token_deployer_address, "FungibleToken.Withdrawn", self.decodeFungibleTokenWithdrawn),
+            (self.flow_fees_deployer_address, "FlowFees.FeesDeducted", self.decodeFeesDeducted),
+            (self.deployer_address, "VoteBoxStandard.BallotDelegated", self.decodeBallotDelegated)
+        ]:
+            self.event_decoders[f"A.{deployer_address}.{event_key}"] = (event_key, event_decoder)
+            self.event_types[event_key] = f"A.{deployer_address}.{event_key}"
+
+        # Protocol events do not belong to any deployed contract, and their type is used as is
+        self.event_decoders["flow.AccountCreated"] = ("flow.AccountCreated", self.decodeAccountCreated)
+        self.event_types["flow.AccountCreated"] = "flow.AccountCreated"
+
 
     async def getEventsByName(self, event_name: str, event_num: int) -> list[cadence.Event]:
         """Function to retrieve a list with the latest-n  events with the name provided as input from the event queue.
@@ -60,7 +136,7 @@ class EventRunner():
         
         :return (list): Returns a list with the even_num-most recent events with event_name from the networks's event queue. 
         """
-        async with flow_client(
+        async with borrowFlowClient(
             host=self.ctx.access_node_host, port=self.ctx.access_node_port
         ) as client:
             
@@ -87,10 +163,60 @@ class EventRunner():
             return events_to_return
     
 
-    async def getBallotCreatedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:int]:
-        """Function to return the latest BallotStandard.BallotCreated events from the event queue
+    async def decodeEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:list[dict]]:
+        """Function to decode every known event from a transaction response in a single pass over its events. Use this one instead of calling several of the
+        get*Events functions for the same transaction, since each one of those goes through the whole event list again.
+
+        :param tx_response (entities.TransactionResultResponse): The transaction result object as returned as the result of the transaction whose events are to be retrieved from.
+
+        :return (dict[str:list[dict]]): Returns the decoded events grouped by their '<contract>.<event>' key, e.g., "ElectionStandard.BallotSubmitted". Every known
+        key is present in the dictionary, with an empty list if the transaction did not emit any event of that type. The format of each decoded event is the one
+        documented in the respective get*Events function.
+        """
+        decoded_events: dict[str:list[dict]] = {}
+
+        for event_key in self.event_types:
+            decoded_events[event_key] = []
+
+        for event in tx_response.events:
+            dispatch_entry: tuple[str, Callable] = self.event_decoders.get(event.type)
+
+            # Events from contracts that this project does not track are simply ignored
+            if (dispatch_entry != None):
+                decoded_events[dispatch_entry[0]].append(dispatch_entry[1](event))
+
+        notifyEventListeners(decoded_events=decoded_events)
+
+        return decoded_events
+
+
+    def filterEvents(self, tx_response: entities.TransactionResultResponse, event_key: str) -> list[dict]:
+        """Internal function to decode only the events of one type from a transaction response.
 
         :param tx_response (entities.TransactionResultResponse): The transaction result object as returned as the result of the transaction whose events are to be retrieved from.
+        :param event_key (str): The '<contract>.<event>' key of the events to decode.
+
+        :return (list[dict]): Returns the decoded events, in the order that they were emitted.
+        """
+        if (event_key not in self.event_types):
+            raise Exception(f"ERROR: No decoder configured for {event_key} events!")
+
+        event_name: str = self.event_types[event_key]
+        event_decoder: Callable = self.event_decoders[event_name][1]
+
+        decoded_events: list[dict] = []
+
+        for event in tx_response.events:
+            if (event.type == event_name):
+                decoded_events.append(event_decoder(event))
+
+        return decoded_events
+
+
+    def decodeBallotCreated(self, event: entities.Event) -> dict:
+        """Decoder for the BallotStandard.BallotCreated events.
+
+        :param event (entities.Event): The event to decode.
 
         :return (dict[str:int]): Returns the event parameters in the format
         {
@@ -98,45 +224,380 @@ class EventRunner():
             "linked_election_id": int
         }
         """
-        event_name: str = "A." + self.deployer_address + ".BallotStandard.BallotCreated"
+        decoded_event: dict = {}
+        decoded_event["ballot_id"] = event.value.fields["_ballotId"].value
+        decoded_event["linked_election_id"] = event.value.fields["_linkedElectionId"].value
 
-        ballot_created_events: list[dict[str:int]] = []
+        return decoded_event
 
-        for event in tx_response.events:
-            if (event.type == event_name):
-                ballot_created_event: dict = {}
-                ballot_created_event["ballot_id"] = event.value.fields["_ballotId"].value
-                ballot_created_event["linked_election_id"] = event.value.fields["_linkedElectionId"].value
 
-                ballot_created_events.append(ballot_created_event)
-        
-        return ballot_created_events
+    def decodeBallotBurned(self, event: entities.Event) -> dict:
+        """Decoder for the BallotStandard.BallotBurned events.
 
+        :param event (entities.Event): The event to decode.
 
-    async def getBallotBurnedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:int]:
-        """Function to return the latest BallotStandard.BallotBurned events from the event queue
+        :return (dict[str:int]): Returns the event parameters in the format
+        {
+            "ballot_id": int,
+            "linked_election_id: int
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["ballot_id"] = event.value.fields["_ballotId"].value
+        decoded_event["linked_election_id"] = event.value.fields["_linkedElectionId"].value
+
+        return decoded_event
+
+
+    def decodeBallotSubmitted(self, event: entities.Event) -> dict:
+        """Decoder for the ElectionStandard.BallotSubmitted events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict[str:int]): Returns the event parameters in the format
+        {
+            "ballot_id": int,
+            "election_id": int
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["ballot_id"] = event.value.fields["_ballotId"].value
+        decoded_event["election_id"] = event.value.fields["_electionId"].value
+
+        return decoded_event
+
+
+    def decodeBallotReplaced(self, event: entities.Event) -> dict:
+        """Decoder for the ElectionStandard.BallotReplaced events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict[str:int]): Returns the event parameters in the format
+        {
+            "old_ballot_id": int,
+            "new_ballot_id": int,
+            "election_id": int
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["old_ballot_id"] = event.value.fields["_oldBallotId"].value
+        decoded_event["new_ballot_id"] = event.value.fields["_newBallotId"].value
+        decoded_event["election_id"] = event.value.fields["_electionId"].value
+
+        return decoded_event
+
+
+    def decodeBallotRevoked(self, event: entities.Event) -> dict:
+        """Decoder for the ElectionStandard.BallotRevoked events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict[str:int]): Returns the event parameters in the format
+        {
+            "ballot_id": int,
+            "election_id": int
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["ballot_id"] = event.value.fields["_ballotId"].value
+        decoded_event["election_id"] = event.value.fields["_electionId"].value
+
+        return decoded_event
+
+
+    def decodeBallotsWithdrawn(self, event: entities.Event) -> dict:
+        """Decoder for the ElectionStandard.BallotsWithdrawn events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict[str:int]): Returns the event parameters in the format
+        {
+            "ballots_withdrawn": int,
+            "election_id": int
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["ballots_withdrawn"] = event.value.fields["_ballotsWithdrawn"].value
+        decoded_event["election_id"] = event.value.fields["_electionId"].value
+
+        return decoded_event
+
+
+    def decodeElectionCreated(self, event: entities.Event) -> dict:
+        """Decoder for the ElectionStandard.ElectionCreated events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict): Returns the event parameters in the format
+        {
+            "election_id": int,
+            "election_name": str
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["election_id"] = event.value.fields["_electionId"].value
+        decoded_event["election_name"] = event.value.fields["_electionName"].value
+
+        return decoded_event
+
+
+    def decodeElectionDestroyed(self, event: entities.Event) -> dict:
+        """Decoder for the ElectionStandard.ElectionDestroyed events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict[str:int]): Returns the event parameters in the format
+        {
+            "election_id": int,
+            "ballots_stored": int
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["election_id"] = event.value.fields["_electionId"].value
+        decoded_event["ballots_stored"] = event.value.fields["_ballotsStored"].value
+
+        return decoded_event
+
+
+    def decodeNonNilResourceReturned(self, event: entities.Event) -> dict:
+        """Decoder for the ElectionStandard.NonNilResourceReturned events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict[str:str]): Returns the event parameters in the format
+        {
+            "resource_type": str
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["resource_type"] = event.value.fields["_resourceType"].value
+
+        return decoded_event
+
+
+    def decodeVoteBoxCreated(self, event: entities.Event) -> dict:
+        """Decoder for the VoteBoxStandard.VoteBoxCreated events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict[str:str]): Returns the event parameters in the format
+        {
+            "voter_address": str
+        }
+        """
+        decoded_event: dict[str:str] = {}
+        decoded_event["voter_address"] = event.value.fields["_voterAddress"].hex()
+
+        return decoded_event
+
+
+    def decodeVoteBoxBurned(self, event: entities.Event) -> dict:
+        """Decoder for the VoteBoxStandard.VoteBoxBurned events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict): Returns the event parameters in the format
+        {
+            "elections_voted": list[int],
+            "active_ballots": int,
+            "voter_address": str
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["active_ballots"] = event.value.fields["_activeBallots"].value
+        decoded_event["voter_address"] = event.value.fields["_voterAddress"].hex()
+        # The election_voted property is an [int], so it needs special processing
+        decoded_event["elections_voted"] = []
+        for active_ballot in event.value.fields["_electionsVoted"].value:
+            decoded_event["elections_voted"].append(active_ballot.value)
+
+        return decoded_event
+
+
+    def decodeElectionIndexCreated(self, event: entities.Event) -> dict:
+        """Decoder for the VoteBooth.ElectionIndexCreated events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict[str:str]): Returns the event parameters in the format
+        {
+            "account_address": str
+        }
+        """
+        decoded_event: dict[str:str] = {}
+        decoded_event["account_address"] = event.value.fields["_accountAddress"].hex()
+
+        return decoded_event
+
+
+    def decodeElectionIndexDestroyed(self, event: entities.Event) -> dict:
+        """Decoder for the VoteBooth.ElectionIndexDestroyed events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict[str:str]): Returns the event parameters in the format
+        {
+            "account_address": str
+        }
+        """
+        decoded_event: dict[str:str] = {}
+        decoded_event["account_address"] = event.value.fields["_accountAddress"].hex()
+
+        return decoded_event
+
+
+    def decodeVoteBoothPrinterAdminCreated(self, event: entities.Event) -> dict:
+        """Decoder for the VoteBooth.VoteBoothPrinterAdminCreated events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict[str:str]): Returns the event parameters in the format
+        {
+            "account_address": str
+        }
+        """
+        decoded_event: dict[str:str] = {}
+        decoded_event["account_address"] = event.value.fields["_accountAddress"].hex()
+
+        return decoded_event
+
+
+    def decodeVoteBoothPrinterAdminDestroyed(self, event: entities.Event) -> dict:
+        """Decoder for the VoteBooth.VoteBoothPrinterAdminDestroyed events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict[str:str]): Returns the event parameters in the format
+        {
+            "account_address": str
+        }
+        """
+        decoded_event: dict[str:str] = {}
+        decoded_event["account_address"] = event.value.fields["_accountAddress"].hex()
+
+        return decoded_event
+
+
+    def decodeTokensDeposited(self, event: entities.Event) -> dict:
+        """Decoder for the FlowToken.TokensDeposited events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict): Returns the event parameters in the format
+        {
+            "amount": float,
+            "to": str
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["amount"] = event.value.fields["amount"].__str__()
+        decoded_event["to"] = event.value.fields["to"].value.hex()
+
+        return decoded_event
+
+
+    def decodeAccountCreated(self, event: entities.Event) -> dict:
+        """Decoder for the flow.AccountCreated events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict): Returns the event parameters in the format
+        {
+            "address": str
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["address"] = event.value.fields["address"].hex()
+
+        return decoded_event
+
+
+    def decodeFungibleTokenWithdrawn(self, event: entities.Event) -> dict:
+        """Decoder for the FungibleToken.Withdrawn events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict): Returns the event parameters in the format
+        {
+            "amount": float,
+            "balance_after": float,
+            "from": str
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["amount"] = event.value.fields["amount"].__str__()
+        decoded_event["balance_after"] = event.value.fields["balanceAfter"].__str__()
+        decoded_event["from"] = event.value.fields["from"].value.hex()
+
+        return decoded_event
+
+
+    def decodeFeesDeducted(self, event: entities.Event) -> dict:
+        """Decoder for the FlowFees.FeesDeducted events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict): Returns the event parameters in the format
+        {
+            "amount": float,
+            "execution_effort": float,
+            "inclusion_effort": float
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["amount"] = event.value.fields["amount"].__str__()
+        decoded_event["execution_effort"] = event.value.fields["executionEffort"].__str__()
+        decoded_event["inclusion_effort"] = event.value.fields["inclusionEffort"].__str__()
+
+        return decoded_event
+
+
+    def decodeBallotDelegated(self, event: entities.Event) -> dict:
+        """Decoder for the VoteBoxStandard.BallotDelegated events.
+
+        :param event (entities.Event): The event to decode.
+
+        :return (dict): Returns the event parameters in the format
+        {
+            "election_id": int,
+            "delegator_address": str,
+            "recipient_address": str
+        }
+        """
+        decoded_event: dict = {}
+        decoded_event["election_id"] = event.value.fields["_electionId"].__str__()
+        decoded_event["delegator_address"] = event.value.fields["_delegatorAddress"].__str__()
+        decoded_event["recipient_address"] = event.value.fields["_recipientAddress"].__str__()
+
+        return decoded_event
+
+
+    async def getBallotCreatedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:int]:
+        """Function to return the latest BallotStandard.BallotCreated events from the event queue
 
         :param tx_response (entities.TransactionResultResponse): The transaction result object as returned as the result of the transaction whose events are to be retrieved from.
 
         :return (dict[str:int]): Returns the event parameters in the format
         {
             "ballot_id": int,
-            "linked_election_id: int
+            "linked_election_id": int
         }
         """
-        event_name: str = "A." + self.deployer_address + ".BallotStandard.BallotBurned"
+        return self.filterEvents(tx_response=tx_response, event_key="BallotStandard.BallotCreated")
 
-        ballot_burned_events: list[dict[str:int]] = []
 
-        for event in tx_response.events:
-            if (event.type == event_name):
-                ballot_burned_event: dict = {}
-                ballot_burned_event["ballot_id"] = event.value.fields["_ballotId"].value
-                ballot_burned_event["linked_election_id"] = event.value.fields["_linkedElectionId"].value
+    async def getBallotBurnedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:int]:
+        """Function to return the latest BallotStandard.BallotBurned events from the event queue
 
-                ballot_burned_events.append(ballot_burned_event)
-        
-        return ballot_burned_events
+        :param tx_response (entities.TransactionResultResponse): The transaction result object as returned as the result of the transaction whose events are to be retrieved from.
+
+        :return (dict[str:int]): Returns the event parameters in the format
+        {
+            "ballot_id": int,
+            "linked_election_id: int
+        }
+        """
+        return self.filterEvents(tx_response=tx_response, event_key="BallotStandard.BallotBurned")
 
 
     async def getBallotSubmittedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:int]:
@@ -150,21 +611,9 @@ class EventRunner():
             "election_id": int
         }
         """
-        event_name: str = "A." + self.deployer_address + ".ElectionStandard.BallotSubmitted"
-
-        ballot_submitted_events: list[dict[str:int]] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                ballot_submitted_event: dict = {}
-                ballot_submitted_event["ballot_id"] = event.value.fields["_ballotId"].value
-                ballot_submitted_event["election_id"] = event.value.fields["_electionId"].value
+        return self.filterEvents(tx_response=tx_response, event_key="ElectionStandard.BallotSubmitted")
 
-                ballot_submitted_events.append(ballot_submitted_event)
 
-        return ballot_submitted_events
-
-    
     async def getBallotReplacedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:int]:
         """Function to return the latest ElectionStandard.BallotReplaced events from the event queue.
 
@@ -177,22 +626,9 @@ class EventRunner():
             "election_id": int
         }
         """
-        event_name: str = "A." + self.deployer_address + ".ElectionStandard.BallotReplaced"
-
-        ballot_replaced_events: list[dict[str:int]] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                ballot_replaced_event: dict = {}
-                ballot_replaced_event["old_ballot_id"] = event.value.fields["_oldBallotId"].value
-                ballot_replaced_event["new_ballot_id"] = event.value.fields["_newBallotId"].value
-                ballot_replaced_event["election_id"] = event.value.fields["_electionId"].value
+        return self.filterEvents(tx_response=tx_response, event_key="ElectionStandard.BallotReplaced")
 
-                ballot_replaced_events.append(ballot_replaced_event)
-        
-        return ballot_replaced_events
 
-    
     async def getBallotRevokedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:int]:
         """Function to return the latest ElectionStandard.BallotRevoked events from the event queue.
 
@@ -204,21 +640,9 @@ class EventRunner():
             "election_id": int
         }
         """
-        event_name: str = "A." + self.deployer_address + ".ElectionStandard.BallotRevoked"
-
-        ballot_revoked_events: list[dict[str:int]] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                ballot_revoked_event: dict = {}
-                ballot_revoked_event["ballot_id"] = event.value.fields["_ballotId"].value
-                ballot_revoked_event["election_id"] = event.value.fields["_electionId"].value
+        return self.filterEvents(tx_response=tx_response, event_key="ElectionStandard.BallotRevoked")
 
-                ballot_revoked_events.append(ballot_revoked_event)
-        
-        return ballot_revoked_events
 
-    
     async def getBallotsWithdrawnEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str: int]:
         """Function to return the latest ElectionStandard.BallotsWithdrawn events from the event queue.
 
@@ -230,21 +654,9 @@ class EventRunner():
             "election_id": int
         }
         """
-        event_name: str = "A." + self.deployer_address + ".ElectionStandard.BallotsWithdrawn"
+        return self.filterEvents(tx_response=tx_response, event_key="ElectionStandard.BallotsWithdrawn")
 
-        ballots_withdrawn_events: list[dict[str:int]] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                ballot_withdrawn_event: dict = {}
-                ballot_withdrawn_event["ballots_withdrawn"] = event.value.fields["_ballotsWithdrawn"].value
-                ballot_withdrawn_event["election_id"] = event.value.fields["_electionId"].value
 
-                ballots_withdrawn_events.append(ballot_withdrawn_event)
-
-        return ballots_withdrawn_events
-
-    
     async def getElectionCreatedEvents(self, tx_response: entities.TransactionResultResponse) -> dict:
         """Function to return the latest ElectionStandard.ElectionCreated events from the event queue.
 
@@ -256,19 +668,7 @@ class EventRunner():
             "election_name": str
         }
         """
-        event_name: str = "A." + self.deployer_address + ".ElectionStandard.ElectionCreated"
-
-        election_created_events: list[dict] = []
-        # Extract all events with the same name as the one defined
-        for event in tx_response.events:
-            if (event.type == event_name):
-                election_created_event: dict = {}
-                election_created_event["election_id"] = event.value.fields["_electionId"].value
-                election_created_event["election_name"] = event.value.fields["_electionName"].value
-
-                election_created_events.append(election_created_event)
-
-        return election_created_events
+        return self.filterEvents(tx_response=tx_response, event_key="ElectionStandard.ElectionCreated")
 
 
     async def getElectionDestroyedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:int]:
@@ -282,20 +682,9 @@ class EventRunner():
             "ballots_stored": int
         }
         """
-        event_name: str = "A." + self.deployer_address + ".ElectionStandard.ElectionDestroyed"
-        election_destroyed_events: list[dict] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                election_destroyed_event: dict = {}
-                election_destroyed_event["election_id"] = event.value.fields["_electionId"].value
-                election_destroyed_event["ballots_stored"] = event.value.fields["_ballotsStored"].value
+        return self.filterEvents(tx_response=tx_response, event_key="ElectionStandard.ElectionDestroyed")
 
-                election_destroyed_events.append(election_destroyed_event)
-        
-        return election_destroyed_events
 
-    
     async def getNonNilResourceReturnedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:str]:
         """Function to return the latest ElectionStandard.NonNilResourceReturned events from the event queue.
 
@@ -306,20 +695,9 @@ class EventRunner():
             "resource_type": str
         }
         """
-        event_name: str = "A." + self.deployer_address + ".ElectionStandard.NonNilResourceReturned"
-
-        non_nil_resource_returned_events: list[dict[str:str]] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                non_nil_resource_returned_event: dict = {}
-                non_nil_resource_returned_event["resource_type"] = event.value.fields["_resourceType"].value
+        return self.filterEvents(tx_response=tx_response, event_key="ElectionStandard.NonNilResourceReturned")
 
-                non_nil_resource_returned_events.append(non_nil_resource_returned_event)
-        
-        return non_nil_resource_returned_events
 
-    
     async def getVoteBoxCreatedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:str]:
         """Function to return the latest VoteBoxStandard.VoteBoxCreated events from the event queue.
 
@@ -330,20 +708,9 @@ class EventRunner():
             "voter_address": str
         }
         """
-        event_name: str = "A." + self.deployer_address + ".VoteBoxStandard.VoteBoxCreated"
-
-        votebox_created_events: list[dict[str:str]] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                votebox_created_event: dict[str:str] = {}
-                votebox_created_event["voter_address"] = event.value.fields["_voterAddress"].hex()
+        return self.filterEvents(tx_response=tx_response, event_key="VoteBoxStandard.VoteBoxCreated")
 
-                votebox_created_events.append(votebox_created_event)
 
-        return votebox_created_events
-
-    
     async def getVoteBoxBurnedEvents(self, tx_response: entities.TransactionResultResponse) -> dict:
         """Function to return the latest VoteBoxStandard.VoteBoxBurned events from the event queue.
 
@@ -356,25 +723,9 @@ class EventRunner():
             "voter_address": str
         }
         """
-        event_name: str = "A." + self.deployer_address + ".VoteBoxStandard.VoteBoxBurned"
-
-        votebox_destroyed_events: list[dict] = []
+        return self.filterEvents(tx_response=tx_response, event_key="VoteBoxStandard.VoteBoxBurned")
 
-        for event in tx_response.events:
-            if (event.type == event_name):
-                votebox_destroyed_event: dict = {}
-                votebox_destroyed_event["active_ballots"] = event.value.fields["_activeBallots"].value
-                votebox_destroyed_event["voter_address"] = event.value.fields["_voterAddress"].hex()
-                # The election_voted property is an [int], so it needs special processing
-                votebox_destroyed_event["elections_voted"] = []
-                for active_ballot in event.value.fields["_electionsVoted"].value:
-                    votebox_destroyed_event["elections_voted"].append(active_ballot.value)
-
-                votebox_destroyed_events.append(votebox_destroyed_event)
-        
-        return votebox_destroyed_events
 
-    
     async def getElectionIndexCreatedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:str]:
         """Function to return the latest VoteBooth.ElectionIndexCreated events from the event queue.
 
@@ -385,20 +736,9 @@ class EventRunner():
             "account_address": str
         }
         """
-        event_name: str = "A." + self.deployer_address + ".VoteBooth.ElectionIndexCreated"
-
-        election_index_created_events: list[dict[str:str]] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                election_index_created_event: dict[str:str] = {}
-                election_index_created_event["account_address"] = event.value.fields["_accountAddress"].hex()
+        return self.filterEvents(tx_response=tx_response, event_key="VoteBooth.ElectionIndexCreated")
 
-                election_index_created_events.append(election_index_created_event)
 
-        return election_index_created_events
-
-    
     async def getElectionIndexDestroyedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:str]:
         """Function to return the latest VoteBooth.ElectionIndexDestroyed events from the event queue.
 
@@ -409,20 +749,9 @@ class EventRunner():
             "account_address": str
         }
         """
-        event_name: str = "A." + self.deployer_address + ".VoteBooth.ElectionIndexDestroyed"
-
-        election_index_destroyed_events: list[dict[str:str]] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                election_index_destroyed_event: dict[str:str] = {}
-                election_index_destroyed_event["account_address"] = event.value.fields["_accountAddress"].hex()
+        return self.filterEvents(tx_response=tx_response, event_key="VoteBooth.ElectionIndexDestroyed")
 
-                election_index_destroyed_events.append(election_index_destroyed_event)
 
-        return election_index_destroyed_events
-
-    
     async def getVoteBoothPrinterAdminCreatedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:str]:
         """Function to return the latest VoteBooth.VoteBoothPrinterAdminCreated events from the event queue.
 
@@ -433,18 +762,7 @@ class EventRunner():
             "account_address": str
         }
         """
-        event_name: str = "A." + self.deployer_address + ".VoteBooth.VoteBoothPrinterAdminCreated"
-
-        votebooth_printer_admin_created_events: list[dict[str:str]] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                votebooth_printer_admin_created_event: dict[str:str] = {}
-                votebooth_printer_admin_created_event["account_address"] = event.value.fields["_accountAddress"].hex()
-
-                votebooth_printer_admin_created_events.append(votebooth_printer_admin_created_event)
-        
-        return votebooth_printer_admin_created_events
+        return self.filterEvents(tx_response=tx_response, event_key="VoteBooth.VoteBoothPrinterAdminCreated")
 
 
     async def getVoteBoothPrinterAdminDestroyedEvents(self, tx_response: entities.TransactionResultResponse) -> dict[str:str]:
@@ -457,19 +775,8 @@ class EventRunner():
             "account_address": str
         }
         """
-        event_name: str = "A." + self.deployer_address + ".VoteBooth.VoteBoothPrinterAdminDestroyed"
-
-        votebooth_printer_admin_destroyed_events: list[dict[str:str]] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                votebooth_printer_admin_destroyed_event: dict[str:str] = {}
-                votebooth_printer_admin_destroyed_event["account_address"] = event.value.fields["_accountAddress"].hex()
+        return self.filterEvents(tx_response=tx_response, event_key="VoteBooth.VoteBoothPrinterAdminDestroyed")
 
-                votebooth_printer_admin_destroyed_events.append(votebooth_printer_admin_destroyed_event)
-
-        return votebooth_printer_admin_destroyed_events
-    
 
     async def getTokensDepositedEvents(self, tx_response: entities.TransactionResultResponse) -> dict:
         """Function to return the latest FlowToken.TokensDeposited events from the event queue.
@@ -482,19 +789,7 @@ class EventRunner():
             "to": str
         }
         """
-        event_name: str = "A." + self.flow_token_deployer_address + ".FlowToken.TokensDeposited"
-
-        tokens_deposited_events: list[dict] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                tokens_deposited_event: dict = {}
-                tokens_deposited_event["amount"] = event.value.fields["amount"].__str__()
-                tokens_deposited_event["to"] = event.value.fields["to"].value.hex()
-
-                tokens_deposited_events.append(tokens_deposited_event)
-
-        return tokens_deposited_events
+        return self.filterEvents(tx_response=tx_response, event_key="FlowToken.TokensDeposited")
 
 
     async def getFungibleTokenWithdrawnEvents(self, tx_response: entities.TransactionResultResponse) -> dict:
@@ -508,21 +803,8 @@ class EventRunner():
             "from": str
         }
         """
-        event_name: str = f"A.{self.fungible_token_deployer_address}.FungibleToken.Withdrawn"
+        return self.filterEvents(tx_response=tx_response, event_key="FungibleToken.Withdrawn")
 
-        tokens_withdrawn_events: list[dict] = []
-
-        for event in tx_response.events:
-            if(event.type == event_name):
-                tokens_withdrawn_event: dict = {}
-                tokens_withdrawn_event["amount"] = event.value.fields["amount"].__str__()
-                tokens_withdrawn_event["balance_after"] = event.value.fields["balanceAfter"].__str__()
-                tokens_withdrawn_event["from"] = event.value.fields["from"].value.hex()
-
-                tokens_withdrawn_events.append(tokens_withdrawn_event)
-        
-        return tokens_withdrawn_events
-    
 
     async def getFlowFeesFeesDeductedEvents(self, tx_response: entities.TransactionResultResponse) -> dict:
         """Function to return the latest FlowFees.FeesDeducted events from a transaction response.
@@ -535,22 +817,8 @@ class EventRunner():
             "inclusion_effort": float
         }
         """
+        return self.filterEvents(tx_response=tx_response, event_key="FlowFees.FeesDeducted")
 
-        event_name: str = f"A.{self.flow_fees_deployer_address}.FlowFees.FeesDeducted"
-
-        fees_deducted_events: list[dict] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                fees_deducted_event: dict = {}
-                fees_deducted_event["amount"] = event.value.fields["amount"].__str__()
-                fees_deducted_event["execution_effort"] = event.value.fields["executionEffort"].__str__()
-                fees_deducted_event["inclusion_effort"] = event.value.fields["inclusionEffort"].__str__()
-
-                fees_deducted_events.append(fees_deducted_event)
-        
-        return fees_deducted_events
-    
 
     async def getBallotDelegatedEvents(self, tx_response: entities.TransactionResultResponse) -> dict:
         """Function to return the latest VoteBoxStandard.BallotDelegated events from the transaction response.
@@ -563,18 +831,4 @@ class EventRunner():
             "recipient_address": str
         }
         """
-
-        event_name: str = f"A.{self.deployer_address}.VoteBoxStandard.BallotDelegated"
-
-        ballot_delegated_events: list[dict] = []
-
-        for event in tx_response.events:
-            if (event.type == event_name):
-                ballot_delegated_event: dict = {}
-                ballot_delegated_event["election_id"] = event.value.fields["_electionId"].__str__()
-                ballot_delegated_event["delegator_address"] = event.value.fields["_delegatorAddress"].__str__()
-                ballot_delegated_event["recipient_address"] = event.value.fields["_recipientAddress"].__str__()
-
-                ballot_delegated_events.append(ballot_delegated_event)
-            
-        return ballot_delegated_events
\ No newline at end of file
+        return self.filterEvents(tx_response=tx_response, event_key="VoteBoxStandard.BallotDelegated")
@@ -0,0 +1,220 @@
+"""Module with a parallel tally engine for the encrypted ballots of an Election.
+
+Decrypting the ballots (base64 decode + RSA-OAEP, or ECDH + AES-GCM for hybrid ballots) is, by far, the most expensive step of finishing an Election, and it used to run in a single Python loop. This engine splits
+the encrypted ballots in chunks, decrypts and counts each chunk in a ProcessPoolExecutor worker, and merges the partial counts and receipts as chunks finish. The final
+election_options_tally and ballot_receipts are exactly the same as the ones produced by the sequential loop, including the order of the receipts.
+"""
+from python_scripts.crypto_management import CryptoUtils
+from common.utils import Utils
+
+import asyncio
+import configparser
+import os
+import pathlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterable, Callable, Iterable
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+config_path = pathlib.Path(os.getcwd()).joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+# Private key loaded once per worker process, by initWorker, instead of once per chunk
+worker_private_key = None
+
+
+def initWorker(private_key_bytes: bytes) -> None:
+    """Initializer for each worker process. Loads the private encryption key once, so that chunks do not need to carry it around.
+
+    :param private_key_bytes (bytes): The PEM contents of the private encryption key.
+    """
+    global worker_private_key
+    worker_private_key = CryptoUtils.load_private_key_from_bytes(key_bytes=private_key_bytes)
+
+
+def tallyChunk(chunk_index: int, encrypted_ballots: list[str], valid_options: list[str], option_separator: str) -> dict:
+    """Function, executed in a worker process, that decrypts and counts a chunk of encrypted ballots. It follows, step by step, the same rules as the original tally loop.
+
+    :param chunk_index (int): The position of this chunk in the ballot sequence. Used to put the receipts back in order.
+    :param encrypted_ballots (list[str]): The base64 encoded, RSA or hybrid encrypted, ballot options.
+    :param valid_options (list[str]): The options of the Election. Anything else is counted as "invalid".
+    :param option_separator (str): The character used to concatenate the option with the salt.
+
+    :return (dict): The partial results in the format {"chunk_index": int, "ballots": int, "tally": {option: count}, "receipts": [int]}
+    """
+    chunk_tally: dict[str:int] = {"invalid": 0}
+    chunk_receipts: list[int] = []
+
+    for encrypted_ballot in encrypted_ballots:
+        # Decode the ballot option from a string first, then decrypt it. The version tag in the ballot selects the scheme
+        decrypted_ballot_option: str = CryptoUtils.decrypt_ballot_option(encrypted_option=encrypted_ballot, private_key=worker_private_key)
+
+        # Split the decrypted ballot option by the character used to concatenate the option with the random salt. I expect 2 and exactly 2 elements
+        option_elements: list[str] = decrypted_ballot_option.split(option_separator)
+
+        if (len(option_elements) != 2):
+            log.error(f"ERROR: Found a illegally formatted ballot option: {decrypted_ballot_option}! Unable to process it further. Skipping...")
+            continue
+
+        if (option_elements[0] in valid_options):
+            chunk_tally[option_elements[0]] = chunk_tally.get(option_elements[0], 0) + 1
+        else:
+            chunk_tally["invalid"] += 1
+            log.warning(f"CAUTION: Retrieved a Ballot with an invalid option: {option_elements[0]}. Ballot counted as 'invalid'")
+
+        chunk_receipts.append(int(option_elements[1]))
+
+    return {
+        "chunk_index": chunk_index,
+        "ballots": len(encrypted_ballots),
+        "tally": chunk_tally,
+        "receipts": chunk_receipts
+    }
+
+
+class TallyEngine(object):
+    """Parallel tally engine. Create one per Election tally and call tally() with the encrypted ballots, either as a list or as an async iterable of ballot pages.
+    """
+    def __init__(self, election_options: dict[int:str], private_encryption_key_name: str, chunk_size: int = None, max_workers: int = None, progress_callback: Callable = None) -> None:
+        """
+        :param election_options (dict[int:str]): The Election options, as returned by ScriptRunner.getElectionOptions.
+        :param private_encryption_key_name (str): The name of the file, inside the 'keys' folder, with the private key that decrypts the ballots.
+        :param chunk_size (int): Number of ballots per worker job. Defaults to the [tally] config section value.
+        :param max_workers (int): Number of worker processes. Defaults to the [tally] config section value, or to the number of CPUs if that one is 0.
+        :param progress_callback (Callable): If provided, this function is called, with the partial tally and the number of ballots processed so far, every time a chunk finishes.
+        """
+        super().__init__()
+        self.election_options: dict[int:str] = election_options
+        self.chunk_size: int = chunk_size if chunk_size else config.getint(section="tally", option="chunk_size", fallback=256)
+        self.max_workers: int = max_workers if max_workers else config.getint(section="tally", option="max_workers", fallback=0)
+
+        if (self.max_workers <= 0):
+            self.max_workers = os.cpu_count() or 1
+
+        self.progress_callback: Callable = progress_callback
+        self.option_separator: str = config.get(section="encryption", option="separator")
+
+        key_path: pathlib.Path = pathlib.Path(os.getcwd()).joinpath("keys", private_encryption_key_name)
+
+        if (not key_path.exists()):
+            raise FileNotFoundError(f"ERROR: Unable to read a key from {key_path.__str__()}")
+
+        with open(file=key_path, mode="rb") as key_file:
+            self.private_key_bytes: bytes = key_file.read()
+
+        # Statistics from the last tally run
+        self.ballots_processed: int = 0
+        self.elapsed_time: float = 0.0
+        self.ballots_per_second: float = 0.0
+
+
+    def newTally(self) -> dict[str:int]:
+        """Function to create an empty tally, with every Election option (in the Election order) plus the "invalid" entry, all set to 0.
+
+        :return (dict[str:int]): The empty tally.
+        """
+        election_options_tally: dict[str:int] = {}
+
+        for election_option in self.election_options:
+            election_options_tally[self.election_options[election_option]] = 0
+
+        election_options_tally["invalid"] = 0
+
+        return election_options_tally
+
+
+    async def iterateChunks(self, encrypted_ballots: Iterable[str] | AsyncIterable[list[str]]):
+        """Internal async generator that regroups the encrypted ballots provided into chunks of chunk_size ballots.
+
+        :param encrypted_ballots (Iterable[str] | AsyncIterable[list[str]]): Either a list of encrypted ballots or an async iterable that yields pages (lists) of them.
+        """
+        current_chunk: list[str] = []
+
+        if (hasattr(encrypted_ballots, "__aiter__")):
+            async for ballot_page in encrypted_ballots:
+                for encrypted_ballot in ballot_page:
+                    current_chunk.append(encrypted_ballot)
+
+                    if (len(current_chunk) == self.chunk_size):
+                        yield current_chunk
+                        current_chunk = []
+        else:
+            for encrypted_ballot in encrypted_ballots:
+                current_chunk.append(encrypted_ballot)
+
+                if (len(current_chunk) == self.chunk_size):
+                    yield current_chunk
+                    current_chunk = []
+
+        if (len(current_chunk) > 0):
+            yield current_chunk
+
+
+    async def tally(self, encrypted_ballots: Iterable[str] | AsyncIterable[list[str]]) -> tuple[dict[str:int], list[int]]:
+        """Function to decrypt and count all the encrypted ballots provided. Chunks are sent to the worker processes as soon as they are available, and the partial results
+        are merged as soon as each chunk finishes.
+
+        :param encrypted_ballots (Iterable[str] | AsyncIterable[list[str]]): Either a list of encrypted ballots, as returned by ScriptRunner.getElectionEncryptedBallots, or
+        an async iterable that yields pages of encrypted ballots.
+
+        :return (tuple[dict[str:int], list[int]]): The election_options_tally and the ballot_receipts, in the same format and order as the sequential tally.
+        """
+        election_options_tally: dict[str:int] = self.newTally()
+        valid_options: list[str] = list(self.election_options.values())
+
+        # Receipts need to come back in ballot order, but chunks can finish in any order. Keep them per chunk and put them together at the end
+        chunk_receipts: dict[int:list[int]] = {}
+        self.ballots_processed = 0
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        tally_start: float = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=initWorker, initargs=(self.private_key_bytes,)) as executor:
+            pending_jobs: set[asyncio.Future] = set()
+            chunk_index: int = 0
+
+            def mergeChunk(chunk_result: dict) -> None:
+                for option in chunk_result["tally"]:
+                    election_options_tally[option] += chunk_result["tally"][option]
+
+                chunk_receipts[chunk_result["chunk_index"]] = chunk_result["receipts"]
+                self.ballots_processed += chunk_result["ballots"]
+
+                elapsed_time: float = time.perf_counter() - tally_start
+                log.info(f"Tallied {self.ballots_processed} ballots so far ({self.ballots_processed / elapsed_time if elapsed_time > 0 else 0.0:.1f} ballots/s)")
+
+                if (self.progress_callback):
+                    self.progress_callback(dict(election_options_tally), self.ballots_processed)
+
+            async for chunk in self.iterateChunks(encrypted_ballots=encrypted_ballots):
+                pending_jobs.add(loop.run_in_executor(executor, tallyChunk, chunk_index, chunk, valid_options, self.option_separator))
+                chunk_index += 1
+
+                # Keep at most two chunks per worker in flight, so that a streamed input does not pile up in memory
+                if (len(pending_jobs) >= 2 * self.max_workers):
+                    done_jobs, pending_jobs = await asyncio.wait(pending_jobs, return_when=asyncio.FIRST_COMPLETED)
+
+                    for done_job in done_jobs:
+                        mergeChunk(chunk_result=done_job.result())
+
+            while (len(pending_jobs) > 0):
+                done_jobs, pending_jobs = await asyncio.wait(pending_jobs, return_when=asyncio.FIRST_COMPLETED)
+
+                for done_job in done_jobs:
+                    mergeChunk(chunk_result=done_job.result())
+
+        self.elapsed_time = time.perf_counter() - tally_start
+        self.ballots_per_second = self.ballots_processed / self.elapsed_time if self.elapsed_time > 0 else 0.0
+
+        ballot_receipts: list[int] = []
+
+        for index in sorted(chunk_receipts.keys()):
+            ballot_receipts.extend(chunk_receipts[index])
+
+        log.info(f"Tally finished: {self.ballots_processed} ballots in {self.elapsed_time:.2f} seconds ({self.ballots_per_second:.1f} ballots/s) using {self.max_workers} workers")
+
+        return (election_options_tally, ballot_receipts)
@@ -0,0 +1,60 @@
+"""
+Script to create, and fund, a number of test accounts in the active network, in batches, with the AccountProvisioner. This replaces 01_create_emulator_accounts.sh,
+which needed one Flow CLI call per account and a separate funding transaction.
+"""
+import asyncio
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pathlib
+from common.utils import Utils
+from common.client_pool import closeClientPools
+from common.metrics_sink import closeMetricsSink
+import configparser
+import datetime
+import time
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+from python_scripts.account_provisioning import AccountProvisioner
+from common.account_config import AccountRecord
+
+project_cwd = pathlib.Path(os.getcwd())
+config_path = project_cwd.joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+
+async def main(account_count: int, funding_amount: float = None) -> None:
+    """
+    Creates the number of accounts provided, with the [account_provisioning] parameters from the config file, and reports how long it took.
+    """
+    account_provisioner: AccountProvisioner = AccountProvisioner(funding_amount=funding_amount)
+
+    gas_results_file_name: str = f"{datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S")}_{config.get(section="network", option="current")}_account_runner_gas_results.csv"
+    gas_results_file_path: pathlib.Path = pathlib.Path(os.getcwd()).joinpath("results", gas_results_file_name)
+
+    run_start: float = time.perf_counter()
+    new_accounts: list[AccountRecord] = await account_provisioner.provisionAccounts(count=account_count, gas_results_file_path=gas_results_file_path)
+    run_time: float = time.perf_counter() - run_start
+
+    log.info(f"Created {len(new_accounts)} out of {account_count} accounts in {run_time:.2f} seconds ({len(new_accounts) / run_time if run_time > 0 else 0.0:.1f} accounts/s)")
+
+    await closeClientPools()
+    await closeMetricsSink()
+
+
+if __name__ == "__main__":
+    """
+    Usage: python runners/account_runner.py <account_count> [<funding_amount>]
+    :param account_count (int): The number of accounts to create.
+    :param funding_amount (float): The FLOW to deposit into each new account. Defaults to the [account_provisioning] funding_amount value.
+    """
+    if (len(sys.argv) < 2):
+        raise Exception("ERROR: Please provide the number of accounts to create")
+
+    account_count: int = int(sys.argv[1].strip())
+    funding_amount: float = float(sys.argv[2].strip()) if len(sys.argv) > 2 else None
+
+    asyncio.run(main(account_count=account_count, funding_amount=funding_amount))
@@ -0,0 +1,520 @@
+"""
+Script to benchmark the whole Election life cycle with declared, reproducible, scenarios. Each scenario sets how many Elections to create, how many voters to register, how
+many voting rounds to run and whether to deploy the contracts first and to tally and finish the Elections at the end. The runner executes the steps in a fixed order:
+
+    deploy -> create_elections -> register_voters -> rounds -> tally -> finish
+
+and writes a JSON report with the wall time of each step, the latency histogram and percentiles per operation, the fees and execution effort (from the FlowFees.FeesDeducted
+events) per step, and the peak RSS of the process. The report also records the git commit, the scenario parameters and the random seed used to pick the ballot options, so
+that reports from different commits can be put side by side with the 'compare' command.
+
+The backend is either the network configured in the [network] section ("network") or the in-process access node stand-in ("stub"), which is started on the host and port of
+the configured network before the scenario runs. The stand-in keeps the Elections, VoteBoxes and Ballots created during the scenario in memory (see
+AccessNodeStub.setElectionDefaults), unless its canned results file sets other results.
+
+Usage: python runners/benchmark_runner.py <scenario> [<backend>]
+       python runners/benchmark_runner.py compare <baseline_report.json> <candidate_report.json>
+"""
+import asyncio
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pathlib
+from common.utils import Utils
+from common.account_config import AccountConfig
+from common.client_pool import closeClientPools
+from common.metrics_sink import metrics_sink, closeMetricsSink
+from common.receipt_store import closeReceiptStore
+import configparser
+import datetime
+import json
+import platform
+import random
+import resource
+import subprocess
+import time
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+from python_scripts.election_management import Election
+from python_scripts.contract_management import DeployContract, DeleteContract
+
+project_cwd = pathlib.Path(os.getcwd())
+config_path = project_cwd.joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+# Declared scenarios. Change these only together with a note in the commit, otherwise reports from different commits stop being comparable
+scenarios: dict[str, dict] = {
+    "smoke": {"deploy": False, "elections": 1, "voters": 2, "rounds": 1, "tally": True, "finish": True, "free_election": True, "max_concurrency": 2, "combined_vote": False},
+    "baseline": {"deploy": True, "elections": 1, "voters": 10, "rounds": 3, "tally": True, "finish": True, "free_election": True, "max_concurrency": 10, "combined_vote": False},
+    "combined": {"deploy": True, "elections": 1, "voters": 10, "rounds": 3, "tally": True, "finish": True, "free_election": True, "max_concurrency": 10, "combined_vote": True},
+    "paid": {"deploy": True, "elections": 1, "voters": 10, "rounds": 3, "tally": True, "finish": True, "free_election": False, "max_concurrency": 10, "combined_vote": False},
+    "stress": {"deploy": True, "elections": 3, "voters": 100, "rounds": 5, "tally": True, "finish": True, "free_election": True, "max_concurrency": 50, "combined_vote": False}
+}
+
+# Steps, in execution order
+benchmark_steps: list[str] = ["deploy", "create_elections", "register_voters", "rounds", "tally", "finish"]
+
+# Upper bounds, in milliseconds, of the latency histogram buckets. Anything above the last one goes into an "inf" bucket
+latency_buckets: list[float] = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+benchmark_election: dict = {
+    "name": "Benchmark Election",
+    "ballot": "Which option should win this benchmark?",
+    "options": {
+        1: "Option A",
+        2: "Option B",
+        3: "Option C",
+        4: "Option D"
+    }
+}
+
+
+class BenchmarkRecorder(object):
+    """Collector of the benchmark measurements. Operation latencies are recorded by timed_operation, while fees and execution efforts arrive through the metrics sink
+    listener, and are attributed to the step running at the time.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.current_step: str = None
+        self.step_times: dict[str, float] = {}
+        self.latencies: dict[str, list[int]] = {}
+        self.errors: dict[str, int] = {}
+        self.fees: dict[str, dict[str, float]] = {}
+
+
+    def startStep(self, step: str) -> float:
+        """Function to mark the beginning of a benchmark step.
+
+        :param step (str): The step name, one of the benchmark_steps.
+
+        :return (float): The step start time, to be provided to endStep.
+        """
+        self.current_step = step
+        self.fees[step] = {"transactions": 0, "fee_amount": 0.0, "execution_effort": 0.0, "inclusion_effort": 0.0}
+        log.info(f"Benchmark step '{step}' started")
+
+        return time.perf_counter()
+
+
+    def endStep(self, step: str, step_start: float) -> None:
+        """Function to mark the end of a benchmark step.
+
+        :param step (str): The step name.
+        :param step_start (float): The value returned by startStep.
+        """
+        self.step_times[step] = time.perf_counter() - step_start
+        self.current_step = None
+        log.info(f"Benchmark step '{step}' finished in {self.step_times[step]:.2f} seconds")
+
+
+    def record(self, operation: str, elapsed_time: int, success: bool = True) -> None:
+        """Function to record the outcome of an operation.
+
+        :param operation (str): The operation name, e.g., "cast_ballot".
+        :param elapsed_time (int): The duration of the operation, in ns.
+        :param success (bool): False if the operation raised an Exception. Failed operations only count as errors, not towards the latencies.
+        """
+        if (success):
+            self.latencies.setdefault(operation, []).append(elapsed_time)
+        else:
+            self.errors[operation] = self.errors.get(operation, 0) + 1
+
+
+    def onMetricsRecord(self, output_file_path: pathlib.Path, headers: list[str], values: list) -> None:
+        """Metrics sink listener that adds the fees from each gas record to the current step. Storage records, and records without fees, are ignored.
+
+        :param output_file_path (pathlib.Path): The file where the record goes to. Not used.
+        :param headers (list[str]): The column names of the record.
+        :param values (list): The record values.
+        """
+        if (self.current_step == None or "Fee Amount (FLOW)" not in headers):
+            return
+
+        fee_amount = values[headers.index("Fee Amount (FLOW)")]
+
+        if (fee_amount == ""):
+            return
+
+        step_fees: dict[str, float] = self.fees[self.current_step]
+        step_fees["transactions"] += 1
+        step_fees["fee_amount"] += float(fee_amount)
+        step_fees["execution_effort"] += float(values[headers.index("Execution Effort")])
+        step_fees["inclusion_effort"] += float(values[headers.index("Inclusion Effort")])
+
+
+    def getOperationReport(self, operation: str) -> dict:
+        """Function to digest the latencies of an operation.
+
+        :param operation (str): The operation name.
+
+        :return (dict): The operation statistics, with the latencies in milliseconds, in the format {"count": int, "errors": int, "mean": float, "p50": float,
+        "p95": float, "p99": float, "max": float, "histogram": {bucket: count}}
+        """
+        sorted_latencies: list[int] = sorted(self.latencies.get(operation, []))
+        histogram: dict[str, int] = {f"<={bucket}ms": 0 for bucket in latency_buckets}
+        histogram["inf"] = 0
+
+        for latency in sorted_latencies:
+            for bucket in latency_buckets:
+                if (latency / 1e6 <= bucket):
+                    histogram[f"<={bucket}ms"] += 1
+                    break
+            else:
+                histogram["inf"] += 1
+
+        return {
+            "count": len(sorted_latencies),
+            "errors": self.errors.get(operation, 0),
+            "mean": sum(sorted_latencies) / len(sorted_latencies) / 1e6 if len(sorted_latencies) > 0 else 0.0,
+            "p50": Utils.percentile(sorted_values=sorted_latencies, percent=50) / 1e6,
+            "p95": Utils.percentile(sorted_values=sorted_latencies, percent=95) / 1e6,
+            "p99": Utils.percentile(sorted_values=sorted_latencies, percent=99) / 1e6,
+            "max": sorted_latencies[-1] / 1e6 if len(sorted_latencies) > 0 else 0.0,
+            "histogram": histogram
+        }
+
+
+async def timed_operation(operation: str, operation_coroutine, recorder: BenchmarkRecorder):
+    """Function to run, and time, one benchmark operation.
+
+    :param operation (str): The operation name, to record the latency under.
+    :param operation_coroutine (coroutine): The (not yet awaited) operation.
+    :param recorder (BenchmarkRecorder): The object where the latency is recorded.
+
+    :return: Whatever the operation returns, or None if it raised an Exception. Failed operations are logged and counted, but do not stop the benchmark.
+    """
+    operation_start: int = time.perf_counter_ns()
+
+    try:
+        operation_result = await operation_coroutine
+    except Exception as e:
+        recorder.record(operation=operation, elapsed_time=time.perf_counter_ns() - operation_start, success=False)
+        log.warning(f"Benchmark operation '{operation}' failed: {e}")
+        return None
+
+    recorder.record(operation=operation, elapsed_time=time.perf_counter_ns() - operation_start)
+
+    return operation_result
+
+
+def get_commit() -> str:
+    """Function to retrieve the current git commit, to tag the report with.
+
+    :return (str): The commit hash, with a '-dirty' suffix if there are uncommitted changes, or "unknown" if git is not available.
+    """
+    try:
+        commit: str = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, cwd=project_cwd).stdout.strip()
+        changes: str = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True, cwd=project_cwd).stdout.strip()
+
+        return commit + ("-dirty" if changes else "")
+    except Exception:
+        return "unknown"
+
+
+async def run_scenario(scenario_name: str, recorder: BenchmarkRecorder, gas_results_file_path: pathlib.Path) -> None:
+    """Function to execute the steps of the scenario provided.
+
+    :param scenario_name (str): One of the declared scenarios.
+    :param recorder (BenchmarkRecorder): The object where the measurements are recorded.
+    :param gas_results_file_path (pathlib.Path): The file where the gas records are written to. These records are also what feeds the fee totals per step.
+    """
+    scenario: dict = scenarios[scenario_name]
+    ctx: AccountConfig = AccountConfig()
+    service_address: str = ctx.service_account["address"].hex()
+
+    if (scenario["voters"] > len(ctx.accounts)):
+        raise Exception(f"ERROR: Scenario '{scenario_name}' needs {scenario["voters"]} voter accounts but only {len(ctx.accounts)} are configured for network {config.get(section="network", option="current")}")
+
+    voter_addresses: list[str] = [account["address"].hex() for account in ctx.accounts[0:scenario["voters"]]]
+
+    # Same seed, same sequence of ballot options, regardless of the commit
+    option_picker: random.Random = random.Random(config.getint(section="benchmark", option="seed", fallback=1234))
+    concurrency_slots: asyncio.Semaphore = asyncio.Semaphore(scenario["max_concurrency"])
+    run_tag: str = datetime.datetime.now().strftime("%d%m%y%H%M%S")
+
+    elections: list[Election] = []
+
+    def voter_roles(voter_address: str) -> dict:
+        # Free elections have the service account paying for the voter transactions
+        if (scenario["free_election"]):
+            return {"tx_signer_address": None, "tx_proposer_address": voter_address, "tx_payer_address": service_address, "tx_authorizer_address": [voter_address]}
+
+        return {"tx_signer_address": voter_address}
+
+    if (scenario["deploy"]):
+        step_start: float = recorder.startStep(step="deploy")
+
+        contract_deleter: DeleteContract = DeleteContract()
+        contract_deleter.event_runner.configureDeployerAddress()
+        await timed_operation(operation="clear_contracts", recorder=recorder, operation_coroutine=contract_deleter.resetNetwork(gas_results_file_path=gas_results_file_path))
+        await timed_operation(operation="deploy_contracts", recorder=recorder, operation_coroutine=DeployContract().deployProject(gas_results_file_path=gas_results_file_path))
+
+        recorder.endStep(step="deploy", step_start=step_start)
+
+    step_start = recorder.startStep(step="create_elections")
+
+    with open(project_cwd.joinpath("keys", config.get(section="benchmark", option="public_key", fallback="rsa_public_1.key"))) as public_key_stream:
+        election_public_key: str = public_key_stream.read()
+
+    for election_index in range(0, scenario["elections"]):
+        election: Election = Election()
+
+        election_id: int = await timed_operation(operation="create_election", recorder=recorder, operation_coroutine=election.create_election(
+            new_election_name=f"{benchmark_election["name"]} {election_index}",
+            new_election_ballot=benchmark_election["ballot"],
+            new_election_options=benchmark_election["options"],
+            new_election_public_key=election_public_key,
+            new_election_storage_path=f"BenchmarkElection{run_tag}{election_index}",
+            new_election_public_path=f"PublicBenchmarkElection{run_tag}{election_index}",
+            free_election=scenario["free_election"],
+            new_tx_signer_address=service_address,
+            gas_results_file_path=gas_results_file_path
+        ))
+
+        if (election_id != None):
+            elections.append(election)
+
+    recorder.endStep(step="create_elections", step_start=step_start)
+
+    if (len(elections) == 0):
+        raise Exception(f"ERROR: Scenario '{scenario_name}' was unable to create any Election. Cannot continue!")
+
+    step_start = recorder.startStep(step="register_voters")
+
+    async def register_voter(voter_address: str) -> None:
+        async with concurrency_slots:
+            await timed_operation(operation="create_votebox", recorder=recorder, operation_coroutine=elections[0].create_votebox(gas_results_file_path=gas_results_file_path, **voter_roles(voter_address)))
+
+    await asyncio.gather(*[register_voter(voter_address=voter_address) for voter_address in voter_addresses])
+    recorder.endStep(step="register_voters", step_start=step_start)
+
+    step_start = recorder.startStep(step="rounds")
+
+    # Pick every option upfront, in a fixed order, so that the concurrency does not change which voter gets which option
+    election_options: list[str] = list(benchmark_election["options"].values())
+    voter_options: list[list[list[str]]] = [[[option_picker.choice(election_options) for voter_address in voter_addresses] for election in elections] for current_round in range(0, scenario["rounds"])]
+
+    async def vote(election: Election, voter_address: str, option: str) -> None:
+        async with concurrency_slots:
+            await timed_operation(operation="create_ballot", recorder=recorder, operation_coroutine=election.mint_ballot_to_votebox(votebox_address=voter_address, tx_signer_address=service_address, gas_results_file_path=gas_results_file_path))
+
+            if (scenario["combined_vote"]):
+                # Same as the baseline, but with the cast, submit and receipt in a single transaction. Compare the two reports to see the difference
+                ballot_receipt: int = await timed_operation(operation="vote", recorder=recorder, operation_coroutine=election.vote(option_to_set=option, gas_results_file_path=gas_results_file_path, **voter_roles(voter_address)))
+
+                if (ballot_receipt != None):
+                    await ctx.addReceipt(voter_address=voter_address, election_id=election.election_id, ballot_receipt=ballot_receipt)
+
+                return
+
+            ballot_receipt: int = await timed_operation(operation="cast_ballot", recorder=recorder, operation_coroutine=election.cast_ballot(option_to_set=option, gas_results_file_path=gas_results_file_path, **voter_roles(voter_address)))
+
+            if (ballot_receipt != None):
+                await ctx.addReceipt(voter_address=voter_address, election_id=election.election_id, ballot_receipt=ballot_receipt)
+                await timed_operation(operation="submit_ballot", recorder=recorder, operation_coroutine=election.submit_ballot(gas_results_file_path=gas_results_file_path, **voter_roles(voter_address)))
+
+    for current_round in range(0, scenario["rounds"]):
+        log.info(f"Benchmark round {current_round + 1} of {scenario["rounds"]}")
+
+        await asyncio.gather(*[
+            vote(election=election, voter_address=voter_address, option=voter_options[current_round][election_index][voter_index])
+            for election_index, election in enumerate(elections)
+            for voter_index, voter_address in enumerate(voter_addresses)
+        ])
+
+    recorder.endStep(step="rounds", step_start=step_start)
+
+    if (scenario["tally"]):
+        step_start = recorder.startStep(step="tally")
+
+        for election in elections:
+            await timed_operation(operation="tally_election", recorder=recorder, operation_coroutine=election.tally_election(private_encryption_key_name=config.get(section="benchmark", option="private_key", fallback="rsa_private_1.key"), tx_signer_address=service_address, gas_results_file_path=gas_results_file_path))
+
+        recorder.endStep(step="tally", step_start=step_start)
+
+    if (scenario["tally"] and scenario["finish"]):
+        step_start = recorder.startStep(step="finish")
+
+        for election in elections:
+            await timed_operation(operation="finish_election", recorder=recorder, operation_coroutine=election.finish_election(tx_signer_address=service_address, gas_results_file_path=gas_results_file_path))
+
+        recorder.endStep(step="finish", step_start=step_start)
+
+
+async def run_benchmark(scenario_name: str, backend: str = None, report_file_path: pathlib.Path = None) -> dict:
+    """Main function of this runner. Runs the scenario provided against the backend selected and writes the report.
+
+    :param scenario_name (str): One of the declared scenarios.
+    :param backend (str): Either "network" or "stub". Defaults to the [benchmark] config section value.
+    :param report_file_path (pathlib.Path): Where to write the JSON report. Defaults to a timestamped file in the results folder.
+
+    :return (dict): The benchmark report.
+    """
+    if (scenario_name not in scenarios):
+        raise Exception(f"ERROR: Unknown scenario '{scenario_name}'. Valid options are: {", ".join(scenarios.keys())}")
+
+    backend = backend if backend else config.get(section="benchmark", option="backend", fallback="network")
+
+    if (backend != "network" and backend != "stub"):
+        raise Exception(f"ERROR: Invalid backend '{backend}'. Please use 'network' or 'stub' to continue!")
+
+    commit: str = get_commit()
+    timestamp: str = datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S")
+    results_dir: pathlib.Path = project_cwd.joinpath(config.get(section="benchmark", option="report_directory", fallback="results"))
+    gas_results_file_path: pathlib.Path = results_dir.joinpath(f"{timestamp}_{config.get(section="network", option="current")}_benchmark_{scenario_name}_gas_results.csv")
+
+    if (report_file_path == None):
+        report_file_path = results_dir.joinpath(f"{timestamp}_benchmark_{scenario_name}_{commit[0:8]}.json")
+
+    recorder: BenchmarkRecorder = BenchmarkRecorder()
+    metrics_sink.addListener(recorder.onMetricsRecord)
+
+    access_node_stub = None
+
+    if (backend == "stub"):
+        # Imported in here so that network runs do not need grpclib server support. The stand-in takes the place of the configured network access node
+        from common.access_node_stub import AccessNodeStub
+
+        ctx: AccountConfig = AccountConfig()
+        access_node_stub = AccessNodeStub(host=ctx.access_node_host, port=ctx.access_node_port)
+        access_node_stub.setElectionDefaults()
+        await access_node_stub.start()
+
+    log.info(f"Running benchmark scenario '{scenario_name}' {scenarios[scenario_name]} against the '{backend}' backend, at commit {commit}")
+    benchmark_start: float = time.perf_counter()
+
+    try:
+        await run_scenario(scenario_name=scenario_name, recorder=recorder, gas_results_file_path=gas_results_file_path)
+    finally:
+        wall_time: float = time.perf_counter() - benchmark_start
+        metrics_sink.removeListener(recorder.onMetricsRecord)
+
+        if (access_node_stub != None):
+            # The stand-in only stops once every connection to it is closed
+            await closeClientPools()
+            await access_node_stub.stop()
+
+    report: dict = {
+        "scenario": scenario_name,
+        "parameters": scenarios[scenario_name],
+        "seed": config.getint(section="benchmark", option="seed", fallback=1234),
+        "backend": backend,
+        "network": config.get(section="network", option="current"),
+        "commit": commit,
+        "timestamp": timestamp,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "wall_time": wall_time,
+        # ru_maxrss is in KB on Linux. The children value covers the tally worker processes
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "peak_rss_children_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        "steps": {
+            step: {"wall_time": recorder.step_times[step], **recorder.fees[step]} for step in benchmark_steps if step in recorder.step_times
+        },
+        "operations": {
+            operation: recorder.getOperationReport(operation=operation) for operation in sorted(set(recorder.latencies.keys()) | set(recorder.errors.keys()))
+        }
+    }
+
+    with open(report_file_path, "w") as report_stream:
+        json.dump(report, report_stream, indent=4)
+
+    log.info(f"Benchmark finished in {wall_time:.2f} seconds. Report written to {report_file_path}")
+    print_report(report=report)
+
+    return report
+
+
+def print_report(report: dict) -> None:
+    """Function to log a benchmark report in a table format.
+
+    :param report (dict): The report returned by run_benchmark.
+    """
+    log.info(f"{"Step":<20}{"Wall (s)":>10}{"Txs":>8}{"Fees (FLOW)":>14}{"Exec. Effort":>14}")
+
+    for step in report["steps"]:
+        log.info(f"{step:<20}{report["steps"][step]["wall_time"]:>10.2f}{report["steps"][step]["transactions"]:>8}{report["steps"][step]["fee_amount"]:>14.8f}{report["steps"][step]["execution_effort"]:>14.2f}")
+
+    log.info(f"{"Operation":<20}{"Count":>8}{"Errors":>8}{"mean (ms)":>12}{"p50 (ms)":>12}{"p95 (ms)":>12}{"p99 (ms)":>12}")
+
+    for operation in report["operations"]:
+        operation_report: dict = report["operations"][operation]
+        log.info(f"{operation:<20}{operation_report["count"]:>8}{operation_report["errors"]:>8}{operation_report["mean"]:>12.1f}{operation_report["p50"]:>12.1f}{operation_report["p95"]:>12.1f}{operation_report["p99"]:>12.1f}")
+
+    log.info(f"Peak RSS: {report["peak_rss_kb"] / 1024:.1f} MB (workers: {report["peak_rss_children_kb"] / 1024:.1f} MB)")
+
+
+def compare_reports(baseline_report_path: pathlib.Path, candidate_report_path: pathlib.Path) -> dict:
+    """Function to compare two benchmark reports, e.g., from two different commits, and log the relative change of the main figures.
+
+    :param baseline_report_path (pathlib.Path): The reference report.
+    :param candidate_report_path (pathlib.Path): The report to compare against the reference.
+
+    :return (dict): The relative changes, in percentage, in the format {"wall_time": float, "peak_rss_kb": float, "steps": {step: float}, "operations": {operation: {"p50": float, "p95": float}}}
+    """
+    with open(baseline_report_path) as baseline_stream:
+        baseline: dict = json.load(baseline_stream)
+
+    with open(candidate_report_path) as candidate_stream:
+        candidate: dict = json.load(candidate_stream)
+
+    if (baseline["scenario"] != candidate["scenario"] or baseline["parameters"] != candidate["parameters"] or baseline["backend"] != candidate["backend"]):
+        log.warning(f"CAUTION: Comparing reports from different scenarios or backends ({baseline["scenario"]}/{baseline["backend"]} vs {candidate["scenario"]}/{candidate["backend"]})")
+
+    def change(baseline_value: float, candidate_value: float) -> float:
+        return (candidate_value - baseline_value) / baseline_value * 100 if baseline_value else 0.0
+
+    comparison: dict = {
+        "wall_time": change(baseline["wall_time"], candidate["wall_time"]),
+        "peak_rss_kb": change(baseline["peak_rss_kb"], candidate["peak_rss_kb"]),
+        "steps": {step: change(baseline["steps"][step]["wall_time"], candidate["steps"][step]["wall_time"]) for step in baseline["steps"] if step in candidate["steps"]},
+        "operations": {
+            operation: {
+                "p50": change(baseline["operations"][operation]["p50"], candidate["operations"][operation]["p50"]),
+                "p95": change(baseline["operations"][operation]["p95"], candidate["operations"][operation]["p95"])
+            } for operation in baseline["operations"] if operation in candidate["operations"]
+        }
+    }
+
+    log.info(f"Comparing {baseline["commit"][0:8]} (baseline) with {candidate["commit"][0:8]} (candidate), scenario '{candidate["scenario"]}'")
+    log.info(f"Wall time: {baseline["wall_time"]:.2f} s -> {candidate["wall_time"]:.2f} s ({comparison["wall_time"]:+.1f}%)")
+    log.info(f"Peak RSS: {baseline["peak_rss_kb"]} KB -> {candidate["peak_rss_kb"]} KB ({comparison["peak_rss_kb"]:+.1f}%)")
+
+    for step in comparison["steps"]:
+        log.info(f"Step {step:<20} {comparison["steps"][step]:+8.1f}%")
+
+    for operation in comparison["operations"]:
+        log.info(f"Operation {operation:<20} p50 {comparison["operations"][operation]["p50"]:+8.1f}%   p95 {comparison["operations"][operation]["p95"]:+8.1f}%")
+
+    return comparison
+
+
+async def main(scenario_name: str = None, backend: str = None) -> None:
+    """
+    Runs the benchmark scenario provided, or the one from the [benchmark] section of the config file.
+    """
+    await run_benchmark(scenario_name=scenario_name if scenario_name else config.get(section="benchmark", option="scenario", fallback="smoke"), backend=backend)
+
+    await closeClientPools()
+    await closeMetricsSink()
+    await closeReceiptStore()
+
+
+if __name__ == "__main__":
+    """
+    Usage: python runners/benchmark_runner.py <scenario> [<backend>]
+           python runners/benchmark_runner.py compare <baseline_report.json> <candidate_report.json>
+    """
+    if (len(sys.argv) > 1 and sys.argv[1].strip() == "compare"):
+        if (len(sys.argv) < 4):
+            raise Exception("ERROR: Please provide the baseline and the candidate report files to compare")
+
+        compare_reports(baseline_report_path=pathlib.Path(sys.argv[2].strip()), candidate_report_path=pathlib.Path(sys.argv[3].strip()))
+    else:
+        scenario_name: str = sys.argv[1].strip() if len(sys.argv) > 1 else None
+        backend: str = sys.argv[2].strip() if len(sys.argv) > 2 else None
+
+        asyncio.run(main(scenario_name=scenario_name, backend=backend))
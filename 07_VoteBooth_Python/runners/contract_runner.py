@@ -17,6 +17,7 @@ from pathlib import Path
 from python_scripts.cadence_scripts import ScriptRunner
 from common.utils import Utils
 from common.account_config import AccountConfig
+from common.client_pool import closeClientPools
 from python_scripts.event_management import EventRunner
 import time
 import datetime
@@ -126,8 +127,9 @@ async def deploy_contract(contract_name: str, contract_source: str, update: bool
 
             if (gas_results_file_path):
                 # Grab the FeesDeducted and TokensWithdrawn events for further analysis
-                tokens_withdrawn_events: list[dict] = await event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-                fees_deducted_events: list[dict] = await event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+                decoded_events: dict[str:list[dict]] = await event_runner.decodeEvents(tx_response=tx_response)
+                tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+                fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
                 Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"{contract["name"]} deployment", output_file_path=gas_results_file_path)
 
@@ -226,8 +228,9 @@ async def update_contract(contract_name: str, contract_source: str, gas_results_
                 await script_runner.profile_all_accounts_csv(program_stage=f"{contract["name"]} - post update", output_file_path=storage_results_file_path, account=signer_address.hex())
 
             if (gas_results_file_path):
-                tokens_withdrawn_events: list[dict] = await event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-                fees_deducted_events: list[dict] = await event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+                decoded_events: dict[str:list[dict]] = await event_runner.decodeEvents(tx_response=tx_response)
+                tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+                fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
                 Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"{contract["name"]} Update", output_file_path=gas_results_file_path)
 
@@ -304,8 +307,9 @@ async def delete_contract(contract_name: str, gas_results_file_path: Path = None
                 await script_runner.profile_all_accounts_csv(program_stage=f"{contract_name} - post deletion", output_file_path=storage_results_file_path, account=signer_address.hex())
 
             if (gas_results_file_path):
-                tokens_withdrawn_events: list[dict] = await event_runner.getFungibleTokenWithdrawnEvents(tx_response=tx_response)
-                fees_deducted_events: list[dict] = await event_runner.getFlowFeesFeesDeductedEvents(tx_response=tx_response)
+                decoded_events: dict[str:list[dict]] = await event_runner.decodeEvents(tx_response=tx_response)
+                tokens_withdrawn_events: list[dict] = decoded_events["FungibleToken.Withdrawn"]
+                fees_deducted_events: list[dict] = decoded_events["FlowFees.FeesDeducted"]
 
                 Utils.processTransactionData(fees_deducted_events=fees_deducted_events, tokens_withdrawn_events=tokens_withdrawn_events, elapsed_time=(tx_end - tx_start), tx_description=f"{contract_name} Deletion", output_file_path=gas_results_file_path)
         except Exception as e:
@@ -357,4 +361,7 @@ if __name__ == "__main__":
         # Operation = "clear"
         for contract_name in project_files:
             log.info(f"Deleting {contract_name}...")
-            new_loop.run_until_complete(delete_contract(contract_name=contract_name, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path))
\ No newline at end of file
+            new_loop.run_until_complete(delete_contract(contract_name=contract_name, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path))
+
+    # Close the pooled access node connections before the event loop goes away
+    new_loop.run_until_complete(closeClientPools())
@@ -7,8 +7,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import pathlib
 from common.utils import Utils
 from common.account_config import AccountConfig
+from common.client_pool import closeClientPools
+from common.receipt_store import receipt_store
 import configparser
-import base64
 import datetime
 
 import logging
@@ -21,7 +22,8 @@ script_runner: ScriptRunner = ScriptRunner()
 from python_scripts.cadence_transactions import TransactionRunner
 tx_runner: TransactionRunner = TransactionRunner()
 
-from python_scripts.crypto_management import CryptoUtils
+from python_scripts.tally_engine import TallyEngine
+from python_scripts.election_cache import election_cache
 
 project_cwd = pathlib.Path(os.getcwd())
 config_path = project_cwd.joinpath("common", "config.ini")
@@ -55,86 +57,73 @@ async def tally_election(election_id: int, private_encryption_key_name: str, tx_
         :param storage_results_file_path (pathlib.Path): A valid path to a file where the storage computations should be written into. If None is provided, the function skips the storage analysis.
         :return (dict[str:int]): Returns the election tally as a dictionary with all the options as keys, and the votes received as values.
         """
-        election_options: list[dict] = await script_runner.getElectionOptions(election_id=election_id)
+        election_options: list[dict] = (await election_cache.getElection(election_id=election_id)).options
 
         ballots_withdrawn_events = await tx_runner.tallyElection(election_id=election_id, tx_signer_address=tx_signer_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
 
         for ballots_withdrawn_event in ballots_withdrawn_events:
             log.info(f"Election {ballots_withdrawn_event["election_id"]} tallied after processing {ballots_withdrawn_event["ballots_withdrawn"]} ballots.")
 
-        # Fetch the election results, namely the array of encrypted ballot options
-        encrypted_ballots: list[str] = await script_runner.getElectionEncryptedBallots(election_id=election_id)
+        # Fetch the election results, namely the array of encrypted ballot options, one page at a time. The pages are fed to the tally engine as they arrive, so the
+        # whole array is never held in memory
+        encrypted_ballots = script_runner.iterateElectionEncryptedBallots(election_id=election_id)
 
-        # Recover the private encryption key from the path provided
-        private_key = CryptoUtils.load_private_key_from_file(private_encryption_key_name)
+        # Decrypt and count the ballots in parallel, with a pool of worker processes
+        tally_engine: TallyEngine = TallyEngine(election_options=election_options, private_encryption_key_name=private_encryption_key_name)
+        election_options_tally, ballot_receipts = await tally_engine.tally(encrypted_ballots=encrypted_ballots)
 
-        # Decrypt the ballot options. These were base64 encoded initially, so they need to be decoded before decrypting
-        decrypted_ballot_options: list[bytes] = []
+        # Done. Return the results
+        return (election_options_tally, ballot_receipts)
 
-        for encrypted_ballot in encrypted_ballots:
-            # Decode the ballot option from a string first
-            bytes_ballot_option: bytes = bytes(encrypted_ballot, encoding=option_encoding)
-            decoded_ballot_option = base64.b64decode(bytes_ballot_option)
 
-            decrypted_ballot_option: str = CryptoUtils.decrypt_message(ciphertext_message=decoded_ballot_option, private_key=private_key)
+async def validate_receipts(voter_addresses: list[str], election_id: int, election_ballot_receipts: list[int], batch_size: int = None, max_concurrency: int = None) -> dict[str:int]:
+    """
+    This function validates all the ballot receipts retrieved from the VoteBoxes of the accounts with the addresses provided as input, under the election_id also provided as input. A ballot receipt is valid if the same number is in the VoteBox resource and the list provided, since this list was extracted from the encrypted ballot options.
+    The election receipts are put in a set once, and the VoteBox receipts are fetched in batches of voters, with one script per batch and a few batches at a time.
+
+    :param voter_addresses (list[str]): The addresses of the accounts to validate the ballots with.
+    :param election_id (int): The election identifier value for the Election instance that produced the ballot receipts list provided.
+    :param election_ballot_receipts (list[int]): A list with the random integers used to obfuscate the Election's Ballot options.
+    :param batch_size (int): The number of voters whose receipts are fetched per script execution.
+    :param max_concurrency (int): The maximum number of scripts running at the same time.
+    :return (dict[str:int]): A summary in the format {"voters": int, "voters_without_receipts": int, "receipts": int, "valid": int, "invalid": int, "missing": int}, where "missing" counts the election receipts that are not in any of the VoteBoxes checked.
+    """
+    batch_size = batch_size if batch_size else config.getint(section="receipt_validation", option="batch_size", fallback=100)
+    max_concurrency = max_concurrency if max_concurrency else config.getint(section="receipt_validation", option="max_concurrency", fallback=4)
 
-            decrypted_ballot_options.append(str(decrypted_ballot_option, encoding=option_encoding))
-        
-        # All the ballots are decrypted. Run another loop to split them from the salt, put it to another array and start counting options
-        election_options_tally: dict[str:int] = {}
-        # Pre-fill the election_options_tally with the current election options (values) as the keys for this dictionary and set each value, the vote counter
-        # to 0 to start counting
-        for election_option in election_options:
-            election_options_tally[election_options[election_option]] = 0
-        
-        # Create an entry for invalid options as well
-        election_options_tally["invalid"] = 0
+    election_receipt_set: set[int] = set(election_ballot_receipts)
+    votebox_receipt_set: set[int] = set()
 
-        ballot_receipts: list[int] = []
+    summary: dict[str:int] = {"voters": len(voter_addresses), "voters_without_receipts": 0, "receipts": 0, "valid": 0, "invalid": 0, "missing": 0}
+    batch_semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
 
-        for decrypted_ballot_option in decrypted_ballot_options:
-            # Split the decrypted ballot option by the character used to concatenate the option with the random salt
-            option_elements: list[str] = decrypted_ballot_option.split(option_separator)
+    async def validate_batch(voter_batch: list[str]) -> None:
+        # Grab the lists of ballot receipts from the votebox side, for the whole batch of voters
+        async with batch_semaphore:
+            voters_receipts: dict[str:list[int]] = await script_runner.getVotersBallotReceipts(voter_addresses=voter_batch, election_id=election_id)
 
-            # I expect 2 and exactly 2 elements from the string split before. Anything different than that is a problem!
-            if (len(option_elements) != 2):
-                log.error(f"ERROR: Found a illegally formatted ballot option: {decrypted_ballot_option}! Unable to process it further. Skipping...")
+        for voter_address, votebox_ballot_receipts in voters_receipts.items():
+            if (not votebox_ballot_receipts):
+                summary["voters_without_receipts"] += 1
                 continue
 
-            # If the current option retrieved is among the ones in the tally dictionary
-            if (option_elements[0] in election_options_tally):
-                # Increase the tally by 1
-                election_options_tally[option_elements[0]] += 1
-            else:
-                # Count it as an "invalid" one and log its contents for debug purposes
-                election_options_tally["invalid"] += 1
-                log.warning("CAUTION: Retrieved a Ballot with an invalid option: {option}. Ballot counted as 'invalid'")
+            for ballot_receipt in votebox_ballot_receipts:
+                summary["receipts"] += 1
+                votebox_receipt_set.add(ballot_receipt)
 
-            # Put the receipts in another return array
-            ballot_receipts.append(int(option_elements[1]))
+                if (ballot_receipt in election_receipt_set):
+                    summary["valid"] += 1
+                else:
+                    summary["invalid"] += 1
+                    log.debug(f"Receipt '{ballot_receipt}' from account {voter_address} is invalid!")
 
-        # Done. Return the results
-        return (election_options_tally, ballot_receipts)
+    await asyncio.gather(*[validate_batch(voter_batch=voter_addresses[batch_start:batch_start + batch_size]) for batch_start in range(0, len(voter_addresses), batch_size)])
 
+    summary["missing"] = len(election_receipt_set - votebox_receipt_set)
 
-async def validate_receipts(voter_address: str, election_id: int, election_ballot_receipts: list[int]) -> None:
-    """
-    This function validates all the ballot receipts retrieved from a VoteBox from the account with the address provided as input, under the election_id also provided as input. A ballot receipt is valid if the same number is in the VoteBox resource and the list provided, since this list was extracted from the encrypted ballot options.
-    
-    :param voter_address(str): The address for the account to use to validate the ballot with.
-    :param election_id (int): The election identifier value for the Election instance that produced the ballot receipts list provided.
-    :param ballot_receipts list[int]: A list with the random integers used to obfuscate the Election's Ballot options.
-    """
-    # Grab the list of ballot receipts from the votebox side.
-    votebox_ballot_receipts: list[int] = await script_runner.getBallotReceipts(voter_address=voter_address, election_id=election_id)
-    
-    # Validate the receipts
-    for ballot_receipt in votebox_ballot_receipts:
-        if (ballot_receipt in election_ballot_receipts):
-            log.info(f"Receipt '{ballot_receipt}' from account {voter_address} is valid.")
-        else:
-            log.info(f"Receipt '{ballot_receipt}' from account {voter_address} is invalid!")
+    log.info(f"Election {election_id} receipt validation: {summary["valid"]} valid, {summary["invalid"]} invalid and {summary["missing"]} missing receipts, from {summary["receipts"]} receipts in {summary["voters"]} voters ({summary["voters_without_receipts"]} without receipts).")
 
+    return summary
 
 
 async def finish_election(election_id: int, election_results: dict, ballot_receipts: list[int], tx_signer_address: str, gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> None:
@@ -177,8 +166,11 @@ async def terminate_election(election_id: int, private_encryption_key_name: str,
     voter_addresses: list[str] = ctx.getAddresses()
     voter_addresses.remove(ctx.service_account["address"].hex())
 
-    for voter_address in voter_addresses:
-        await validate_receipts(voter_address=voter_address, election_id=election_id, election_ballot_receipts=election_ballot_receipts)
+    await validate_receipts(voter_addresses=voter_addresses, election_id=election_id, election_ballot_receipts=election_ballot_receipts)
+
+    # Compare the receipts recorded by the voter runners, in the receipt store, with the ones in the ballots
+    receipt_match: dict[str:int] = receipt_store.matchElectionReceipts(election_id=election_id, ballot_receipts=election_ballot_receipts)
+    log.info(f"Election {election_id}: {receipt_match["matched"]} of {receipt_match["stored"]} stored receipts found among {receipt_match["ballots"]} ballots ({receipt_match["missing"]} missing, {receipt_match["unknown"]} ballots without a stored receipt).")
 
     # Finish the election by setting the election results and ballot receipts to the resource
     await finish_election(election_id=election_id, election_results=election_results, ballot_receipts=election_ballot_receipts, tx_signer_address=tx_signer_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
@@ -216,4 +208,7 @@ if __name__ == "__main__":
     new_loop = asyncio.new_event_loop()
     asyncio.set_event_loop(new_loop)
 
-    new_loop.run_until_complete(terminate_election(election_id=election_id, private_encryption_key_name=election_private_encryption_keys_filenames[election_index], tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path))
\ No newline at end of file
+    new_loop.run_until_complete(terminate_election(election_id=election_id, private_encryption_key_name=election_private_encryption_keys_filenames[election_index], tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path))
+
+    # Close the pooled access node connections before the event loop goes away
+    new_loop.run_until_complete(closeClientPools())
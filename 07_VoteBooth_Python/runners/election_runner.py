@@ -7,6 +7,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import pathlib
 from common.utils import Utils
 from common.account_config import AccountConfig
+from common.client_pool import closeClientPools
+from common.receipt_store import receipt_store
 import configparser
 import datetime
 
@@ -133,6 +135,9 @@ async def destroy_election(election_id: int, tx_signer_address: str, gas_results
 
     await tx_runner.deleteElection(election_id=election_id, tx_signer_address=tx_signer_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
 
+    # The Election is gone, so its receipts have nothing left to be validated against
+    receipt_store.removeElection(election_id=election_id)
+
 async def list_active_elections() -> None:
     """
     Simple async function to print a list of all active elections in the network configured.
@@ -202,3 +207,6 @@ if __name__ == "__main__":
         new_loop.run_until_complete(list_active_elections())
     else:
         new_loop.run_until_complete(destroy_election(election_id=election_id, tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path))
+
+    # Close the pooled access node connections before the event loop goes away
+    new_loop.run_until_complete(closeClientPools())
@@ -0,0 +1,47 @@
+"""
+Script to run the VoteBooth event indexer in the foreground, until interrupted with Ctrl+C
+"""
+import asyncio
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from common.utils import Utils
+from common.client_pool import closeClientPools
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+from python_scripts.event_indexer import EventIndexer
+
+
+async def run_indexer(start_height: int = None) -> None:
+    """Function to keep the local event index up to date with the network.
+
+    :param start_height (int): The first block height to index, if the indexer does not have a checkpoint yet.
+    """
+    event_indexer: EventIndexer = EventIndexer(start_height=start_height)
+
+    try:
+        await event_indexer.run()
+    finally:
+        event_indexer.event_store.close()
+        await closeClientPools()
+
+
+if __name__ == "__main__":
+    """
+    Usage: python event_indexer_runner.py <start_height>
+    :param start_height (int): Optional. The first block height to index when there is no checkpoint yet. If omitted, the [event_indexer] config value is used instead.
+    """
+    start_height: int = None
+
+    if (len(sys.argv) > 1):
+        start_height = int(sys.argv[1])
+
+        if (start_height < 0):
+            raise Exception(f"ERROR: Invalid start height provided: {start_height}. Please provide a positive value to continue!")
+
+    try:
+        asyncio.run(run_indexer(start_height=start_height))
+    except KeyboardInterrupt:
+        log.info("Event indexer stopped.")
@@ -0,0 +1,393 @@
+"""
+Script to load test an Election by simulating a large number of voters, concurrently, with asyncio. Each simulated voter runs the same mint -> cast -> submit -> addBallotReceipt
+cycle from voter_runner.process_ballot_account, but instead of running one voter after the other, this runner keeps up to 'max_concurrency' voters in flight at the same time,
+starts them according to a ramp up profile and, optionally, caps the number of transactions sent per second. At the end, it reports the throughput and the p50/p95/p99 latency
+per transaction type.
+
+Simulated voters are mapped, round-robin, to the test accounts configured for the active network. Since an account VoteBox can only hold one Ballot per Election at a time,
+simulated voters that share the same account run one after the other. The service account mints the Ballots (and pays for free elections), so give it several proposal keys
+(see the 'proposal_keys' entry in AccountConfig) to avoid serializing every transaction on the service account key.
+
+Usage: python runners/load_generator.py <election_id> [<total_voters> <max_concurrency>]
+"""
+import asyncio
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pathlib
+from common.utils import Utils
+from common.account_config import AccountConfig
+from common.client_pool import closeClientPools
+from common.metrics_sink import closeMetricsSink
+from common.receipt_store import closeReceiptStore
+import configparser
+import datetime
+import time
+import math
+
+import logging
+log = logging.getLogger(__name__)
+Utils.configureLogging()
+
+from python_scripts.cadence_scripts import ScriptRunner
+script_runner: ScriptRunner = ScriptRunner()
+
+from python_scripts.cadence_transactions import TransactionRunner
+tx_runner: TransactionRunner = TransactionRunner()
+
+from python_scripts.election_cache import election_cache, ElectionMetadata
+from python_scripts.ballot_preparation import ballot_preparation, closeBallotPreparation, PreparedBallot
+
+project_cwd = pathlib.Path(os.getcwd())
+config_path = project_cwd.joinpath("common", "config.ini")
+config = configparser.ConfigParser()
+config.read(config_path)
+
+# Transaction types measured by this runner, in the order they are executed in each round
+tx_types: list[str] = ["create_ballot", "cast_ballot", "submit_ballot", "add_ballot_receipt", "vote"]
+
+
+class LatencyRecorder(object):
+    """Simple collector of transaction latencies, per transaction type.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.latencies: dict[str, list[int]] = {tx_type: [] for tx_type in tx_types}
+        self.errors: dict[str, int] = {tx_type: 0 for tx_type in tx_types}
+
+
+    def record(self, tx_type: str, elapsed_time: int, success: bool = True) -> None:
+        """Function to record the outcome of a transaction.
+
+        :param tx_type (str): The type of transaction, one of the tx_types.
+        :param elapsed_time (int): The time, in ns, between submitting the transaction and getting it sealed.
+        :param success (bool): False if the transaction raised an Exception. Failed transactions only count as errors, not towards the latencies.
+        """
+        if (success):
+            self.latencies[tx_type].append(elapsed_time)
+        else:
+            self.errors[tx_type] += 1
+
+
+    def merge(self, latencies: dict[str, list[int]], errors: dict[str, int]) -> None:
+        """Function to add the latencies and errors collected by another recorder, e.g., one from a different process, to this one.
+
+        :param latencies (dict[str, list[int]]): The latencies, in ns, per transaction type, as in LatencyRecorder.latencies.
+        :param errors (dict[str, int]): The number of failed transactions per transaction type, as in LatencyRecorder.errors.
+        """
+        for tx_type in tx_types:
+            self.latencies[tx_type].extend(latencies.get(tx_type, []))
+            self.errors[tx_type] += errors.get(tx_type, 0)
+
+
+    def getReport(self, wall_time: float) -> dict[str, dict]:
+        """Function to digest the latencies recorded into a report.
+
+        :param wall_time (float): The total duration of the load test, in seconds. Used to compute the throughput.
+
+        :return (dict[str, dict]): A dictionary in the format {tx_type: {"count": int, "errors": int, "throughput": float, "p50": float, "p95": float, "p99": float}}, with
+        the throughput in transactions per second and the latencies in milliseconds.
+        """
+        report: dict[str, dict] = {}
+
+        for tx_type in tx_types:
+            sorted_latencies: list[int] = sorted(self.latencies[tx_type])
+
+            report[tx_type] = {
+                "count": len(sorted_latencies),
+                "errors": self.errors[tx_type],
+                "throughput": len(sorted_latencies) / wall_time if wall_time > 0 else 0.0,
+                "p50": Utils.percentile(sorted_values=sorted_latencies, percent=50) / 1e6,
+                "p95": Utils.percentile(sorted_values=sorted_latencies, percent=95) / 1e6,
+                "p99": Utils.percentile(sorted_values=sorted_latencies, percent=99) / 1e6
+            }
+
+        return report
+
+
+class RateLimiter(object):
+    """Token bucket rate limiter, shared by all the simulated voters, to cap the number of transactions sent per second.
+    """
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        super().__init__()
+        self.rate: float = rate
+        self.burst: int = max(1, burst)
+        self.tokens: float = float(self.burst)
+        self.last_refill: float = time.monotonic()
+        self.lock: asyncio.Lock = asyncio.Lock()
+
+
+    async def acquire(self) -> None:
+        """Function to wait for a token before sending a new transaction.
+        """
+        async with self.lock:
+            while (True):
+                current_time: float = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (current_time - self.last_refill) * self.rate)
+                self.last_refill = current_time
+
+                if (self.tokens >= 1):
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def get_start_delay(voter_index: int, total_voters: int, ramp_up_profile: str, ramp_up_time: float, step_size: int) -> float:
+    """Function to compute when a simulated voter should start, according to the ramp up profile selected.
+
+    :param voter_index (int): The index of the simulated voter, from 0 to total_voters - 1.
+    :param total_voters (int): The total number of simulated voters.
+    :param ramp_up_profile (str): One of:
+        - "constant": every voter starts right away (limited only by max_concurrency).
+        - "linear": voter start times are spread evenly over the ramp up time.
+        - "step": voters start in groups of step_size, with the groups spread evenly over the ramp up time.
+    :param ramp_up_time (float): The number of seconds it takes for all voters to start.
+    :param step_size (int): The number of voters per group, for the "step" profile.
+
+    :return (float): The number of seconds this voter needs to wait before starting.
+    """
+    if (ramp_up_profile == "constant" or ramp_up_time <= 0 or total_voters <= 1):
+        return 0.0
+    elif (ramp_up_profile == "linear"):
+        return ramp_up_time * voter_index / total_voters
+    elif (ramp_up_profile == "step"):
+        total_steps: int = math.ceil(total_voters / step_size)
+        return ramp_up_time * (voter_index // step_size) / total_steps
+    else:
+        raise Exception(f"ERROR: Invalid ramp up profile provided: '{ramp_up_profile}'. Please use 'constant', 'linear' or 'step' to continue!")
+
+
+async def timed_transaction(tx_type: str, tx_coroutine, recorder: LatencyRecorder, rate_limiter: RateLimiter = None):
+    """Function to run, and time, one of the transaction functions from the TransactionRunner.
+
+    :param tx_type (str): The type of transaction, to record the latency under.
+    :param tx_coroutine (coroutine): The (not yet awaited) TransactionRunner function call.
+    :param recorder (LatencyRecorder): The object where the latency is recorded.
+    :param rate_limiter (RateLimiter): If provided, the transaction waits for a token before being sent.
+
+    :return: Whatever the transaction function returns. Exceptions are recorded and raised again.
+    """
+    if (rate_limiter):
+        await rate_limiter.acquire()
+
+    tx_start: int = time.perf_counter_ns()
+
+    try:
+        tx_result = await tx_coroutine
+    except Exception:
+        recorder.record(tx_type=tx_type, elapsed_time=time.perf_counter_ns() - tx_start, success=False)
+        raise
+
+    recorder.record(tx_type=tx_type, elapsed_time=time.perf_counter_ns() - tx_start)
+
+    return tx_result
+
+
+async def simulate_voter(voter_index: int, voter_address: str, election_id: int, election_parameters: dict, rounds: int, recorder: LatencyRecorder, rate_limiter: RateLimiter = None, gas_results_file_path: pathlib.Path = None) -> int:
+    """Function that runs the voting cycle for one simulated voter.
+
+    :param voter_index (int): The index of the simulated voter, for logging purposes.
+    :param voter_address (str): The account address used by this simulated voter.
+    :param election_id (int): The Election to vote in.
+    :param election_parameters (dict): The Election parameters retrieved, once, by run_load, namely, "free".
+    :param rounds (int): The number of Ballots this voter submits.
+    :param recorder (LatencyRecorder): The object where the transaction latencies are recorded.
+    :param rate_limiter (RateLimiter): If provided, every transaction waits for a token from this limiter before being sent.
+    :param gas_results_file_path (pathlib.Path): If provided, the gas data for every transaction is written into this file.
+
+    :return (int): The number of rounds that finished successfully.
+    """
+    ctx: AccountConfig = tx_runner.ctx
+    service_address: str = ctx.service_account["address"].hex()
+    combined_vote: bool = config.getboolean(section="voting", option="combined_vote", fallback=True)
+
+    tx_signer_address: str = None
+    tx_proposer_address: str = None
+    tx_payer_address: str = None
+    tx_authorizer_address: list[str] = []
+
+    if (election_parameters["free"]):
+        tx_proposer_address = voter_address
+        tx_payer_address = service_address
+        tx_authorizer_address.append(voter_address)
+    else:
+        tx_signer_address = voter_address
+
+    successful_rounds: int = 0
+
+    for current_round in range(0, rounds):
+        try:
+            await timed_transaction(tx_type="create_ballot", recorder=recorder, rate_limiter=rate_limiter, tx_coroutine=tx_runner.createBallot(election_id=election_id, recipient_address=voter_address, tx_signer_address=service_address, gas_results_file_path=gas_results_file_path))
+
+            # The random option comes already salted and encrypted from the ballot preparation service, so the event loop only waits on the network
+            prepared_ballot: PreparedBallot = await ballot_preparation.getBallot(election_id=election_id)
+            option_salt: int = prepared_ballot.salt
+            base64_option: str = prepared_ballot.encrypted_option
+
+            if (combined_vote):
+                await timed_transaction(tx_type="vote", recorder=recorder, rate_limiter=rate_limiter, tx_coroutine=tx_runner.vote(election_id=election_id, new_option=base64_option, ballot_receipt=option_salt, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=tx_authorizer_address, gas_results_file_path=gas_results_file_path))
+
+                await ctx.addReceipt(voter_address=voter_address, election_id=election_id, ballot_receipt=option_salt)
+            else:
+                await timed_transaction(tx_type="cast_ballot", recorder=recorder, rate_limiter=rate_limiter, tx_coroutine=tx_runner.castBallot(election_id=election_id, new_option=base64_option, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=tx_authorizer_address, gas_results_file_path=gas_results_file_path))
+
+                await timed_transaction(tx_type="submit_ballot", recorder=recorder, rate_limiter=rate_limiter, tx_coroutine=tx_runner.submitBallot(election_id=election_id, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=tx_authorizer_address, gas_results_file_path=gas_results_file_path))
+
+                await ctx.addReceipt(voter_address=voter_address, election_id=election_id, ballot_receipt=option_salt)
+
+                await timed_transaction(tx_type="add_ballot_receipt", recorder=recorder, rate_limiter=rate_limiter, tx_coroutine=tx_runner.addBallotReceipt(election_id=election_id, ballot_receipt=option_salt, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=tx_authorizer_address, gas_results_file_path=gas_results_file_path))
+
+            successful_rounds += 1
+        except Exception as e:
+            log.warning(f"Simulated voter {voter_index} ({voter_address}) failed round {current_round}: {e}")
+
+    return successful_rounds
+
+
+async def run_load(election_id: int = None, total_voters: int = 1000, max_concurrency: int = 50, rounds: int = 1, ramp_up_profile: str = "linear", ramp_up_time: float = 60.0, step_size: int = 10, max_tx_rate: float = None, gas_results_file_path: pathlib.Path = None, report_file_path: pathlib.Path = None) -> dict[str, dict]:
+    """Main function of this runner. Simulates the number of voters provided, with bounded concurrency, and reports the throughput and latency per transaction type.
+
+    :param election_id (int): The Election to load test. If not provided, or not active, the first active Election is used instead.
+    :param total_voters (int): The number of voters to simulate.
+    :param max_concurrency (int): The maximum number of simulated voters running at the same time.
+    :param rounds (int): The number of Ballots that each simulated voter submits.
+    :param ramp_up_profile (str): How the simulated voters are started, namely, "constant", "linear", or "step". Check get_start_delay for details.
+    :param ramp_up_time (float): The number of seconds it takes for all simulated voters to start.
+    :param step_size (int): The number of voters started at once, for the "step" profile.
+    :param max_tx_rate (float): If provided, the maximum number of transactions sent per second, across all simulated voters.
+    :param gas_results_file_path (pathlib.Path): If provided, the gas data of every transaction is written into this file. Skip it for large runs, since it writes one line per transaction.
+    :param report_file_path (pathlib.Path): If provided, the final report is also written into this file, in CSV format.
+
+    :return (dict[str, dict]): The report from LatencyRecorder.getReport.
+    """
+    if (total_voters < 1 or max_concurrency < 1 or rounds < 1):
+        raise Exception(f"ERROR: Invalid load parameters provided: total_voters = {total_voters}, max_concurrency = {max_concurrency}, rounds = {rounds}. Please provide positive numbers to continue!")
+
+    ctx: AccountConfig = tx_runner.ctx
+    voter_addresses: list[str] = [account["address"].hex() for account in ctx.accounts]
+
+    if (len(voter_addresses) == 0):
+        raise Exception(f"ERROR: No voter accounts configured for network {config.get(section="network", option="current")}")
+
+    active_election_ids: list[int] = await script_runner.getActiveElections()
+
+    if (len(active_election_ids) == 0):
+        raise Exception("ERROR: No active Elections detected! Cannot continue.")
+
+    if (election_id not in active_election_ids):
+        log.warning(f"Election id provided '{election_id}' is not among the active election ids. Defaulting to '{active_election_ids[0]}'")
+        election_id = active_election_ids[0]
+
+    # Retrieve the Election parameters only once, instead of once per voter
+    election_metadata: ElectionMetadata = await election_cache.getElection(election_id=election_id)
+    election_parameters: dict = {
+        "free": election_metadata.free
+    }
+
+    # Start encrypting ballots in the background while the first voters mint theirs
+    ballot_preparation.startElection(election_id=election_id)
+
+    recorder: LatencyRecorder = LatencyRecorder()
+    rate_limiter: RateLimiter = RateLimiter(rate=max_tx_rate, burst=max_concurrency) if max_tx_rate else None
+    concurrency_slots: asyncio.Semaphore = asyncio.Semaphore(max_concurrency)
+
+    # A VoteBox holds one Ballot per Election, so simulated voters that share an account cannot overlap
+    account_locks: dict[str, asyncio.Lock] = {voter_address: asyncio.Lock() for voter_address in voter_addresses}
+
+    async def run_voter(voter_index: int) -> int:
+        voter_address: str = voter_addresses[voter_index % len(voter_addresses)]
+
+        await asyncio.sleep(get_start_delay(voter_index=voter_index, total_voters=total_voters, ramp_up_profile=ramp_up_profile, ramp_up_time=ramp_up_time, step_size=step_size))
+
+        async with concurrency_slots:
+            async with account_locks[voter_address]:
+                return await simulate_voter(voter_index=voter_index, voter_address=voter_address, election_id=election_id, election_parameters=election_parameters, rounds=rounds, recorder=recorder, rate_limiter=rate_limiter, gas_results_file_path=gas_results_file_path)
+
+    log.info(f"Starting load test in Election {election_id}: {total_voters} voters, {rounds} rounds each, up to {max_concurrency} concurrent voters, '{ramp_up_profile}' ramp up over {ramp_up_time} seconds")
+
+    test_start: float = time.perf_counter()
+    successful_rounds: list[int] = await asyncio.gather(*[run_voter(voter_index=voter_index) for voter_index in range(0, total_voters)])
+    wall_time: float = time.perf_counter() - test_start
+
+    report: dict[str, dict] = recorder.getReport(wall_time=wall_time)
+
+    log.info(f"Load test finished in {wall_time:.2f} seconds. {sum(successful_rounds)} out of {total_voters * rounds} rounds completed successfully")
+    print_report(report=report)
+
+    if (report_file_path):
+        write_report(report=report, wall_time=wall_time, output_file_path=report_file_path)
+
+    return report
+
+
+def print_report(report: dict[str, dict]) -> None:
+    """Function to log the load test report in a table format.
+
+    :param report (dict[str, dict]): The report returned by LatencyRecorder.getReport.
+    """
+    log.info(f"{"Transaction":<20}{"Count":>8}{"Errors":>8}{"tx/s":>10}{"p50 (ms)":>12}{"p95 (ms)":>12}{"p99 (ms)":>12}")
+
+    for tx_type in report:
+        log.info(f"{tx_type:<20}{report[tx_type]["count"]:>8}{report[tx_type]["errors"]:>8}{report[tx_type]["throughput"]:>10.2f}{report[tx_type]["p50"]:>12.1f}{report[tx_type]["p95"]:>12.1f}{report[tx_type]["p99"]:>12.1f}")
+
+
+def write_report(report: dict[str, dict], wall_time: float, output_file_path: pathlib.Path) -> None:
+    """Function to append the load test report to a CSV file, creating it, with a header line, if it does not exist yet.
+
+    :param report (dict[str, dict]): The report returned by LatencyRecorder.getReport.
+    :param wall_time (float): The total duration of the load test, in seconds.
+    :param output_file_path (pathlib.Path): The CSV file to write into.
+    """
+    if (os.path.isfile(output_file_path)):
+        output_stream = open(output_file_path, "+a")
+    else:
+        output_stream = open(output_file_path, "+x")
+        output_stream.write("Timestamp, Transaction Type, Count, Errors, Wall Time (s), Throughput (tx/s), p50 (ms), p95 (ms), p99 (ms)\n")
+
+    timestamp: str = datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S")
+
+    for tx_type in report:
+        output_stream.write(f"{timestamp},{tx_type},{report[tx_type]["count"]},{report[tx_type]["errors"]},{wall_time},{report[tx_type]["throughput"]},{report[tx_type]["p50"]},{report[tx_type]["p95"]},{report[tx_type]["p99"]}\n")
+
+    output_stream.close()
+
+
+async def main(election_id: int = None, total_voters: int = None, max_concurrency: int = None) -> None:
+    """
+    Runs the load test with the parameters from the [load_generator] section of the config file, overridden by the ones provided as arguments.
+    """
+    report_file_name: str = f"{datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S")}_{config.get(section="network", option="current")}_load_generator_report.csv"
+    report_file_path: pathlib.Path = pathlib.Path(os.getcwd()).joinpath("results", report_file_name)
+
+    max_tx_rate: float = config.getfloat(section="load_generator", option="max_tx_rate", fallback=0.0)
+
+    await run_load(
+        election_id=election_id,
+        total_voters=total_voters if total_voters else config.getint(section="load_generator", option="total_voters", fallback=1000),
+        max_concurrency=max_concurrency if max_concurrency else config.getint(section="load_generator", option="max_concurrency", fallback=50),
+        rounds=config.getint(section="load_generator", option="rounds", fallback=1),
+        ramp_up_profile=config.get(section="load_generator", option="ramp_up_profile", fallback="linear"),
+        ramp_up_time=config.getfloat(section="load_generator", option="ramp_up_time", fallback=60.0),
+        step_size=config.getint(section="load_generator", option="step_size", fallback=10),
+        max_tx_rate=max_tx_rate if max_tx_rate > 0 else None,
+        report_file_path=report_file_path
+    )
+
+    await closeBallotPreparation()
+    await closeClientPools()
+    await closeMetricsSink()
+    await closeReceiptStore()
+
+
+if __name__ == "__main__":
+    """
+    Usage: python runners/load_generator.py <election_id> [<total_voters> <max_concurrency>]
+    """
+    if (len(sys.argv) < 2):
+        raise Exception("ERROR: Please provide an election_id to continue")
+
+    election_id: int = int(sys.argv[1].strip())
+    total_voters: int = int(sys.argv[2].strip()) if len(sys.argv) > 2 else None
+    max_concurrency: int = int(sys.argv[3].strip()) if len(sys.argv) > 3 else None
+
+    asyncio.run(main(election_id=election_id, total_voters=total_voters, max_concurrency=max_concurrency))
@@ -6,6 +6,7 @@ import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from common.utils import Utils
 from common.account_config import AccountConfig
+from common.client_pool import closeClientPools
 import datetime
 from pathlib import Path
 import configparser
@@ -88,4 +89,7 @@ if __name__ == "__main__":
             # Remove the service account from the set
             active_addresses.remove(ctx.service_account["address"].hex())
             for active_address in active_addresses:
-                new_loop.run_until_complete(delete_votebox(tx_signer_address=None, tx_proposer_address=active_address, tx_payer_address=ctx.service_account["address"].hex(), tx_authorizer_address=[active_address], gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path))
\ No newline at end of file
+                new_loop.run_until_complete(delete_votebox(tx_signer_address=None, tx_proposer_address=active_address, tx_payer_address=ctx.service_account["address"].hex(), tx_authorizer_address=[active_address], gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path))
+
+    # Close the pooled access node connections before the event loop goes away
+    new_loop.run_until_complete(closeClientPools())
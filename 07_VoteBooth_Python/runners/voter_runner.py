@@ -7,11 +7,15 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import pathlib
 from common.utils import Utils
 from common.account_config import AccountConfig
+from common.client_pool import closeClientPools
+from common.key_scheduler import key_scheduler
+from common.metrics_sink import closeMetricsSink
+from common.receipt_store import closeReceiptStore
 import configparser
 import datetime
+import multiprocessing
 import time
-import random
-import base64
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 
 import logging
 log = logging.getLogger(__name__)
@@ -23,7 +27,10 @@ script_runner: ScriptRunner = ScriptRunner()
 from python_scripts.cadence_transactions import TransactionRunner
 tx_runner: TransactionRunner = TransactionRunner()
 
-from python_scripts.crypto_management import CryptoUtils
+from python_scripts.election_cache import election_cache, ElectionMetadata
+from python_scripts.ballot_preparation import ballot_preparation, closeBallotPreparation, PreparedBallot
+
+from runners.load_generator import LatencyRecorder, timed_transaction, print_report, write_report
 
 project_cwd = pathlib.Path(os.getcwd())
 config_path = project_cwd.joinpath("common", "config.ini")
@@ -31,7 +38,7 @@ config = configparser.ConfigParser()
 config.read(config_path)
 
 
-async def process_ballot_account(voter_address: str, election_id: int = None, rounds: int = 2, max_delay: int = 10, gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None) -> None:
+async def process_ballot_account(voter_address: str, election_id: int = None, rounds: int = 2, max_delay: int = 10, gas_results_file_path: pathlib.Path = None, storage_results_file_path: pathlib.Path = None, recorder: LatencyRecorder = None) -> int:
     """
     Simple function to abstract the minting, casting, and submission of ballots. The idea is to have this function running on a separate thread, casting ballots continuously from one account. 
     :param voter_address (str): The account address to use for this purpose.
@@ -40,7 +47,13 @@ async def process_ballot_account(voter_address: str, election_id: int = None, ro
     :param max_delay (int): The maximum number of seconds that each cycle must wait (to avoid concurrent and racing conditions) at the beginning of each cycle.
     :param gas_results_file_path (pathlib.Path): A valid path to a file to where the gas calculations should be written into. If None is provided, the function skips the gas analysis.
     :param storage_results_file_path (pathlib.Path): A valid path to a file where the storage computations should be written into. If None is provided, the function skips the storage analysis.
+    :param recorder (LatencyRecorder): If provided, the latency of every transaction is recorded into it.
+
+    :return (int): The number of Ballots submitted.
     """
+    if (recorder == None):
+        recorder = LatencyRecorder()
+
     # Get the current account configuration
     ctx = AccountConfig()
     
@@ -77,14 +90,16 @@ async def process_ballot_account(voter_address: str, election_id: int = None, ro
     # Set the thread to sleep for a random value between 0 and the max value provided
     # time.sleep(random.randint(a=0, b=max_delay))
 
-    # Use the election_id provided to get a lot of useful parameters from the election in question
-    free_election: bool = await script_runner.isElectionFree(election_id=election_id)
-    election_options: list[dict] = await script_runner.getElectionOptions(election_id=election_id)
-    election_public_encryption_key: str = await script_runner.getPublicEncryptionKey(election_id=election_id)
+    # Use the election_id provided to get a lot of useful parameters from the election in question. These come from the election cache, which only goes to the network
+    # once per election, and already has the public encryption key deserialized
+    election_metadata: ElectionMetadata = await election_cache.getElection(election_id=election_id)
+    free_election: bool = election_metadata.free
 
-    # Get the option separator and encoding to use with the encrypted data
-    option_separator: str = config.get(section="encryption", option="separator")
-    option_encoding: str = config.get(section="encryption", option="encoding")
+    # Start filling the queue of encrypted ballots for this election while the first Ballot is minted
+    ballot_preparation.startElection(election_id=election_id)
+
+    # Cast, submit and add the receipt with one transaction instead of three
+    combined_vote: bool = config.getboolean(section="voting", option="combined_vote", fallback=True)
 
     # Setup the transaction signing parameters based on the election being free or not
     tx_signer_address: str = None
@@ -101,52 +116,225 @@ async def process_ballot_account(voter_address: str, election_id: int = None, ro
         # If the election is not free, the voter pays for everything
         tx_signer_address = voter_address
 
+    submitted_ballots: int = 0
+
     # Run this in a while loop
     while(rounds > 0):
 #         time.sleep(random.randint(a=0, b=max_delay))
         
         # Mint a new ballot to the account. This transaction is solely from the service_account's responsibility, therefore this accounts pays for everything.
-        await tx_runner.createBallot(election_id=election_id, recipient_address=voter_address, tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
+        await timed_transaction(tx_type="create_ballot", recorder=recorder, tx_coroutine=tx_runner.createBallot(election_id=election_id, recipient_address=voter_address, tx_signer_address=ctx.service_account["address"].hex(), gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path))
 
-        # Cast the Ballot
-        random_index: int = random.randint(a=1, b=len(election_options))
-        random_option: dict[int:str] = election_options[random_index]
+        # Cast the Ballot. The random option is already salted and encrypted, off the event loop, by the ballot preparation service
+        prepared_ballot: PreparedBallot = await ballot_preparation.getBallot(election_id=election_id)
+        option_salt: int = prepared_ballot.salt
+        base64_option: str = prepared_ballot.encrypted_option
 
         # But the cast Ballot transaction gas expenses payment depend of the free state of the election. In this case, use the parameters set above
-        option_salt: int = CryptoUtils.generate_random_salt()
-        salted_option: str = random_option + option_separator + str(option_salt)
-        encryption_key = CryptoUtils.load_public_key_from_string(key_string=election_public_encryption_key)
+        if (combined_vote):
+            # Cast, submit and add the receipt to the VoteBox, all in the same transaction
+            await timed_transaction(tx_type="vote", recorder=recorder, tx_coroutine=tx_runner.vote(election_id=election_id, new_option=base64_option, ballot_receipt=option_salt, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=tx_authorizer_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path))
 
-        # Encrypt the option
-        encrypted_salted_option: str = CryptoUtils.encrypt_message(
-            plaintext_message=salted_option,
-            public_key=encryption_key
-        )
+            # Set the ballot receipt to the voter account
+            await ctx.addReceipt(voter_address=voter_address, election_id=election_id, ballot_receipt=option_salt)
+        else:
+            # Cast the new option to the Ballot
+            await timed_transaction(tx_type="cast_ballot", recorder=recorder, tx_coroutine=tx_runner.castBallot(election_id=election_id, new_option=base64_option, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=tx_authorizer_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path))
 
-        # Encode the result into a more data economical base64 encoding
-        base64_option: str = base64.b64encode(encrypted_salted_option)
+            # Submit the Ballot
+            await timed_transaction(tx_type="submit_ballot", recorder=recorder, tx_coroutine=tx_runner.submitBallot(election_id=election_id, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=tx_authorizer_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path))
 
-        # Cast the new option to the Ballot
-        await tx_runner.castBallot(election_id=election_id, new_option=str(base64_option, encoding=option_encoding), tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=tx_authorizer_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
-        
-
-        # Submit the Ballot
-        await tx_runner.submitBallot(election_id=election_id, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=tx_authorizer_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
-
-        # Set the ballot receipt to the voter account
-        ctx.addReceipt(voter_address=voter_address, election_id=election_id, ballot_receipt=option_salt)
-        # And add the receipt to the VoteBox also
-        await tx_runner.addBallotReceipt(election_id=election_id, ballot_receipt=option_salt, tx_signer_address=None, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=tx_authorizer_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
+            # Set the ballot receipt to the voter account
+            await ctx.addReceipt(voter_address=voter_address, election_id=election_id, ballot_receipt=option_salt)
+            # And add the receipt to the VoteBox also
+            await timed_transaction(tx_type="add_ballot_receipt", recorder=recorder, tx_coroutine=tx_runner.addBallotReceipt(election_id=election_id, ballot_receipt=option_salt, tx_signer_address=tx_signer_address, tx_proposer_address=tx_proposer_address, tx_payer_address=tx_payer_address, tx_authorizer_address=tx_authorizer_address, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path))
 
         # Inform the voter.
         log.info(f"Round {rounds}: Account {voter_address} successfully cast a Ballot to Election {election_id}")
 
         # Decrease the round number and go for another one, if needed.
         rounds -= 1
+        submitted_ballots += 1
     
     # Voting done for this voter!
     log.info(f"Voter {voter_address} is finished for Election {election_id}")
 
+    return submitted_ballots
+
+
+async def run_voters(voter_addresses: list[str], election_id: int = None, rounds: int = 20, max_delay: int = 10, max_concurrency: int = 1, recorder: LatencyRecorder = None) -> dict:
+    """Function to run process_ballot_account for every voter address provided, with up to max_concurrency voters at the same time. A failed voter is logged and counted,
+    but does not stop the others.
+
+    :param voter_addresses (list[str]): The voter account addresses.
+    :param election_id (int): The Election to vote in.
+    :param rounds (int): The number of Ballots submitted by each voter.
+    :param max_delay (int): The maximum delay, in seconds, passed to process_ballot_account.
+    :param max_concurrency (int): The maximum number of voters running at the same time. 1 runs them one after the other.
+    :param recorder (LatencyRecorder): The object where the transaction latencies are recorded.
+
+    :return (dict): The results in the format {"voters": int, "failed_voters": int, "ballots": int, "wall_time": float}.
+    """
+    if (recorder == None):
+        recorder = LatencyRecorder()
+
+    concurrency_slots: asyncio.Semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_voter(voter_address: str) -> int:
+        gas_results_file_name: str = f"{datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S")}_{voter_address}_{config.get(section="network", option="current")}_voter_runner_gas_results.csv"
+        gas_results_file_path: pathlib.Path = pathlib.Path(os.getcwd()).joinpath("results", gas_results_file_name)
+
+        storage_results_file_name: str = f"{datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S")}_{voter_address}_{config.get(section="network", option="current")}_voter_runner_storage_results.csv"
+        storage_results_file_path: pathlib.Path = pathlib.Path(os.getcwd()).joinpath("results", storage_results_file_name)
+
+        async with concurrency_slots:
+            try:
+                return await process_ballot_account(voter_address=voter_address, election_id=election_id, rounds=rounds, max_delay=max_delay, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path, recorder=recorder)
+            except Exception as e:
+                log.error(f"Voter {voter_address} failed in Election {election_id}: {e}")
+                return None
+
+    run_start: float = time.perf_counter()
+    voter_ballots: list[int] = await asyncio.gather(*[run_voter(voter_address=voter_address) for voter_address in voter_addresses])
+
+    return {
+        "voters": len(voter_addresses),
+        "failed_voters": len([ballots for ballots in voter_ballots if ballots == None]),
+        "ballots": sum([ballots for ballots in voter_ballots if ballots != None]),
+        "wall_time": time.perf_counter() - run_start
+    }
+
+
+def get_shard_key_ids(shard_index: int, shard_count: int) -> list[int]:
+    """Function to select the service account proposal keys that a shard is allowed to use. Every shard mints Ballots with the service account, and each worker process
+    tracks the key sequence numbers on its own, so two shards using the same key would keep invalidating each other's transactions.
+
+    :param shard_index (int): The index of the shard.
+    :param shard_count (int): The total number of shards.
+
+    :return (list[int]): The indexes of the service account keys where key_id % shard_count == shard_index.
+    """
+    ctx = AccountConfig()
+
+    return [key_entry["key_id"] for key_entry in ctx.service_account.keys if key_entry["key_id"] % shard_count == shard_index]
+
+
+async def run_shard(shard_index: int, shard_count: int, voter_addresses: list[str], election_id: int, rounds: int, max_delay: int, max_concurrency: int) -> dict:
+    """Internal coroutine with the work of one shard: run its voters and close the process wide resources before its event loop goes away.
+    """
+    recorder: LatencyRecorder = LatencyRecorder()
+    ctx = AccountConfig()
+
+    key_scheduler.restrictKeys(address=ctx.service_account.address, key_ids=get_shard_key_ids(shard_index=shard_index, shard_count=shard_count))
+
+    try:
+        shard_results: dict = await run_voters(voter_addresses=voter_addresses, election_id=election_id, rounds=rounds, max_delay=max_delay, max_concurrency=max_concurrency, recorder=recorder)
+    finally:
+        await closeBallotPreparation()
+        await closeClientPools()
+        await closeMetricsSink()
+        await closeReceiptStore()
+
+    shard_results["shard_index"] = shard_index
+    shard_results["latencies"] = recorder.latencies
+    shard_results["errors"] = recorder.errors
+
+    return shard_results
+
+
+def run_voter_shard(shard_index: int, shard_count: int, voter_addresses: list[str], election_id: int, rounds: int, max_delay: int, max_concurrency: int) -> dict:
+    """Function, executed in a worker process, that votes with a shard of the voter accounts. Each worker has its own event loop, access node client pool, ballot
+    preparation pool and metrics sink. The receipts go to the shared receipt store, which is safe to write from several processes.
+
+    :param shard_index (int): The index of this shard. It also selects the service account proposal keys the shard uses (see get_shard_key_ids).
+    :param shard_count (int): The total number of shards.
+    :param voter_addresses (list[str]): The voter account addresses in this shard.
+    :param election_id (int): The Election to vote in.
+    :param rounds (int): The number of Ballots submitted by each voter.
+    :param max_delay (int): The maximum delay, in seconds, passed to process_ballot_account.
+    :param max_concurrency (int): The maximum number of voters running at the same time in this shard.
+
+    :return (dict): The run_voters results, plus the "shard_index" and the raw "latencies" and "errors" from the shard LatencyRecorder, for the coordinator to merge.
+    """
+    log.info(f"Shard {shard_index} (pid {os.getpid()}) starting with {len(voter_addresses)} voters")
+
+    return asyncio.run(run_shard(shard_index=shard_index, shard_count=shard_count, voter_addresses=voter_addresses, election_id=election_id, rounds=rounds, max_delay=max_delay, max_concurrency=max_concurrency))
+
+
+def run_coordinator(election_id: int, workers: int = None, rounds: int = None, max_delay: int = None, max_concurrency: int = None, report_file_path: pathlib.Path = None) -> dict[str, dict]:
+    """Function to split the voter accounts of the active network across several worker processes, wait for all of them, and aggregate their results. Signing and
+    encrypting ballots is CPU bound, so a single process cannot keep the access node busy, while this mode scales with the number of cores.
+
+    :param election_id (int): The Election to vote in.
+    :param workers (int): The number of worker processes. 0 uses the number of CPUs. Defaults to the [voter_runner] config section value.
+    :param rounds (int): The number of Ballots submitted by each voter. Defaults to the [voter_runner] config section value.
+    :param max_delay (int): The maximum delay, in seconds, passed to process_ballot_account. Defaults to the [voter_runner] config section value.
+    :param max_concurrency (int): The maximum number of voters running at the same time in each worker. Defaults to the [voter_runner] config section value.
+    :param report_file_path (pathlib.Path): If provided, the aggregated report is also written into this file, in CSV format.
+
+    :return (dict[str, dict]): The aggregated report, in the LatencyRecorder.getReport format.
+    """
+    workers = workers if workers != None else config.getint(section="voter_runner", option="workers", fallback=1)
+    rounds = rounds if rounds != None else config.getint(section="voter_runner", option="rounds", fallback=20)
+    max_delay = max_delay if max_delay != None else config.getint(section="voter_runner", option="max_delay", fallback=10)
+    max_concurrency = max_concurrency if max_concurrency != None else config.getint(section="voter_runner", option="max_concurrency", fallback=1)
+
+    if (workers <= 0):
+        workers = os.cpu_count() or 1
+
+    ctx = AccountConfig()
+    voter_addresses: list[str] = ctx.getAddresses()
+    voter_addresses.remove(ctx.service_account["address"].hex())
+
+    if (len(voter_addresses) == 0):
+        raise Exception(f"ERROR: No voter accounts configured for network {config.get(section="network", option="current")}")
+
+    # Round robin, so that every shard gets the same number of voters, give or take one. There is no point in having more shards than voters
+    shards: list[list[str]] = [voter_addresses[shard_index::workers] for shard_index in range(0, min(workers, len(voter_addresses)))]
+
+    # Each shard needs its own service account proposal keys to mint Ballots with
+    for shard_index in range(0, len(shards)):
+        if (len(get_shard_key_ids(shard_index=shard_index, shard_count=len(shards))) == 0):
+            raise Exception(f"ERROR: The service account has {len(ctx.service_account.keys)} proposal keys, not enough for {len(shards)} worker processes. Add more proposal keys or use fewer workers")
+
+    log.info(f"Coordinator: {len(voter_addresses)} voters across {len(shards)} worker processes, {rounds} rounds each, up to {max_concurrency} concurrent voters per worker")
+
+    recorder: LatencyRecorder = LatencyRecorder()
+    shard_results: list[dict] = []
+    run_start: float = time.perf_counter()
+
+    # Spawn instead of fork: a forked child would inherit the gRPC channels and the event loop state from this process
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=multiprocessing.get_context("spawn")) as executor:
+        shard_jobs: list[Future] = [
+            executor.submit(run_voter_shard, shard_index, len(shards), shard, election_id, rounds, max_delay, max_concurrency) for shard_index, shard in enumerate(shards)
+        ]
+
+        for shard_job in as_completed(shard_jobs):
+            try:
+                shard_result: dict = shard_job.result()
+            except Exception as e:
+                log.error(f"A voter shard failed: {e}")
+                continue
+
+            recorder.merge(latencies=shard_result["latencies"], errors=shard_result["errors"])
+            shard_results.append(shard_result)
+
+            log.info(f"Shard {shard_result["shard_index"]} finished in {shard_result["wall_time"]:.2f} seconds: {shard_result["ballots"]} ballots from {shard_result["voters"]} voters ({shard_result["failed_voters"]} failed)")
+
+    wall_time: float = time.perf_counter() - run_start
+    total_ballots: int = sum([shard_result["ballots"] for shard_result in shard_results])
+    failed_voters: int = sum([shard_result["failed_voters"] for shard_result in shard_results])
+
+    log.info(f"Coordinator finished in {wall_time:.2f} seconds. {total_ballots} ballots submitted ({total_ballots / wall_time if wall_time > 0 else 0.0:.2f} ballots/s), {failed_voters} voters failed, {len(shards) - len(shard_results)} shards failed")
+
+    report: dict[str, dict] = recorder.getReport(wall_time=wall_time)
+    print_report(report=report)
+
+    if (report_file_path):
+        write_report(report=report, wall_time=wall_time, output_file_path=report_file_path)
+
+    return report
+
 
 async def main(election_id: int = None):
     """
@@ -155,34 +343,43 @@ async def main(election_id: int = None):
     ctx = AccountConfig()
 
     # Number of rounds to run this process with. This is the number of Ballots submitted by the account provided
-    rounds: int = 20
+    rounds: int = config.getint(section="voter_runner", option="rounds", fallback=20)
 
     # Maximum number of seconds that this process can wait between rounds. The actual sleep value is a random one between 0 and the value set in the parameter
-    max_delay: int = 10
+    max_delay: int = config.getint(section="voter_runner", option="max_delay", fallback=10)
     voter_addresses: list[str] = ctx.getAddresses()
     voter_addresses.remove(ctx.service_account["address"].hex())
 
     # Launch the function
-    for voter_address in voter_addresses:
-        gas_results_file_name: str = f"{datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S")}_{voter_address}_{config.get(section="network", option="current")}_voter_runner_gas_results.csv"
-        gas_results_file_path: pathlib.Path = pathlib.Path(os.getcwd()).joinpath("results", gas_results_file_name)
+    await run_voters(voter_addresses=voter_addresses, election_id=election_id, rounds=rounds, max_delay=max_delay, max_concurrency=config.getint(section="voter_runner", option="max_concurrency", fallback=1))
 
-        storage_results_file_name: str = f"{datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S")}_{voter_address}_{config.get(section="network", option="current")}_voter_runner_storage_results.csv"
-        storage_results_file_path: pathlib.Path = pathlib.Path(os.getcwd()).joinpath("results", storage_results_file_name)
-
-        await process_ballot_account(voter_address=voter_address, election_id=election_id, rounds=rounds, max_delay=max_delay, gas_results_file_path=gas_results_file_path, storage_results_file_path=storage_results_file_path)
+    # Close the pooled access node channels before the event loop goes away
+    await closeBallotPreparation()
+    await closeClientPools()
+    await closeMetricsSink()
+    await closeReceiptStore()
 
 
 if __name__ == "__main__":
     """
-    Usage: python voter_runner <address> <election_id>
+    Usage: python voter_runner <election_id> [<workers>]
+    :param workers (int): If provided, and different from 1, the voter accounts are split across this many worker processes (0 for one per CPU) by run_coordinator.
+    Otherwise, the [voter_runner] workers value from the config file is used.
+
+    Former usage: python voter_runner <address> <election_id>
     :param address (str): The voter account address to proceed with this process. The account must exist is the configured network, otherwise an Exception is raised instead.
     :param election_id (int): If provided, the process retrieves the Election reference to the Election in question, if it exits. If no election_id is provided, or the one provided does not exists, the process lists all current active Elections and selects the first one (index = 0) of the set returned. If not active Election are found, the process raises a proper Exception. 
     """
     # Grab the election_id from input arguments
     election_id: int = int(sys.argv[1].strip())
+    workers: int = int(sys.argv[2].strip()) if len(sys.argv) > 2 else config.getint(section="voter_runner", option="workers", fallback=1)
+
+    if (workers != 1):
+        report_file_name: str = f"{datetime.datetime.now().strftime("%d-%m-%yT%H:%M:%S")}_{config.get(section="network", option="current")}_voter_runner_report.csv"
+        run_coordinator(election_id=election_id, workers=workers, report_file_path=pathlib.Path(os.getcwd()).joinpath("results", report_file_name))
+    else:
+        asyncio.run(main(election_id=election_id))
 
-    asyncio.run(main(election_id=election_id))
     exit(0)
 
     ctx = AccountConfig()
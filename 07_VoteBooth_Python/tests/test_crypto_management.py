@@ -0,0 +1,76 @@
+"""
+Tests for the ballot option encryption schemes in CryptoUtils, i.e., the original RSA-OAEP ballots and the tagged hybrid (v2) ones.
+
+Run from the project folder, since every module reads common/config.ini from the current working directory:
+    python -m unittest discover -s tests
+"""
+import os, sys
+project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_dir)
+os.chdir(project_dir)
+import base64
+import unittest
+
+from python_scripts.crypto_management import CryptoUtils, hybrid_ballot_tag, str_encoding
+
+salted_option: str = "Option A|123456789012345"
+
+
+class TestCryptoManagement(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.rsa_private_key, cls.rsa_public_key = CryptoUtils.generate_rsa_key_pair()
+        cls.ec_private_key, cls.ec_public_key = CryptoUtils.generate_ec_key_pair()
+
+
+    def tamper(self, encrypted_option: str, byte_index: int) -> str:
+        """
+        Flips one bit of the ciphertext inside a v2 ballot option and encodes it back.
+        """
+        ciphertext: bytearray = bytearray(base64.b64decode(encrypted_option[len(hybrid_ballot_tag):]))
+        ciphertext[byte_index] ^= 0x01
+
+        return hybrid_ballot_tag + str(base64.b64encode(bytes(ciphertext)), encoding=str_encoding)
+
+
+    def test_v2_round_trip(self) -> None:
+        encrypted_option: str = CryptoUtils.encrypt_ballot_option(plaintext_option=salted_option, public_key=self.ec_public_key)
+
+        self.assertTrue(encrypted_option.startswith(hybrid_ballot_tag))
+        self.assertEqual(CryptoUtils.decrypt_ballot_option(encrypted_option=encrypted_option, private_key=self.ec_private_key), salted_option)
+
+        # Every ballot uses a new ephemeral key, so the same option never encrypts to the same text
+        self.assertNotEqual(CryptoUtils.encrypt_ballot_option(plaintext_option=salted_option, public_key=self.ec_public_key), encrypted_option)
+
+
+    def test_untagged_rsa_ballot(self) -> None:
+        """
+        Ballots cast before the hybrid scheme, i.e., base64 encoded RSA-OAEP without a tag, must still decrypt.
+        """
+        encrypted_option: str = str(base64.b64encode(CryptoUtils.encrypt_message(plaintext_message=salted_option, public_key=self.rsa_public_key)), encoding=str_encoding)
+
+        self.assertFalse(encrypted_option.startswith(hybrid_ballot_tag))
+        self.assertFalse(CryptoUtils.encrypt_ballot_option(plaintext_option=salted_option, public_key=self.rsa_public_key).startswith(hybrid_ballot_tag))
+        self.assertEqual(CryptoUtils.decrypt_ballot_option(encrypted_option=encrypted_option, private_key=self.rsa_private_key), salted_option)
+
+
+    def test_tampered_v2_ballot(self) -> None:
+        encrypted_option: str = CryptoUtils.encrypt_ballot_option(plaintext_option=salted_option, public_key=self.ec_public_key)
+
+        # The ephemeral public key (first byte after the point prefix), the AES-GCM ciphertext and the tag
+        for byte_index in [1, 40, -1]:
+            with self.subTest(byte_index=byte_index):
+                with self.assertRaises(Exception):
+                    CryptoUtils.decrypt_ballot_option(encrypted_option=self.tamper(encrypted_option=encrypted_option, byte_index=byte_index), private_key=self.ec_private_key)
+
+
+    def test_wrong_key_type(self) -> None:
+        with self.assertRaises(Exception):
+            CryptoUtils.decrypt_ballot_option(encrypted_option=CryptoUtils.encrypt_ballot_option(plaintext_option=salted_option, public_key=self.ec_public_key), private_key=self.rsa_private_key)
+
+        with self.assertRaises(Exception):
+            CryptoUtils.decrypt_ballot_option(encrypted_option=CryptoUtils.encrypt_ballot_option(plaintext_option=salted_option, public_key=self.rsa_public_key), private_key=self.ec_private_key)
+
+
+if __name__ == "__main__":
+    unittest.main()
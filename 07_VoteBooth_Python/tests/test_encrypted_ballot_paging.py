@@ -0,0 +1,124 @@
+"""
+Tests for ScriptRunner.iterateElectionEncryptedBallots, with the script calls replaced, so that no network is needed.
+
+Run from the project folder, since every module reads common/config.ini from the current working directory:
+    python -m unittest discover -s tests
+"""
+import os, sys
+project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_dir)
+os.chdir(project_dir)
+import json
+import pathlib
+import tempfile
+import unittest
+
+from ecdsa import SigningKey, NIST256p
+
+from common import account_config
+from common.account_config import AccountConfig
+from python_scripts.cadence_scripts import ScriptRunner
+
+# The error returned by the access node when the script calls a function that the deployed contract does not have
+missing_function_error: str = "error: value of type `&{ElectionStandard.ElectionPublic}` has no member `getEncryptedOptionsPage`"
+
+
+class TestEncryptedBallotPaging(unittest.IsolatedAsyncioTestCase):
+    encrypted_options: list[str] = [f"encrypted_option_{index}" for index in range(0, 23)]
+
+    async def asyncSetUp(self) -> None:
+        self.temporary_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+
+        # ScriptRunner builds an AccountConfig, which only needs a flow.json with the service account
+        current_network: str = account_config.config.get(section="network", option="current")
+        flow_json_path: pathlib.Path = pathlib.Path(self.temporary_dir.name).joinpath("flow.json")
+        flow_json_path.write_text(json.dumps({
+            "accounts": {
+                "emulator-account" if current_network == "emulator" else "flow_test_service_account": {
+                    "address": account_config.config.get(section=current_network, option="service_account"),
+                    "key": {"privateKey": SigningKey.generate(curve=NIST256p).to_string().hex()}
+                }
+            }
+        }))
+
+        self.previous_flow_json_file: str = account_config.flow_json_file
+        self.previous_use_index: str = account_config.config.get(section="account_config", option="use_index", fallback="True")
+        account_config.flow_json_file = str(flow_json_path)
+        account_config.config.set(section="account_config", option="use_index", value="False")
+        AccountConfig.reset()
+
+        self.script_runner: ScriptRunner = ScriptRunner()
+        self.full_calls: int = 0
+        self.page_calls: int = 0
+        self.script_runner.getElectionEncryptedBallots = self.getElectionEncryptedBallots
+
+
+    async def asyncTearDown(self) -> None:
+        self.temporary_dir.cleanup()
+
+        account_config.flow_json_file = self.previous_flow_json_file
+        account_config.config.set(section="account_config", option="use_index", value=self.previous_use_index)
+        AccountConfig.reset()
+
+
+    async def getElectionEncryptedBallots(self, election_id: int) -> list[str]:
+        self.full_calls += 1
+        return list(self.encrypted_options)
+
+
+    async def getPage(self, election_id: int, offset: int, limit: int) -> list[str]:
+        self.page_calls += 1
+        return self.encrypted_options[offset:offset + limit]
+
+
+    async def getPageFromOldContract(self, election_id: int, offset: int, limit: int) -> list[str]:
+        self.page_calls += 1
+        raise Exception(missing_function_error)
+
+
+    async def collectPages(self, page_size: int) -> list[list[str]]:
+        return [page async for page in self.script_runner.iterateElectionEncryptedBallots(election_id=1, page_size=page_size)]
+
+
+    async def test_paging(self) -> None:
+        self.script_runner.getElectionEncryptedBallotsPage = self.getPage
+
+        pages: list[list[str]] = await self.collectPages(page_size=5)
+
+        self.assertEqual([len(page) for page in pages], [5, 5, 5, 5, 3])
+        self.assertEqual(sum(pages, []), self.encrypted_options)
+        self.assertEqual(self.full_calls, 0)
+
+
+    async def test_fallback_without_paging_functions(self) -> None:
+        """
+        Contracts deployed before the paging functions were added must still be tallied, through the script that returns every encrypted option at once.
+        """
+        self.script_runner.getElectionEncryptedBallotsPage = self.getPageFromOldContract
+
+        pages: list[list[str]] = await self.collectPages(page_size=5)
+
+        self.assertEqual([len(page) for page in pages], [5, 5, 5, 5, 3])
+        self.assertEqual(sum(pages, []), self.encrypted_options)
+        self.assertEqual(self.full_calls, 1)
+
+        # The paging script is not tried again once it failed for that reason
+        await self.collectPages(page_size=5)
+        self.assertEqual(self.page_calls, 1)
+        self.assertEqual(self.full_calls, 2)
+
+
+    async def test_other_errors_are_raised(self) -> None:
+        async def failingPage(election_id: int, offset: int, limit: int) -> list[str]:
+            raise Exception("Connection refused")
+
+        self.script_runner.getElectionEncryptedBallotsPage = failingPage
+
+        with self.assertRaises(Exception):
+            await self.collectPages(page_size=5)
+
+        self.assertEqual(self.full_calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
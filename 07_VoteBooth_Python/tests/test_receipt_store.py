@@ -0,0 +1,73 @@
+"""
+Tests for the ReceiptStore group commit, against a temporary database.
+
+Run from the project folder, since every module reads common/config.ini from the current working directory:
+    python -m unittest discover -s tests
+"""
+import asyncio
+import os, sys
+project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_dir)
+os.chdir(project_dir)
+import pathlib
+import sqlite3
+import tempfile
+import unittest
+
+from common.receipt_store import ReceiptStore
+
+
+class ReceiptStoreTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.temp_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.database_path: pathlib.Path = pathlib.Path(self.temp_dir.name).joinpath("receipts.db")
+        self.store: ReceiptStore = ReceiptStore(database_path=self.database_path, network="test")
+
+
+    async def asyncTearDown(self) -> None:
+        await self.store.close()
+        self.temp_dir.cleanup()
+
+
+    def countOnDisk(self) -> int:
+        """
+        Counts the receipts through a separate connection, i.e., only the ones already committed.
+        """
+        with sqlite3.connect(self.database_path) as connection:
+            return connection.execute("SELECT COUNT(*) FROM receipts").fetchone()[0]
+
+
+    async def test_receipts_are_committed_when_add_returns(self) -> None:
+        voter_count: int = 50
+
+        async def vote(voter_index: int) -> None:
+            await self.store.addReceipt(voter_address=f"0x{voter_index:016x}", election_id=7, ballot_receipt=voter_index)
+            # Nothing else runs in this voter until its receipt is on disk
+            self.assertGreaterEqual(self.countOnDisk(), 1)
+
+        await asyncio.gather(*[vote(voter_index=voter_index) for voter_index in range(0, voter_count)])
+
+        self.assertEqual(self.countOnDisk(), voter_count)
+        self.assertEqual(self.store.getElectionReceiptSet(election_id=7), set(range(0, voter_count)))
+
+
+    async def test_reads_see_receipts_being_written(self) -> None:
+        pending_votes: list[asyncio.Task] = [asyncio.create_task(self.store.addReceipt(voter_address="0x01", election_id=3, ballot_receipt=receipt)) for receipt in range(0, 20)]
+
+        # Let the receipts reach the buffer, and possibly the flusher, before reading from a worker thread
+        await asyncio.sleep(0)
+        stored_receipts: list[int] = await asyncio.to_thread(self.store.getReceipts, voter_address="0x01", election_id=3)
+
+        self.assertEqual(stored_receipts, list(range(0, 20)))
+        await asyncio.gather(*pending_votes)
+
+
+    async def test_failed_write_raises_in_the_voter(self) -> None:
+        with self.assertRaises(Exception):
+            await self.store.addReceipt(voter_address="0x01", election_id=1, ballot_receipt="not a receipt")
+
+        self.assertEqual(self.store.buffer, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
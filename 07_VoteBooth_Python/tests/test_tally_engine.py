@@ -0,0 +1,152 @@
+"""
+Tests for the parallel TallyEngine, against the sequential tally loop it replaced, with a fixed set of encrypted ballots.
+
+Run from the project folder, since every module reads common/config.ini from the current working directory:
+    python -m unittest discover -s tests
+"""
+import os, sys
+project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_dir)
+os.chdir(project_dir)
+import pathlib
+import tempfile
+import unittest
+
+from cryptography.hazmat.primitives import serialization
+
+from python_scripts.crypto_management import CryptoUtils
+from python_scripts.tally_engine import TallyEngine, config
+
+election_options: dict[int:str] = {1: "Option A", 2: "Option B", 3: "Option C"}
+option_separator: str = config.get(section="encryption", option="separator")
+
+# Salted options as cast by the voters. Besides the valid ones, there are options that are not in the Election ("invalid") and options without exactly one separator
+# ("malformed"), which the tally skips without a receipt
+salted_options: list[str] = [
+    f"Option A{option_separator}1001",
+    f"Option B{option_separator}1002",
+    f"Option Z{option_separator}1003",
+    f"Option A{option_separator}1004",
+    "Option C",
+    f"Option C{option_separator}1005",
+    f"Option B{option_separator}1006{option_separator}7",
+    f"Option A{option_separator}1007",
+    f"{option_separator}1008",
+    f"Option C{option_separator}1009",
+    f"Option B{option_separator}1010",
+    f"Option A{option_separator}1011",
+    f"Option D{option_separator}1012"
+]
+
+
+def sequentialTally(encrypted_ballots: list[str], private_key) -> tuple[dict[str:int], list[int]]:
+    """
+    The sequential tally loop that the TallyEngine replaced, as a reference.
+    """
+    decrypted_ballot_options: list[str] = [CryptoUtils.decrypt_ballot_option(encrypted_option=encrypted_ballot, private_key=private_key) for encrypted_ballot in encrypted_ballots]
+
+    election_options_tally: dict[str:int] = {}
+    for election_option in election_options:
+        election_options_tally[election_options[election_option]] = 0
+
+    election_options_tally["invalid"] = 0
+
+    ballot_receipts: list[int] = []
+
+    for decrypted_ballot_option in decrypted_ballot_options:
+        option_elements: list[str] = decrypted_ballot_option.split(option_separator)
+
+        if (len(option_elements) != 2):
+            continue
+
+        if (option_elements[0] in election_options_tally):
+            election_options_tally[option_elements[0]] += 1
+        else:
+            election_options_tally["invalid"] += 1
+
+        ballot_receipts.append(int(option_elements[1]))
+
+    return (election_options_tally, ballot_receipts)
+
+
+class TestTallyEngine(unittest.IsolatedAsyncioTestCase):
+    key_name: str = "tally_engine_test.key"
+
+    def setUp(self) -> None:
+        self.temporary_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        pathlib.Path(self.temporary_dir.name).joinpath("keys").mkdir()
+
+
+    def tearDown(self) -> None:
+        self.temporary_dir.cleanup()
+
+
+    def newEngine(self, private_key, chunk_size: int, max_workers: int) -> TallyEngine:
+        """
+        TallyEngine reads the private key from the 'keys' folder under the current working directory, so write it to a temporary one and only go there while the engine
+        is built.
+        """
+        pathlib.Path(self.temporary_dir.name).joinpath("keys", self.key_name).write_bytes(private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        ))
+
+        os.chdir(self.temporary_dir.name)
+
+        try:
+            return TallyEngine(election_options=election_options, private_encryption_key_name=self.key_name, chunk_size=chunk_size, max_workers=max_workers)
+        finally:
+            os.chdir(project_dir)
+
+
+    async def assertMatchesSequentialTally(self, private_key, public_key) -> None:
+        encrypted_ballots: list[str] = [CryptoUtils.encrypt_ballot_option(plaintext_option=salted_option, public_key=public_key) for salted_option in salted_options]
+        expected_tally, expected_receipts = sequentialTally(encrypted_ballots=encrypted_ballots, private_key=private_key)
+
+        # 13 ballots: one per chunk, chunks that do not divide the ballot count, and a single chunk, with one or more workers
+        for chunk_size, max_workers in [(1, 1), (1, 3), (4, 2), (5, 3), (len(encrypted_ballots), 2)]:
+            with self.subTest(chunk_size=chunk_size, max_workers=max_workers):
+                tally_engine: TallyEngine = self.newEngine(private_key=private_key, chunk_size=chunk_size, max_workers=max_workers)
+                election_options_tally, ballot_receipts = await tally_engine.tally(encrypted_ballots=encrypted_ballots)
+
+                # Same counts and same option order, and the receipts in ballot order
+                self.assertEqual(list(election_options_tally.items()), list(expected_tally.items()))
+                self.assertEqual(ballot_receipts, expected_receipts)
+                self.assertEqual(tally_engine.ballots_processed, len(encrypted_ballots))
+
+        self.assertEqual(expected_tally, {"Option A": 4, "Option B": 2, "Option C": 2, "invalid": 3})
+        self.assertEqual(expected_receipts, [1001, 1002, 1003, 1004, 1005, 1007, 1008, 1009, 1010, 1011, 1012])
+
+
+    async def test_rsa_ballots(self) -> None:
+        private_key, public_key = CryptoUtils.generate_rsa_key_pair()
+        await self.assertMatchesSequentialTally(private_key=private_key, public_key=public_key)
+
+
+    async def test_hybrid_ballots(self) -> None:
+        private_key, public_key = CryptoUtils.generate_ec_key_pair()
+        await self.assertMatchesSequentialTally(private_key=private_key, public_key=public_key)
+
+
+    async def test_ballot_pages(self) -> None:
+        """
+        Pages from ScriptRunner.iterateElectionEncryptedBallots do not line up with the chunks, and the result must not depend on it.
+        """
+        private_key, public_key = CryptoUtils.generate_rsa_key_pair()
+        encrypted_ballots: list[str] = [CryptoUtils.encrypt_ballot_option(plaintext_option=salted_option, public_key=public_key) for salted_option in salted_options]
+        expected_tally, expected_receipts = sequentialTally(encrypted_ballots=encrypted_ballots, private_key=private_key)
+
+        async def ballotPages():
+            for page_start in range(0, len(encrypted_ballots), 3):
+                yield encrypted_ballots[page_start:page_start + 3]
+
+        tally_engine: TallyEngine = self.newEngine(private_key=private_key, chunk_size=5, max_workers=2)
+        election_options_tally, ballot_receipts = await tally_engine.tally(encrypted_ballots=ballotPages())
+
+        self.assertEqual(list(election_options_tally.items()), list(expected_tally.items()))
+        self.assertEqual(ballot_receipts, expected_receipts)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Concurrency tests for TransactionRunner, against the AccessNodeStub, so that no emulator is needed.
+
+Run from the project folder, since every module reads common/config.ini from the current working directory:
+    python -m unittest discover -s tests
+"""
+import asyncio
+import os, sys
+project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_dir)
+os.chdir(project_dir)
+import json
+import pathlib
+import socket
+import tempfile
+import unittest
+
+from ecdsa import SigningKey, NIST256p
+
+from common import account_config, client_pool
+from common.access_node_stub import AccessNodeStub
+from common.account_config import AccountConfig, AccountRecord
+from common.client_pool import FlowClientPool, closeClientPools
+from common.sequence_manager import sequence_manager
+from common.source_cache import source_cache
+from python_scripts.cadence_transactions import TransactionRunner
+
+# The transaction only needs to go through the access node stub, which does not run any Cadence
+test_transaction_code: str = "transaction {\n    prepare(signer: &Account) {}\n}\n"
+
+
+def get_free_port() -> int:
+    """
+    Returns a local TCP port that is not in use at the moment.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as test_socket:
+        test_socket.bind(("localhost", 0))
+        return test_socket.getsockname()[1]
+
+
+class TestTransactionConcurrency(unittest.IsolatedAsyncioTestCase):
+    pool_size: int = 2
+    tx_name: str = "concurrency_test"
+
+    async def asyncSetUp(self) -> None:
+        self.stub: AccessNodeStub = AccessNodeStub(host="localhost", port=get_free_port())
+        self.stub.seal_delay = 0.0
+        await self.stub.start()
+
+        self.temporary_dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        temporary_path: pathlib.Path = pathlib.Path(self.temporary_dir.name)
+
+        # A flow.json with only the service account, with a single key, i.e., a single proposal key, and the (process wide) account configuration pointing to the stub
+        current_network: str = account_config.config.get(section="network", option="current")
+        flow_json_path: pathlib.Path = temporary_path.joinpath("flow.json")
+        flow_json_path.write_text(json.dumps({
+            "accounts": {
+                "emulator-account" if current_network == "emulator" else "flow_test_service_account": {
+                    "address": account_config.config.get(section=current_network, option="service_account"),
+                    "key": {"privateKey": SigningKey.generate(curve=NIST256p).to_string().hex()}
+                }
+            }
+        }))
+
+        self.previous_flow_json_file: str = account_config.flow_json_file
+        self.previous_use_index: str = account_config.config.get(section="account_config", option="use_index", fallback="True")
+        account_config.flow_json_file = str(flow_json_path)
+        account_config.config.set(section="account_config", option="use_index", value="False")
+        AccountConfig.reset()
+
+        self.ctx: AccountConfig = AccountConfig()
+        self.ctx.access_node_host = self.stub.host
+        self.ctx.access_node_port = self.stub.port
+        self.signer_account: AccountRecord = self.ctx.service_account
+
+        # Every test starts a new stand-in, with every sequence number back at 0, but the sequence numbers tracked by the process are kept between tests
+        for key_entry in self.signer_account.keys:
+            sequence_manager.invalidate(address=self.signer_account.address, key_id=key_entry["key_id"])
+
+        # A pool smaller than the number of concurrent transactions
+        client_pool.client_pools[(self.stub.host, self.stub.port)] = FlowClientPool(host=self.stub.host, port=self.stub.port, size=self.pool_size)
+
+        tx_path: pathlib.Path = temporary_path.joinpath(f"{self.tx_name}.cdc")
+        tx_path.write_text(test_transaction_code)
+        source_cache.paths[("transactions", self.tx_name)] = tx_path
+
+        self.tx_runner: TransactionRunner = TransactionRunner()
+
+
+    async def asyncTearDown(self) -> None:
+        await closeClientPools()
+        await self.stub.stop()
+
+        source_cache.paths.pop(("transactions", self.tx_name), None)
+        source_cache.invalidate(section="transactions", name=self.tx_name)
+        self.temporary_dir.cleanup()
+
+        account_config.flow_json_file = self.previous_flow_json_file
+        account_config.config.set(section="account_config", option="use_index", value=self.previous_use_index)
+        AccountConfig.reset()
+
+
+    async def runTransaction(self) -> None:
+        tx_object = await self.tx_runner.getTransaction(tx_name=self.tx_name, tx_arguments=[], tx_signer_address=self.signer_account.address_hex)
+        tx_future: asyncio.Future = await self.tx_runner.sendTransaction(tx_object=tx_object)
+        await tx_future
+
+
+    async def test_more_transactions_than_clients_and_keys(self) -> None:
+        """
+        Transactions waiting for a proposal key must not hold a client from the pool, or the transaction that holds the key is never able to send itself and release it.
+        """
+        tx_count: int = 4 * (self.pool_size + len(self.signer_account.keys))
+
+        try:
+            await asyncio.wait_for(asyncio.gather(*[self.runTransaction() for _ in range(0, tx_count)]), timeout=30)
+        except asyncio.TimeoutError:
+            self.fail(f"{tx_count} concurrent transactions did not finish with {self.pool_size} clients and {len(self.signer_account.keys)} proposal key(s)")
+
+        # Every transaction used the same key, one after the other, without any sequence number mismatches
+        self.assertEqual(self.stub.getAccount(address=self.signer_account.address.bytes).keys[0].sequence_number, tx_count)
+
+
+    async def test_out_of_order_sealing(self) -> None:
+        """
+        The network does not execute the transactions of a proposal key in the order they were sent, so a key must not be handed to another transaction before the
+        previous one is sealed, or the later ones fail with sequence number mismatches.
+        """
+        self.stub.seal_jitter = 0.05
+        tx_count: int = 4 * len(self.signer_account.keys)
+
+        try:
+            await asyncio.wait_for(asyncio.gather(*[self.runTransaction() for _ in range(0, tx_count)]), timeout=30)
+        except asyncio.TimeoutError:
+            self.fail(f"{tx_count} concurrent transactions did not finish with {len(self.signer_account.keys)} proposal key(s)")
+
+        self.assertEqual(self.stub.getAccount(address=self.signer_account.address.bytes).keys[0].sequence_number, tx_count)
+
+
+    async def test_failed_transactions_resync_the_key(self) -> None:
+        """
+        A transaction that fails still uses its sequence number. The key is re-synced with the network after the failure, and the following transactions use it as usual.
+        """
+        self.stub.seal_jitter = 0.05
+        tx_count: int = 4 * len(self.signer_account.keys)
+        executed_count: list[int] = [0]
+
+        def failEveryThird(arguments: list, transaction) -> list:
+            executed_count[0] += 1
+
+            if (executed_count[0] % 3 == 0):
+                raise Exception("ERROR: Transaction failed on purpose")
+
+            return []
+
+        self.stub.setTransactionResult(transaction_name=self.tx_name, events=failEveryThird)
+
+        tx_results: list = await asyncio.wait_for(asyncio.gather(*[self.runTransaction() for _ in range(0, tx_count)], return_exceptions=True), timeout=30)
+        failed_results: list = [tx_result for tx_result in tx_results if isinstance(tx_result, BaseException)]
+
+        self.assertEqual(len(failed_results), tx_count // 3)
+        self.assertTrue(all("on purpose" in str(failed_result) for failed_result in failed_results))
+        self.assertEqual(self.stub.getAccount(address=self.signer_account.address.bytes).keys[0].sequence_number, tx_count)
+
+
+if __name__ == "__main__":
+    unittest.main()